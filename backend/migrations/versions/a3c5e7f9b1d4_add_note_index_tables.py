@@ -0,0 +1,58 @@
+"""add note_files and note_chunks for semantic note search
+
+Revision ID: a3c5e7f9b1d4
+Revises: f2b4d6e8a0c3
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c5e7f9b1d4'
+down_revision: Union[str, None] = 'f2b4d6e8a0c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'note_files',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('path', sa.Text(), nullable=False, unique=True),
+        sa.Column('mtime_ns', sa.BigInteger(), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('indexed_at', sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_table(
+        'note_chunks',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column(
+            'file_id',
+            sa.Integer(),
+            sa.ForeignKey('note_files.id', ondelete='CASCADE'),
+            nullable=False,
+        ),
+        sa.Column('start_line', sa.Integer(), nullable=False),
+        sa.Column('end_line', sa.Integer(), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('embedding', Vector(768), nullable=True),
+    )
+    op.create_index('ix_note_chunks_file_id', 'note_chunks', ['file_id'])
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_note_chunks_embedding_hnsw "
+        "ON note_chunks USING hnsw (embedding vector_cosine_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_note_chunks_embedding_hnsw")
+    op.drop_index('ix_note_chunks_file_id', table_name='note_chunks')
+    op.drop_table('note_chunks')
+    op.drop_table('note_files')
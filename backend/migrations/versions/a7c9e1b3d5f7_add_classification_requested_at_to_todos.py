@@ -0,0 +1,35 @@
+"""add classification_requested_at to todos
+
+Revision ID: a7c9e1b3d5f7
+Revises: f6b8d0a2c4e6
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c9e1b3d5f7'
+down_revision: Union[str, None] = 'f6b8d0a2c4e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'todos',
+        sa.Column('classification_requested_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    # The classification queue is the (usually tiny) set of rows with this set
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_todos_classification_queue "
+        "ON todos (id) WHERE classification_requested_at IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_todos_classification_queue")
+    op.drop_column('todos', 'classification_requested_at')
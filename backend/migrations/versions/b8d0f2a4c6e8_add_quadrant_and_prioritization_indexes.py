@@ -0,0 +1,67 @@
+"""add generated quadrant column and prioritization indexes to todos
+
+Revision ID: b8d0f2a4c6e8
+Revises: a7c9e1b3d5f7
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d0f2a4c6e8'
+down_revision: Union[str, None] = 'a7c9e1b3d5f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match istari.models.todo.QUADRANT_SQL
+_QUADRANT_SQL = (
+    "CASE WHEN urgent AND important THEN 1 WHEN important THEN 2 WHEN urgent THEN 3 "
+    "WHEN urgent IS NULL AND important IS NULL THEN 4 ELSE 5 END"
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        'todos',
+        sa.Column(
+            'quadrant',
+            sa.SmallInteger(),
+            sa.Computed(_QUADRANT_SQL, persisted=True),
+            nullable=False,
+        ),
+    )
+    # get_prioritized: stored-quadrant order, read straight off the index
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_todos_prioritized "
+        "ON todos (quadrant, priority, due_date, created_at DESC) "
+        "WHERE status IN ('open', 'in_progress')"
+    )
+    # get_due_soon and the deadline-urgent branch of get_prioritized
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_todos_actionable_due_date "
+        "ON todos (due_date) "
+        "WHERE due_date IS NOT NULL AND status IN ('open', 'in_progress', 'blocked')"
+    )
+    # list_open
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_todos_actionable_created_at "
+        "ON todos (created_at DESC) "
+        "WHERE status IN ('open', 'in_progress', 'blocked')"
+    )
+    # list_today: only a handful of rows ever have today_date set
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_todos_today_date "
+        "ON todos (today_date) WHERE today_date IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_todos_today_date")
+    op.execute("DROP INDEX IF EXISTS ix_todos_actionable_created_at")
+    op.execute("DROP INDEX IF EXISTS ix_todos_actionable_due_date")
+    op.execute("DROP INDEX IF EXISTS ix_todos_prioritized")
+    op.drop_column('todos', 'quadrant')
@@ -0,0 +1,37 @@
+"""add selected to calendar_sources and response_status to calendar_entries
+
+Revision ID: c7e9b1d3f5a8
+Revises: b5d7f9a1c3e6
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e9b1d3f5a8'
+down_revision: Union[str, None] = 'b5d7f9a1c3e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Both are filled in by the next sync; clearing the sync tokens makes it a
+    # full one so existing entries get their response status too
+    op.add_column(
+        'calendar_sources',
+        sa.Column('selected', sa.Boolean(), nullable=False, server_default=sa.true()),
+    )
+    op.add_column(
+        'calendar_entries',
+        sa.Column('response_status', sa.String(length=16), nullable=True),
+    )
+    op.execute("UPDATE calendar_sources SET sync_token = NULL")
+
+
+def downgrade() -> None:
+    op.drop_column('calendar_entries', 'response_status')
+    op.drop_column('calendar_sources', 'selected')
@@ -0,0 +1,69 @@
+"""add project_stats aggregate table and index todos.project_id
+
+Revision ID: c9e1a3b5d7f9
+Revises: b8d0f2a4c6e8
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e1a3b5d7f9'
+down_revision: Union[str, None] = 'b8d0f2a4c6e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'project_stats',
+        sa.Column(
+            'project_id',
+            sa.Integer(),
+            sa.ForeignKey('projects.id', ondelete='CASCADE'),
+            primary_key=True,
+        ),
+        sa.Column('open_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('in_progress_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('blocked_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_activity', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_open_activity', sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            'next_action_status',
+            postgresql.ENUM(name='todostatus', create_type=False),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_project_stats_last_open_activity', 'project_stats', ['last_open_activity']
+    )
+    # Per-project recompute after every todo write
+    op.execute("CREATE INDEX IF NOT EXISTS ix_todos_project_id ON todos (project_id)")
+
+    # Backfill; from here on the ORM write paths keep rows current
+    op.execute("""
+        INSERT INTO project_stats (project_id, open_count, in_progress_count, blocked_count,
+                                   last_activity, last_open_activity, next_action_status)
+        SELECT p.id,
+               count(t.id) FILTER (WHERE t.status = 'open'),
+               count(t.id) FILTER (WHERE t.status = 'in_progress'),
+               count(t.id) FILTER (WHERE t.status = 'blocked'),
+               max(t.updated_at),
+               max(t.updated_at) FILTER (WHERE t.status IN ('open', 'in_progress')),
+               na.status
+          FROM projects p
+          LEFT JOIN todos t ON t.project_id = p.id
+          LEFT JOIN todos na ON na.id = p.next_action_id
+         GROUP BY p.id, na.status
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_todos_project_id")
+    op.drop_index('ix_project_stats_last_open_activity', table_name='project_stats')
+    op.drop_table('project_stats')
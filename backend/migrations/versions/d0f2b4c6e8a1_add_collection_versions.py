@@ -0,0 +1,35 @@
+"""add collection_versions counters for list ETags
+
+Revision ID: d0f2b4c6e8a1
+Revises: c9e1a3b5d7f9
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd0f2b4c6e8a1'
+down_revision: Union[str, None] = 'c9e1a3b5d7f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'collection_versions',
+        sa.Column('name', sa.String(length=32), primary_key=True),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+    )
+    # Seed every collection so write paths only ever UPDATE
+    op.execute("""
+        INSERT INTO collection_versions (name, version)
+        VALUES ('todos', 0), ('projects', 0), ('notifications', 0), ('digests', 0)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('collection_versions')
@@ -0,0 +1,73 @@
+"""add mail_messages mirror and mail_sync_state
+
+Revision ID: e1a3c5d7f9b2
+Revises: d0f2b4c6e8a1
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1a3c5d7f9b2'
+down_revision: Union[str, None] = 'd0f2b4c6e8a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'mail_messages',
+        sa.Column('id', sa.String(length=32), primary_key=True),
+        sa.Column('thread_id', sa.String(length=32), nullable=False),
+        sa.Column('sender', sa.Text(), nullable=False),
+        sa.Column('subject', sa.Text(), nullable=False),
+        sa.Column('snippet', sa.Text(), nullable=False),
+        sa.Column('date', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('received_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('labels', sa.JSON(), nullable=False),
+        sa.Column('is_unread', sa.Boolean(), nullable=False),
+        sa.Column('in_inbox', sa.Boolean(), nullable=False),
+        sa.Column('is_hidden', sa.Boolean(), nullable=False),
+        sa.Column('digested_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "to_tsvector('english', coalesce(subject, '') || ' ' || "
+                "coalesce(sender, '') || ' ' || coalesce(snippet, ''))",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index('ix_mail_messages_thread_id', 'mail_messages', ['thread_id'])
+    op.create_index('ix_mail_messages_received_at', 'mail_messages', ['received_at'])
+    op.create_index(
+        'ix_mail_messages_unread_received_at', 'mail_messages', ['is_unread', 'received_at']
+    )
+    op.create_index(
+        'ix_mail_messages_search_vector',
+        'mail_messages',
+        ['search_vector'],
+        postgresql_using='gin',
+    )
+    op.create_table(
+        'mail_sync_state',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('history_id', sa.String(length=32), nullable=False),
+        sa.Column('synced_at', sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('mail_sync_state')
+    op.drop_index('ix_mail_messages_search_vector', table_name='mail_messages')
+    op.drop_index('ix_mail_messages_unread_received_at', table_name='mail_messages')
+    op.drop_index('ix_mail_messages_received_at', table_name='mail_messages')
+    op.drop_index('ix_mail_messages_thread_id', table_name='mail_messages')
+    op.drop_table('mail_messages')
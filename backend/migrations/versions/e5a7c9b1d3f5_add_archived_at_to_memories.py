@@ -0,0 +1,35 @@
+"""add archived_at to memories
+
+Revision ID: e5a7c9b1d3f5
+Revises: d4f6a8b2c1e3
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c9b1d3f5'
+down_revision: Union[str, None] = 'd4f6a8b2c1e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'memories',
+        sa.Column('archived_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    # Search and prompt injection only ever read live rows
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_memories_live "
+        "ON memories (created_at DESC, id DESC) WHERE archived_at IS NULL"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_memories_live")
+    op.drop_column('memories', 'archived_at')
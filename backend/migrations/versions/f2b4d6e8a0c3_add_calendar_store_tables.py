@@ -0,0 +1,92 @@
+"""add calendar_sources, calendar_entries and calendar_occurrences
+
+Revision ID: f2b4d6e8a0c3
+Revises: e1a3c5d7f9b2
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b4d6e8a0c3'
+down_revision: Union[str, None] = 'e1a3c5d7f9b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'calendar_sources',
+        sa.Column('id', sa.String(length=255), primary_key=True),
+        sa.Column('summary', sa.Text(), nullable=False),
+        sa.Column('time_zone', sa.String(length=64), nullable=False),
+        sa.Column('sync_token', sa.Text(), nullable=True),
+        sa.Column('synced_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('expanded_until', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_table(
+        'calendar_entries',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column(
+            'calendar_id',
+            sa.String(length=255),
+            sa.ForeignKey('calendar_sources.id', ondelete='CASCADE'),
+            nullable=False,
+        ),
+        sa.Column('event_id', sa.String(length=1024), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('summary', sa.Text(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('location', sa.Text(), nullable=False),
+        sa.Column('html_link', sa.Text(), nullable=False),
+        sa.Column('organizer', sa.Text(), nullable=False),
+        sa.Column('all_day', sa.Boolean(), nullable=False),
+        sa.Column('transparent', sa.Boolean(), nullable=False),
+        sa.Column('start_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('end_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('time_zone', sa.String(length=64), nullable=True),
+        sa.Column('recurrence', sa.JSON(), nullable=True),
+        sa.Column('recurring_event_id', sa.String(length=1024), nullable=True),
+        sa.Column('original_start_at', sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint(
+            'calendar_id', 'event_id', name='uq_calendar_entries_calendar_event'
+        ),
+    )
+    op.create_index(
+        'ix_calendar_entries_series', 'calendar_entries', ['calendar_id', 'recurring_event_id']
+    )
+    op.create_table(
+        'calendar_occurrences',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column(
+            'entry_id',
+            sa.Integer(),
+            sa.ForeignKey('calendar_entries.id', ondelete='CASCADE'),
+            nullable=False,
+        ),
+        sa.Column('start_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('end_at', sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(
+        'ix_calendar_occurrences_entry_id', 'calendar_occurrences', ['entry_id']
+    )
+    op.create_index(
+        'ix_calendar_occurrences_start_at', 'calendar_occurrences', ['start_at']
+    )
+    op.create_index(
+        'ix_calendar_occurrences_end_at', 'calendar_occurrences', ['end_at']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_calendar_occurrences_end_at', table_name='calendar_occurrences')
+    op.drop_index('ix_calendar_occurrences_start_at', table_name='calendar_occurrences')
+    op.drop_index('ix_calendar_occurrences_entry_id', table_name='calendar_occurrences')
+    op.drop_table('calendar_occurrences')
+    op.drop_index('ix_calendar_entries_series', table_name='calendar_entries')
+    op.drop_table('calendar_entries')
+    op.drop_table('calendar_sources')
@@ -0,0 +1,50 @@
+"""add search_vector to conversation_messages
+
+Revision ID: f6b8d0a2c4e6
+Revises: e5a7c9b1d3f5
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6b8d0a2c4e6'
+down_revision: Union[str, None] = 'e5a7c9b1d3f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Generated column: Postgres fills it for existing rows during the ALTER
+    op.add_column(
+        'conversation_messages',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', content)", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_conversation_messages_search_vector',
+        'conversation_messages',
+        ['search_vector'],
+        postgresql_using='gin',
+    )
+    # History loading and search pagination walk messages newest-first
+    op.create_index(
+        'ix_conversation_messages_created_at_id',
+        'conversation_messages',
+        ['created_at', 'id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_conversation_messages_created_at_id', table_name='conversation_messages')
+    op.drop_index('ix_conversation_messages_search_vector', table_name='conversation_messages')
+    op.drop_column('conversation_messages', 'search_vector')
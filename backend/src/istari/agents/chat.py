@@ -12,6 +12,7 @@ System prompt is assembled fresh on each turn from three sources (in order):
   2. memory/USER.md  — user profile (editable, gitignored)
   3. Stored memories — semantically relevant to the current message (via pgvector cosine
      similarity), falling back to newest-N when no message context or embeddings unavailable
+  4. Past conversation episodes — summaries of earlier chats close to the current message
 
 Tools are bound to the current DB session at WebSocket connect time via closures,
 so the agent has no direct DB access — all persistence goes through tool functions.
@@ -27,6 +28,8 @@ from typing import TYPE_CHECKING, Any, cast
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
+    from istari.models.memory import Memory
+
 from openai.types.chat.chat_completion_message_tool_call import ChatCompletionMessageToolCall
 
 from istari.agents.tools.base import AgentContext, AgentTool
@@ -77,6 +80,9 @@ def _format_tool_status(tool_name: str, args: dict[str, Any]) -> str:
             if d:
                 return f"Searching files in {d} for '{q}'..."
             return f"Searching files for '{q}'..." if q else "Searching files..."
+        case "semantic_search_files":
+            q = args.get("query", "")
+            return f"Searching notes for '{q}'..." if q else "Searching notes..."
         case _:
             label = tool_name.replace("_", " ").title()
             return f"Running {label}..."
@@ -96,6 +102,7 @@ def _looks_like_mutation(user_message: str) -> bool:
 
 _MAX_TURNS = 8
 _MAX_PROMPT_MEMORIES = 20
+_MAX_PROMPT_EPISODES = 3
 
 # In dev (editable install): .../src/istari/agents/chat.py → parents[4] = project root
 # In Docker (regular install): lives under site-packages → fall back to WORKDIR (/app)
@@ -138,17 +145,26 @@ async def build_system_prompt(
       2. USER.md  (user profile — optional; falls back to user_name setting)
       3. Relevant memories: semantic search on user_message when provided (pgvector cosine),
          falling back to newest-N when no message or embeddings unavailable
+      4. Relevant past conversations: episodic memories within episode_max_distance of
+         user_message (omitted when there is no message or nothing is close enough)
     """
+    from istari.config.settings import settings
     from istari.tools.memory.store import MemoryStore
 
     soul = _read_memory_file("SOUL.md") or _FALLBACK_SOUL
     user_profile = _read_memory_file("USER.md")
 
     store = MemoryStore(session)
+    episodes: list[Memory] = []
     if user_message:
         memories = await store.search(user_message)
         if not memories:
             memories = await store.list_explicit()
+        episodes = await store.search_episodes(
+            user_message,
+            top_k=_MAX_PROMPT_EPISODES,
+            max_distance=settings.episode_max_distance,
+        )
     else:
         memories = await store.list_explicit()
 
@@ -163,6 +179,10 @@ async def build_system_prompt(
         mem_lines = [f"- {m.content}" for m in memories[:_MAX_PROMPT_MEMORIES]]
         parts.append("## What you know about this user\n\n" + "\n".join(mem_lines))
 
+    if episodes:
+        ep_lines = [f"- {e.content}" for e in episodes]
+        parts.append("## Relevant past conversations\n\n" + "\n".join(ep_lines))
+
     return "\n\n---\n\n".join(parts)
 
 
@@ -177,6 +197,7 @@ def build_tools(
     they are appended after the built-in tools so built-ins always take precedence.
     """
     from istari.agents.tools.calendar import make_calendar_tools
+    from istari.agents.tools.conversation import make_conversation_tools
     from istari.agents.tools.filesystem import make_filesystem_tools
     from istari.agents.tools.gmail import make_gmail_tools
     from istari.agents.tools.memory import make_memory_tools
@@ -188,9 +209,10 @@ def build_tools(
         *make_todo_tools(session, context),
         *make_project_tools(session, context),
         *make_memory_tools(session, context),
-        *make_gmail_tools(),
-        *make_calendar_tools(),
-        *make_filesystem_tools(),
+        *make_conversation_tools(session),
+        *make_gmail_tools(session),
+        *make_calendar_tools(session),
+        *make_filesystem_tools(session),
         *make_web_search_tools(),
     ]
     if mcp_tools:
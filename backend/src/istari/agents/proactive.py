@@ -31,9 +31,14 @@ class ProactiveState(TypedDict, total=False):
 
 
 async def scan_gmail_node(state: ProactiveState) -> ProactiveState:
-    """Scan Gmail for unread messages."""
+    """Scan Gmail for unread messages, unless the caller already supplied them."""
     from istari.tools.gmail.reader import GmailReader
 
+    if "emails" in state:
+        # The digest job passes just the mail it hasn't reported yet
+        logger.info("Gmail scan: using %d email(s) supplied by caller", len(state["emails"]))
+        return state
+
     token_path = state.get("gmail_token_path", "gmail_token.json")
     max_results = state.get("gmail_max_results", settings.gmail_max_results)
 
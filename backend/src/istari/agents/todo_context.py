@@ -43,8 +43,8 @@ async def get_todo_context(title: str, session: "AsyncSession") -> str:
     context = AgentContext()
     tools = [
         *make_memory_tools(session, context),
-        *make_gmail_tools(),
-        *make_calendar_tools(),
+        *make_gmail_tools(session),
+        *make_calendar_tools(session),
         *make_web_search_tools(),
     ]
 
@@ -1,22 +1,43 @@
 """Calendar agent tools — read and search calendar events.
 
 Routes to AppleCalendarReader or CalendarReader (Google) based on
-the CALENDAR_BACKEND setting ("apple" or "google").
+the CALENDAR_BACKEND setting ("apple" or "google"). find_free_slots answers
+"when can I do this?" from a free/busy index instead of raw event lists.
 """
 
 import logging
 from typing import Any
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from istari.config.settings import settings
+from istari.tools.calendar.freebusy import Slot, Task, load_tasks, plan_slots, user_zone
 from istari.tools.calendar.reader import CalendarReader
+from istari.tools.calendar.store import CalendarStore
 
 from .base import AgentTool
 
 logger = logging.getLogger(__name__)
 
+_MAX_SLOTS_SHOWN = 15
+
+
+def _format_slot(slot: Slot) -> str:
+    zone = user_zone()
+    start, end = slot.start.astimezone(zone), slot.end.astimezone(zone)
+    return f"{start:%a %d %b %H:%M}-{end:%H:%M} ({slot.minutes} min)"
+
+
+def make_calendar_tools(session: AsyncSession | None = None) -> list[AgentTool]:
+    """Return Calendar tools.
 
-def make_calendar_tools() -> list[AgentTool]:
-    """Return Calendar tools. No session needed."""
+    With a session, Google reads are served from the local event store when it is fresh.
+    """
+    store = (
+        CalendarStore(session)
+        if session is not None and settings.calendar_store_enabled
+        else None
+    )
 
     async def check_calendar(query: str = "", days: int = 7) -> str:
         max_r = settings.calendar_max_results
@@ -34,7 +55,7 @@ def make_calendar_tools() -> list[AgentTool]:
                 from istari.tools.apple_calendar.reader import AppleCalendarReader
                 reader = AppleCalendarReader()
             else:
-                reader = CalendarReader(settings.calendar_token_path)
+                reader = CalendarReader(settings.calendar_token_path, store=store)
 
             if query:
                 events = await reader.search(query, max_results=max_r)
@@ -70,6 +91,66 @@ def make_calendar_tools() -> list[AgentTool]:
             lines.append(f"- {title} ({start}{loc})")
         return f"Found {len(events)} event(s):\n" + "\n".join(lines)
 
+    async def find_free_slots(
+        days: int = 0, duration_minutes: int = 0, todos: list[dict[str, Any]] | None = None
+    ) -> str:
+        days = days or settings.slot_search_days
+        min_minutes = duration_minutes or settings.default_task_minutes
+        logger.info(
+            "find_free_slots | days=%d min=%d todos=%d", days, min_minutes, len(todos or [])
+        )
+        tasks: list[Task] = []
+        missing: list[int] = []
+        if todos and session is not None:
+            estimates = []
+            for item in todos:
+                try:
+                    estimates.append((int(item["id"]), int(item.get("minutes") or 0) or None))
+                except (KeyError, TypeError, ValueError):
+                    return 'Each entry in "todos" needs a numeric "id" (and optional "minutes").'
+            tasks, missing = await load_tasks(session, estimates)
+        try:
+            plan = await plan_slots(session, days, min_minutes, tasks)
+        except ImportError as exc:
+            logger.error("find_free_slots | import error: %s", exc)
+            return f"Calendar backend unavailable: {exc}"
+        except FileNotFoundError:
+            logger.error("find_free_slots | token file not found: %s", settings.calendar_token_path)
+            return (
+                "Google Calendar isn't connected yet. "
+                "Run `python scripts/setup_calendar.py` to link your calendar."
+            )
+        except PermissionError as exc:
+            logger.error("find_free_slots | permission error: %s", exc)
+            return str(exc)
+        except Exception:
+            logger.exception("find_free_slots | unexpected error")
+            return "Couldn't reach your calendar. Try again in a moment."
+
+        lines = []
+        if plan.placements:
+            lines.append("Suggested schedule:")
+            for p in plan.placements:
+                if p.slot is None:
+                    when = "no free slot long enough before it's due"
+                else:
+                    when = _format_slot(p.slot)
+                lines.append(f"- #{p.task.id} {p.task.title} ({p.task.minutes} min): {when}")
+        if missing:
+            lines.append("Not found: " + ", ".join(f"#{i}" for i in missing))
+        if not plan.slots:
+            lines.append(
+                f"No free slots of {min_minutes}+ min in working hours over the next {days} days."
+            )
+        else:
+            lines.append(
+                f"Free slots of {min_minutes}+ min in working hours, next {days} days:"
+            )
+            lines.extend(f"- {_format_slot(s)}" for s in plan.slots[:_MAX_SLOTS_SHOWN])
+            if len(plan.slots) > _MAX_SLOTS_SHOWN:
+                lines.append(f"…and {len(plan.slots) - _MAX_SLOTS_SHOWN} more")
+        return "\n".join(lines)
+
     backend_label = "calendar (Apple or Google depending on CALENDAR_BACKEND setting)"
     return [
         AgentTool(
@@ -94,4 +175,48 @@ def make_calendar_tools() -> list[AgentTool]:
             },
             fn=check_calendar,
         ),
+        AgentTool(
+            name="find_free_slots",
+            description=(
+                "Find free time in the user's working hours over the next `days` days. "
+                "Pass `todos` (ids with your estimate of minutes each) to get a suggested "
+                "time for each, earliest due date first and before its due date. Use this "
+                "for 'when can I do X?' instead of reading the raw calendar."
+            ),
+            parameters={
+                "type": "object",
+                "properties": {
+                    "days": {
+                        "type": "integer",
+                        "description": (
+                            f"How many days ahead to look (default {settings.slot_search_days})."
+                        ),
+                    },
+                    "duration_minutes": {
+                        "type": "integer",
+                        "description": (
+                            "Shortest free slot worth listing, in minutes "
+                            f"(default {settings.default_task_minutes})."
+                        ),
+                    },
+                    "todos": {
+                        "type": "array",
+                        "description": "TODOs to schedule, with estimated durations.",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "id": {"type": "integer", "description": "TODO id."},
+                                "minutes": {
+                                    "type": "integer",
+                                    "description": "Estimated minutes needed.",
+                                },
+                            },
+                            "required": ["id"],
+                        },
+                    },
+                },
+                "required": [],
+            },
+            fn=find_free_slots,
+        ),
     ]
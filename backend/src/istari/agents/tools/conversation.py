@@ -0,0 +1,53 @@
+"""Conversation agent tools — search past chat beyond the recent history window."""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from istari.tools.conversation.store import ConversationStore
+
+from .base import AgentTool
+
+_DEFAULT_LIMIT = 5
+_MAX_LIMIT = 20
+
+
+def make_conversation_tools(session: AsyncSession) -> list[AgentTool]:
+    """Return conversation search tools bound to the given session."""
+
+    async def search_conversations(query: str, limit: int = _DEFAULT_LIMIT) -> str:
+        limit = max(1, min(int(limit), _MAX_LIMIT))
+        hits = await ConversationStore(session).search_ranked(query, limit=limit)
+        if not hits:
+            return f'No past messages found matching "{query}".'
+        lines = []
+        for h in hits:
+            when = h.created_at.strftime("%Y-%m-%d %H:%M UTC") if h.created_at else "?"
+            speaker = "User" if h.role == "user" else "Assistant"
+            lines.append(f"- [{when}] {speaker}: {h.snippet}")
+        return f'Past messages matching "{query}" (best match first):\n' + "\n".join(lines)
+
+    return [
+        AgentTool(
+            name="search_conversations",
+            description=(
+                "Full-text search over all past chat messages, including ones older than "
+                "the current conversation. Use when the user asks what they said or "
+                "discussed before, e.g. 'what did I say about the dentist last month?'. "
+                "Supports quoted phrases, OR, and -exclusions."
+            ),
+            parameters={
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Words or phrase to search for.",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": f"Max results (default {_DEFAULT_LIMIT}, max {_MAX_LIMIT}).",
+                    },
+                },
+                "required": ["query"],
+            },
+            fn=search_conversations,
+        ),
+    ]
@@ -4,51 +4,77 @@ import asyncio
 import logging
 from pathlib import Path
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from istari.config.settings import settings
+from istari.tools.filesystem import reader
+
 from .base import AgentTool
 
 logger = logging.getLogger(__name__)
 
-_MAX_CHARS = 8_000
+_DEFAULT_TOP_K = 5
+_MAX_TOP_K = 20
+_CHUNK_PREVIEW_CHARS = 600
 
 
-def make_filesystem_tools() -> list[AgentTool]:
-    """Return filesystem tools. No session or context needed — read-only."""
+def make_filesystem_tools(session: AsyncSession | None = None) -> list[AgentTool]:
+    """Return filesystem tools. Read-only; semantic note search needs a session."""
 
-    async def read_file(path: str) -> str:
+    async def read_file(
+        path: str,
+        offset: int | None = None,
+        length: int | None = None,
+        start_line: int | None = None,
+        end_line: int | None = None,
+    ) -> str:
         resolved = Path(path).expanduser()
         if not resolved.is_absolute():
             resolved = Path.home() / resolved
 
+        by_line = start_line is not None or end_line is not None
+        if by_line and offset is not None:
+            return "Use either offset/length or start_line/end_line, not both."
+        if (offset or 0) < 0 or (start_line or 1) < 1:
+            return "offset must be 0 or more and start_line 1 or more."
+        if end_line is not None and end_line < (start_line or 1):
+            return "end_line must not be before start_line."
+
         try:
-            raw = await asyncio.to_thread(resolved.read_bytes)
+            if by_line:
+                page = await asyncio.to_thread(
+                    reader.read_lines,
+                    resolved,
+                    start_line or 1,
+                    end_line,
+                    length or reader.PAGE_BYTES,
+                )
+            else:
+                page = await asyncio.to_thread(
+                    reader.read_range, resolved, offset or 0, length or reader.PAGE_BYTES
+                )
         except FileNotFoundError:
             return f"File not found: {resolved}"
         except PermissionError:
             return f"Permission denied: {resolved}"
+        except reader.BinaryFileError:
+            return f"Cannot read {resolved.name}: file appears to be binary."
         except OSError as exc:
             return f"Could not read file: {exc}"
 
-        try:
-            text = raw.decode("utf-8")
-        except UnicodeDecodeError:
-            return f"Cannot read {resolved.name}: file appears to be binary."
-
-        if len(text) <= _MAX_CHARS:
-            return text
-
-        truncated = text[:_MAX_CHARS]
-        remaining = len(text) - _MAX_CHARS
-        return f"{truncated}\n\n[...truncated — {remaining} more characters not shown]"
+        if page.complete:
+            return page.text
+        return f"{page.text}\n\n{_page_note(page)}"
 
     async def search_files(
         query: str,
         directory: str = "~",
         extensions: str = "",
     ) -> str:
-        from istari.tools.filesystem.search import search_text_in_files
+        from istari.tools.filesystem import search
 
         results = await asyncio.to_thread(
-            search_text_in_files,
+            search.search_files,
             query,
             directory,
             extensions,
@@ -66,12 +92,14 @@ def make_filesystem_tools() -> list[AgentTool]:
             + "\n".join(lines)
         )
 
-    return [
+    tools = [
         AgentTool(
             name="read_file",
             description=(
                 "Read the contents of a local file. Supports plain text, "
-                "markdown, JSON, CSV, Python, etc. Use ~ for the home directory."
+                "markdown, JSON, CSV, Python, etc. Use ~ for the home directory. "
+                "Large files come back one page at a time with the file size and "
+                "where to continue; page on with offset, or jump to a line range."
             ),
             parameters={
                 "type": "object",
@@ -82,7 +110,26 @@ def make_filesystem_tools() -> list[AgentTool]:
                             "File path to read. Absolute or relative to home dir. "
                             "Example: ~/Documents/notes.md"
                         ),
-                    }
+                    },
+                    "offset": {
+                        "type": "integer",
+                        "description": "Byte offset to start reading at. Defaults to 0.",
+                    },
+                    "length": {
+                        "type": "integer",
+                        "description": (
+                            f"Bytes to read. Defaults to {reader.PAGE_BYTES}, "
+                            f"at most {reader.MAX_PAGE_BYTES}."
+                        ),
+                    },
+                    "start_line": {
+                        "type": "integer",
+                        "description": "First line to read (1-based). Use instead of offset.",
+                    },
+                    "end_line": {
+                        "type": "integer",
+                        "description": "Last line to read (inclusive).",
+                    },
                 },
                 "required": ["path"],
             },
@@ -92,7 +139,7 @@ def make_filesystem_tools() -> list[AgentTool]:
             name="search_files",
             description=(
                 "Search local files for text content. Returns matching file paths "
-                "with a preview of the matching line."
+                "with a preview of the matching line, best matches first."
             ),
             parameters={
                 "type": "object",
@@ -121,3 +168,85 @@ def make_filesystem_tools() -> list[AgentTool]:
             fn=search_files,
         ),
     ]
+    if session is not None and settings.note_index_enabled:
+        tools.append(_semantic_search_tool(session))
+    return tools
+
+
+def _semantic_search_tool(session: AsyncSession) -> AgentTool:
+    """semantic_search_files, bound to ``session``."""
+
+    async def semantic_search_files(
+        query: str, directory: str = "", top_k: int = _DEFAULT_TOP_K
+    ) -> str:
+        from istari.tools.filesystem.semantic import NoteIndex
+
+        top_k = max(1, min(int(top_k), _MAX_TOP_K))
+        try:
+            hits = await NoteIndex(session).search(query, top_k, directory or None)
+        except Exception:
+            logger.warning("Semantic note search failed", exc_info=True)
+            return (
+                "Semantic search is unavailable right now (the embedding model could "
+                "not be reached). Use search_files for a text search instead."
+            )
+        if not hits:
+            where = f" under {directory}" if directory else ""
+            return f'No indexed notes{where} match "{query}".'
+        lines = []
+        for h in hits:
+            text = h.content
+            if len(text) > _CHUNK_PREVIEW_CHARS:
+                text = text[:_CHUNK_PREVIEW_CHARS].rstrip() + " …"
+            lines.append(
+                f"- {h.path} (lines {h.start_line}-{h.end_line}, score {h.score:.2f})\n"
+                f"{text}"
+            )
+        return f'Notes related to "{query}" (best match first):\n\n' + "\n\n".join(lines)
+
+    return AgentTool(
+        name="semantic_search_files",
+        description=(
+            "Search the user's notes (text and markdown files under the indexed "
+            "note folders) by meaning rather than exact words. Returns the most "
+            "related passages with file paths and line ranges; use read_file with "
+            "start_line/end_line for more context. Prefer this for conceptual "
+            "questions, e.g. 'what did I decide about the kitchen renovation?'; "
+            "use search_files for exact text."
+        ),
+        parameters={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "What to look for, in natural language.",
+                },
+                "directory": {
+                    "type": "string",
+                    "description": (
+                        "Only search notes under this directory. Leave empty for all."
+                    ),
+                },
+                "top_k": {
+                    "type": "integer",
+                    "description": (
+                        f"Passages to return (default {_DEFAULT_TOP_K}, max {_MAX_TOP_K})."
+                    ),
+                },
+            },
+            "required": ["query"],
+        },
+        fn=semantic_search_files,
+    )
+
+
+def _page_note(page: reader.FilePage) -> str:
+    span = f"bytes {page.start:,}-{page.end:,} of {page.size:,}"
+    if page.first_line is not None:
+        span += f", lines {page.first_line}-{page.last_line}"
+    if page.end >= page.size:
+        return f"[showing {span}; end of file]"
+    more = f"offset={page.end}"
+    if page.last_line is not None and page.ends_on_line:
+        more += f" or start_line={page.last_line + 1}"
+    return f"[...truncated — showing {span}. To read on, call read_file with {more}.]"
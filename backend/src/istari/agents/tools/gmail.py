@@ -2,7 +2,10 @@
 
 import logging
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from istari.config.settings import settings
+from istari.tools.gmail.mirror import MailMirror
 from istari.tools.gmail.reader import GmailReader
 
 from .base import AgentTool
@@ -10,8 +13,12 @@ from .base import AgentTool
 logger = logging.getLogger(__name__)
 
 
-def make_gmail_tools() -> list[AgentTool]:
-    """Return Gmail tools. No session needed — uses OAuth token from settings."""
+def make_gmail_tools(session: AsyncSession | None = None) -> list[AgentTool]:
+    """Return Gmail tools. Uses the OAuth token from settings.
+
+    With a session, reads are served from the local mail mirror when it is fresh.
+    """
+    mirror = MailMirror(session) if session is not None and settings.gmail_mirror_enabled else None
 
     async def check_email(query: str = "", max_results: int = 0) -> str:
         limit = max_results or settings.gmail_max_results
@@ -20,7 +27,7 @@ def make_gmail_tools() -> list[AgentTool]:
             settings.gmail_token_path, query or "<unread>", limit,
         )
         try:
-            reader = GmailReader(settings.gmail_token_path)
+            reader = GmailReader(settings.gmail_token_path, mirror=mirror)
             if query:
                 emails = await reader.search(query, max_results=limit)
             else:
@@ -50,7 +57,10 @@ def make_gmail_tools() -> list[AgentTool]:
             name="check_email",
             description=(
                 "Check the user's Gmail. With no query, returns unread emails. "
-                "With a query, searches all mail for matching emails."
+                "With a query, searches all mail for matching emails. Searches of "
+                "recent mail (is:unread, newer_than:) may be answered from a local "
+                "copy that matches sender, subject and snippet only, not message "
+                "bodies; when that finds nothing, Gmail itself is searched."
             ),
             parameters={
                 "type": "object",
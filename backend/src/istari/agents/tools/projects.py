@@ -32,36 +32,19 @@ def make_project_tools(session: AsyncSession, context: AgentContext) -> list[Age
 
     async def list_projects(status: str = "active") -> str:
         mgr = ProjectManager(session)
-        if status == "all":
-            projects = await mgr.list_all()
-        else:
-            projects = await mgr.list_active()
+        summaries = await mgr.list_summaries(include_inactive=status == "all")
 
-        if not projects:
+        if not summaries:
             label = "active" if status != "all" else ""
             return f"No {label} projects found.".strip()
 
         lines: list[str] = []
-        for p in projects:
-            # Count associated todos
-            stmt = select(Todo).where(
-                Todo.project_id == p.id,
-                Todo.status.in_((TodoStatus.OPEN, TodoStatus.IN_PROGRESS, TodoStatus.BLOCKED)),
-            )
-            result = await session.execute(stmt)
-            todo_count = len(list(result.scalars().all()))
-
-            next_action_title = "none set"
-            if p.next_action_id is not None:
-                todo_mgr = TodoManager(session)
-                na = await todo_mgr.get(p.next_action_id)
-                if na is not None:
-                    next_action_title = na.title
-
+        for s in summaries:
+            p = s.project
             status_tag = f" [{p.status.value}]" if p.status != ProjectStatus.active else ""
             lines.append(
                 f"- (id={p.id}) **{p.name}**{status_tag} | "
-                f"next: {next_action_title} | {todo_count} open todos"
+                f"next: {s.next_action_title or 'none set'} | {s.open_todo_count} open todos"
             )
             if p.goal:
                 lines.append(f"  Goal: {p.goal}")
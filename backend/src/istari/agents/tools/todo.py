@@ -4,15 +4,15 @@ import contextlib
 import datetime
 import json
 import logging
-from typing import Any
+from collections.abc import Awaitable, Callable, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from istari.config.settings import settings
-from istari.llm.router import completion
 from istari.models.todo import Todo, TodoStatus
-from istari.tools.todo.manager import TodoManager
+from istari.tools.todo.manager import TodoManager, TodoRow
+from istari.tools.todo.view_cache import get_view_cache
 
 from .base import AgentContext, AgentTool, normalize_status
 
@@ -27,54 +27,10 @@ _QUADRANT_LABELS: dict[tuple[bool | None, bool | None], str] = {
     (False, False): "Q4 — Drop",
 }
 
-_CLASSIFY_SYSTEM_PROMPT = """\
-You classify TODO items using the Eisenhower matrix.
-
-For each title return a JSON object with:
-- "title": the original title (unchanged)
-- "urgent": true if time-sensitive or immediately impactful, false if not, null if unclear
-- "important": true if significant to goals/values/outcomes, false if not, null if unclear
-- "uncertain": true if you genuinely cannot tell from the title alone
-
-Return a JSON array — one object per title, in order. No prose, no markdown fences.
-
-Example input: ["Call dentist", "Reorganize bookshelf", "Fix prod outage"]
-Example output:
-[
-  {"title": "Call dentist", "urgent": false, "important": true, "uncertain": false},
-  {"title": "Reorganize bookshelf", "urgent": false, "important": false, "uncertain": false},
-  {"title": "Fix prod outage", "urgent": true, "important": true, "uncertain": false}
-]"""
-
-
-async def _classify_titles(titles: list[str]) -> list[dict[str, Any]]:
-    """Call LLM to classify titles; returns empty list on any error."""
-    try:
-        resp = await completion(
-            "todo_classification",
-            messages=[
-                {"role": "system", "content": _CLASSIFY_SYSTEM_PROMPT},
-                {"role": "user", "content": json.dumps(titles)},
-            ],
-        )
-        raw = resp.choices[0].message.content or ""
-        raw = raw.strip()
-        if raw.startswith("```"):
-            raw = raw.split("```")[1]
-            if raw.startswith("json"):
-                raw = raw[4:]
-        parsed = json.loads(raw)
-        if isinstance(parsed, list):
-            return parsed
-    except Exception:
-        logger.debug("TODO classification failed", exc_info=True)
-    return []
-
-
 def make_todo_tools(session: AsyncSession, context: AgentContext) -> list[AgentTool]:
     """Return TODO tools bound to the given session and context."""
 
-    def _due_tag(t: Todo) -> str:
+    def _due_tag(t: Todo | TodoRow) -> str:
         """Format a due date tag for display in tool output."""
         if t.due_date is None:
             return ""
@@ -87,10 +43,26 @@ def make_todo_tools(session: AsyncSession, context: AgentContext) -> list[AgentT
             return " [due TODAY]"
         return f" [due in {diff}d]"
 
+    async def _apply(
+        query: str, mutate: Callable[[ColumnElement[bool]], Awaitable[list[Todo]]]
+    ) -> list[Todo]:
+        """Run a set-based mutation on the TODO whose ID is ``query``, else on title matches.
+
+        Title matching is only the fallback when no TODO has that ID — an existing
+        ID whose mutation changes nothing returns an empty list.
+        """
+        with contextlib.suppress(ValueError, TypeError):
+            todo_id = int(query)
+            exists = await session.scalar(select(Todo.id).where(Todo.id == todo_id))
+            if exists is not None:
+                return await mutate(TodoManager.match(ids=[todo_id]))
+        return await mutate(TodoManager.match(title_query=query))
+
     async def list_todos(filter: str = "open") -> str:
         mgr = TodoManager(session)
+        todos: Sequence[Todo | TodoRow]
         if filter == "all":
-            todos = await mgr.list_visible()
+            todos = await mgr.list_visible_rows()
         elif filter == "complete":
             stmt = (
                 select(Todo)
@@ -100,7 +72,7 @@ def make_todo_tools(session: AsyncSession, context: AgentContext) -> list[AgentT
             result = await session.execute(stmt)
             todos = list(result.scalars().all())
         else:
-            todos = await mgr.list_open()
+            todos = await mgr.list_open_rows()
 
         if not todos:
             return "No TODOs found."
@@ -116,39 +88,20 @@ def make_todo_tools(session: AsyncSession, context: AgentContext) -> list[AgentT
 
     async def create_todos(titles: list[str]) -> str:
         mgr = TodoManager(session)
-        created: list[Todo] = []
-        for title in titles:
-            todo = await mgr.create(title=title.strip(), source="chat")
-            created.append(todo)
+        # Classification runs after the response is sent (see tools/todo/classification.py)
+        created = await mgr.bulk_create(
+            [title.strip() for title in titles],
+            source="chat",
+            classification_requested_at=datetime.datetime.now(datetime.UTC),
+        )
         await session.commit()
         context.todo_created = True
-
-        # Auto-classify in the background — update DB but don't block the response
-        classifications = await _classify_titles([t.title for t in created])
-        uncertain_titles: list[str] = []
-        for todo, cls in zip(created, classifications, strict=False):
-            urgent = cls.get("urgent")
-            important = cls.get("important")
-            uncertain = cls.get("uncertain", False)
-            if uncertain:
-                uncertain_titles.append(todo.title)
-            await mgr.set_urgency_importance(todo.id, urgent, important)
-        if classifications:
-            await session.commit()
+        context.classification_queued.extend(t.id for t in created)
 
         titles_str = ", ".join(f'"{t.title}"' for t in created)
-        summary = (
-            f'Added {len(created)} TODOs: {titles_str}'
-            if len(created) > 1
-            else f'Added TODO: "{created[0].title}"'
-        )
-        if uncertain_titles:
-            listed = ", ".join(f'"{t}"' for t in uncertain_titles)
-            summary += (
-                f"\n\nI wasn't sure how to classify: {listed}. "
-                "Are these urgent, important, both, or neither?"
-            )
-        return summary
+        if len(created) > 1:
+            return f"Added {len(created)} TODOs: {titles_str}"
+        return f'Added TODO: "{created[0].title}"'
 
     async def update_todo_status(query: str, status: str) -> str:
         normalized = normalize_status(status)
@@ -159,27 +112,18 @@ def make_todo_tools(session: AsyncSession, context: AgentContext) -> list[AgentT
             return f'"{status}" is not a valid status. Valid values: {valid}.'
 
         mgr = TodoManager(session)
-
-        # Try numeric ID first
-        with contextlib.suppress(ValueError, TypeError):
-            todo_id = int(query)
-            todo = await mgr.get(todo_id)
-            if todo is not None:
-                await mgr.set_status(todo.id, new_status)
-                await session.commit()
-                context.todo_updated = True
-                return f'Updated "{todo.title}" to {new_status.value}.'
-
-        # Pattern match — update ALL matching todos
-        stmt = select(Todo).where(Todo.title.ilike(f"%{query}%"))
-        result = await session.execute(stmt)
-        todos = list(result.scalars().all())
+        todos = await _apply(query, lambda where: mgr.bulk_set_status(where, new_status))
 
         if not todos:
+            # Nothing changed — distinguish "no match" from "already in that status"
+            where = TodoManager.match(title_query=query)
+            if query.strip().isdigit():
+                where = or_(where, Todo.id == int(query))
+            already = await session.scalar(select(Todo.id).where(where).limit(1))
+            if already is not None:
+                return f'Matching TODOs are already {new_status.value}.'
             return f'No TODOs found matching "{query}".'
 
-        for todo in todos:
-            await mgr.set_status(todo.id, new_status)
         await session.commit()
         context.todo_updated = True
 
@@ -191,28 +135,13 @@ def make_todo_tools(session: AsyncSession, context: AgentContext) -> list[AgentT
     async def update_todo_priority(query: str, urgent: bool | None, important: bool | None) -> str:
         """Find a TODO and set its Eisenhower urgency/importance."""
         mgr = TodoManager(session)
-
-        # Try numeric ID first
-        with contextlib.suppress(ValueError, TypeError):
-            todo_id = int(query)
-            todo = await mgr.get(todo_id)
-            if todo is not None:
-                await mgr.set_urgency_importance(todo.id, urgent, important)
-                await session.commit()
-                context.todo_updated = True
-                quadrant = _QUADRANT_LABELS.get((urgent, important), "unclassified")
-                return f'Updated "{todo.title}" → {quadrant}.'
-
-        # Pattern match
-        stmt = select(Todo).where(Todo.title.ilike(f"%{query}%"))
-        result = await session.execute(stmt)
-        todos = list(result.scalars().all())
+        todos = await _apply(
+            query, lambda where: mgr.bulk_update(where, urgent=urgent, important=important)
+        )
 
         if not todos:
             return f'No TODOs found matching "{query}".'
 
-        for todo in todos:
-            await mgr.set_urgency_importance(todo.id, urgent, important)
         await session.commit()
         context.todo_updated = True
         quadrant = _QUADRANT_LABELS.get((urgent, important), "unclassified")
@@ -227,7 +156,7 @@ def make_todo_tools(session: AsyncSession, context: AgentContext) -> list[AgentT
 
         # Soft cap: warn when already at 5 tasks focused for today
         if focus:
-            current = await mgr.list_today()
+            current = await mgr.list_today_rows()
             if len(current) >= 5:
                 titles = ", ".join(f'"{t.title}"' for t in current)
                 return (
@@ -235,30 +164,11 @@ def make_todo_tools(session: AsyncSession, context: AgentContext) -> list[AgentT
                     "Consider removing one before adding another."
                 )
 
-        # Try numeric ID first
-        with contextlib.suppress(ValueError, TypeError):
-            todo_id = int(query)
-            todo = await mgr.get(todo_id)
-            if todo is not None:
-                await mgr.set_today(todo.id, focus)
-                await session.commit()
-                context.todo_updated = True
-                action = "Added" if focus else "Removed"
-                prep = "to" if focus else "from"
-                return f'{action} "{todo.title}" {prep} today\'s focus.'
-
-        # Pattern match
-        stmt = select(Todo).where(Todo.title.ilike(f"%{query}%"))
-        result = await session.execute(stmt)
-        todos = list(result.scalars().all())
+        updated = await _apply(query, lambda where: mgr.bulk_set_today(where, focus))
 
-        if not todos:
+        if not updated:
             return f'No TODOs found matching "{query}".'
 
-        updated: list[Todo] = []
-        for todo in todos:
-            await mgr.set_today(todo.id, focus)
-            updated.append(todo)
         await session.commit()
         context.todo_updated = True
         action = "Added" if focus else "Removed"
@@ -270,7 +180,7 @@ def make_todo_tools(session: AsyncSession, context: AgentContext) -> list[AgentT
 
     async def get_today_focus() -> str:
         mgr = TodoManager(session)
-        todos = await mgr.list_today()
+        todos = await mgr.list_today_rows()
         if not todos:
             return "You haven't set any tasks to focus on today."
         lines = [f"Today's focus ({len(todos)}/5):"]
@@ -283,33 +193,64 @@ def make_todo_tools(session: AsyncSession, context: AgentContext) -> list[AgentT
     async def get_priorities() -> str:
         from istari.tools.project.manager import ProjectManager
 
+        cache = get_view_cache()
+        if cache is None:
+            return await _build_priorities()
+
+        async def _next_change() -> datetime.datetime | None:
+            crossings = [
+                await TodoManager(session).next_deadline_crossing(settings.deadline_urgent_days),
+                await ProjectManager(session).next_stale_at(settings.project_staleness_days),
+            ]
+            return min((c for c in crossings if c is not None), default=None)
+
+        text: str = await cache.read_through(
+            session,
+            "get_priorities",
+            (
+                settings.priorities_max,
+                settings.deadline_urgent_days,
+                settings.project_staleness_days,
+                datetime.date.today(),
+            ),
+            ("todos", "projects"),
+            _build_priorities,
+            json.dumps,
+            json.loads,
+            expires_at=_next_change,
+        )
+        return text
+
+    async def _build_priorities() -> str:
+        from istari.tools.project.manager import ProjectManager
+
         mgr = TodoManager(session)
         proj_mgr = ProjectManager(session)
         max_tasks = settings.priorities_max
 
         # Collect next actions from active projects
-        active_projects = await proj_mgr.list_active()
-        project_next_actions: list[tuple[str, Todo]] = []
-        project_na_ids: set[int] = set()
-        for proj in active_projects:
-            if proj.next_action_id is not None:
-                na = await mgr.get(proj.next_action_id)
-                if na is not None and na.status in (
-                    TodoStatus.OPEN,
-                    TodoStatus.IN_PROGRESS,
-                ):
-                    project_next_actions.append((proj.name, na))
-                    project_na_ids.add(na.id)
+        project_next_actions: list[tuple[str, int, str]] = []
+        for summary in await proj_mgr.list_summaries():
+            na_id = summary.project.next_action_id
+            if (
+                na_id is not None
+                and summary.next_action_title is not None
+                and summary.next_action_status in (TodoStatus.OPEN, TodoStatus.IN_PROGRESS)
+            ):
+                project_next_actions.append(
+                    (summary.project.name, na_id, summary.next_action_title)
+                )
+        project_na_ids = {na_id for _, na_id, _ in project_next_actions}
 
         # Today's focus tasks
-        today_todos = await mgr.list_today()
+        today_todos = await mgr.list_today_rows()
         today_ids = {t.id for t in today_todos}
 
         # Fill remaining slots from standalone high-priority todos
         used_ids = project_na_ids | {t.id for t in today_todos}
         remaining = max_tasks - len(project_next_actions)
         if remaining > 0:
-            extra = await mgr.get_prioritized(
+            extra = await mgr.get_prioritized_rows(
                 limit=remaining,
                 exclude_ids=list(used_ids),
             )
@@ -323,11 +264,11 @@ def make_todo_tools(session: AsyncSession, context: AgentContext) -> list[AgentT
 
         if project_next_actions:
             lines.append("**Project next actions:**")
-            for proj_name, t in project_next_actions:
-                today_tag = " ★ Today" if t.id in today_ids else ""
-                lines.append(f"- **{proj_name}** → {t.title}{today_tag}")
+            for proj_name, na_id, na_title in project_next_actions:
+                today_tag = " ★ Today" if na_id in today_ids else ""
+                lines.append(f"- **{proj_name}** → {na_title}{today_tag}")
 
-        standalone: list[Todo] = []
+        standalone: list[TodoRow] = []
         for t in today_todos:
             if t.id not in project_na_ids:
                 standalone.append(t)
@@ -371,28 +312,11 @@ def make_todo_tools(session: AsyncSession, context: AgentContext) -> list[AgentT
             except ValueError:
                 return f'Invalid date format "{due_date}". Use YYYY-MM-DD.'
 
-        # Try numeric ID first
-        with contextlib.suppress(ValueError, TypeError):
-            todo_id = int(query)
-            todo = await mgr.get(todo_id)
-            if todo is not None:
-                await mgr.update(todo.id, due_date=new_due)
-                await session.commit()
-                context.todo_updated = True
-                if new_due:
-                    return f'Set due date on "{todo.title}" to {due_date}.'
-                return f'Cleared due date on "{todo.title}".'
-
-        # Pattern match
-        stmt = select(Todo).where(Todo.title.ilike(f"%{query}%"))
-        result = await session.execute(stmt)
-        todos = list(result.scalars().all())
+        todos = await _apply(query, lambda where: mgr.bulk_update(where, due_date=new_due))
 
         if not todos:
             return f'No TODOs found matching "{query}".'
 
-        for todo in todos:
-            await mgr.update(todo.id, due_date=new_due)
         await session.commit()
         context.todo_updated = True
 
@@ -453,7 +377,8 @@ def make_todo_tools(session: AsyncSession, context: AgentContext) -> list[AgentT
                 "Create one or more TODO items. Pass a list of task titles — even for a "
                 "single task, wrap it in a list. Use concise action phrases starting with "
                 "a verb (e.g., 'Buy groceries', 'Call dentist'). After creation, "
-                "urgency/importance are auto-classified; if uncertain, ask the user."
+                "urgency/importance are auto-classified in the background and the user is "
+                "asked about any that are unclear — don't ask about them yourself."
             ),
             parameters={
                 "type": "object",
@@ -0,0 +1,99 @@
+"""Conditional GET for list endpoints — ETags from collection version counters.
+
+A list's ETag hashes the version counters of the collections it reads
+(istari.models.collection_version), the query string, the response schema,
+and any clock input its query depends on. Checking ``If-None-Match`` costs one
+primary-key lookup, so an unchanged list answers 304 without running the list
+query or serializing a row. Versions are read before the list query: a write
+landing in between can only make the next request miss, never serve stale data.
+
+Hits and misses are counted per path, in process, for /api/debug/etag-stats.
+"""
+
+import datetime
+import functools
+import hashlib
+import json
+from collections import defaultdict
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from istari.models.collection_version import read_versions
+
+_hits: defaultdict[str, int] = defaultdict(int)
+_misses: defaultdict[str, int] = defaultdict(int)
+
+
+@functools.cache
+def _schema_fingerprint(model: type[BaseModel]) -> str:
+    # A deploy that changes the response shape must not revalidate old bodies
+    raw = json.dumps(model.model_json_schema(), sort_keys=True)
+    return hashlib.blake2b(raw.encode(), digest_size=8).hexdigest()
+
+
+def minute_bucket() -> str:
+    """Clock input for lists ordered by ``due_date < now()``.
+
+    Overdue ranking shifts without any write, so such ETags also roll over
+    each minute; a list is at most a minute behind a deadline passing.
+    """
+    return datetime.datetime.now(datetime.UTC).strftime("%Y-%m-%dT%H:%M")
+
+
+def _matches(header: str | None, etag: str) -> bool:
+    if header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison: a W/ prefix does not matter
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    collections: tuple[str, ...],
+    model: type[BaseModel],
+    *parts: object,
+) -> Response | None:
+    """Return a 304 response if the client's copy is current.
+
+    Otherwise sets ``ETag`` on ``response`` and returns None; the endpoint
+    then builds the list as usual.
+    """
+    versions = await read_versions(db, collections)
+    raw = json.dumps(
+        [
+            [versions[name] for name in collections],
+            request.url.query,
+            _schema_fingerprint(model),
+            [str(p) for p in parts],
+        ]
+    )
+    etag = '"' + hashlib.blake2b(raw.encode(), digest_size=12).hexdigest() + '"'
+    # Let browsers keep the body but revalidate it on every request
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    path = request.url.path
+    if _matches(request.headers.get("if-none-match"), etag):
+        _hits[path] += 1
+        return Response(status_code=304, headers=headers)
+    _misses[path] += 1
+    response.headers.update(headers)
+    return None
+
+
+def etag_stats() -> dict[str, dict[str, float]]:
+    """Per-path hits, misses and hit rate since process start."""
+    stats: dict[str, dict[str, float]] = {}
+    for path in sorted(_hits.keys() | _misses.keys()):
+        hits, misses = _hits[path], _misses[path]
+        stats[path] = {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses)}
+    return stats
+
+
+def reset_etag_stats() -> None:
+    _hits.clear()
+    _misses.clear()
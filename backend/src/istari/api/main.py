@@ -1,5 +1,6 @@
 """FastAPI application factory."""
 
+import asyncio
 import logging
 import logging.handlers
 from collections.abc import AsyncGenerator
@@ -11,10 +12,27 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from istari.api.debug import ring_buffer
 from istari.api.middleware.auth import AuthMiddleware
-from istari.api.routes import auth, chat, digests, memory, notifications, projects, settings, todos
+from istari.api.routes import (
+    auth,
+    calendar,
+    chat,
+    digests,
+    events,
+    memory,
+    notifications,
+    projects,
+    settings,
+    todos,
+)
 from istari.api.routes import debug as debug_routes
 from istari.config.settings import settings as app_settings
+from istari.db.changes import change_hub, listen
+from istari.db.session import async_session_factory, engine
 from istari.tools.mcp.client import MCPManager, load_mcp_server_configs
+from istari.tools.memory.vector_cache import (
+    start_memory_vector_cache,
+    stop_memory_vector_cache,
+)
 
 _LOG_FORMAT = "%(asctime)s %(levelname)-8s %(name)s | %(message)s"
 _LOG_DATEFMT = "%H:%M:%S"
@@ -76,10 +94,35 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # In-process ring buffer for /api/debug/recent-errors
     root.addHandler(ring_buffer)
 
+    cache_refresh: asyncio.Task[None] | None = None
+    if app_settings.memory_vector_cache_enabled:
+        try:
+            cache_refresh = await start_memory_vector_cache(
+                async_session_factory,
+                max_rows=app_settings.memory_vector_cache_max_rows,
+                refresh_seconds=app_settings.memory_vector_cache_refresh_seconds,
+            )
+        except Exception:
+            logging.getLogger(__name__).warning(
+                "Memory vector cache unavailable; using pgvector", exc_info=True
+            )
+
+    # SQLite (tests) has no LISTEN; its commits publish to the hub directly
+    change_feed: asyncio.Task[None] | None = None
+    if engine.dialect.name == "postgresql":
+        change_feed = asyncio.create_task(listen(engine, change_hub))
+
     configs = load_mcp_server_configs()
-    async with MCPManager(configs) as manager:
-        app.state.mcp_tools = await manager.get_agent_tools()
-        yield
+    try:
+        async with MCPManager(configs) as manager:
+            app.state.mcp_tools = await manager.get_agent_tools()
+            yield
+    finally:
+        if cache_refresh is not None:
+            cache_refresh.cancel()
+        if change_feed is not None:
+            change_feed.cancel()
+        stop_memory_vector_cache()
 
 
 app = FastAPI(title="Istari", version="0.1.0", lifespan=lifespan)
@@ -96,11 +139,13 @@ app.add_middleware(
 
 app.include_router(auth.router, prefix="/api")
 app.include_router(chat.router, prefix="/api")
+app.include_router(calendar.router, prefix="/api")
 app.include_router(todos.router, prefix="/api")
 app.include_router(projects.router, prefix="/api")
 app.include_router(memory.router, prefix="/api")
 app.include_router(notifications.router, prefix="/api")
 app.include_router(digests.router, prefix="/api")
+app.include_router(events.router, prefix="/api")
 app.include_router(settings.router, prefix="/api")
 app.include_router(debug_routes.router, prefix="/api")
 
@@ -0,0 +1,61 @@
+"""Calendar endpoints — free slots and fitting todos into them."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from istari.api.deps import get_db
+from istari.api.schemas import (
+    FreeSlotResponse,
+    FreeSlotsRequest,
+    FreeSlotsResponse,
+    SlotPlacementResponse,
+)
+from istari.config.settings import settings
+from istari.tools.calendar.freebusy import Slot, load_tasks, plan_slots
+
+router = APIRouter(prefix="/calendar", tags=["calendar"])
+
+DB = Annotated[AsyncSession, Depends(get_db)]
+
+_MAX_DAYS = 366
+
+
+def _slot(slot: Slot) -> FreeSlotResponse:
+    return FreeSlotResponse(start=slot.start, end=slot.end, minutes=slot.minutes)
+
+
+@router.post("/free-slots", response_model=FreeSlotsResponse)
+async def find_free_slots(body: FreeSlotsRequest, db: DB) -> FreeSlotsResponse:
+    """Free working-hours slots, with each requested todo fitted before its due date."""
+    days = body.days or settings.slot_search_days
+    if not 1 <= days <= _MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"days must be between 1 and {_MAX_DAYS}")
+    min_minutes = body.duration_minutes or settings.default_task_minutes
+    tasks, missing = await load_tasks(db, [(t.todo_id, t.minutes) for t in body.todos])
+    try:
+        plan = await plan_slots(db, days, min_minutes, tasks)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=503, detail="Calendar is not connected") from exc
+    except (ImportError, PermissionError) as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    return FreeSlotsResponse(
+        start=plan.start,
+        end=plan.end,
+        source=plan.source,
+        busy=[_slot(b) for b in plan.busy.busy_between(plan.start, plan.end)],
+        slots=[_slot(s) for s in plan.slots],
+        placements=[
+            SlotPlacementResponse(
+                todo_id=p.task.id,
+                title=p.task.title,
+                minutes=p.task.minutes,
+                due=p.task.due,
+                start=p.slot.start if p.slot else None,
+                end=p.slot.end if p.slot else None,
+            )
+            for p in plan.placements
+        ],
+        missing_todo_ids=missing,
+    )
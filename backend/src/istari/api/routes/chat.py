@@ -3,25 +3,36 @@
 import asyncio
 import contextlib
 import datetime
+import logging
 import time
 import uuid
 from collections import deque
+from typing import Annotated, Any
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from istari.agents.chat import build_system_prompt, build_tools, run_agent
 from istari.agents.memory_extractor import extract_and_store
 from istari.agents.tools.base import AgentContext
 from istari.api.auth import COOKIE_NAME, verify_token
+from istari.api.deps import get_db
+from istari.api.schemas import ConversationHitResponse, ConversationSearchResponse
 from istari.config.settings import settings
 from istari.db.session import async_session_factory
 from istari.tools.conversation.store import ConversationStore
+from istari.tools.memory.store import MemoryStore
+from istari.tools.todo.classification import classify_pending, uncertain_prompt
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
 _WS_RATE_LIMIT = 20    # max messages per window
 _WS_RATE_WINDOW = 60.0  # sliding window in seconds
 
+DB = Annotated[AsyncSession, Depends(get_db)]
+
 
 class _RateLimiter:
     """Per-connection sliding-window rate limiter.
@@ -47,11 +58,64 @@ class _RateLimiter:
         return True
 
 
+async def _push_classifications(
+    ws: WebSocket, todo_ids: list[int], history: list[dict[str, Any]]
+) -> None:
+    """Classify freshly created todos, then tell the client (and ask about unclear ones).
+
+    Runs after the chat response is sent, so todo creation never waits on the
+    local model. Anything left unclassified stays queued for the worker job.
+    """
+    try:
+        async with async_session_factory() as session:
+            batch = await classify_pending(
+                session, limit=settings.todo_classification_batch_size, ids=todo_ids
+            )
+            question = uncertain_prompt(batch.uncertain_titles) if batch.uncertain_titles else ""
+            if question:
+                await ConversationStore(session).save_message("assistant", question)
+            await session.commit()
+    except Exception:
+        logger.warning("Background todo classification failed", exc_info=True)
+        return
+    if not batch.classified_ids:
+        return
+
+    if question:
+        history.append({"role": "assistant", "content": question})
+    with contextlib.suppress(Exception):
+        await ws.send_json({
+            "type": "todos_classified",
+            "todo_ids": batch.classified_ids,
+            "id": str(uuid.uuid4()),
+            "content": question,
+            "created_at": datetime.datetime.now(datetime.UTC).isoformat(),
+        })
+
+
 @router.get("/")
 async def get_conversations() -> dict[str, list[object]]:
     return {"conversations": []}
 
 
+@router.get("/search", response_model=ConversationSearchResponse)
+async def search_conversations(
+    db: DB,
+    q: Annotated[str, Query(min_length=1)],
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: int | None = None,
+) -> ConversationSearchResponse:
+    """Full-text search over past messages, newest first.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` for the next page.
+    """
+    hits = await ConversationStore(db).search(q, limit=limit, before_id=cursor)
+    return ConversationSearchResponse(
+        results=[ConversationHitResponse.model_validate(h) for h in hits],
+        next_cursor=hits[-1].id if len(hits) == limit else None,
+    )
+
+
 @router.websocket("/ws")
 async def chat_ws(ws: WebSocket) -> None:
     # Authenticate via session cookie before accepting the connection.
@@ -120,6 +184,9 @@ async def chat_ws(ws: WebSocket) -> None:
                     context=context,
                     status_callback=_send_status,
                 )
+                # Stamp memories surfaced during this turn, on the session that found them
+                await MemoryStore(session).flush_references()
+                await session.commit()
 
             if context.tool_errors:
                 error_lines = "\n".join(f"- {e}" for e in context.tool_errors)
@@ -149,5 +216,10 @@ async def chat_ws(ws: WebSocket) -> None:
                 "memory_created": context.memory_created,
             })
 
+            if context.classification_queued:
+                asyncio.create_task(  # noqa: RUF006
+                    _push_classifications(ws, context.classification_queued, history)
+                )
+
     except WebSocketDisconnect:
         pass
@@ -1,10 +1,12 @@
-"""Debug endpoints — in-process error ring buffer."""
+"""Debug endpoints — in-process error ring buffer and cache counters."""
 
 from typing import Any
 
 from fastapi import APIRouter
 
 from istari.api.debug import get_recent_errors
+from istari.api.etags import etag_stats
+from istari.tools.todo.view_cache import get_view_cache
 
 router = APIRouter(prefix="/debug", tags=["debug"])
 
@@ -14,3 +16,24 @@ async def recent_errors() -> dict[str, Any]:
     """Return the last 50 WARNING+ log records captured in-process."""
     errors = get_recent_errors()
     return {"errors": errors, "count": len(errors)}
+
+
+@router.get("/etag-stats")
+async def get_etag_stats() -> dict[str, Any]:
+    """Conditional-GET hits, misses and hit rate per list path since startup."""
+    return {"paths": etag_stats()}
+
+
+@router.get("/view-cache-stats")
+async def get_view_cache_stats() -> dict[str, Any]:
+    """Todo view cache hits, misses and write-transaction bypasses since startup."""
+    cache = get_view_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "backend": type(cache.backend).__name__,
+        "hits": cache.hits,
+        "misses": cache.misses,
+        "bypasses": cache.bypasses,
+    }
@@ -0,0 +1,42 @@
+"""Change feed endpoint — one multiplexed SSE stream per client.
+
+Each event is an entity-level delta from istari.db.changes; the frontend
+refetches the affected list instead of polling it on a timer.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from istari.db.changes import ChangeHub, change_hub
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+# Comment lines keep proxies from timing out an idle stream
+HEARTBEAT_SECONDS = 15.0
+
+
+async def event_stream(
+    hub: ChangeHub, heartbeat_seconds: float = HEARTBEAT_SECONDS
+) -> AsyncIterator[str]:
+    with hub.subscription() as queue:
+        # Tells a reconnecting EventSource how long to back off
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                change = await asyncio.wait_for(queue.get(), heartbeat_seconds)
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: change\ndata: {change.to_json()}\n\n"
+
+
+@router.get("/")
+async def stream_events() -> StreamingResponse:
+    return StreamingResponse(
+        event_stream(change_hub),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
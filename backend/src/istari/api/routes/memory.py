@@ -2,11 +2,13 @@
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from istari.api.deps import get_db
 from istari.api.schemas import MemoryCreate, MemoryListResponse, MemoryResponse
+from istari.api.streaming import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, ndjson_response
 from istari.tools.memory.store import MemoryStore
 
 router = APIRouter(prefix="/memory", tags=["memory"])
@@ -15,14 +17,35 @@ DB = Annotated[AsyncSession, Depends(get_db)]
 
 
 @router.get("/", response_model=MemoryListResponse)
-async def list_memories(db: DB) -> MemoryListResponse:
+async def list_memories(
+    db: DB,
+    limit: Annotated[int | None, Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    cursor: str | None = None,
+) -> MemoryListResponse:
+    """Explicit memories, newest first; paged when ``limit`` or ``cursor`` is given."""
     store = MemoryStore(db)
-    memories = await store.list_explicit()
+    if limit is None and cursor is None:
+        memories = await store.list_explicit_rows()
+        return MemoryListResponse(
+            memories=[MemoryResponse.model_validate(m) for m in memories],
+        )
+    try:
+        page = await store.list_explicit_page(limit or DEFAULT_PAGE_SIZE, cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     return MemoryListResponse(
-        memories=[MemoryResponse.model_validate(m) for m in memories],
+        memories=[MemoryResponse.model_validate(m) for m in page.items],
+        next_cursor=page.next_cursor,
     )
 
 
+@router.get("/export")
+async def export_memories(db: DB) -> StreamingResponse:
+    """All explicit memories as NDJSON, streamed from a server-side cursor."""
+    store = MemoryStore(db)
+    return ndjson_response(store.stream_explicit_rows(), MemoryResponse.model_validate)
+
+
 @router.get("/search", response_model=MemoryListResponse)
 async def search_memories(q: str, db: DB) -> MemoryListResponse:
     store = MemoryStore(db)
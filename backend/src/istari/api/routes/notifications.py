@@ -3,10 +3,11 @@
 import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from istari.api.deps import get_db
+from istari.api.etags import conditional_get
 from istari.api.schemas import (
     NotificationListResponse,
     NotificationResponse,
@@ -21,11 +22,20 @@ DB = Annotated[AsyncSession, Depends(get_db)]
 
 @router.get("/", response_model=NotificationListResponse)
 async def list_notifications(
-    db: DB, limit: int = 20, unread_only: bool = False
-) -> NotificationListResponse:
-    mgr = NotificationManager(db)
+    request: Request,
+    response: Response,
+    db: DB,
+    limit: int = 20,
+    unread_only: bool = False,
+) -> NotificationListResponse | Response:
     now = datetime.datetime.now(datetime.UTC)
     start_of_today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    not_modified = await conditional_get(
+        request, response, db, ("notifications",), NotificationListResponse, start_of_today
+    )
+    if not_modified is not None:
+        return not_modified
+    mgr = NotificationManager(db)
     notifications = await mgr.list_recent(
         limit=limit,
         include_read=not unread_only,
@@ -2,39 +2,80 @@
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from istari.api.deps import get_db
+from istari.api.etags import conditional_get
 from istari.api.schemas import (
     NextActionUpdate,
     ProjectCreate,
     ProjectListResponse,
     ProjectResponse,
+    ProjectSummaryResponse,
     ProjectUpdate,
     ProjectWithTodos,
     TodoResponse,
 )
+from istari.api.streaming import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, ndjson_response
 from istari.models.project import ProjectStatus
-from istari.tools.project.manager import ProjectManager
+from istari.tools.project.manager import ProjectManager, ProjectSummary
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 DB = Annotated[AsyncSession, Depends(get_db)]
 
 
+def _summary_response(s: ProjectSummary) -> ProjectSummaryResponse:
+    return ProjectSummaryResponse(
+        **ProjectResponse.model_validate(s.project).model_dump(),
+        next_action_title=s.next_action_title,
+        open_todo_count=s.open_todo_count,
+        last_activity=s.last_activity,
+    )
+
+
 @router.get("/", response_model=ProjectListResponse)
-async def list_projects(db: DB, status: str = "active") -> ProjectListResponse:
+async def list_projects(
+    request: Request,
+    response: Response,
+    db: DB,
+    status: str = "active",
+    limit: Annotated[int | None, Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    cursor: str | None = None,
+) -> ProjectListResponse | Response:
+    """Project summaries, newest first; paged when ``limit`` or ``cursor`` is given."""
+    not_modified = await conditional_get(
+        request, response, db, ("projects",), ProjectListResponse
+    )
+    if not_modified is not None:
+        return not_modified
     mgr = ProjectManager(db)
-    if status == "all":
-        projects = await mgr.list_all()
-    else:
-        projects = await mgr.list_active()
+    include_inactive = status == "all"
+    if limit is None and cursor is None:
+        summaries = await mgr.list_summaries(include_inactive=include_inactive)
+        return ProjectListResponse(projects=[_summary_response(s) for s in summaries])
+    try:
+        page = await mgr.list_summaries_page(
+            limit or DEFAULT_PAGE_SIZE, cursor, include_inactive=include_inactive
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     return ProjectListResponse(
-        projects=[ProjectResponse.model_validate(p) for p in projects]
+        projects=[_summary_response(s) for s in page.items],
+        next_cursor=page.next_cursor,
     )
 
 
+@router.get("/export")
+async def export_projects(db: DB, status: str = "active") -> StreamingResponse:
+    """Project summaries as NDJSON, streamed from a server-side cursor."""
+    mgr = ProjectManager(db)
+    rows = mgr.stream_summaries(include_inactive=status == "all")
+    return ndjson_response(rows, _summary_response)
+
+
 @router.post("/", response_model=ProjectResponse, status_code=201)
 async def create_project(body: ProjectCreate, db: DB) -> ProjectResponse:
     mgr = ProjectManager(db)
@@ -3,10 +3,12 @@
 import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from istari.api.deps import get_db
+from istari.api.etags import conditional_get, minute_bucket
 from istari.api.schemas import (
     PrioritizedTodosResponse,
     TodoContextResponse,
@@ -15,6 +17,7 @@ from istari.api.schemas import (
     TodoResponse,
     TodoUpdate,
 )
+from istari.api.streaming import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, ndjson_response
 from istari.config.settings import settings
 from istari.tools.todo.manager import TodoManager
 
@@ -24,10 +27,41 @@ DB = Annotated[AsyncSession, Depends(get_db)]
 
 
 @router.get("/", response_model=TodoListResponse)
-async def list_todos(db: DB) -> TodoListResponse:
+async def list_todos(
+    request: Request,
+    response: Response,
+    db: DB,
+    limit: Annotated[int | None, Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    cursor: str | None = None,
+) -> TodoListResponse | Response:
+    """Visible todos. Without ``limit``/``cursor`` returns all of them in one response.
+
+    With either, returns one page; pass ``next_cursor`` back as ``cursor``.
+    """
+    not_modified = await conditional_get(
+        request, response, db, ("todos",), TodoListResponse, minute_bucket()
+    )
+    if not_modified is not None:
+        return not_modified
     mgr = TodoManager(db)
-    todos = await mgr.list_visible()
-    return TodoListResponse(todos=[TodoResponse.model_validate(t) for t in todos])
+    if limit is None and cursor is None:
+        todos = await mgr.list_visible_rows()
+        return TodoListResponse(todos=[TodoResponse.model_validate(t) for t in todos])
+    try:
+        page = await mgr.list_visible_page(limit or DEFAULT_PAGE_SIZE, cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return TodoListResponse(
+        todos=[TodoResponse.model_validate(t) for t in page.items],
+        next_cursor=page.next_cursor,
+    )
+
+
+@router.get("/export")
+async def export_todos(db: DB) -> StreamingResponse:
+    """All visible todos as NDJSON, streamed from a server-side cursor."""
+    mgr = TodoManager(db)
+    return ndjson_response(mgr.stream_visible_rows(), TodoResponse.model_validate)
 
 
 @router.post("/", response_model=TodoResponse, status_code=201)
@@ -40,9 +74,16 @@ async def create_todo(body: TodoCreate, db: DB) -> TodoResponse:
 
 
 @router.get("/today", response_model=TodoListResponse)
-async def list_today_todos(db: DB) -> TodoListResponse:
+async def list_today_todos(
+    request: Request, response: Response, db: DB
+) -> TodoListResponse | Response:
+    not_modified = await conditional_get(
+        request, response, db, ("todos",), TodoListResponse, datetime.date.today()
+    )
+    if not_modified is not None:
+        return not_modified
     mgr = TodoManager(db)
-    todos = await mgr.list_today()
+    todos = await mgr.list_today_rows()
     return TodoListResponse(todos=[TodoResponse.model_validate(t) for t in todos])
 
 
@@ -62,9 +103,22 @@ async def toggle_today(todo_id: int, db: DB) -> TodoResponse:
 
 
 @router.get("/prioritized", response_model=PrioritizedTodosResponse)
-async def get_prioritized(db: DB) -> PrioritizedTodosResponse:
+async def get_prioritized(
+    request: Request, response: Response, db: DB
+) -> PrioritizedTodosResponse | Response:
+    not_modified = await conditional_get(
+        request,
+        response,
+        db,
+        ("todos",),
+        PrioritizedTodosResponse,
+        settings.priorities_max,
+        minute_bucket(),
+    )
+    if not_modified is not None:
+        return not_modified
     mgr = TodoManager(db)
-    todos = await mgr.get_prioritized(limit=settings.priorities_max)
+    todos = await mgr.get_prioritized_rows(limit=settings.priorities_max)
     return PrioritizedTodosResponse(
         todos=[TodoResponse.model_validate(t) for t in todos],
     )
@@ -50,6 +50,7 @@ class TodoResponse(BaseModel):
 
 class TodoListResponse(BaseModel):
     todos: list[TodoResponse]
+    next_cursor: str | None = None
 
 
 class PrioritizedTodosResponse(BaseModel):
@@ -98,8 +99,15 @@ class NextActionUpdate(BaseModel):
     todo_id: int | None = None
 
 
+class ProjectSummaryResponse(ProjectResponse):
+    next_action_title: str | None = None
+    open_todo_count: int = 0
+    last_activity: datetime.datetime | None = None
+
+
 class ProjectListResponse(BaseModel):
-    projects: list[ProjectResponse]
+    projects: list[ProjectSummaryResponse]
+    next_cursor: str | None = None
 
 
 # --- Memory schemas ---
@@ -122,6 +130,7 @@ class MemoryResponse(BaseModel):
 
 class MemoryListResponse(BaseModel):
     memories: list[MemoryResponse]
+    next_cursor: str | None = None
 
 
 # --- Settings schemas ---
@@ -204,3 +213,57 @@ class ChatResponse(BaseModel):
     todo_created: bool = False
     todo_updated: bool = False
     memory_created: bool = False
+
+
+class ConversationHitResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    role: str
+    created_at: datetime.datetime
+    snippet: str
+    rank: float
+
+
+class ConversationSearchResponse(BaseModel):
+    results: list[ConversationHitResponse]
+    next_cursor: int | None = None
+
+
+# --- Calendar schemas ---
+
+
+class TaskEstimate(BaseModel):
+    todo_id: int
+    minutes: int | None = None
+
+
+class FreeSlotsRequest(BaseModel):
+    days: int | None = None
+    duration_minutes: int | None = None
+    todos: list[TaskEstimate] = []
+
+
+class FreeSlotResponse(BaseModel):
+    start: datetime.datetime
+    end: datetime.datetime
+    minutes: int
+
+
+class SlotPlacementResponse(BaseModel):
+    todo_id: int
+    title: str
+    minutes: int
+    due: datetime.datetime | None = None
+    start: datetime.datetime | None = None  # None: no slot fits before it is due
+    end: datetime.datetime | None = None
+
+
+class FreeSlotsResponse(BaseModel):
+    start: datetime.datetime
+    end: datetime.datetime
+    source: str
+    busy: list[FreeSlotResponse]
+    slots: list[FreeSlotResponse]
+    placements: list[SlotPlacementResponse]
+    missing_todo_ids: list[int] = []
@@ -0,0 +1,29 @@
+"""NDJSON export responses — one JSON object per line, streamed as rows arrive."""
+
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+# Default page size when a client sends a cursor without a limit
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def ndjson_response(
+    rows: AsyncIterator[Any], to_model: Callable[[Any], BaseModel]
+) -> StreamingResponse:
+    """Stream ``rows`` (typically a manager's server-side cursor) as NDJSON.
+
+    Each row is validated and serialized on its own, so API memory stays flat
+    regardless of how many rows the export covers. ``rows`` may read from the
+    request's ``get_db`` session: since FastAPI 0.118, yield dependencies are
+    torn down only after the response body has been sent.
+    """
+
+    async def _lines() -> AsyncIterator[str]:
+        async for row in rows:
+            yield to_model(row).model_dump_json() + "\n"
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
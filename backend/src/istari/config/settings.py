@@ -50,10 +50,44 @@ class Settings(BaseSettings):
     google_client_secret: str = ""
     gmail_token_path: str = "secrets/gmail_token.json"
     gmail_max_results: int = 50
+    # Local mail mirror (gmail_sync job): reads are served locally while it is this fresh
+    gmail_mirror_enabled: bool = True
+    gmail_mirror_max_age_minutes: int = 15
+    gmail_mirror_bootstrap_max: int = 500  # messages copied by a first or expired-history sync
     calendar_token_path: str = "secrets/calendar_token.json"
     calendar_max_results: int = 10
     # "google" uses OAuth CalendarReader; "apple" uses EventKit (macOS only)
     calendar_backend: str = "google"
+    # Local event store (calendar_sync job): reads are served locally while it is this fresh
+    calendar_store_enabled: bool = True
+    calendar_store_max_age_minutes: int = 15
+    calendar_expand_days: int = 365  # recurring events are expanded this far ahead
+    calendar_expand_past_days: int = 30
+    # Slot finder (find_free_slots): working hours are wall-clock times in user_timezone
+    user_timezone: str = "UTC"
+    working_hours_start: int = 9
+    working_hours_end: int = 17
+    working_days: list[int] = [0, 1, 2, 3, 4]  # Monday = 0
+    default_task_minutes: int = 30
+    slot_search_days: int = 7
+
+    # Filesystem search index (fs_index job): searches inside these roots use the index
+    fs_index_enabled: bool = True
+    fs_index_roots: list[str] = ["~/Documents", "~/Desktop"]
+    fs_index_path: str = "data/fs_index.sqlite3"
+    fs_index_max_file_bytes: int = 2 * 1024 * 1024  # text indexed per file
+    # Un-indexed directories are scanned in parallel, within these limits
+    fs_scan_workers: int = 8
+    fs_scan_max_files: int = 20_000
+    fs_scan_max_file_bytes: int = 2 * 1024 * 1024  # bytes searched per file
+    fs_scan_time_budget_seconds: float = 10.0
+    # Semantic note search (note_index job): text under these roots is chunked and embedded
+    note_index_enabled: bool = True
+    note_index_roots: list[str] = ["~/Documents"]
+    note_index_extensions: list[str] = ["md", "markdown", "txt"]
+    note_index_max_file_bytes: int = 1024 * 1024
+    note_chunk_chars: int = 1500  # chunks are whole lines, up to about this long
+    note_embed_batch_size: int = 32
 
     # User identity (injected into agent system prompt)
     user_name: str = ""
@@ -65,9 +99,33 @@ class Settings(BaseSettings):
     project_staleness_days: int = 7
     deadline_urgent_days: int = 3  # todos due within N days auto-elevate to urgent in sort
     deadline_nudge_days: int = 3   # worker job: notify for todos due within N days
+    embedding_backfill_batch_size: int = 32
+    embedding_backfill_batches_per_minute: int = 30  # rate limit so Ollama stays free for chat
+
+    # Memory consolidation (nightly learning_update job)
+    memory_duplicate_distance: float = 0.08  # cosine distance under which memories are merged
+    memory_decay_days: int = 30              # unreferenced this long → confidence decays
+    memory_decay_factor: float = 0.95        # applied nightly while unreferenced
+    memory_archive_confidence: float = 0.3   # auto-extracted memories below this are archived
+
+    # Episodic memory — past conversations summarized into searchable episodes
+    episode_gap_minutes: int = 60       # idle time that ends a conversation
+    episode_max_messages: int = 20      # longer conversations are split into several episodes
+    episode_max_distance: float = 0.35  # cosine distance for injecting an episode into the prompt
+
+    # In-process memory vector cache (requires the [vector-cache] extra)
+    memory_vector_cache_enabled: bool = False
+    memory_vector_cache_max_rows: int = 20000  # above this, search falls back to pgvector
+    memory_vector_cache_refresh_seconds: int = 30
 
     # TODO priorities
     priorities_max: int = 5  # max tasks returned by get_priorities tool + /todos/prioritized
+    todo_classification_batch_size: int = 20  # titles per Eisenhower classification LLM call
+
+    # Read-through cache for the prioritized/today views and get_priorities
+    todo_view_cache_enabled: bool = True
+    todo_view_cache_url: str = ""  # redis://… shares entries across API + worker ([redis] extra)
+    todo_view_cache_max_seconds: int = 3600  # upper bound on any entry's lifetime
 
     # Backup
     backup_enabled: bool = False
@@ -85,10 +143,10 @@ class Settings(BaseSettings):
     # Logging
     log_level: str = "INFO"
 
-    @field_validator("gmail_token_path", "calendar_token_path", mode="before")
+    @field_validator("gmail_token_path", "calendar_token_path", "fs_index_path", mode="before")
     @classmethod
     def _resolve_token_path(cls, v: str) -> str:
-        """Resolve relative token paths against the project root, not CWD."""
+        """Resolve relative token and data paths against the project root, not CWD."""
         p = Path(v)
         return str(p if p.is_absolute() else _PROJECT_ROOT / p)
 
@@ -0,0 +1,258 @@
+"""Change feed — entity-level deltas pushed to clients instead of polled.
+
+Every ORM write to todos, projects, notifications and digests — flushes and
+ORM-enabled bulk INSERT/UPDATE/DELETE, in the API and the worker alike — emits
+a ``Change`` on the ``istari_changes`` Postgres channel via ``pg_notify`` in
+the writing transaction, so listeners only hear about committed work. The API
+holds one LISTEN connection and fans each change out to every connected
+client's queue (``ChangeHub``); ``/api/events`` streams those queues as SSE.
+
+Changes carry ids where the write path knows them; ``ids=None`` means "some
+rows of this entity changed — refetch". A ``resync`` change tells clients to
+refetch everything, e.g. after the LISTEN connection was lost or a client fell
+too far behind. The same hooks bump the per-collection counters
+(istari.models.collection_version) that back the list endpoints' ETags.
+
+SQLite (the test suite) has no NOTIFY; there changes are published to the
+in-process hub when the session commits.
+"""
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Connection, event, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+
+from istari.models.collection_version import bump_versions
+from istari.models.digest import Digest
+from istari.models.notification import Notification
+from istari.models.project import Project
+from istari.models.todo import Todo
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "istari_changes"
+
+# NOTIFY payloads are capped at 8000 bytes; 500 ids stays well under that
+_IDS_PER_CHANGE = 500
+
+_ENTITIES: dict[type, str] = {
+    Todo: "todos",
+    Project: "projects",
+    Notification: "notifications",
+    Digest: "digests",
+}
+
+# Collection versions to bump per changed entity; project summaries carry
+# todo counts and next-action status, so todo writes change them too
+_VERSIONED: dict[str, tuple[str, ...]] = {
+    "todos": ("todos", "projects"),
+    "projects": ("projects",),
+    "notifications": ("notifications",),
+    "digests": ("digests",),
+}
+
+_PENDING_KEY = "istari_pending_changes"
+_WRITTEN_KEY = "istari_written_collections"
+
+
+@dataclass(frozen=True, slots=True)
+class Change:
+    entity: str  # "todos", "projects", "notifications", "digests", or "*" for resync
+    op: str  # "created", "updated", "deleted" or "resync"
+    ids: tuple[int, ...] | None = None
+
+    def to_json(self) -> str:
+        ids = None if self.ids is None else list(self.ids)
+        return json.dumps({"entity": self.entity, "op": self.op, "ids": ids}, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, payload: str) -> "Change":
+        data = json.loads(payload)
+        ids = data.get("ids")
+        return cls(
+            entity=data["entity"],
+            op=data["op"],
+            ids=None if ids is None else tuple(int(i) for i in ids),
+        )
+
+
+RESYNC = Change(entity="*", op="resync")
+
+
+class ChangeHub:
+    """Fans published changes out to one bounded queue per subscriber.
+
+    A subscriber that stops draining its queue is not allowed to hold up the
+    others: when its queue fills, the backlog is dropped and replaced by a
+    single RESYNC.
+    """
+
+    def __init__(self, max_queue: int = 256) -> None:
+        self._max_queue = max_queue
+        self._queues: set[asyncio.Queue[Change]] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._queues)
+
+    @contextmanager
+    def subscription(self) -> Iterator["asyncio.Queue[Change]"]:
+        queue: asyncio.Queue[Change] = asyncio.Queue(self._max_queue)
+        self._queues.add(queue)
+        try:
+            yield queue
+        finally:
+            self._queues.discard(queue)
+
+    def publish(self, change: Change) -> None:
+        for queue in self._queues:
+            try:
+                queue.put_nowait(change)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC)
+
+    def publish_payload(self, payload: str) -> None:
+        try:
+            change = Change.from_json(payload)
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed change payload: %.200s", payload)
+            return
+        self.publish(change)
+
+
+change_hub = ChangeHub()
+
+
+async def listen(engine: AsyncEngine, hub: ChangeHub, retry_seconds: float = 5.0) -> None:
+    """LISTEN on CHANNEL and publish every notification to ``hub``, forever.
+
+    Reconnects after ``retry_seconds`` when the connection drops, then
+    publishes RESYNC since anything notified in the gap was missed.
+    """
+    reconnecting = False
+    while True:
+        try:
+            async with engine.connect() as conn:
+                raw = await conn.get_raw_connection()
+                driver: Any = raw.driver_connection
+                lost = asyncio.Event()
+
+                def _on_notify(_conn: Any, _pid: int, _channel: str, payload: str) -> None:
+                    hub.publish_payload(payload)
+
+                await driver.add_listener(CHANNEL, _on_notify)
+                driver.add_termination_listener(lambda _conn, lost=lost: lost.set())
+                if reconnecting:
+                    hub.publish(RESYNC)
+                try:
+                    await lost.wait()
+                finally:
+                    if not driver.is_closed():
+                        await driver.remove_listener(CHANNEL, _on_notify)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning("Change feed listener failed; retrying", exc_info=True)
+        reconnecting = True
+        await asyncio.sleep(retry_seconds)
+
+
+def has_uncommitted_writes(session: Session, collections: Iterable[str]) -> bool:
+    """Whether ``session``'s open transaction has flushed writes to ``collections``.
+
+    Such a transaction sees data — and version counters — no other session
+    can see yet, and may still roll back, so it must bypass shared caches.
+    """
+    written: set[str] = session.info.get(_WRITTEN_KEY, set())
+    return not written.isdisjoint(collections)
+
+
+# ---------------------------------------------------------------------------
+# Write-path emission
+# ---------------------------------------------------------------------------
+
+
+def _changes(entity: str, op: str, ids: Iterable[int] | None) -> list[Change]:
+    if ids is None:
+        return [Change(entity, op)]
+    ordered = sorted(set(ids))
+    return [
+        Change(entity, op, tuple(ordered[i : i + _IDS_PER_CHANGE]))
+        for i in range(0, len(ordered), _IDS_PER_CHANGE)
+    ]
+
+
+def _emit(session: Session, conn: Connection, changes: list[Change]) -> None:
+    if not changes:
+        return
+    collections = {name for c in changes for name in _VERSIONED[c.entity]}
+    bump_versions(conn, collections)
+    session.info.setdefault(_WRITTEN_KEY, set()).update(collections)
+    if conn.dialect.name == "postgresql":
+        # One round trip; NOTIFY is held back until (and unless) the commit
+        conn.execute(select(*(func.pg_notify(CHANNEL, c.to_json()) for c in changes)))
+    else:
+        session.info.setdefault(_PENDING_KEY, []).extend(changes)
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context: UOWTransaction) -> None:
+    touched: dict[tuple[str, str], set[int]] = defaultdict(set)
+    for op, objs in (
+        ("created", session.new),
+        ("updated", session.dirty),
+        ("deleted", session.deleted),
+    ):
+        for obj in objs:
+            entity = _ENTITIES.get(type(obj))
+            if entity is None or obj.id is None:
+                continue
+            if op == "updated" and not session.is_modified(obj, include_collections=False):
+                continue
+            touched[(entity, op)].add(obj.id)
+    if not touched:
+        return
+    changes = [c for (entity, op), ids in touched.items() for c in _changes(entity, op, ids)]
+    _emit(session, session.connection(), changes)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_bulk_write(state: ORMExecuteState) -> None:
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    if state.bind_mapper is None:
+        return
+    entity = _ENTITIES.get(state.bind_mapper.class_)
+    if entity is None:
+        return
+    op = "created" if state.is_insert else "updated" if state.is_update else "deleted"
+    statement: Any = state.statement
+    params: Any = state.parameters
+    ids: list[int] | None = None
+    if not state.is_insert and statement.whereclause is None and isinstance(params, list):
+        # Bulk UPDATE by primary key: the ids are in the parameter sets
+        ids = [r["id"] for r in params if "id" in r]
+    _emit(state.session, state.session.connection(), _changes(entity, op, ids))
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    session.info.pop(_WRITTEN_KEY, None)
+    for change in session.info.pop(_PENDING_KEY, ()):
+        change_hub.publish(change)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_WRITTEN_KEY, None)
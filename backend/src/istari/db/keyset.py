@@ -0,0 +1,133 @@
+"""Keyset (cursor) pagination over SQLAlchemy selects.
+
+A page is read by seeking past the sort-key values of the previous page's last
+row instead of skipping rows with OFFSET, so every page costs the same no matter
+how deep it is and rows inserted meanwhile don't shift later pages. The sort
+keys must end in a unique column (the primary key) to make the order total.
+
+Cursors are opaque to clients: the last row's key values as base64url JSON.
+"""
+
+import base64
+import binascii
+import datetime
+import json
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import ColumnElement, and_, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import QueryableAttribute
+from sqlalchemy.sql import Select
+
+
+@dataclass(frozen=True)
+class SortKey:
+    expr: ColumnElement[Any] | QueryableAttribute[Any]
+    descending: bool = False
+
+    def clause(self) -> ColumnElement[Any]:
+        return self.expr.desc() if self.descending else self.expr.asc()
+
+
+@dataclass(frozen=True)
+class Page:
+    items: list[Any]
+    next_cursor: str | None
+
+
+def order_by(keys: Sequence[SortKey]) -> list[ColumnElement[Any]]:
+    return [key.clause() for key in keys]
+
+
+def seek(keys: Sequence[SortKey], values: Sequence[Any]) -> ColumnElement[bool]:
+    """Rows strictly after ``values`` in ``keys`` order.
+
+    Uniform directions use a row-value comparison, which Postgres can answer
+    from a matching index; mixed directions expand to the equivalent OR chain.
+    """
+    if len({key.descending for key in keys}) == 1:
+        row = tuple_(*(key.expr for key in keys))
+        bound = tuple_(*values)
+        return row < bound if keys[0].descending else row > bound
+    terms = []
+    for i, key in enumerate(keys):
+        ties = [k.expr == v for k, v in zip(keys[:i], values[:i], strict=True)]
+        step = key.expr < values[i] if key.descending else key.expr > values[i]
+        terms.append(and_(*ties, step))
+    return or_(*terms)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    def _tag(value: Any) -> Any:
+        if isinstance(value, datetime.datetime):
+            return {"dt": value.isoformat()}
+        return value
+
+    raw = json.dumps([_tag(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[SortKey]) -> list[Any]:
+    """Decode a cursor from ``encode_cursor``; raises ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise ValueError("Invalid cursor")
+    try:
+        decoded = [
+            datetime.datetime.fromisoformat(v["dt"]) if isinstance(v, dict) else v
+            for v in values
+        ]
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    # A value of the wrong type would reach the database as a bad comparison
+    if not all(_fits(key, value) for key, value in zip(keys, decoded, strict=True)):
+        raise ValueError("Invalid cursor")
+    return decoded
+
+
+def _fits(key: SortKey, value: Any) -> bool:
+    """Whether ``value`` can be compared with ``key``'s column."""
+    try:
+        expected = key.expr.type.python_type
+    except NotImplementedError:
+        return value is not None
+    if isinstance(value, bool) and expected is not bool:
+        return False
+    if expected is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, expected)
+
+
+async def fetch_page(
+    session: AsyncSession,
+    stmt: Select[*tuple[Any, ...]],
+    keys: Sequence[SortKey],
+    limit: int,
+    cursor: str | None,
+    build: Callable[[Sequence[Any]], Any],
+) -> Page:
+    """Run ``stmt`` as one keyset page of at most ``limit`` items.
+
+    ``stmt``'s own ORDER BY is replaced by ``keys``. The key values ride along
+    as extra columns, so ``build`` receives each row without them. One extra row
+    is read to tell whether another page exists.
+    """
+    if cursor is not None:
+        stmt = stmt.where(seek(keys, decode_cursor(cursor, keys)))
+    n = len(keys)
+    stmt = (
+        stmt.add_columns(*(key.expr.label(f"_seek_{i}") for i, key in enumerate(keys)))
+        .order_by(None)
+        .order_by(*order_by(keys))
+        .limit(limit + 1)
+    )
+    rows = (await session.execute(stmt)).all()
+    items = [build(row[:-n]) for row in rows[:limit]]
+    next_cursor = encode_cursor(tuple(rows[limit - 1][-n:])) if len(rows) > limit else None
+    return Page(items=items, next_cursor=next_cursor)
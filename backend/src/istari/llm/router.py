@@ -2,13 +2,18 @@
 
 from typing import Any, cast
 
-from openai import AsyncOpenAI
+from openai import APIConnectionError, AsyncOpenAI
 from openai.types.chat import ChatCompletion
 
 from istari.config.settings import settings
 from istari.llm.config import get_model_config
 
 
+def is_unreachable(exc: BaseException) -> bool:
+    """Whether ``exc`` means the model could not be reached, not that it rejected the input."""
+    return isinstance(exc, (APIConnectionError, ConnectionError, TimeoutError))
+
+
 def _make_client(model: str) -> tuple[AsyncOpenAI, str]:
     """Return (client, bare_model_name) for any supported model prefix."""
     if model.startswith("ollama/"):
@@ -80,3 +85,16 @@ async def embedding(text: str) -> list[float]:
     client, bare_model = _make_client(model)
     response = await client.embeddings.create(model=bare_model, input=[text])
     return response.data[0].embedding
+
+
+async def embedding_batch(texts: list[str]) -> list[list[float]]:
+    """Embed several texts in one request; vectors are returned in input order."""
+    if not texts:
+        return []
+    config = get_model_config("embedding")
+    model = config["model"]
+
+    client, bare_model = _make_client(model)
+    response = await client.embeddings.create(model=bare_model, input=texts)
+    items = sorted(response.data, key=lambda d: d.index)
+    return [d.embedding for d in items]
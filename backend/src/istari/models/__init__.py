@@ -2,22 +2,36 @@
 
 from istari.models.agent_run import AgentRun
 from istari.models.base import Base
+from istari.models.calendar_event import CalendarEntry, CalendarOccurrence, CalendarSource
+from istari.models.collection_version import CollectionVersion
 from istari.models.conversation import ConversationMessage
 from istari.models.digest import Digest
+from istari.models.mail import MailMessage, MailSyncState
 from istari.models.memory import Memory
+from istari.models.note import NoteChunk, NoteFile
 from istari.models.notification import Notification
 from istari.models.project import Project
+from istari.models.project_stats import ProjectStats
 from istari.models.todo import Todo
 from istari.models.user import UserPreference, UserSetting
 
 __all__ = [
     "AgentRun",
     "Base",
+    "CalendarEntry",
+    "CalendarOccurrence",
+    "CalendarSource",
+    "CollectionVersion",
     "ConversationMessage",
     "Digest",
+    "MailMessage",
+    "MailSyncState",
     "Memory",
+    "NoteChunk",
+    "NoteFile",
     "Notification",
     "Project",
+    "ProjectStats",
     "Todo",
     "UserPreference",
     "UserSetting",
@@ -0,0 +1,105 @@
+"""Local Google Calendar store, kept current with per-calendar syncTokens.
+
+CalendarSource is one subscribed calendar and its sync state. CalendarEntry
+is one Google event resource as synced: a single event, a recurring series
+(with its RRULE/EXDATE lines), or an exception to a series (a moved or
+cancelled instance, linked by ``recurring_event_id``). CalendarOccurrence is
+the time-indexed expansion: one row per concrete occurrence inside the
+expansion window, which is what time-range queries read.
+
+All-day entries are stored from midnight UTC of their start date to
+midnight UTC of their (exclusive) end date.
+"""
+
+import datetime
+
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from istari.models.base import Base
+
+
+class CalendarSource(Base):
+    __tablename__ = "calendar_sources"
+
+    id: Mapped[str] = mapped_column(String(255), primary_key=True)  # Google calendar id
+    summary: Mapped[str] = mapped_column(Text, default="")
+    time_zone: Mapped[str] = mapped_column(String(64), default="UTC")
+    # Shown in the user's calendar list (or primary): only these count as busy,
+    # as with Google's freeBusy over the same list
+    selected: Mapped[bool] = mapped_column(Boolean, default=True)
+    # Null until the first full sync finishes, and again after Google expires it
+    sync_token: Mapped[str | None] = mapped_column(Text)
+    synced_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True))
+    # Recurring entries are expanded up to here; the window slides forward daily
+    expanded_until: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True))
+
+    def __repr__(self) -> str:
+        return f"<CalendarSource {self.id} {self.summary!r}>"
+
+
+class CalendarEntry(Base):
+    __tablename__ = "calendar_entries"
+    __table_args__ = (
+        UniqueConstraint("calendar_id", "event_id", name="uq_calendar_entries_calendar_event"),
+        # Exceptions are looked up by their series when it is expanded
+        Index("ix_calendar_entries_series", "calendar_id", "recurring_event_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    calendar_id: Mapped[str] = mapped_column(
+        String(255), ForeignKey("calendar_sources.id", ondelete="CASCADE")
+    )
+    event_id: Mapped[str] = mapped_column(String(1024))
+    status: Mapped[str] = mapped_column(String(16), default="confirmed")
+    summary: Mapped[str] = mapped_column(Text, default="")
+    description: Mapped[str] = mapped_column(Text, default="")
+    location: Mapped[str] = mapped_column(Text, default="")
+    html_link: Mapped[str] = mapped_column(Text, default="")
+    organizer: Mapped[str] = mapped_column(Text, default="")
+    all_day: Mapped[bool] = mapped_column(Boolean, default=False)
+    # "Show as available": not counted as busy time
+    transparent: Mapped[bool] = mapped_column(Boolean, default=False)
+    # The user's own attendee responseStatus; "declined" is not busy time.
+    # Null when the user isn't listed as an attendee (e.g. their own events)
+    response_status: Mapped[str | None] = mapped_column(String(16))
+    start_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True))
+    end_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True))
+    # IANA zone the series repeats in (wall-clock times survive DST changes)
+    time_zone: Mapped[str | None] = mapped_column(String(64))
+    recurrence: Mapped[list[str] | None] = mapped_column(JSON)
+    recurring_event_id: Mapped[str | None] = mapped_column(String(1024))
+    # For exceptions: the series occurrence this one replaces
+    original_start_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True))
+
+    def __repr__(self) -> str:
+        return f"<CalendarEntry {self.calendar_id}/{self.event_id} {self.summary!r}>"
+
+
+class CalendarOccurrence(Base):
+    __tablename__ = "calendar_occurrences"
+    __table_args__ = (
+        # Range queries: starts before the window ends, ends after it starts
+        Index("ix_calendar_occurrences_start_at", "start_at"),
+        Index("ix_calendar_occurrences_end_at", "end_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    entry_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("calendar_entries.id", ondelete="CASCADE"), index=True
+    )
+    start_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True))
+    end_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True))
+
+    def __repr__(self) -> str:
+        return f"<CalendarOccurrence entry={self.entry_id} {self.start_at}>"
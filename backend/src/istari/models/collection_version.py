@@ -0,0 +1,63 @@
+"""Per-collection version counters backing the list endpoints' ETags.
+
+One row per collection ("todos", "projects", "notifications", "digests"),
+bumped by the change-feed write hooks in the writing transaction, so a
+committed write is always visible as a new version. Readers compare versions
+instead of re-running list queries. Writers to the same collection serialize
+on its row until commit — fine for a single-user store.
+"""
+
+from collections.abc import Iterable
+
+from sqlalchemy import BigInteger, Connection, String, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from istari.models.base import Base
+
+
+class CollectionVersion(Base):
+    __tablename__ = "collection_versions"
+
+    name: Mapped[str] = mapped_column(String(32), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, default=0)
+
+    def __repr__(self) -> str:
+        return f"<CollectionVersion {self.name}={self.version}>"
+
+
+def bump_versions(conn: Connection, names: Iterable[str]) -> None:
+    """Increment the counters for ``names``, creating missing rows at 1."""
+    wanted = sorted(set(names))
+    if not wanted:
+        return
+    result = conn.execute(
+        update(CollectionVersion)
+        .where(CollectionVersion.name.in_(wanted))
+        .values(version=CollectionVersion.version + 1)
+    )
+    if result.rowcount == len(wanted):
+        return
+    # Rows are seeded by the migration; only a fresh schema gets here
+    existing = set(
+        conn.execute(
+            select(CollectionVersion.name).where(CollectionVersion.name.in_(wanted))
+        ).scalars()
+    )
+    conn.execute(
+        insert(CollectionVersion),
+        [{"name": name, "version": 1} for name in wanted if name not in existing],
+    )
+
+
+async def read_versions(session: AsyncSession, names: Iterable[str]) -> dict[str, int]:
+    """Current counters for ``names``; collections never written read as 0."""
+    wanted = sorted(set(names))
+    rows = await session.execute(
+        select(CollectionVersion.name, CollectionVersion.version).where(
+            CollectionVersion.name.in_(wanted)
+        )
+    )
+    versions = dict.fromkeys(wanted, 0)
+    versions.update({name: version for name, version in rows})
+    return versions
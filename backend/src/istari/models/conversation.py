@@ -2,7 +2,8 @@
 
 import datetime
 
-from sqlalchemy import DateTime, String, Text, func
+from sqlalchemy import Computed, DateTime, Index, String, Text, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 
 from istari.models.base import Base
@@ -10,6 +11,10 @@ from istari.models.base import Base
 
 class ConversationMessage(Base):
     __tablename__ = "conversation_messages"
+    __table_args__ = (
+        Index("ix_conversation_messages_created_at_id", "created_at", "id"),
+        Index("ix_conversation_messages_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     role: Mapped[str] = mapped_column(String(20))   # "user" or "assistant"
@@ -17,3 +22,9 @@ class ConversationMessage(Base):
     created_at: Mapped[datetime.datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
+    # Maintained by Postgres from content; only read by full-text search queries.
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('english', content)", persisted=True),
+        deferred=True,
+    )
@@ -0,0 +1,74 @@
+"""Local Gmail metadata mirror, kept current from Gmail's history API.
+
+MailMessage holds what listings and the digest show — no bodies. Label ids are
+kept as-is; the few the mirror filters on are also stored as flags so those
+filters can use plain indexes. MailSyncState is a single row holding the
+Gmail historyId the mirror is current to, when it last synced and whether it
+holds the whole mailbox.
+"""
+
+import datetime
+
+from sqlalchemy import JSON, Boolean, Computed, DateTime, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column
+
+from istari.models.base import Base
+
+# Kept in step with MailMessage.search_vector and the migration
+MAIL_SEARCH_DOCUMENT = (
+    "coalesce(subject, '') || ' ' || coalesce(sender, '') || ' ' || coalesce(snippet, '')"
+)
+
+
+class MailMessage(Base):
+    __tablename__ = "mail_messages"
+    __table_args__ = (
+        # Listings and search read newest first; unread listings filter first
+        Index("ix_mail_messages_received_at", "received_at"),
+        Index("ix_mail_messages_unread_received_at", "is_unread", "received_at"),
+        Index("ix_mail_messages_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)  # Gmail message id
+    thread_id: Mapped[str] = mapped_column(String(32), index=True)
+    sender: Mapped[str] = mapped_column(Text, default="")
+    subject: Mapped[str] = mapped_column(Text, default="")
+    snippet: Mapped[str] = mapped_column(Text, default="")
+    # Parsed Date header, as shown to the user
+    date: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True))
+    # Gmail's internalDate — the order Gmail lists messages in
+    received_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True))
+    labels: Mapped[list[str]] = mapped_column(JSON, default=list)
+    is_unread: Mapped[bool] = mapped_column(Boolean, default=False)
+    in_inbox: Mapped[bool] = mapped_column(Boolean, default=False)
+    # SPAM or TRASH: left out of listings and search, as Gmail does
+    is_hidden: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Set once the Gmail digest has reported the message
+    digested_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True))
+    # Maintained by Postgres; only read by full-text search queries.
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(f"to_tsvector('english', {MAIL_SEARCH_DOCUMENT})", persisted=True),
+        deferred=True,
+    )
+
+    def set_labels(self, labels: list[str]) -> None:
+        self.labels = sorted(set(labels))
+        self.is_unread = "UNREAD" in labels
+        self.in_inbox = "INBOX" in labels
+        self.is_hidden = "SPAM" in labels or "TRASH" in labels
+
+    def __repr__(self) -> str:
+        return f"<MailMessage {self.id} {self.subject!r}>"
+
+
+class MailSyncState(Base):
+    __tablename__ = "mail_sync_state"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)  # always 1
+    history_id: Mapped[str] = mapped_column(String(32))
+    synced_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True))
+    # True when the last full sync copied the whole mailbox; otherwise the
+    # mirror only covers mail received since its oldest message
+    complete: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -1,5 +1,6 @@
 """Memory model — explicit, inferred, and episodic memory types."""
 
+import datetime
 import enum
 
 from pgvector.sqlalchemy import Vector
@@ -24,7 +25,18 @@ class Memory(TimestampMixin, Base):
     )
     content: Mapped[str] = mapped_column(Text)
     confidence: Mapped[float] = mapped_column(Float, default=1.0)
-    last_referenced_at: Mapped[None] = mapped_column(DateTime(timezone=True), nullable=True)
-    last_contradicted_at: Mapped[None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_referenced_at: Mapped[datetime.datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    last_contradicted_at: Mapped[datetime.datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # Set when consolidation merges or evicts a memory; archived rows are never
+    # searched or injected into the prompt.
+    archived_at: Mapped[datetime.datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
     source: Mapped[str | None] = mapped_column(String(100))
-    embedding: Mapped[list[float] | None] = mapped_column(Vector(768))
+    # Deferred: recall ranks in pgvector or selects the column into the vector
+    # cache, so loading a Memory to show or inject it never needs the vector
+    embedding: Mapped[list[float] | None] = mapped_column(Vector(768), deferred=True)
@@ -0,0 +1,48 @@
+"""Semantic note index — local text/markdown files, chunked and embedded.
+
+NoteFile is one file under ``note_index_roots`` as last indexed: its mtime
+and size decide whether it needs reading again, and its content hash whether
+it needs re-chunking. NoteChunk is a run of whole lines of that file, with
+its embedding. A chunk's ``content_hash`` lets an edit re-use the vectors of
+chunks that did not change.
+"""
+
+import datetime
+
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from istari.models.base import Base
+
+
+class NoteFile(Base):
+    __tablename__ = "note_files"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    path: Mapped[str] = mapped_column(Text, unique=True)
+    mtime_ns: Mapped[int] = mapped_column(BigInteger)
+    size: Mapped[int] = mapped_column(BigInteger)
+    content_hash: Mapped[str] = mapped_column(String(64))
+    indexed_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True))
+
+    def __repr__(self) -> str:
+        return f"<NoteFile {self.path}>"
+
+
+class NoteChunk(Base):
+    __tablename__ = "note_chunks"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    file_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("note_files.id", ondelete="CASCADE"), index=True
+    )
+    start_line: Mapped[int] = mapped_column(Integer)  # 1-based, inclusive
+    end_line: Mapped[int] = mapped_column(Integer)
+    content: Mapped[str] = mapped_column(Text)
+    content_hash: Mapped[str] = mapped_column(String(64))
+    # Null until embedded; the indexer fills these in batches
+    embedding: Mapped[list[float] | None] = mapped_column(Vector(768), deferred=True)
+
+    def __repr__(self) -> str:
+        return f"<NoteChunk file={self.file_id} lines {self.start_line}-{self.end_line}>"
@@ -0,0 +1,209 @@
+"""Per-project todo aggregates, kept current by the ORM write paths.
+
+ProjectStats holds the figures project listings and the staleness check need,
+so neither has to scan todos. Rows are recomputed — never incremented — for
+the projects touched by each flush and by each ORM-enabled bulk INSERT/UPDATE/
+DELETE on todos, inside the same transaction. The recompute is one grouped
+query over the affected projects' todos (via ix_todos_project_id), so a missed
+write can only leave a row stale, never wrong forever: the project stats
+repair job recomputes everything and reports any drift.
+"""
+
+import datetime
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import (
+    Connection,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    delete,
+    event,
+    func,
+    insert,
+    inspect,
+    select,
+)
+from sqlalchemy.orm import Mapped, ORMExecuteState, Session, UOWTransaction, aliased, mapped_column
+
+from istari.models.base import Base
+from istari.models.project import Project
+from istari.models.todo import Todo, TodoStatus
+
+# Todo statuses whose recent updates keep a project from going stale
+_MOVING_STATUSES = (TodoStatus.OPEN, TodoStatus.IN_PROGRESS)
+
+
+class ProjectStats(Base):
+    __tablename__ = "project_stats"
+    __table_args__ = (
+        # get_stale: active projects whose newest open/in-progress update is old
+        Index("ix_project_stats_last_open_activity", "last_open_activity"),
+    )
+
+    project_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    open_count: Mapped[int] = mapped_column(Integer, default=0)
+    in_progress_count: Mapped[int] = mapped_column(Integer, default=0)
+    blocked_count: Mapped[int] = mapped_column(Integer, default=0)
+    # Newest updated_at over all of the project's todos, any status
+    last_activity: Mapped[datetime.datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # Newest updated_at over open and in-progress todos only
+    last_open_activity: Mapped[datetime.datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    next_action_status: Mapped[TodoStatus | None] = mapped_column(
+        Enum(TodoStatus, values_callable=lambda e: [m.value for m in e]),
+        nullable=True,
+    )
+
+    @property
+    def outstanding_count(self) -> int:
+        """Todos still to do: open, in progress, or blocked."""
+        return self.open_count + self.in_progress_count + self.blocked_count
+
+    def __repr__(self) -> str:
+        return f"<ProjectStats project_id={self.project_id} open={self.open_count}>"
+
+
+def _aggregate(project_ids: list[int] | None) -> Any:
+    """SELECT producing one ProjectStats row per project (all, or just these)."""
+    next_action = aliased(Todo)
+
+    def _count(status: TodoStatus) -> Any:
+        return func.count(Todo.id).filter(Todo.status == status)
+
+    stmt = (
+        select(
+            Project.id,
+            _count(TodoStatus.OPEN),
+            _count(TodoStatus.IN_PROGRESS),
+            _count(TodoStatus.BLOCKED),
+            func.max(Todo.updated_at),
+            func.max(Todo.updated_at).filter(Todo.status.in_(_MOVING_STATUSES)),
+            next_action.status,
+        )
+        .outerjoin(Todo, Todo.project_id == Project.id)
+        .outerjoin(next_action, next_action.id == Project.next_action_id)
+        .group_by(Project.id, next_action.status)
+    )
+    if project_ids is not None:
+        stmt = stmt.where(Project.id.in_(project_ids))
+    return stmt
+
+
+_COLUMNS = (
+    "project_id",
+    "open_count",
+    "in_progress_count",
+    "blocked_count",
+    "last_activity",
+    "last_open_activity",
+    "next_action_status",
+)
+
+
+def refresh_project_stats(conn: Connection, project_ids: Iterable[int] | None = None) -> None:
+    """Recompute stats rows for ``project_ids`` (every project when None)."""
+    ids = None if project_ids is None else sorted(set(project_ids))
+    if ids == []:
+        return
+    clear = delete(ProjectStats)
+    if ids is not None:
+        clear = clear.where(ProjectStats.project_id.in_(ids))
+    conn.execute(clear)
+    conn.execute(insert(ProjectStats).from_select(_COLUMNS, _aggregate(ids)))
+
+
+def diff_project_stats(conn: Connection) -> list[int]:
+    """Return ids of projects whose stored stats differ from a fresh recompute."""
+    expected = {row[0]: tuple(row) for row in conn.execute(_aggregate(None))}
+    stored = {
+        row[0]: tuple(row)
+        for row in conn.execute(select(*(getattr(ProjectStats, name) for name in _COLUMNS)))
+    }
+    return sorted(
+        pid for pid in expected.keys() | stored.keys()
+        if _normalized(expected.get(pid)) != _normalized(stored.get(pid))
+    )
+
+
+def _normalized(row: tuple[Any, ...] | None) -> tuple[Any, ...] | None:
+    # SQLite hands back naive datetimes and enum names; compare like for like
+    if row is None:
+        return None
+    return tuple(
+        v.replace(tzinfo=None) if isinstance(v, datetime.datetime)
+        else getattr(v, "value", v)
+        for v in row
+    )
+
+
+# ---------------------------------------------------------------------------
+# Write-path maintenance
+# ---------------------------------------------------------------------------
+
+
+def _affected_by_todo_ids(conn: Connection, todo_ids: set[int]) -> set[int]:
+    """Projects that own these todos or have one of them as next action."""
+    if not todo_ids:
+        return set()
+    owners = select(Todo.project_id).where(Todo.id.in_(todo_ids), Todo.project_id.is_not(None))
+    pointers = select(Project.id).where(Project.next_action_id.in_(todo_ids))
+    return {pid for pid in conn.execute(owners.union(pointers)).scalars() if pid is not None}
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context: UOWTransaction) -> None:
+    project_ids: set[int] = set()
+    todo_ids: set[int] = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Todo):
+            history = inspect(obj).attrs.project_id.history
+            project_ids.update(pid for pid in history.sum() if pid is not None)
+            if obj.id is not None:
+                todo_ids.add(obj.id)
+        elif isinstance(obj, Project) and obj.id is not None:
+            project_ids.add(obj.id)
+    if not project_ids and not todo_ids:
+        return
+    conn = session.connection()
+    refresh_project_stats(conn, project_ids | _affected_by_todo_ids(conn, todo_ids))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_bulk_todo_write(state: ORMExecuteState) -> Any:
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return None
+    if state.bind_mapper is None or state.bind_mapper.class_ is not Todo:
+        return None
+
+    conn = state.session.connection()
+    project_ids: set[int] = set()
+    todo_ids: set[int] = set()
+    statement: Any = state.statement
+    params: Any = state.parameters
+    rows: list[dict[str, Any]] = params if isinstance(params, list) else [params] if params else []
+
+    if state.is_insert:
+        # New todos cannot be anyone's next action yet; only their projects move
+        project_ids.update(r["project_id"] for r in rows if r.get("project_id") is not None)
+    elif statement.whereclause is not None:
+        todo_ids.update(conn.execute(select(Todo.id).where(statement.whereclause)).scalars())
+    else:
+        # UPDATE by primary key with a list of parameter sets
+        todo_ids.update(r["id"] for r in rows if "id" in r)
+
+    # Projects the rows belonged to before the statement...
+    project_ids |= _affected_by_todo_ids(conn, todo_ids)
+    result = state.invoke_statement()
+    # ...and after it, in case project_id itself was reassigned
+    project_ids |= _affected_by_todo_ids(conn, todo_ids)
+    refresh_project_stats(conn, project_ids)
+    return result
@@ -5,7 +5,20 @@ import enum
 from typing import TYPE_CHECKING
 
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import Boolean, Date, DateTime, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Boolean,
+    Computed,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    Text,
+    text,
+)
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -28,8 +41,53 @@ class PrioritySource(enum.StrEnum):
     USER_SET = "user_set"
 
 
+# Eisenhower quadrant as a sort key: 1 urgent+important, 2 important, 3 urgent,
+# 4 unclassified, 5 neither. Kept by the database so ORDER BY can use an index.
+QUADRANT_SQL = (
+    "CASE WHEN urgent AND important THEN 1 WHEN important THEN 2 WHEN urgent THEN 3 "
+    "WHEN urgent IS NULL AND important IS NULL THEN 4 ELSE 5 END"
+)
+
+
 class Todo(TimestampMixin, Base):
     __tablename__ = "todos"
+    # Partial-index predicates use literal statuses; TodoManager renders its
+    # status filters as literals too so the planner can match them.
+    __table_args__ = (
+        Index(
+            "ix_todos_prioritized",
+            "quadrant",
+            "priority",
+            "due_date",
+            text("created_at DESC"),
+            postgresql_where=text("status IN ('open', 'in_progress')"),
+        ),
+        Index(
+            "ix_todos_actionable_due_date",
+            "due_date",
+            postgresql_where=text(
+                "due_date IS NOT NULL AND status IN ('open', 'in_progress', 'blocked')"
+            ),
+        ),
+        Index(
+            "ix_todos_actionable_created_at",
+            text("created_at DESC"),
+            postgresql_where=text("status IN ('open', 'in_progress', 'blocked')"),
+        ),
+        Index(
+            "ix_todos_today_date",
+            "today_date",
+            postgresql_where=text("today_date IS NOT NULL"),
+        ),
+        # ProjectStats recompute for the projects touched by a write
+        Index("ix_todos_project_id", "project_id"),
+        # The classification queue is the (usually tiny) set of rows with this set
+        Index(
+            "ix_todos_classification_queue",
+            "id",
+            postgresql_where=text("classification_requested_at IS NOT NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(String(500))
@@ -44,14 +102,21 @@ class Todo(TimestampMixin, Base):
     )
     urgent: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
     important: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
+    quadrant: Mapped[int] = mapped_column(SmallInteger, Computed(QUADRANT_SQL, persisted=True))
     source: Mapped[str | None] = mapped_column(String(100))
     source_link: Mapped[str | None] = mapped_column(String(1000))
     due_date: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True))
     recurrence_rule: Mapped[str | None] = mapped_column(String(200), nullable=True)
     today_date: Mapped[datetime.date | None] = mapped_column(Date, nullable=True)
     last_prompted_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True))
+    # Set while queued for background Eisenhower classification; cleared once classified.
+    classification_requested_at: Mapped[datetime.datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
     tags: Mapped[list[str] | None] = mapped_column(ARRAY(String))
-    embedding: Mapped[list[float] | None] = mapped_column(Vector(768))
+    # Only the embedding backfill writes this and nothing reads it yet; deferred
+    # so every todo list and view doesn't load 768 floats per row
+    embedding: Mapped[list[float] | None] = mapped_column(Vector(768), deferred=True)
     project_id: Mapped[int | None] = mapped_column(
         Integer,
         ForeignKey("projects.id", ondelete="SET NULL"),
@@ -0,0 +1,294 @@
+"""Free/busy index — merged busy intervals, free slots and fitting todos into them.
+
+Busy time comes from the local event store while it is fresh and expanded far
+enough (one indexed range query), otherwise from Google's freeBusy API, or
+from EventKit on the Apple backend. The store counts what freeBusy counts:
+calendars shown in the user's list, minus invitations the user declined. BusyIndex sorts
+and merges it once; every query afterwards is a bisect plus a walk over only
+the intervals it returns, so months of events stay cheap to ask about.
+
+Free slots are cut from working-hours windows (``user_timezone``), and
+``fit_tasks`` places each task, earliest due date first, in the earliest
+slot long enough that still ends before the task is due.
+"""
+
+import bisect
+import datetime
+import logging
+import math
+import zoneinfo
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from istari.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Slot starts are rounded up to this, so suggestions read like 10:15, not 10:07
+_GRANULARITY = datetime.timedelta(minutes=5)
+_APPLE_MAX_EVENTS = 5000
+
+
+@dataclass(frozen=True, order=True)
+class Slot:
+    start: datetime.datetime
+    end: datetime.datetime
+
+    @property
+    def minutes(self) -> int:
+        return int((self.end - self.start).total_seconds() // 60)
+
+
+@dataclass(frozen=True)
+class WorkingHours:
+    """Daily working window in a time zone; ``days`` are weekdays, Monday = 0."""
+
+    start: datetime.time
+    end: datetime.time
+    days: frozenset[int]
+    tz: datetime.tzinfo
+
+    @classmethod
+    def from_settings(cls) -> "WorkingHours":
+        return cls(
+            start=datetime.time(settings.working_hours_start),
+            end=datetime.time(settings.working_hours_end),
+            days=frozenset(settings.working_days),
+            tz=user_zone(),
+        )
+
+    def windows(self, start: datetime.datetime, end: datetime.datetime) -> Iterator[Slot]:
+        """Working windows clipped to [start, end), in order, in UTC."""
+        day = start.astimezone(self.tz).date() - datetime.timedelta(days=1)
+        last = end.astimezone(self.tz).date()
+        while day <= last:
+            if day.weekday() in self.days:
+                # Built from wall-clock times, so DST days keep their hours
+                lo = datetime.datetime.combine(day, self.start, self.tz)
+                hi = datetime.datetime.combine(day, self.end, self.tz)
+                if hi <= lo:  # overnight shift
+                    hi += datetime.timedelta(days=1)
+                lo, hi = max(lo, start), min(hi, end)
+                if lo < hi:
+                    yield Slot(lo.astimezone(datetime.UTC), hi.astimezone(datetime.UTC))
+            day += datetime.timedelta(days=1)
+
+
+class BusyIndex:
+    """Busy intervals, merged and sorted once, for fast overlap and gap queries."""
+
+    def __init__(self, intervals: Iterable[tuple[datetime.datetime, datetime.datetime]]) -> None:
+        self._starts: list[datetime.datetime] = []
+        self._ends: list[datetime.datetime] = []
+        for start, end in sorted((_utc(s), _utc(e)) for s, e in intervals):
+            if end <= start:
+                continue
+            if self._ends and start <= self._ends[-1]:
+                self._ends[-1] = max(self._ends[-1], end)
+            else:
+                self._starts.append(start)
+                self._ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    @property
+    def intervals(self) -> list[Slot]:
+        return [Slot(s, e) for s, e in zip(self._starts, self._ends, strict=True)]
+
+    def busy_between(self, start: datetime.datetime, end: datetime.datetime) -> list[Slot]:
+        """Merged busy intervals overlapping [start, end), clipped to it."""
+        # Merged intervals are disjoint, so their ends are sorted too
+        i = bisect.bisect_right(self._ends, start)
+        found = []
+        while i < len(self._starts) and self._starts[i] < end:
+            found.append(Slot(max(self._starts[i], start), min(self._ends[i], end)))
+            i += 1
+        return found
+
+    def is_free(self, start: datetime.datetime, end: datetime.datetime) -> bool:
+        return not self.busy_between(start, end)
+
+    def free_slots(
+        self,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        working_hours: WorkingHours | None = None,
+        min_duration: datetime.timedelta = datetime.timedelta(),
+    ) -> list[Slot]:
+        """Gaps of at least ``min_duration`` in [start, end), within working hours if given."""
+        windows = working_hours.windows(start, end) if working_hours else [Slot(start, end)]
+        slots = []
+        for window in windows:
+            cursor = _round_up(window.start)
+            for busy in self.busy_between(window.start, window.end):
+                if busy.start - cursor >= max(min_duration, _GRANULARITY):
+                    slots.append(Slot(cursor, busy.start))
+                cursor = max(cursor, _round_up(busy.end))
+            if window.end - cursor >= max(min_duration, _GRANULARITY):
+                slots.append(Slot(cursor, window.end))
+        return slots
+
+
+@dataclass(frozen=True)
+class Task:
+    id: int
+    title: str
+    minutes: int
+    due: datetime.datetime | None = None
+
+
+@dataclass(frozen=True)
+class Placement:
+    task: Task
+    slot: Slot | None  # None: no free slot long enough before it is due
+
+
+def fit_tasks(tasks: Iterable[Task], slots: Iterable[Slot]) -> list[Placement]:
+    """Place tasks, earliest due first, each in the earliest free time that fits.
+
+    Placed time is taken out of the slot, so later tasks never overlap it.
+    """
+    free = sorted(slots)
+    placements = []
+    ordered = sorted(tasks, key=lambda t: (t.due is None, t.due or datetime.datetime.max))
+    for task in ordered:
+        need = datetime.timedelta(minutes=task.minutes)
+        placed: Slot | None = None
+        for i, slot in enumerate(free):
+            if slot.start + need > slot.end:
+                continue
+            if task.due is not None and slot.start + need > task.due:
+                break  # every later slot ends later still
+            placed = Slot(slot.start, slot.start + need)
+            free[i] = Slot(placed.end, slot.end)
+            break
+        placements.append(Placement(task, placed))
+    return placements
+
+
+@dataclass
+class SlotPlan:
+    start: datetime.datetime
+    end: datetime.datetime
+    busy: BusyIndex
+    slots: list[Slot]
+    placements: list[Placement] = field(default_factory=list)
+    source: str = ""  # "store", "google" or "apple"
+
+
+async def plan_slots(
+    session: AsyncSession | None,
+    days: int,
+    min_minutes: int,
+    tasks: list[Task] | None = None,
+    now: datetime.datetime | None = None,
+) -> SlotPlan:
+    """Free working-hours slots over the next ``days`` days, with ``tasks`` fitted in."""
+    start = _round_up(now or datetime.datetime.now(datetime.UTC))
+    end = start + datetime.timedelta(days=days)
+    busy, source = await load_busy_index(start, end, session)
+    slots = busy.free_slots(start, end, WorkingHours.from_settings())
+    shown = [s for s in slots if s.minutes >= min_minutes]
+    plan = SlotPlan(start=start, end=end, busy=busy, slots=shown, source=source)
+    if tasks:
+        # Short tasks may use gaps shorter than the listing threshold
+        plan.placements = fit_tasks(tasks, slots)
+    return plan
+
+
+async def load_busy_index(
+    start: datetime.datetime, end: datetime.datetime, session: AsyncSession | None = None
+) -> tuple[BusyIndex, str]:
+    """Busy time in [start, end) from the configured calendar backend, and its source.
+
+    Raises what the readers raise (FileNotFoundError without a token,
+    ImportError/PermissionError for EventKit).
+    """
+    if settings.calendar_backend == "apple":
+        from istari.tools.apple_calendar.reader import AppleCalendarReader
+
+        days = math.ceil((end - datetime.datetime.now(datetime.UTC)).total_seconds() / 86400)
+        events = await AppleCalendarReader().list_upcoming(
+            days=max(days, 1), max_results=_APPLE_MAX_EVENTS
+        )
+        intervals = [
+            (e.start, e.end)
+            for e in events
+            if not e.all_day
+            and isinstance(e.start, datetime.datetime)
+            and isinstance(e.end, datetime.datetime)
+        ]
+        return BusyIndex(intervals), "apple"
+
+    from istari.tools.calendar.reader import CalendarReader
+    from istari.tools.calendar.store import CalendarStore
+
+    if session is not None and settings.calendar_store_enabled:
+        store = CalendarStore(session)
+        expanded = await store.expanded_until()
+        if expanded is not None and expanded >= end and await store.is_fresh():
+            rows = await store.occurrences_between(start, end)
+            return BusyIndex((s, e) for s, e, _ in rows), "store"
+    reader = CalendarReader(settings.calendar_token_path)
+    return BusyIndex(await reader.free_busy(start, end)), "google"
+
+
+async def load_tasks(
+    session: AsyncSession, estimates: Iterable[tuple[int, int | None]]
+) -> tuple[list[Task], list[int]]:
+    """Tasks for (todo id, estimated minutes) pairs, and the ids that don't exist.
+
+    A missing estimate falls back to ``default_task_minutes``.
+    """
+    from istari.tools.todo.manager import TodoManager
+
+    mgr = TodoManager(session)
+    tasks: list[Task] = []
+    missing: list[int] = []
+    for todo_id, minutes in estimates:
+        todo = await mgr.get(todo_id)
+        if todo is None:
+            missing.append(todo_id)
+            continue
+        tasks.append(Task(
+            id=todo.id,
+            title=todo.title,
+            minutes=minutes or settings.default_task_minutes,
+            due=deadline(todo.due_date),
+        ))
+    return tasks, missing
+
+
+def user_zone() -> datetime.tzinfo:
+    try:
+        return zoneinfo.ZoneInfo(settings.user_timezone or "UTC")
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        logger.warning("Unknown user_timezone %r, using UTC", settings.user_timezone)
+        return datetime.UTC
+
+
+def deadline(due: datetime.datetime | None) -> datetime.datetime | None:
+    """When a todo must be done by: a date-only due date (midnight UTC) means end of that day."""
+    if due is None:
+        return None
+    due = _utc(due)
+    if due.time() == datetime.time():
+        next_day = due.date() + datetime.timedelta(days=1)
+        return datetime.datetime.combine(next_day, datetime.time(), user_zone())
+    return due
+
+
+def _round_up(value: datetime.datetime) -> datetime.datetime:
+    value = _utc(value)
+    step = _GRANULARITY.total_seconds()
+    seconds = math.ceil(value.timestamp() / step) * step
+    return datetime.datetime.fromtimestamp(seconds, datetime.UTC)
+
+
+def _utc(value: datetime.datetime) -> datetime.datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=datetime.UTC)
+    return value.astimezone(datetime.UTC)
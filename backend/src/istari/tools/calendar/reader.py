@@ -5,14 +5,27 @@ import datetime
 import logging
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, ClassVar
+from typing import TYPE_CHECKING, Any, ClassVar
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+
+from istari.tools.google.services import get_service
+
+if TYPE_CHECKING:
+    from istari.tools.calendar.store import CalendarStore
 
 logger = logging.getLogger(__name__)
 
+# events.list page size cap
+_PAGE_SIZE = 2500
+# freeBusy.query limits: calendars per request, and a span it reliably accepts
+_FREEBUSY_MAX_CALENDARS = 50
+_FREEBUSY_SPAN = datetime.timedelta(days=60)
+
+
+class SyncTokenExpiredError(Exception):
+    """Google invalidated a calendar's syncToken (410 Gone); resync it fully."""
+
 
 @dataclass
 class CalendarEvent:
@@ -33,11 +46,15 @@ class CalendarEventList:
 
 
 class CalendarReader:
-    """Read-only Google Calendar API wrapper. Requires a saved OAuth token."""
+    """Read-only Google Calendar API wrapper. Requires a saved OAuth token.
+
+    Given a ``store``, ``list_upcoming`` and ``search`` are answered from the
+    local event store while it is fresh, across every subscribed calendar.
+    """
 
     SCOPES: ClassVar[list[str]] = ["https://www.googleapis.com/auth/calendar.readonly"]
 
-    def __init__(self, token_path: str) -> None:
+    def __init__(self, token_path: str, store: "CalendarStore | None" = None) -> None:
         path = Path(token_path)
         logger.debug("CalendarReader: loading token from %s", path)
         if not path.exists():
@@ -46,13 +63,9 @@ class CalendarReader:
                 f"Calendar token not found at {path}. "
                 "Run: python scripts/setup_calendar.py"
             )
-        creds = Credentials.from_authorized_user_file(str(path), self.SCOPES)  # type: ignore[no-untyped-call]
-        if creds.expired and creds.refresh_token:
-            logger.info("CalendarReader: refreshing expired token")
-            creds.refresh(Request())
-            path.write_text(creds.to_json())
-        self._service = build("calendar", "v3", credentials=creds)
-        logger.info("CalendarReader: ready")
+        # Built once per process; refreshed credentials are written back to path
+        self._service = get_service("calendar", "v3", path, self.SCOPES)
+        self._store = store
 
     def _list_events_sync(
         self,
@@ -86,11 +99,95 @@ class CalendarReader:
         )
         return self._parse_event(event)
 
+    def _list_calendars_sync(self) -> list[dict[str, Any]]:
+        calendars: list[dict[str, Any]] = []
+        page_token: str | None = None
+        while True:
+            resp = self._service.calendarList().list(pageToken=page_token).execute()
+            calendars.extend(resp.get("items", []))
+            page_token = resp.get("nextPageToken")
+            if not page_token:
+                return calendars
+
+    def _list_changes_sync(
+        self, calendar_id: str, sync_token: str | None
+    ) -> tuple[list[dict[str, Any]], str]:
+        # Series stay unexpanded (singleEvents=False): the store expands them
+        params: dict[str, Any] = {
+            "calendarId": calendar_id, "maxResults": _PAGE_SIZE, "singleEvents": False,
+        }
+        if sync_token:
+            params["syncToken"] = sync_token
+        items: list[dict[str, Any]] = []
+        while True:
+            try:
+                resp = self._service.events().list(**params).execute()
+            except HttpError as exc:
+                if exc.status_code == 410:
+                    raise SyncTokenExpiredError(calendar_id) from exc
+                raise
+            items.extend(resp.get("items", []))
+            if "nextPageToken" not in resp:
+                return items, str(resp.get("nextSyncToken", ""))
+            params["pageToken"] = resp["nextPageToken"]
+
+    def _free_busy_sync(
+        self, start: datetime.datetime, end: datetime.datetime
+    ) -> list[tuple[datetime.datetime, datetime.datetime]]:
+        calendar_ids = [
+            c["id"] for c in self._list_calendars_sync()
+            if c.get("selected") or c.get("primary")
+        ][:_FREEBUSY_MAX_CALENDARS] or ["primary"]
+        busy: list[tuple[datetime.datetime, datetime.datetime]] = []
+        chunk_start = start
+        while chunk_start < end:
+            chunk_end = min(chunk_start + _FREEBUSY_SPAN, end)
+            body = {
+                "timeMin": chunk_start.isoformat(),
+                "timeMax": chunk_end.isoformat(),
+                "items": [{"id": cid} for cid in calendar_ids],
+            }
+            resp = self._service.freebusy().query(body=body).execute()
+            for calendar in resp.get("calendars", {}).values():
+                busy.extend(
+                    (
+                        datetime.datetime.fromisoformat(b["start"]),
+                        datetime.datetime.fromisoformat(b["end"]),
+                    )
+                    for b in calendar.get("busy", [])
+                )
+            chunk_start = chunk_end
+        return busy
+
+    async def free_busy(
+        self, start: datetime.datetime, end: datetime.datetime
+    ) -> list[tuple[datetime.datetime, datetime.datetime]]:
+        """Busy (start, end) intervals across the calendars shown in the user's list."""
+        logger.info("CalendarReader: free/busy %s → %s", start.isoformat(), end.isoformat())
+        return await asyncio.to_thread(self._free_busy_sync, start, end)
+
+    async def list_calendars(self) -> list[dict[str, Any]]:
+        """The user's calendar list entries (subscribed calendars)."""
+        return await asyncio.to_thread(self._list_calendars_sync)
+
+    async def list_changes(
+        self, calendar_id: str, sync_token: str | None
+    ) -> tuple[list[dict[str, Any]], str]:
+        """Raw events changed since ``sync_token`` (all of them when None) and the next token.
+
+        Raises SyncTokenExpiredError when Google no longer accepts the token.
+        """
+        return await asyncio.to_thread(self._list_changes_sync, calendar_id, sync_token)
+
     async def list_upcoming(
         self, days: int = 7, max_results: int = 20
     ) -> list[CalendarEvent]:
         """Return events starting within the next `days` days."""
         logger.info("CalendarReader: listing upcoming events (days=%d, max=%d)", days, max_results)
+        if self._store is not None and await self._store.is_fresh():
+            results = await self._store.list_upcoming(days, max_results)
+            logger.info("CalendarReader: list_upcoming served %d event(s) locally", len(results))
+            return results
         now = datetime.datetime.now(datetime.UTC)
         time_max = now + datetime.timedelta(days=days)
         results = await asyncio.to_thread(
@@ -105,6 +202,10 @@ class CalendarReader:
     async def search(self, query: str, max_results: int = 10) -> list[CalendarEvent]:
         """Search events by text query (searches title, description, location)."""
         logger.info("CalendarReader: searching query=%r (max=%d)", query, max_results)
+        if self._store is not None and await self._store.is_fresh():
+            results = await self._store.search(query, max_results)
+            logger.info("CalendarReader: search served %d event(s) locally", len(results))
+            return results
         now = datetime.datetime.now(datetime.UTC)
         results = await asyncio.to_thread(
             self._list_events_sync,
@@ -0,0 +1,505 @@
+"""Local Google Calendar store — every subscribed calendar, synced by syncToken.
+
+Each sync lists the user's calendars and asks each one only for the events
+that changed since its stored syncToken. A calendar is read in full only the
+first time or when Google answers 410 Gone for its token. Series are kept
+unexpanded as Google sends them and expanded here into CalendarOccurrence
+rows, from ``calendar_expand_past_days`` ago to ``calendar_expand_days``
+ahead. The window slides forward as the sync runs each day. Moved or
+cancelled instances (exceptions) replace the series occurrence they override.
+
+While every calendar has synced within ``calendar_store_max_age_minutes``,
+CalendarReader answers ``list_upcoming`` and ``search`` from here, which
+takes an indexed range query instead of an API round trip.
+"""
+
+import datetime
+import itertools
+import logging
+import re
+import zoneinfo
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from dateutil.rrule import rrulestr
+from sqlalchemy import delete, func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from istari.models.calendar_event import CalendarEntry, CalendarOccurrence, CalendarSource
+from istari.tools.calendar.reader import CalendarEvent, CalendarReader, SyncTokenExpiredError
+
+logger = logging.getLogger(__name__)
+
+# Runaway rules (e.g. FREQ=MINUTELY) stop here
+_MAX_OCCURRENCES_PER_SERIES = 5000
+_IN_CHUNK = 500
+_UNTIL = re.compile(r"UNTIL=(\d{8})(T\d{6})?Z?")
+
+
+@dataclass
+class CalendarSyncResult:
+    calendars: int = 0
+    full_syncs: list[str] = field(default_factory=list)
+    changed: int = 0
+
+
+class CalendarStore:
+    def __init__(
+        self,
+        session: AsyncSession,
+        max_age: datetime.timedelta | None = None,
+        expand_days: int | None = None,
+        expand_past_days: int | None = None,
+    ) -> None:
+        from istari.config.settings import settings
+
+        self.session = session
+        self.max_age = max_age or datetime.timedelta(
+            minutes=settings.calendar_store_max_age_minutes
+        )
+        self.expand_days = expand_days or settings.calendar_expand_days
+        self.expand_past_days = expand_past_days or settings.calendar_expand_past_days
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    async def sync(self, reader: CalendarReader) -> CalendarSyncResult:
+        """Bring every subscribed calendar up to date. Flushes; the caller commits."""
+        calendars = await reader.list_calendars()
+        listed = {c["id"]: c for c in calendars}
+        sources = {s.id: s for s in (await self.session.execute(select(CalendarSource))).scalars()}
+        for calendar_id in sources.keys() - listed.keys():
+            logger.info("CalendarStore: calendar %s unsubscribed, dropping it", calendar_id)
+            await self._clear_entries(calendar_id)
+            await self.session.delete(sources.pop(calendar_id))
+
+        result = CalendarSyncResult(calendars=len(listed))
+        now = datetime.datetime.now(datetime.UTC)
+        for calendar_id, info in listed.items():
+            source = sources.get(calendar_id)
+            if source is None:
+                source = CalendarSource(id=calendar_id)
+                self.session.add(source)
+            source.summary = info.get("summaryOverride") or info.get("summary", "")
+            source.time_zone = info.get("timeZone") or "UTC"
+            source.selected = bool(info.get("selected") or info.get("primary"))
+
+            try:
+                items, token = await reader.list_changes(calendar_id, source.sync_token)
+            except SyncTokenExpiredError:
+                logger.warning("CalendarStore: sync token for %s expired, resyncing", calendar_id)
+                source.sync_token = None
+                items, token = await reader.list_changes(calendar_id, None)
+            if source.sync_token is None:
+                # A full listing: anything stored but not listed is gone
+                await self._clear_entries(calendar_id)
+                result.full_syncs.append(calendar_id)
+            result.changed += await self._apply(source, items, now)
+            source.sync_token = token or None
+            source.synced_at = now
+        await self.session.flush()
+        logger.info(
+            "CalendarStore: synced %d calendar(s), %d change(s), full: %s",
+            result.calendars, result.changed, result.full_syncs or "none",
+        )
+        return result
+
+    async def _apply(
+        self, source: CalendarSource, items: list[dict[str, Any]], now: datetime.datetime
+    ) -> int:
+        existing: dict[str, CalendarEntry] = {}
+        ids = [item["id"] for item in items]
+        for start in range(0, len(ids), _IN_CHUNK):
+            rows = await self.session.execute(
+                select(CalendarEntry).where(
+                    CalendarEntry.calendar_id == source.id,
+                    CalendarEntry.event_id.in_(ids[start : start + _IN_CHUNK]),
+                )
+            )
+            existing.update((e.event_id, e) for e in rows.scalars())
+
+        series: set[str] = set()
+        singles: list[CalendarEntry] = []
+        for item in items:
+            entry = existing.get(item["id"])
+            if item.get("status") == "cancelled" and not item.get("recurringEventId"):
+                # A deleted event or whole series, with any exceptions to it
+                if entry is not None:
+                    await self._delete_entries([entry.id])
+                    existing.pop(item["id"])
+                await self._delete_exceptions(source.id, item["id"])
+                continue
+            if entry is None:
+                entry = CalendarEntry(calendar_id=source.id, event_id=item["id"])
+                self.session.add(entry)
+                existing[item["id"]] = entry
+            _fill(entry, item, source.time_zone)
+            if entry.recurring_event_id:
+                series.add(entry.recurring_event_id)
+            if entry.recurrence:
+                series.add(entry.event_id)
+            else:
+                singles.append(entry)
+        await self.session.flush()
+
+        for entry in singles:
+            await self._replace_occurrences(entry.id, _single_occurrence(entry))
+
+        window = self._window(now)
+        if source.expanded_until is None or _utc(source.expanded_until) < window[1] - _DAY:
+            # Slide the window: every series in this calendar is re-expanded
+            series |= set(
+                (
+                    await self.session.execute(
+                        select(CalendarEntry.event_id).where(
+                            CalendarEntry.calendar_id == source.id,
+                            CalendarEntry.recurrence.is_not(None),
+                        )
+                    )
+                ).scalars()
+            )
+            source.expanded_until = window[1]
+        for event_id in sorted(series):
+            await self._expand_series(source.id, event_id, *window)
+        return len(items)
+
+    async def _expand_series(
+        self,
+        calendar_id: str,
+        event_id: str,
+        after: datetime.datetime,
+        before: datetime.datetime,
+    ) -> None:
+        master = (
+            await self.session.execute(
+                select(CalendarEntry).where(
+                    CalendarEntry.calendar_id == calendar_id, CalendarEntry.event_id == event_id
+                )
+            )
+        ).scalar_one_or_none()
+        if master is None or not master.recurrence:
+            return  # exceptions synced before (or without) their series
+        overridden = {
+            _utc(start)
+            for start in (
+                await self.session.execute(
+                    select(CalendarEntry.original_start_at).where(
+                        CalendarEntry.calendar_id == calendar_id,
+                        CalendarEntry.recurring_event_id == event_id,
+                    )
+                )
+            ).scalars()
+            if start is not None
+        }
+        occurrences = [
+            (start, end)
+            for start, end in expand_series(master, after, before)
+            if start not in overridden
+        ]
+        await self._replace_occurrences(master.id, occurrences)
+
+    async def _replace_occurrences(
+        self, entry_id: int, occurrences: list[tuple[datetime.datetime, datetime.datetime]]
+    ) -> None:
+        await self.session.execute(
+            delete(CalendarOccurrence).where(CalendarOccurrence.entry_id == entry_id)
+        )
+        if occurrences:
+            await self.session.execute(
+                insert(CalendarOccurrence),
+                [{"entry_id": entry_id, "start_at": s, "end_at": e} for s, e in occurrences],
+            )
+
+    async def _delete_exceptions(self, calendar_id: str, event_id: str) -> None:
+        ids = (
+            await self.session.execute(
+                select(CalendarEntry.id).where(
+                    CalendarEntry.calendar_id == calendar_id,
+                    CalendarEntry.recurring_event_id == event_id,
+                )
+            )
+        ).scalars().all()
+        await self._delete_entries(list(ids))
+
+    async def _clear_entries(self, calendar_id: str) -> None:
+        ids = (
+            await self.session.execute(
+                select(CalendarEntry.id).where(CalendarEntry.calendar_id == calendar_id)
+            )
+        ).scalars().all()
+        await self._delete_entries(list(ids))
+
+    async def _delete_entries(self, ids: list[int]) -> None:
+        # Explicit rather than ON DELETE CASCADE, which SQLite skips by default
+        for start in range(0, len(ids), _IN_CHUNK):
+            chunk = ids[start : start + _IN_CHUNK]
+            await self.session.execute(
+                delete(CalendarOccurrence).where(CalendarOccurrence.entry_id.in_(chunk))
+            )
+            await self.session.execute(
+                delete(CalendarEntry)
+                .where(CalendarEntry.id.in_(chunk))
+                .execution_options(synchronize_session="fetch")
+            )
+
+    def _window(self, now: datetime.datetime) -> tuple[datetime.datetime, datetime.datetime]:
+        return (
+            now - datetime.timedelta(days=self.expand_past_days),
+            now + datetime.timedelta(days=self.expand_days),
+        )
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    async def is_fresh(self) -> bool:
+        """Whether every calendar has synced recently enough to answer reads."""
+        oldest, missing = (
+            await self.session.execute(
+                select(
+                    func.min(CalendarSource.synced_at),
+                    func.count().filter(CalendarSource.synced_at.is_(None)),
+                )
+            )
+        ).one()
+        if oldest is None or missing:
+            return False
+        return datetime.datetime.now(datetime.UTC) - _utc(oldest) <= self.max_age
+
+    async def expanded_until(self) -> datetime.datetime | None:
+        """How far ahead every calendar's series are expanded (None before a first sync)."""
+        until = (
+            await self.session.execute(select(func.min(CalendarSource.expanded_until)))
+        ).scalar_one_or_none()
+        return _utc(until) if until is not None else None
+
+    async def list_upcoming(self, days: int, max_results: int) -> list[CalendarEvent]:
+        now = datetime.datetime.now(datetime.UTC)
+        return await self._events(now, now + datetime.timedelta(days=days), [], max_results)
+
+    async def search(self, query: str, max_results: int) -> list[CalendarEvent]:
+        """Upcoming events whose title, description or location contain every word."""
+        conditions = [
+            or_(
+                CalendarEntry.summary.ilike(f"%{word}%"),
+                CalendarEntry.description.ilike(f"%{word}%"),
+                CalendarEntry.location.ilike(f"%{word}%"),
+            )
+            for word in query.split()
+        ]
+        now = datetime.datetime.now(datetime.UTC)
+        return await self._events(now, None, conditions, max_results)
+
+    async def occurrences_between(
+        self, start: datetime.datetime, end: datetime.datetime, include_transparent: bool = False
+    ) -> list[tuple[datetime.datetime, datetime.datetime, bool]]:
+        """(start, end, all_day) of every busy occurrence overlapping [start, end).
+
+        Counts what Google's freeBusy counts: calendars shown in the user's
+        list, without invitations the user declined.
+        """
+        stmt = (
+            select(CalendarOccurrence.start_at, CalendarOccurrence.end_at, CalendarEntry.all_day)
+            .join(CalendarEntry, CalendarEntry.id == CalendarOccurrence.entry_id)
+            .join(CalendarSource, CalendarSource.id == CalendarEntry.calendar_id)
+            .where(
+                CalendarOccurrence.end_at > start,
+                CalendarOccurrence.start_at < end,
+                CalendarSource.selected.is_(True),
+                or_(
+                    CalendarEntry.response_status.is_(None),
+                    CalendarEntry.response_status != "declined",
+                ),
+            )
+            .order_by(CalendarOccurrence.start_at)
+        )
+        if not include_transparent:
+            stmt = stmt.where(CalendarEntry.transparent.is_(False))
+        return [
+            (_utc(row.start_at), _utc(row.end_at), row.all_day)
+            for row in await self.session.execute(stmt)
+        ]
+
+    async def _events(
+        self,
+        start: datetime.datetime,
+        end: datetime.datetime | None,
+        conditions: list[Any],
+        limit: int,
+    ) -> list[CalendarEvent]:
+        stmt = (
+            select(CalendarEntry, CalendarOccurrence.start_at, CalendarOccurrence.end_at)
+            .join(CalendarEntry, CalendarEntry.id == CalendarOccurrence.entry_id)
+            .where(CalendarOccurrence.end_at > start, *conditions)
+            .order_by(CalendarOccurrence.start_at, CalendarOccurrence.id)
+            .limit(limit)
+        )
+        if end is not None:
+            stmt = stmt.where(CalendarOccurrence.start_at < end)
+        return [
+            _to_event(entry, _utc(s), _utc(e))
+            for entry, s, e in await self.session.execute(stmt)
+        ]
+
+
+# ---------------------------------------------------------------------------
+# Google event → entry, and series expansion
+# ---------------------------------------------------------------------------
+
+_DAY = datetime.timedelta(days=1)
+
+
+def _fill(entry: CalendarEntry, item: dict[str, Any], default_tz: str) -> None:
+    start_raw = item.get("start", {})
+    entry.status = item.get("status", "confirmed")
+    entry.summary = item.get("summary", "(no title)")
+    entry.description = item.get("description", "")
+    entry.location = item.get("location", "")
+    entry.html_link = item.get("htmlLink", "")
+    entry.organizer = item.get("organizer", {}).get("email", "")
+    entry.all_day = "date" in start_raw and "dateTime" not in start_raw
+    entry.transparent = item.get("transparency") == "transparent"
+    entry.response_status = next(
+        (a.get("responseStatus") for a in item.get("attendees", []) if a.get("self")), None
+    )
+    entry.start_at = _parse_time(start_raw)
+    entry.end_at = _parse_time(item.get("end", {}))
+    entry.time_zone = start_raw.get("timeZone") or default_tz
+    entry.recurrence = item.get("recurrence") or None
+    entry.recurring_event_id = item.get("recurringEventId")
+    entry.original_start_at = _parse_time(item.get("originalStartTime", {}))
+
+
+def _parse_time(raw: dict[str, Any]) -> datetime.datetime | None:
+    try:
+        if "dateTime" in raw:
+            return _utc(datetime.datetime.fromisoformat(raw["dateTime"]))
+        if "date" in raw:
+            day = datetime.date.fromisoformat(raw["date"])
+            return datetime.datetime.combine(day, datetime.time(), datetime.UTC)
+    except (ValueError, TypeError):
+        pass
+    return None
+
+
+def _single_occurrence(
+    entry: CalendarEntry,
+) -> list[tuple[datetime.datetime, datetime.datetime]]:
+    if entry.status == "cancelled" or entry.start_at is None:
+        return []
+    start = _utc(entry.start_at)
+    return [(start, _utc(entry.end_at) if entry.end_at is not None else start)]
+
+
+def expand_series(
+    entry: CalendarEntry, after: datetime.datetime, before: datetime.datetime
+) -> list[tuple[datetime.datetime, datetime.datetime]]:
+    """(start, end) of each occurrence of a series overlapping [after, before), in UTC.
+
+    Timed series repeat in their own time zone, so a 9:00 meeting stays at
+    9:00 local across DST changes. A rule that can't be parsed yields just
+    the first occurrence.
+    """
+    if entry.status == "cancelled" or entry.start_at is None:
+        return []
+    first = _utc(entry.start_at)
+    duration = (_utc(entry.end_at) - first) if entry.end_at is not None else datetime.timedelta()
+    try:
+        if entry.all_day:
+            # Floating dates: expand naive, at midnight UTC like stored all-day times
+            dtstart = first.replace(tzinfo=None)
+            lo, hi = (after - duration).replace(tzinfo=None), before.replace(tzinfo=None)
+            starts: Iterable[datetime.datetime] = (
+                s.replace(tzinfo=datetime.UTC)
+                for s in _occurrences(entry.recurrence or [], dtstart, lo, hi, aware=False)
+            )
+        else:
+            zone = _zone(entry.time_zone)
+            dtstart = first.astimezone(zone)
+            starts = (
+                s.astimezone(datetime.UTC)
+                for s in _occurrences(
+                    entry.recurrence or [], dtstart,
+                    (after - duration).astimezone(zone), before.astimezone(zone), aware=True,
+                )
+            )
+        return [(s, s + duration) for s in starts]
+    except (ValueError, TypeError, OverflowError):
+        logger.warning(
+            "CalendarStore: can't expand %s (%s); keeping the first occurrence",
+            entry.event_id, entry.recurrence,
+        )
+        return [(first, first + duration)] if after - duration <= first < before else []
+
+
+def _occurrences(
+    lines: list[str],
+    dtstart: datetime.datetime,
+    after: datetime.datetime,
+    before: datetime.datetime,
+    aware: bool,
+) -> list[datetime.datetime]:
+    rule = rrulestr("\n".join(_normalized(line, aware) for line in lines),
+                    dtstart=dtstart, forceset=True)
+    found = rule.xafter(after, count=_MAX_OCCURRENCES_PER_SERIES, inc=False)
+    return list(itertools.takewhile(lambda s: s < before, found))
+
+
+def _normalized(line: str, aware: bool) -> str:
+    # dateutil wants UNTIL in UTC for zoned series and floating for all-day
+    # ones; Google sends date-only, floating and UTC forms
+    if not line.startswith(("RRULE", "EXRULE")):
+        return line
+
+    def _fix(match: re.Match[str]) -> str:
+        day, time = match.groups()
+        if not aware:
+            return f"UNTIL={day}{time or ''}"
+        return f"UNTIL={day}{time or 'T235959'}Z"
+
+    return _UNTIL.sub(_fix, line)
+
+
+def _zone(name: str | None) -> datetime.tzinfo:
+    try:
+        return zoneinfo.ZoneInfo(name or "UTC")
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        return datetime.UTC
+
+
+def _utc(value: datetime.datetime) -> datetime.datetime:
+    # SQLite hands back naive datetimes; everything is stored in UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=datetime.UTC)
+    return value.astimezone(datetime.UTC)
+
+
+def _to_event(
+    entry: CalendarEntry, start: datetime.datetime, end: datetime.datetime
+) -> CalendarEvent:
+    event_id = entry.event_id
+    if entry.recurrence:
+        # Google's own instance id format
+        suffix = f"{start:%Y%m%d}" if entry.all_day else f"{start:%Y%m%dT%H%M%SZ}"
+        event_id = f"{entry.event_id}_{suffix}"
+    shown_start: datetime.datetime | datetime.date
+    shown_end: datetime.datetime | datetime.date
+    if entry.all_day:
+        shown_start, shown_end = start.date(), end.date()
+    else:
+        zone = _zone(entry.time_zone)
+        shown_start, shown_end = start.astimezone(zone), end.astimezone(zone)
+    return CalendarEvent(
+        id=event_id,
+        summary=entry.summary,
+        start=shown_start,
+        end=shown_end,
+        location=entry.location,
+        description=entry.description,
+        html_link=entry.html_link,
+        organizer=entry.organizer,
+        all_day=entry.all_day,
+    )
+
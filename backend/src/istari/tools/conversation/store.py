@@ -1,14 +1,31 @@
 """Conversation store — persist and load chat history across WebSocket reconnects."""
 
+import datetime
+from dataclasses import dataclass
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, Select, and_, func, literal, select, true
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from istari.models.conversation import ConversationMessage
 
 _HISTORY_LIMIT = 40
 
+_TS_CONFIG = "english"
+_HEADLINE_OPTIONS = "MaxWords=30, MinWords=10, MaxFragments=2, StartSel=**, StopSel=**"
+_EXCERPT_WORDS = 30
+
+
+@dataclass(frozen=True)
+class ConversationHit:
+    """A message matching a full-text search, with a highlighted snippet."""
+
+    id: int
+    role: str
+    created_at: datetime.datetime
+    snippet: str
+    rank: float
+
 
 class ConversationStore:
     """Load and save conversation turns to the DB."""
@@ -46,3 +63,86 @@ class ConversationStore:
         self.session.add(ConversationMessage(role="user", content=user_content))
         self.session.add(ConversationMessage(role="assistant", content=assistant_content))
         await self.session.flush()
+
+    async def save_message(self, role: str, content: str) -> None:
+        """Persist a single message, e.g. a follow-up the assistant sends unprompted."""
+        self.session.add(ConversationMessage(role=role, content=content))
+        await self.session.flush()
+
+    # ------------------------------------------------------------------
+    # Full-text search (the GIN-indexed search_vector on PostgreSQL)
+    # ------------------------------------------------------------------
+
+    async def search(
+        self, query: str, limit: int = 20, before_id: int | None = None
+    ) -> list[ConversationHit]:
+        """Return matching messages newest-first, starting below ``before_id``.
+
+        Keyset pagination: pass the last hit's id as ``before_id`` for the next page.
+        """
+        stmt = self._match(query)
+        if before_id is not None:
+            stmt = stmt.where(ConversationMessage.id < before_id)
+        page = stmt.order_by(ConversationMessage.id.desc()).limit(limit).subquery()
+        return await self._with_snippets(page, query, page.c.id.desc())
+
+    async def search_ranked(self, query: str, limit: int = 5) -> list[ConversationHit]:
+        """Return the ``limit`` best-matching messages by ts_rank_cd."""
+        stmt = self._match(query)
+        rank = stmt.selected_columns.rank
+        page = stmt.order_by(rank.desc(), ConversationMessage.id.desc()).limit(limit).subquery()
+        return await self._with_snippets(page, query, page.c.rank.desc(), page.c.id.desc())
+
+    @property
+    def _full_text(self) -> bool:
+        return self.session.get_bind().dialect.name == "postgresql"
+
+    def _match(self, query: str) -> Select[Any]:
+        if self._full_text:
+            tsquery = func.websearch_to_tsquery(_TS_CONFIG, query)
+            rank: ColumnElement[Any] = func.ts_rank_cd(ConversationMessage.search_vector, tsquery)
+            condition: ColumnElement[bool] = ConversationMessage.search_vector.op("@@")(tsquery)
+        else:
+            # No full-text search elsewhere (the SQLite test database): every
+            # word must appear in the message, and all matches rank alike
+            rank = literal(0.0)
+            words = query.replace('"', " ").split()
+            condition = and_(true(), *(ConversationMessage.content.ilike(f"%{w}%") for w in words))
+        return select(
+            ConversationMessage.id,
+            ConversationMessage.role,
+            ConversationMessage.created_at,
+            ConversationMessage.content,
+            rank.label("rank"),
+        ).where(condition)
+
+    async def _with_snippets(
+        self, page: Any, query: str, *order_by: Any
+    ) -> list[ConversationHit]:
+        if self._full_text:
+            # ts_headline re-parses the whole message, so run it only on the page
+            tsquery = func.websearch_to_tsquery(_TS_CONFIG, query)
+            snippet = func.ts_headline(_TS_CONFIG, page.c.content, tsquery, _HEADLINE_OPTIONS)
+        else:
+            snippet = page.c.content
+        stmt = select(
+            page.c.id, page.c.role, page.c.created_at, snippet.label("snippet"), page.c.rank
+        ).order_by(*order_by)
+        result = await self.session.execute(stmt)
+        return [
+            ConversationHit(
+                id=row.id,
+                role=row.role,
+                created_at=row.created_at,
+                snippet=row.snippet if self._full_text else _excerpt(row.snippet),
+                rank=float(row.rank),
+            )
+            for row in result.all()
+        ]
+
+
+def _excerpt(content: str) -> str:
+    """The first ``_EXCERPT_WORDS`` words, standing in for ts_headline's snippet."""
+    words = content.split()
+    text = " ".join(words[:_EXCERPT_WORDS])
+    return text + " ..." if len(words) > _EXCERPT_WORDS else text
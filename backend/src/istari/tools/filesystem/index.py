@@ -0,0 +1,447 @@
+"""Persistent trigram index over the text files under the configured roots.
+
+The index is a single SQLite file (``fs_index_path``). It uses SQLite rather
+than Postgres because it indexes the disk of whichever machine runs the app,
+and FTS5's trigram tokenizer gives indexed, case-insensitive substring
+matching. Each file has a metadata row (path, extension, mtime, size). Text
+files also have their first ``fs_index_max_file_bytes`` in the FTS table.
+
+``refresh`` walks each root with ``os.scandir``. It prunes .git,
+node_modules, hidden directories and anything a .gitignore excludes. A file
+is re-read only when its mtime or size changed, and files gone from disk are
+dropped, so a refresh over an unchanged tree costs one stat per file. The
+fs_index job runs it every few minutes; searches for a directory inside an
+indexed root are answered from here. Each hit is re-checked against the
+disk before it is returned, so an edit since the last refresh can't return
+a stale match.
+"""
+
+import contextlib
+import fnmatch
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Directories never worth indexing, whatever the .gitignore files say
+SKIP_DIRS = frozenset({
+    ".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv",
+    ".tox", ".mypy_cache", ".pytest_cache", ".ruff_cache", ".cache", ".Trash",
+})
+# Bytes read to decide whether a file is binary
+SNIFF_BYTES = 8192
+_BATCH = 500
+_PREVIEW_LEN = 120
+# Added to a file's bm25 score when the query is in its name
+_NAME_BOOST = 1.0
+# The part of files.path after the last separator (bound to os.sep)
+_BASENAME = "substr(f.path, length(rtrim(f.path, replace(f.path, ?, ''))) + 1)"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    ext TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    is_text INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS roots (
+    path TEXT PRIMARY KEY,
+    scanned_at REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS contents USING fts5(
+    body, tokenize = 'trigram case_sensitive 0'
+);
+"""
+
+
+@dataclass(frozen=True)
+class IndexHit:
+    path: str
+    preview: str
+    rank: float
+
+
+@dataclass
+class RefreshResult:
+    scanned: int = 0
+    indexed: int = 0
+    removed: int = 0
+    seconds: float = 0.0
+
+
+def is_binary(head: bytes) -> bool:
+    """A NUL byte in the first block means binary, as git and grep decide."""
+    return b"\x00" in head
+
+
+def find_preview(text: str, needle: str) -> str | None:
+    """The first line containing ``needle`` (lower-cased), trimmed, or None."""
+    pos = text.lower().find(needle)
+    if pos < 0:
+        return None
+    start = text.rfind("\n", 0, pos) + 1
+    end = text.find("\n", pos)
+    return text[start : end if end >= 0 else len(text)].strip()[:_PREVIEW_LEN]
+
+
+class _IgnoreRules:
+    """The subset of .gitignore patterns a scan can apply cheaply.
+
+    Name globs (``*.log``, ``build/``) apply at any depth below their file;
+    patterns with a slash are anchored to it. Negations (``!keep.log``) are
+    not supported, so such files stay out of the index.
+    """
+
+    def __init__(self, rules: tuple[tuple[str, str, bool, bool], ...] = ()) -> None:
+        self._rules = rules  # (base dir, pattern, dirs only, anchored)
+
+    def child(self, directory: str) -> "_IgnoreRules":
+        try:
+            with open(os.path.join(directory, ".gitignore"), encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except (OSError, UnicodeDecodeError):
+            return self
+        added = []
+        for raw in lines:
+            line = raw.strip()
+            if not line or line.startswith(("#", "!")):
+                continue
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            anchored = "/" in line
+            added.append((directory, line.lstrip("/"), dir_only, anchored))
+        return _IgnoreRules(self._rules + tuple(added)) if added else self
+
+    def ignored(self, path: str, name: str, is_dir: bool) -> bool:
+        for base, pattern, dir_only, anchored in self._rules:
+            if dir_only and not is_dir:
+                continue
+            target = os.path.relpath(path, base) if anchored else name
+            if fnmatch.fnmatchcase(target, pattern):
+                return True
+        return False
+
+
+def walk_files(root: str) -> Iterator[os.DirEntry[str]]:
+    """Regular files under ``root``, pruning skipped, hidden and git-ignored paths.
+
+    Symlinks are not followed.
+    """
+    stack: list[tuple[str, _IgnoreRules]] = [(root, _IgnoreRules().child(root))]
+    while stack:
+        directory, rules = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if is_dir:
+                    if entry.name in SKIP_DIRS or entry.name.startswith("."):
+                        continue
+                    if not rules.ignored(entry.path, entry.name, True):
+                        stack.append((entry.path, rules.child(entry.path)))
+                elif entry.is_file(follow_symlinks=False):
+                    if not rules.ignored(entry.path, entry.name, False):
+                        yield entry
+            except OSError:
+                continue
+
+
+class FileIndex:
+    """Trigram content index in one SQLite file. Safe to share between threads."""
+
+    def __init__(self, path: str | Path, max_file_bytes: int | None = None) -> None:
+        from istari.config.settings import settings
+
+        self.path = Path(path)
+        self.max_file_bytes = max_file_bytes or settings.fs_index_max_file_bytes
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread; WAL lets the worker refresh while the API reads
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    def refresh(self, roots: Iterable[str]) -> RefreshResult:
+        """Bring the index up to date with every root; roots no longer listed are dropped."""
+        began = time.perf_counter()
+        result = RefreshResult()
+        wanted = [str(Path(r).expanduser().resolve()) for r in roots]
+        conn = self._connect()
+        for (old,) in conn.execute("SELECT path FROM roots").fetchall():
+            if old not in wanted:
+                result.removed += self._drop_under(old)
+                conn.execute("DELETE FROM roots WHERE path = ?", (old,))
+        for root in wanted:
+            if os.path.isdir(root):
+                self._refresh_root(root, result)
+        result.seconds = time.perf_counter() - began
+        logger.info(
+            "FileIndex: scanned %d file(s), indexed %d, removed %d in %.1fs",
+            result.scanned, result.indexed, result.removed, result.seconds,
+        )
+        return result
+
+    def _refresh_root(self, root: str, result: RefreshResult) -> None:
+        conn = self._connect()
+        lo, hi = _prefix_range(root)
+        known = {
+            path: (mtime_ns, size)
+            for path, mtime_ns, size in conn.execute(
+                "SELECT path, mtime_ns, size FROM files WHERE path >= ? AND path < ?", (lo, hi)
+            )
+        }
+        seen: set[str] = set()
+        changed: list[tuple[str, os.stat_result]] = []
+        for entry in walk_files(root):
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            result.scanned += 1
+            seen.add(entry.path)
+            if known.get(entry.path) != (st.st_mtime_ns, st.st_size):
+                changed.append((entry.path, st))
+                if len(changed) >= _BATCH:
+                    result.indexed += self._index_batch(changed)
+                    changed = []
+        result.indexed += self._index_batch(changed)
+
+        gone = [p for p in known if p not in seen]
+        for start in range(0, len(gone), _BATCH):
+            self._delete(gone[start : start + _BATCH])
+        result.removed += len(gone)
+        conn.execute(
+            "INSERT INTO roots (path, scanned_at) VALUES (?, ?) "
+            "ON CONFLICT(path) DO UPDATE SET scanned_at = excluded.scanned_at",
+            (root, time.time()),
+        )
+
+    def _index_batch(self, batch: list[tuple[str, os.stat_result]]) -> int:
+        if not batch:
+            return 0
+        conn = self._connect()
+        conn.execute("BEGIN")
+        try:
+            for path, st in batch:
+                body = self._read_text(path)
+                (file_id,) = conn.execute(
+                    "INSERT INTO files (path, ext, mtime_ns, size, is_text) "
+                    "VALUES (?, ?, ?, ?, ?) ON CONFLICT(path) DO UPDATE SET "
+                    "mtime_ns = excluded.mtime_ns, size = excluded.size, "
+                    "is_text = excluded.is_text RETURNING id",
+                    (path, _ext(path), st.st_mtime_ns, st.st_size, body is not None),
+                ).fetchone()
+                conn.execute("DELETE FROM contents WHERE rowid = ?", (file_id,))
+                if body is not None:
+                    conn.execute(
+                        "INSERT INTO contents (rowid, body) VALUES (?, ?)", (file_id, body)
+                    )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return len(batch)
+
+    def _read_text(self, path: str) -> str | None:
+        try:
+            with open(path, "rb") as f:
+                head = f.read(SNIFF_BYTES)
+                if is_binary(head):
+                    return None
+                raw = head + f.read(max(self.max_file_bytes - len(head), 0))
+        except OSError:
+            return None
+        return raw[: self.max_file_bytes].decode("utf-8", errors="replace")
+
+    def _delete(self, paths: list[str]) -> None:
+        conn = self._connect()
+        marks = ",".join("?" * len(paths))
+        conn.execute("BEGIN")
+        conn.execute(
+            f"DELETE FROM contents WHERE rowid IN (SELECT id FROM files WHERE path IN ({marks}))",
+            paths,
+        )
+        conn.execute(f"DELETE FROM files WHERE path IN ({marks})", paths)
+        conn.execute("COMMIT")
+
+    def _drop_under(self, root: str) -> int:
+        conn = self._connect()
+        lo, hi = _prefix_range(root)
+        paths = [
+            p for (p,) in conn.execute(
+                "SELECT path FROM files WHERE path >= ? AND path < ?", (lo, hi)
+            )
+        ]
+        for start in range(0, len(paths), _BATCH):
+            self._delete(paths[start : start + _BATCH])
+        return len(paths)
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def covers(self, directory: str | Path) -> bool:
+        """Whether ``directory`` lies inside a root that has been scanned."""
+        target = str(Path(directory).expanduser().resolve())
+        for (root,) in self._connect().execute("SELECT path FROM roots"):
+            if target == root or target.startswith(root.rstrip(os.sep) + os.sep):
+                return True
+        return False
+
+    def search(
+        self,
+        query: str,
+        directory: str | Path,
+        extensions: Iterable[str] = (),
+        max_results: int = 10,
+    ) -> list[IndexHit]:
+        """Best-ranked files under ``directory`` containing ``query`` (case-insensitive).
+
+        Ranked by FTS5's bm25(), with a boost when the query is in the file
+        name; SQLite sorts the matches and only a page of them is read back,
+        so file bodies are touched only for the hits returned. Queries under
+        three characters can't use the trigram index: they are ranked on the
+        file name, then the most recently modified.
+        """
+        needle = query.lower()
+        if not needle.strip():
+            return []
+        lo, hi = _prefix_range(str(Path(directory).expanduser().resolve()))
+        params: list[object] = [os.sep, needle]
+        if len(needle) >= 3:
+            # A quoted trigram phrase is a substring match served by the index
+            score, match = "-bm25(contents)", "contents MATCH ?"
+            params.append('"' + query.replace('"', '""') + '"')
+        else:
+            score, match = "0.0", "contents.body LIKE ? ESCAPE '\\'"
+            params.append("%" + _escape_like(query) + "%")
+        sql = (
+            f"SELECT f.id, f.path, f.mtime_ns, f.size, {score} + {_NAME_BOOST} * "
+            f"(instr(lower({_BASENAME}), ?) > 0) AS score "
+            "FROM contents JOIN files f ON f.id = contents.rowid "
+            f"WHERE {match} AND f.path >= ? AND f.path < ?"
+        )
+        params += [lo, hi]
+        exts = sorted({e.lower().lstrip(".") for e in extensions if e})
+        if exts:
+            sql += f" AND f.ext IN ({','.join('?' * len(exts))})"
+            params += exts
+        sql += " ORDER BY score DESC, f.mtime_ns DESC LIMIT ? OFFSET ?"
+        page = max(2 * max_results, 20)
+        conn = self._connect()
+        hits: list[IndexHit] = []
+        offset = 0
+        while len(hits) < max_results:
+            rows = conn.execute(sql, [*params, page, offset]).fetchall()
+            for file_id, path, mtime_ns, size, rank in rows:
+                (body,) = conn.execute(
+                    "SELECT body FROM contents WHERE rowid = ?", (file_id,)
+                ).fetchone()
+                preview = self._verify(path, mtime_ns, size, body, needle)
+                if preview is None:
+                    continue
+                hits.append(IndexHit(path=path, preview=preview, rank=rank))
+                if len(hits) >= max_results:
+                    break
+            if len(rows) < page:
+                break
+            # Hits dropped as stale by _verify: read the next page
+            offset += page
+        return hits
+
+    def _verify(
+        self, path: str, mtime_ns: int, size: int, body: str, needle: str
+    ) -> str | None:
+        """Preview for a hit still true on disk; re-reads files changed since indexed."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if (st.st_mtime_ns, st.st_size) != (mtime_ns, size):
+            fresh = self._read_text(path)
+            if fresh is None:
+                return None
+            body = fresh
+        return find_preview(body, needle)
+
+    def stats(self) -> dict[str, int]:
+        conn = self._connect()
+        files, text = conn.execute(
+            "SELECT count(*), coalesce(sum(is_text), 0) FROM files"
+        ).fetchone()
+        return {"files": files, "text_files": text}
+
+
+_default: FileIndex | None = None
+_default_lock = threading.Lock()
+
+
+def get_file_index() -> FileIndex | None:
+    """The process-wide index at ``fs_index_path``, or None when disabled."""
+    from istari.config.settings import settings
+
+    global _default
+    if not settings.fs_index_enabled:
+        return None
+    with _default_lock:
+        if _default is None or _default.path != Path(settings.fs_index_path):
+            try:
+                _default = FileIndex(settings.fs_index_path)
+            except (OSError, sqlite3.Error):
+                logger.exception("FileIndex: can't open %s", settings.fs_index_path)
+                return None
+        return _default
+
+
+def reset_file_index() -> None:
+    """Forget the process-wide index (tests, or after changing fs_index_path)."""
+    global _default
+    with _default_lock:
+        if _default is not None:
+            with contextlib.suppress(sqlite3.Error):
+                _default.close()
+        _default = None
+
+
+def _prefix_range(root: str) -> tuple[str, str]:
+    # Every path strictly below root sorts in [root/, root0): "0" follows "/"
+    base = root.rstrip(os.sep)
+    return base + os.sep, base + chr(ord(os.sep) + 1)
+
+
+def _ext(path: str) -> str:
+    return os.path.splitext(path)[1].lstrip(".").lower()
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
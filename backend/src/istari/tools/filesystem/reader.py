@@ -0,0 +1,187 @@
+"""Paged file reads — one window of a file, by byte offset or by line range.
+
+Nothing reads more than the page asked for plus one chunk. A line range is
+found by counting newlines chunk by chunk, so it costs one pass up to the
+start line but never holds more than a chunk of the skipped part. Whether a
+file is text is decided from its first ``SNIFF_BYTES`` (a NUL byte or
+invalid UTF-8 means binary), so a multi-GB log is never decoded whole.
+
+Pages are cut on UTF-8 character boundaries. Where a page stops short of
+the end of the file, it ends after the last complete line when that line
+ends in the second half of the page.
+"""
+
+import codecs
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from istari.tools.filesystem.index import SNIFF_BYTES, is_binary
+
+PAGE_BYTES = 8_000
+MAX_PAGE_BYTES = 64_000
+_CHUNK_BYTES = 64 * 1024
+
+
+class BinaryFileError(ValueError):
+    """The file does not look like UTF-8 text."""
+
+
+@dataclass(frozen=True)
+class FilePage:
+    text: str
+    start: int  # byte offset of the first byte shown
+    end: int  # byte offset just past the last byte shown
+    size: int  # total file size in bytes
+    first_line: int | None = None  # 1-based, when known
+    last_line: int | None = None  # inclusive
+
+    @property
+    def complete(self) -> bool:
+        """The page is the whole file."""
+        return self.start == 0 and self.end >= self.size
+
+    @property
+    def ends_on_line(self) -> bool:
+        """The page stops at a line boundary (or the end of the file)."""
+        return self.end >= self.size or self.text.endswith("\n")
+
+
+def read_range(path: str | Path, offset: int = 0, length: int = PAGE_BYTES) -> FilePage:
+    """Up to ``length`` bytes from ``offset``, decoded.
+
+    Raises BinaryFileError for binary files and OSError as ``open`` does.
+    """
+    length = min(max(length, 1), MAX_PAGE_BYTES)
+    with open(path, "rb") as f:
+        size = _check_text(f)
+        offset = min(max(offset, 0), size)
+        f.seek(offset)
+        data = f.read(length)
+
+    skip = _continuation_bytes(data)
+    cut = len(data)
+    if offset + cut < size:
+        cut = _line_cut(data, skip)
+    return _page(data[skip:cut], offset + skip, offset + cut, size, 1 if offset == 0 else None)
+
+
+def read_lines(
+    path: str | Path,
+    start_line: int = 1,
+    end_line: int | None = None,
+    max_bytes: int = PAGE_BYTES,
+) -> FilePage:
+    """Lines ``start_line`` through ``end_line`` (1-based, inclusive), at most ``max_bytes``.
+
+    A range past the end of the file gives an empty page at the end. Raises
+    BinaryFileError for binary files and OSError as ``open`` does.
+    """
+    max_bytes = min(max(max_bytes, 1), MAX_PAGE_BYTES)
+    start_line = max(start_line, 1)
+    with open(path, "rb") as f:
+        size = _check_text(f)
+        f.seek(0)
+        start, rest = _seek_line(f, start_line)
+        if start is None:
+            return FilePage(text="", start=size, end=size, size=size)
+
+        wanted = None if end_line is None else max(end_line - start_line + 1, 0)
+        data = bytearray(rest)
+        # Read only until the wanted lines are in, or the page is full
+        while len(data) <= max_bytes and (wanted is None or data.count(b"\n") < wanted):
+            chunk = f.read(_CHUNK_BYTES)
+            if not chunk:
+                break
+            data += chunk
+
+    cut = len(data)
+    if wanted is not None:
+        cut = _nth_newline(data, wanted, cut)
+    if cut > max_bytes:
+        cut = _line_cut(bytes(data[:max_bytes]), 0)
+    return _page(bytes(data[:cut]), start, start + cut, size, start_line)
+
+
+def _check_text(f: BinaryIO) -> int:
+    size = os.fstat(f.fileno()).st_size
+    head = f.read(SNIFF_BYTES)
+    if is_binary(head):
+        raise BinaryFileError(f"{f.name} appears to be binary")
+    try:
+        # Incremental: a character cut off at the end of the sniff is fine
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+    except UnicodeDecodeError as exc:
+        raise BinaryFileError(f"{f.name} appears to be binary") from exc
+    return size
+
+
+def _seek_line(f: BinaryIO, line: int) -> tuple[int | None, bytes]:
+    """Offset where ``line`` starts and the bytes read past it, or (None, b"") past EOF."""
+    pos = 0
+    newlines = line - 1
+    while True:
+        if newlines == 0:
+            return pos, b""
+        chunk = f.read(_CHUNK_BYTES)
+        if not chunk:
+            return None, b""
+        count = chunk.count(b"\n")
+        if count < newlines:
+            newlines -= count
+            pos += len(chunk)
+            continue
+        idx = _nth_newline(chunk, newlines, len(chunk))
+        rest = chunk[idx:] or f.read(1)
+        if not rest:
+            return None, b""  # the file ends right after the previous line
+        return pos + idx, rest
+
+
+def _nth_newline(data: bytes | bytearray, n: int, default: int) -> int:
+    """Offset just past the ``n``-th newline, or ``default`` if there are fewer."""
+    idx = -1
+    for _ in range(n):
+        idx = data.find(b"\n", idx + 1)
+        if idx < 0:
+            return default
+    return idx + 1
+
+
+def _continuation_bytes(data: bytes) -> int:
+    """Leading UTF-8 continuation bytes: a page starting mid-character skips them."""
+    skip = 0
+    while skip < min(len(data), 3) and data[skip] & 0xC0 == 0x80:
+        skip += 1
+    return skip
+
+
+def _line_cut(data: bytes, floor: int) -> int:
+    """Where to end a page that stops short of the end of the file."""
+    newline = data.rfind(b"\n", max(len(data) // 2, floor))
+    if newline >= 0:
+        return newline + 1
+    # No line break near the end: cut before any character split at the edge
+    for back in range(1, min(len(data) - floor, 4) + 1):
+        byte = data[-back]
+        if byte & 0xC0 != 0x80:  # found the last lead (or ASCII) byte
+            width = 1 if byte < 0x80 else 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+            return len(data) - back if width > back else len(data)
+    return len(data)
+
+
+def _page(data: bytes, start: int, end: int, size: int, first_line: int | None) -> FilePage:
+    text = data.decode("utf-8", errors="replace")
+    last_line = None
+    if first_line is not None and text:
+        last_line = first_line + text.count("\n") - (1 if text.endswith("\n") else 0)
+    return FilePage(
+        text=text,
+        start=start,
+        end=end,
+        size=size,
+        first_line=first_line if text else None,
+        last_line=last_line,
+    )
+
@@ -0,0 +1,213 @@
+"""Parallel content scan for directories the file index doesn't cover.
+
+The walk (``walk_files``: ``os.scandir``, pruning .git, node_modules,
+hidden and git-ignored directories) runs on the calling thread and hands
+files to a small thread pool. Each reader streams its file in fixed-size
+chunks and looks for the lower-cased needle with a bytes search. It gives
+up on a file whose first block looks binary and never reads past
+``max_file_bytes``. A file is read once, and the preview line is cut from
+the chunk the match was found in.
+
+Results come back in walk order, so the same tree always gives the same
+answers. The scan stops as soon as it has ``max_results`` matches, has
+read ``max_files`` files or runs out of ``time_budget`` seconds, and
+in-flight readers stop at their next chunk.
+"""
+
+import collections
+import concurrent.futures
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from istari.tools.filesystem.index import SNIFF_BYTES, is_binary, walk_files
+
+_CHUNK_BYTES = 256 * 1024
+_PREVIEW_LEN = 120
+# Carried into the next chunk so a line cut at a chunk boundary still previews whole
+_CARRY_BYTES = 4096
+# Files handed to a reader at a time; amortizes the pool's per-task overhead
+_BATCH_FILES = 32
+# Batches queued per reader thread; bounds memory and the work thrown away on early exit
+_QUEUE_PER_WORKER = 2
+
+
+@dataclass
+class ScanResult:
+    matches: list[tuple[str, str]] = field(default_factory=list)  # (path, preview line)
+    scanned: int = 0  # files read (until a match, the size cap or a binary sniff)
+    bytes_read: int = 0
+    timed_out: bool = False
+    seconds: float = 0.0
+
+
+def scan_text(
+    query: str,
+    directory: str = "~",
+    extensions: str = "",
+    max_files: int | None = None,
+    max_results: int = 10,
+    max_file_bytes: int | None = None,
+    time_budget: float | None = None,
+    workers: int | None = None,
+) -> ScanResult:
+    """Find files under ``directory`` whose text contains ``query`` (case-insensitive).
+
+    Limits not given come from the ``fs_scan_*`` settings.
+    """
+    from istari.config.settings import settings
+
+    max_files = max_files or settings.fs_scan_max_files
+    max_file_bytes = max_file_bytes or settings.fs_scan_max_file_bytes
+    budget = settings.fs_scan_time_budget_seconds if time_budget is None else time_budget
+    workers = max(workers or settings.fs_scan_workers, 1)
+
+    began = time.perf_counter()
+    result = ScanResult()
+    root = Path(directory).expanduser().resolve()
+    if not root.is_dir():
+        return result
+
+    ext_set = {e.strip().lstrip(".").lower() for e in extensions.split(",") if e.strip()}
+    deadline = time.monotonic() + budget
+    stop = threading.Event()
+    search = _Matcher(query, max_file_bytes, stop)
+    pending: collections.deque[concurrent.futures.Future[list[tuple[str, _FileScan]]]] = (
+        collections.deque()
+    )
+    batch: list[str] = []
+    pool = concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix="fs-scan")
+
+    def collect() -> bool:
+        """Take the oldest queued batch's results; False once the scan should stop."""
+        future = pending.popleft()
+        try:
+            scans = future.result(timeout=max(deadline - time.monotonic(), 0))
+        except TimeoutError:
+            result.timed_out = True
+            return False
+        for path, scan in scans:
+            result.scanned += 1
+            result.bytes_read += scan.bytes_read
+            if scan.preview is not None:
+                result.matches.append((path, scan.preview))
+                if len(result.matches) >= max_results:
+                    return False
+        return True
+
+    try:
+        submitted = 0
+        running = True
+        for entry in walk_files(str(root)):
+            if time.monotonic() >= deadline:
+                result.timed_out = True  # still collect what has already been read
+                break
+            if ext_set and Path(entry.name).suffix.lstrip(".").lower() not in ext_set:
+                continue
+            if submitted >= max_files:
+                break
+            batch.append(entry.path)
+            submitted += 1
+            if len(batch) < _BATCH_FILES:
+                continue
+            pending.append(pool.submit(search.batch, batch))
+            batch = []
+            # Take finished batches as they come, so a common needle stops
+            # the walk early; block only when the queue is full
+            while pending and (pending[0].done() or len(pending) >= workers * _QUEUE_PER_WORKER):
+                if not collect():
+                    running = False
+                    break
+            if not running:
+                break
+        if running and batch:
+            pending.append(pool.submit(search.batch, batch))
+        while running and pending:
+            running = collect()
+    finally:
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    result.seconds = time.perf_counter() - began
+    return result
+
+
+@dataclass(frozen=True)
+class _FileScan:
+    preview: str | None  # None: no match
+    bytes_read: int
+
+
+class _Matcher:
+    """Streams one file looking for the needle; called from the reader threads."""
+
+    def __init__(self, query: str, max_file_bytes: int, stop: threading.Event) -> None:
+        self.needle = query.lower()
+        self.max_file_bytes = max_file_bytes
+        self.stop = stop
+        self._find: Callable[[bytes], int]
+        if self.needle.isascii():
+            # ASCII bytes never occur inside a UTF-8 multibyte sequence, so
+            # bytes.lower() matches exactly what str.lower() would
+            encoded = self.needle.encode()
+            self._find = lambda buf: buf.lower().find(encoded)
+            self._overlap = max(len(encoded) - 1, 0)
+        else:
+            self._find = self._find_decoded
+            # Room for the needle plus a multibyte character split at the cut
+            self._overlap = len(self.needle.encode()) + 3
+
+    def batch(self, paths: list[str]) -> list[tuple[str, _FileScan]]:
+        return [(path, self(path)) for path in paths if not self.stop.is_set()]
+
+    def __call__(self, path: str) -> _FileScan:
+        read = 0
+        tail = b""
+        try:
+            # Unbuffered: every read is already a large block
+            with open(path, "rb", buffering=0) as f:
+                while read < self.max_file_bytes and not self.stop.is_set():
+                    want = min(_CHUNK_BYTES, self.max_file_bytes - read)
+                    chunk = f.read(want)
+                    if not chunk:
+                        break
+                    if read == 0 and is_binary(chunk[:SNIFF_BYTES]):
+                        return _FileScan(None, len(chunk))
+                    read += len(chunk)
+                    buf = tail + chunk
+                    pos = self._find(buf)
+                    if pos >= 0:
+                        return _FileScan(_line_at(buf, pos), read)
+                    if len(chunk) < want:
+                        break  # short read: end of file, no need to ask again
+                    tail = buf[_carry_from(buf, self._overlap) :]
+        except OSError:
+            pass
+        return _FileScan(None, read)
+
+    def _find_decoded(self, buf: bytes) -> int:
+        text = buf.decode("utf-8", errors="ignore").lower()
+        pos = text.find(self.needle)
+        if pos < 0:
+            return -1
+        # Back to a byte offset, approximately; any point on the matching line will do
+        return len(text[:pos].encode())
+
+
+def _carry_from(buf: bytes, overlap: int) -> int:
+    """Where the carried tail starts: the last line start, within limits.
+
+    At least ``overlap`` bytes are kept, so a needle across the cut is found.
+    """
+    floor = max(len(buf) - max(overlap, _CARRY_BYTES), 0)
+    line_start = max(buf.rfind(b"\n", floor) + 1, floor)
+    return max(min(line_start, len(buf) - overlap), 0)
+
+
+def _line_at(buf: bytes, pos: int) -> str:
+    start = buf.rfind(b"\n", 0, pos) + 1
+    end = buf.find(b"\n", pos)
+    line = buf[start : end if end >= 0 else len(buf)]
+    return line.decode("utf-8", errors="replace").strip()[:_PREVIEW_LEN]
@@ -1,23 +1,22 @@
 """Filesystem search tool — search local files by name, content, recency. Read-only."""
 
-from pathlib import Path
-
-_MAX_FILES = 500
-_PREVIEW_LEN = 120
+from istari.tools.filesystem.index import get_file_index
+from istari.tools.filesystem.scan import scan_text
 
 
 def search_text_in_files(
     query: str,
     directory: str = "~",
     extensions: str = "",
-    max_files: int = _MAX_FILES,
+    max_files: int | None = None,
     max_results: int = 10,
 ) -> list[tuple[str, str]]:
     """Search files under *directory* whose text content contains *query*.
 
     Returns a list of (file_path_str, preview_line) tuples, capped at
-    *max_results*.  Skips binary files silently.  Scans at most *max_files*
-    files to avoid runaway traversal.
+    *max_results*, in traversal order.  Skips binary files silently.  The
+    scan runs on a thread pool and stops early at *max_results*, at
+    *max_files* files or when the ``fs_scan_time_budget_seconds`` run out.
 
     Args:
         query: Case-insensitive substring to search for.
@@ -25,48 +24,30 @@ def search_text_in_files(
             the user's home directory.
         extensions: Comma-separated file extensions without dots, e.g.
             ``"md,txt,py"``.  Empty string means all files.
-        max_files: Hard scan limit to prevent runaway searches.
+        max_files: Hard scan limit to prevent runaway searches. Defaults to
+            ``fs_scan_max_files``.
         max_results: Maximum number of matching files to return.
     """
-    root = Path(directory).expanduser().resolve()
-    if not root.is_dir():
-        return []
-
-    ext_set: set[str] = set()
-    if extensions:
-        ext_set = {e.strip().lstrip(".").lower() for e in extensions.split(",") if e.strip()}
-
-    q_lower = query.lower()
-    matches: list[tuple[str, str]] = []
-    scanned = 0
-
-    for path in root.rglob("*"):
-        if scanned >= max_files:
-            break
-        if not path.is_file():
-            continue
-        if ext_set and path.suffix.lstrip(".").lower() not in ext_set:
-            continue
-
-        scanned += 1
-        try:
-            text = path.read_bytes()
-            decoded = text.decode("utf-8", errors="strict")
-        except (UnicodeDecodeError, OSError):
-            continue
-
-        if q_lower not in decoded.lower():
-            continue
+    result = scan_text(
+        query, directory, extensions, max_files=max_files, max_results=max_results
+    )
+    return result.matches
 
-        # Find the first matching line as a preview
-        preview = ""
-        for line in decoded.splitlines():
-            if q_lower in line.lower():
-                preview = line.strip()[:_PREVIEW_LEN]
-                break
 
-        matches.append((str(path), preview))
-        if len(matches) >= max_results:
-            break
+def search_files(
+    query: str,
+    directory: str = "~",
+    extensions: str = "",
+    max_results: int = 10,
+) -> list[tuple[str, str]]:
+    """Search like ``search_text_in_files``, from the file index where it can.
 
-    return matches
+    Directories inside an indexed root get ranked results from the whole
+    tree; anything else falls back to a bounded scan.
+    """
+    index = get_file_index()
+    if index is not None and index.covers(directory):
+        exts = [e.strip() for e in extensions.split(",") if e.strip()]
+        hits = index.search(query, directory, exts, max_results=max_results)
+        return [(h.path, h.preview) for h in hits]
+    return search_text_in_files(query, directory, extensions, max_results=max_results)
@@ -0,0 +1,421 @@
+"""Semantic search over local notes — text files chunked and embedded into pgvector.
+
+``NoteIndex.refresh`` walks ``note_index_roots`` (the same pruning walk as the
+trigram index) for ``note_index_extensions`` files. A file is re-read only
+when its mtime or size changed, and re-chunked only when its content hash
+did. Chunks are runs of whole lines, about ``note_chunk_chars`` long, that
+start at markdown headings and prefer to end at blank lines; each keeps its
+line range. A re-chunked file keeps the embedding of every chunk whose text
+is unchanged, so editing one section of a long note re-embeds one chunk.
+
+New chunks are written without vectors, then embedded ``note_embed_batch_size``
+at a time and committed per batch. If the embedding model is down the
+refresh stops there, and the next one picks up the chunks still missing. A
+batch the model rejects is retried chunk by chunk, and chunks that still fail
+are left for the next refresh rather than holding up the ones after them.
+
+``search`` embeds the query and returns the nearest chunks by cosine
+distance (the HNSW index on Postgres).
+"""
+
+import asyncio
+import datetime
+import hashlib
+import logging
+import math
+import os
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import ColumnElement, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from istari.config.settings import settings
+from istari.llm.router import embedding as generate_embedding
+from istari.llm.router import embedding_batch, is_unreachable
+from istari.models.note import NoteChunk, NoteFile
+from istari.tools.filesystem.index import SNIFF_BYTES, is_binary, walk_files
+
+logger = logging.getLogger(__name__)
+
+# Changed files read and written per round of statements (and per commit)
+_FILE_BATCH = 200
+
+
+@dataclass(frozen=True)
+class Chunk:
+    start_line: int  # 1-based, inclusive
+    end_line: int
+    content: str
+
+
+@dataclass(frozen=True)
+class NoteHit:
+    path: str
+    start_line: int
+    end_line: int
+    content: str
+    score: float  # cosine similarity, 1.0 = same direction
+
+
+@dataclass
+class NoteIndexResult:
+    scanned: int = 0
+    changed: int = 0  # files re-chunked
+    removed: int = 0
+    chunks: int = 0  # chunks written
+    reused: int = 0  # of those, embeddings carried over from the previous version
+    embedded: int = 0
+    failed: int = 0  # chunks left without a vector for the next run
+    seconds: float = 0.0
+
+
+def chunk_text(text: str, max_chars: int) -> list[Chunk]:
+    """Split ``text`` into runs of whole lines of about ``max_chars``.
+
+    A markdown heading always starts a new chunk, and a chunk past half its
+    size ends at the next blank line. A single line longer than
+    ``max_chars`` is cut into ``max_chars`` pieces, each a chunk of its own, so
+    no chunk is longer than ``max_chars``.
+    """
+    chunks: list[Chunk] = []
+    lines: list[tuple[int, str]] = []
+    size = 0
+
+    def flush() -> None:
+        nonlocal size
+        while lines and not lines[-1][1].strip():
+            lines.pop()
+        if lines:
+            content = "\n".join(line for _, line in lines)
+            chunks.append(Chunk(lines[0][0], lines[-1][0], content))
+        lines.clear()
+        size = 0
+
+    for number, line in enumerate(text.splitlines(), start=1):
+        if len(line) > max_chars:
+            flush()
+            for i in range(0, len(line), max_chars):
+                piece = line[i : i + max_chars]
+                if piece.strip():
+                    chunks.append(Chunk(number, number, piece))
+            continue
+        blank = not line.strip()
+        if lines and (line.startswith("#") or size + len(line) > max_chars):
+            flush()
+        if blank and not lines:
+            continue
+        lines.append((number, line))
+        size += len(line) + 1
+        if blank and size >= max_chars // 2:
+            flush()
+    flush()
+    return chunks
+
+
+async def _embed_one_by_one(
+    rows: Sequence[Any], texts: list[str]
+) -> tuple[list[dict[str, Any]], int, bool]:
+    """Embed a rejected batch one chunk at a time.
+
+    Returns the UPDATE parameters for the chunks that worked, how many the
+    model rejected, and False if it stopped being reachable part-way.
+    """
+    values: list[dict[str, Any]] = []
+    rejected = 0
+    for row, text in zip(rows, texts, strict=True):
+        try:
+            (vec,) = await embedding_batch([text])
+        except Exception as exc:
+            if is_unreachable(exc):
+                return values, rejected, False
+            logger.warning("Note index | skipping chunk id=%d of %s: %s", row.id, row.path, exc)
+            rejected += 1
+        else:
+            values.append({"id": row.id, "embedding": vec})
+    return values, rejected, True
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class NoteIndex:
+    """Chunk embeddings for the notes under the configured roots."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    async def refresh(self, roots: Iterable[str] | None = None) -> NoteIndexResult:
+        """Bring the index up to date with ``roots`` and embed what is missing.
+
+        Files no longer under any root are dropped. Commits as it goes.
+        """
+        began = time.perf_counter()
+        result = NoteIndexResult()
+        wanted = roots if roots is not None else settings.note_index_roots
+        on_disk = await asyncio.to_thread(_scan, wanted, settings.note_index_extensions)
+        result.scanned = len(on_disk)
+
+        stmt = select(
+            NoteFile.id, NoteFile.path, NoteFile.mtime_ns, NoteFile.size, NoteFile.content_hash
+        )
+        known = {row.path: row for row in await self.session.execute(stmt)}
+        gone = [row.id for path, row in known.items() if path not in on_disk]
+        if gone:
+            await self._delete_files(gone)
+            await self.session.commit()
+            result.removed = len(gone)
+
+        stale = [
+            (path, stat, known.get(path))
+            for path, stat in on_disk.items()
+            if path not in known or (known[path].mtime_ns, known[path].size) != stat
+        ]
+        for i in range(0, len(stale), _FILE_BATCH):
+            await self._apply(stale[i : i + _FILE_BATCH], result)
+            await self.session.commit()
+
+        result.embedded, result.failed = await self.embed_pending()
+        result.seconds = time.perf_counter() - began
+        return result
+
+    async def embed_pending(self, batch_size: int | None = None) -> tuple[int, int]:
+        """Embed chunks that have no vector, in id order; returns (embedded, left over).
+
+        Stops if the model can't be reached and leaves the rest for the next run.
+        A batch the model rejects is retried chunk by chunk; chunks that still
+        fail are skipped and retried on the next run.
+        """
+        batch_size = batch_size or settings.note_embed_batch_size
+        embedded = 0
+        skipped = 0
+        last_id = 0
+        while True:
+            rows = (
+                await self.session.execute(
+                    select(NoteChunk.id, NoteChunk.content, NoteFile.path)
+                    .join(NoteFile, NoteFile.id == NoteChunk.file_id)
+                    .where(NoteChunk.embedding.is_(None), NoteChunk.id > last_id)
+                    .order_by(NoteChunk.id)
+                    .limit(batch_size)
+                )
+            ).all()
+            if not rows:
+                return embedded, skipped
+            texts = [_embed_text(r.path, r.content) for r in rows]
+            try:
+                values = [
+                    {"id": r.id, "embedding": v}
+                    for r, v in zip(rows, await embedding_batch(texts), strict=True)
+                ]
+            except Exception as exc:
+                if is_unreachable(exc):
+                    logger.warning(
+                        "Note index | embedding batch after chunk id=%d failed; "
+                        "will resume next run",
+                        last_id, exc_info=True,
+                    )
+                    return embedded, await self._count_pending()
+                logger.warning(
+                    "Note index | batch after chunk id=%d rejected (%s); retrying one by one",
+                    last_id, exc,
+                )
+                values, rejected, reachable = await _embed_one_by_one(rows, texts)
+                skipped += rejected
+                if not reachable:
+                    if values:
+                        await self.session.execute(update(NoteChunk), values)
+                        await self.session.commit()
+                        embedded += len(values)
+                    return embedded, await self._count_pending()
+            if values:
+                await self.session.execute(update(NoteChunk), values)
+                await self.session.commit()
+                embedded += len(values)
+            last_id = rows[-1].id
+
+    async def _count_pending(self) -> int:
+        stmt = select(func.count()).select_from(NoteChunk).where(NoteChunk.embedding.is_(None))
+        return (await self.session.execute(stmt)).scalar_one()
+
+    async def _apply(
+        self, batch: list[tuple[str, tuple[int, int], Any]], result: NoteIndexResult
+    ) -> None:
+        """Re-read a batch of changed files and rewrite the ones whose text changed.
+
+        A handful of statements per batch, not per file: one read of the old
+        vectors, one chunk delete, one insert of new files, one update of
+        existing ones and one insert of all their chunks.
+        """
+        texts = await asyncio.to_thread(
+            lambda: [_read_text(path, settings.note_index_max_file_bytes) for path, _, _ in batch]
+        )
+        now = datetime.datetime.now(datetime.UTC)
+        unreadable: list[int] = []
+        touched: list[dict[str, Any]] = []
+        rewrite: list[tuple[dict[str, Any], str]] = []
+        for (path, (mtime_ns, size), old), text in zip(batch, texts, strict=True):
+            if text is None:  # binary or unreadable now
+                if old is not None:
+                    unreadable.append(old.id)
+                continue
+            digest = content_hash(text)
+            if old is not None and old.content_hash == digest:
+                touched.append({"id": old.id, "mtime_ns": mtime_ns, "size": size})
+                continue
+            values: dict[str, Any] = {
+                "path": path,
+                "mtime_ns": mtime_ns,
+                "size": size,
+                "content_hash": digest,
+                "indexed_at": now,
+            }
+            if old is not None:
+                values["id"] = old.id
+            rewrite.append((values, text))
+
+        if unreadable:
+            await self._delete_files(unreadable)
+            result.removed += len(unreadable)
+        if touched:
+            await self.session.execute(update(NoteFile), touched)
+        if not rewrite:
+            return
+
+        existing = [values for values, _ in rewrite if "id" in values]
+        previous: dict[tuple[int, str], Any] = {}
+        if existing:
+            ids = [values["id"] for values in existing]
+            rows = await self.session.execute(
+                select(NoteChunk.file_id, NoteChunk.content_hash, NoteChunk.embedding).where(
+                    NoteChunk.file_id.in_(ids), NoteChunk.embedding.is_not(None)
+                )
+            )
+            previous = {(r.file_id, r.content_hash): r.embedding for r in rows}
+            await self.session.execute(delete(NoteChunk).where(NoteChunk.file_id.in_(ids)))
+            await self.session.execute(update(NoteFile), existing)
+        new = [values for values, _ in rewrite if "id" not in values]
+        if new:
+            inserted = await self.session.execute(
+                insert(NoteFile).returning(NoteFile.id, sort_by_parameter_order=True), new
+            )
+            for values, file_id in zip(new, inserted.scalars(), strict=True):
+                values["id"] = file_id
+
+        chunks = []
+        for values, text in rewrite:
+            for chunk in chunk_text(text, settings.note_chunk_chars):
+                digest = content_hash(chunk.content)
+                chunks.append({
+                    "file_id": values["id"],
+                    "start_line": chunk.start_line,
+                    "end_line": chunk.end_line,
+                    "content": chunk.content,
+                    "content_hash": digest,
+                    "embedding": previous.get((values["id"], digest)),
+                })
+        if chunks:
+            await self.session.execute(insert(NoteChunk), chunks)
+        result.changed += len(rewrite)
+        result.chunks += len(chunks)
+        result.reused += sum(c["embedding"] is not None for c in chunks)
+
+    async def _delete_files(self, file_ids: list[int]) -> None:
+        # Chunks first: the SQLite test database does not cascade
+        await self.session.execute(delete(NoteChunk).where(NoteChunk.file_id.in_(file_ids)))
+        await self.session.execute(delete(NoteFile).where(NoteFile.id.in_(file_ids)))
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    async def search(
+        self, query: str, top_k: int = 5, directory: str | None = None
+    ) -> list[NoteHit]:
+        """The ``top_k`` chunks nearest to ``query``, optionally under ``directory``.
+
+        Raises whatever the embedding call raises.
+        """
+        vec = await generate_embedding(query)
+        conditions: list[ColumnElement[bool]] = [NoteChunk.embedding.is_not(None)]
+        if directory:
+            prefix = str(Path(directory).expanduser().resolve()).rstrip(os.sep) + os.sep
+            conditions.append(NoteFile.path.startswith(prefix, autoescape=True))
+        columns = (NoteFile.path, NoteChunk.start_line, NoteChunk.end_line, NoteChunk.content)
+
+        if self.session.get_bind().dialect.name == "postgresql":
+            distance = NoteChunk.embedding.cosine_distance(vec)
+            stmt = (
+                select(*columns, distance.label("distance"))
+                .join(NoteFile, NoteFile.id == NoteChunk.file_id)
+                .where(*conditions)
+                .order_by(distance)
+                .limit(top_k)
+            )
+            return [
+                NoteHit(r.path, r.start_line, r.end_line, r.content, 1.0 - float(r.distance))
+                for r in await self.session.execute(stmt)
+            ]
+
+        # No vector operators elsewhere (the SQLite test database): rank in Python
+        stmt = (
+            select(*columns, NoteChunk.embedding)
+            .join(NoteFile, NoteFile.id == NoteChunk.file_id)
+            .where(*conditions)
+        )
+        hits = [
+            NoteHit(r.path, r.start_line, r.end_line, r.content, _cosine(vec, r.embedding))
+            for r in await self.session.execute(stmt)
+        ]
+        hits.sort(key=lambda h: h.score, reverse=True)
+        return hits[:top_k]
+
+
+def _scan(roots: Iterable[str], extensions: Iterable[str]) -> dict[str, tuple[int, int]]:
+    """(mtime_ns, size) of every note file under ``roots``, by resolved path."""
+    exts = {"." + e.lower().lstrip(".") for e in extensions}
+    found: dict[str, tuple[int, int]] = {}
+    for root in roots:
+        resolved = Path(root).expanduser().resolve()
+        if not resolved.is_dir():
+            continue
+        for entry in walk_files(str(resolved)):
+            if os.path.splitext(entry.name)[1].lower() not in exts:
+                continue
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            found[entry.path] = (st.st_mtime_ns, st.st_size)
+    return found
+
+
+def _read_text(path: str, max_bytes: int) -> str | None:
+    try:
+        with open(path, "rb") as f:
+            data = f.read(max_bytes)
+    except OSError:
+        return None
+    if is_binary(data[:SNIFF_BYTES]):
+        return None
+    return data.decode("utf-8", errors="replace")
+
+
+def _embed_text(path: str, content: str) -> str:
+    # The file name often says what a note is about when its text doesn't
+    return f"{Path(path).stem}\n\n{content}"
+
+
+def _cosine(a: list[float], b: Iterable[float]) -> float:
+    b = list(b)
+    dot = sum(x * y for x, y in zip(a, b, strict=False))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
@@ -0,0 +1,121 @@
+"""Bounded plain-text extraction from Gmail message payloads.
+
+Gmail hands back each MIME part's body as base64url text. Only as much of it
+as the byte cap needs is decoded — a 5 MB newsletter costs the cap, not 5 MB.
+The first text/plain part wins; messages with only HTML fall back to a
+text rendering of their first text/html part, read up to a larger cap since
+markup is mostly tags. Attachments are never decoded.
+"""
+
+import base64
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import Any
+
+TRUNCATED = "\n[… truncated]"
+
+# Elements whose text is never shown
+_SKIP_TAGS = {"script", "style", "head", "title", "noscript", "template"}
+# Elements that start a new line when rendered
+_BLOCK_TAGS = {
+    "p", "div", "br", "tr", "li", "ul", "ol", "table", "section", "article",
+    "blockquote", "pre", "hr", "h1", "h2", "h3", "h4", "h5", "h6",
+}
+_CHARSET = re.compile(r"charset=\"?([\w.:-]+)", re.IGNORECASE)
+_SPACES = re.compile(r"[ \t\r\f\v]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+
+def extract_text(payload: dict[str, Any], max_bytes: int, html_max_bytes: int) -> str:
+    """Readable text of a message, at most about ``max_bytes`` of it."""
+    part = _find_part(payload, "text/plain")
+    if part is not None:
+        text, cut = decode_part(part, max_bytes)
+        return text + TRUNCATED if cut else text
+    part = _find_part(payload, "text/html")
+    if part is None:
+        return ""
+    html, html_cut = decode_part(part, html_max_bytes)
+    text = html_to_text(html)
+    if len(text.encode()) > max_bytes:
+        text = text.encode()[:max_bytes].decode("utf-8", errors="ignore")
+        html_cut = True
+    return text + TRUNCATED if html_cut else text
+
+
+def decode_part(part: dict[str, Any], max_bytes: int) -> tuple[str, bool]:
+    """Decode at most ``max_bytes`` of a part's body; also say whether it was cut."""
+    data: str = part.get("body", {}).get("data", "")
+    if not data:
+        return "", False
+    # 4 base64 characters carry 3 bytes; decode only the prefix we need
+    chars = -(-max_bytes // 3) * 4
+    raw = base64.urlsafe_b64decode(_padded(data[:chars]))
+    cut = len(data) > chars or len(raw) > max_bytes
+    raw = raw[:max_bytes]
+    try:
+        decoder = codecs.getincrementaldecoder(_charset(part))(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    # Not final: a multi-byte character split by the cap is dropped, not mangled
+    return decoder.decode(raw, final=not cut), cut
+
+
+def html_to_text(html: str) -> str:
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    text = "".join(parser.chunks)
+    lines = (_SPACES.sub(" ", line).strip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _find_part(payload: dict[str, Any], mime: str) -> dict[str, Any] | None:
+    if payload.get("filename"):
+        return None  # an attachment, whatever its type
+    part_mime = payload.get("mimeType", "")
+    if part_mime == mime and payload.get("body", {}).get("data"):
+        return payload
+    if part_mime.startswith("multipart/"):
+        for part in payload.get("parts", []):
+            found = _find_part(part, mime)
+            if found is not None:
+                return found
+    return None
+
+
+def _charset(part: dict[str, Any]) -> str:
+    for header in part.get("headers", []):
+        if header.get("name", "").lower() == "content-type":
+            match = _CHARSET.search(header.get("value", ""))
+            if match:
+                return match.group(1)
+    return "utf-8"
+
+
+def _padded(data: str) -> str:
+    return data + "=" * (-len(data) % 4)
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.chunks: list[str] = []
+        self._skipping = 0
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in _SKIP_TAGS:
+            self._skipping += 1
+        elif tag in _BLOCK_TAGS:
+            self.chunks.append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIP_TAGS:
+            self._skipping = max(0, self._skipping - 1)
+        elif tag in _BLOCK_TAGS:
+            self.chunks.append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if not self._skipping:
+            self.chunks.append(data)
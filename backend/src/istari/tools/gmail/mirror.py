@@ -0,0 +1,357 @@
+"""Local Gmail mirror — message metadata in Postgres, synced from history.list.
+
+The first sync (and any sync after Gmail has expired our starting point)
+copies the newest ``gmail_mirror_bootstrap_max`` messages. Every later sync
+asks Gmail only for what changed since the stored historyId: new messages are
+fetched in batches, deleted ones dropped, and label changes applied in place.
+
+While the mirror has synced within ``gmail_mirror_max_age_minutes``,
+GmailReader answers unread listings and the searches the mirror understands
+from here instead of the API. Unless the bootstrap copied the whole mailbox,
+the mirror only covers mail received since its oldest message. A search is
+then answered here only when ``newer_than`` limits it to that period, and
+unread listings go to Gmail, since older unread mail may be missing. The
+mirror only holds metadata, so free text matches subject, sender and
+snippet — not bodies. Anything else returns None and goes to Gmail.
+"""
+
+import datetime
+import logging
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import ColumnElement, and_, delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from istari.models.mail import MailMessage, MailSyncState
+from istari.tools.gmail.reader import EmailSummary, GmailReader, HistoryExpiredError
+
+logger = logging.getLogger(__name__)
+
+_STATE_ID = 1
+_TS_CONFIG = "english"
+
+# op:value, "quoted phrase", or bare word
+_TOKEN = re.compile(r'(\w+):("[^"]*"|\S+)|"([^"]*)"|(\S+)')
+_AGE = re.compile(r"(\d+)([dmy])")
+_AGE_DAYS = {"d": 1, "m": 30, "y": 365}
+# Bare words Gmail treats as syntax rather than text
+_SYNTAX = {"OR", "AND", "AROUND"}
+_DOCUMENT_COLUMNS = (MailMessage.subject, MailMessage.sender, MailMessage.snippet)
+
+
+@dataclass
+class MailSyncResult:
+    full: bool
+    added: int = 0
+    removed: int = 0
+    relabeled: int = 0
+
+
+class MailMirror:
+    def __init__(
+        self, session: AsyncSession, max_age: datetime.timedelta | None = None
+    ) -> None:
+        self.session = session
+        if max_age is None:
+            from istari.config.settings import settings
+
+            max_age = datetime.timedelta(minutes=settings.gmail_mirror_max_age_minutes)
+        self.max_age = max_age
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    async def sync(self, reader: GmailReader, bootstrap_max: int = 500) -> MailSyncResult:
+        """Bring the mirror up to date with Gmail. Flushes; the caller commits."""
+        state = await self.session.get(MailSyncState, _STATE_ID)
+        if state is None:
+            result = await self._full_sync(reader, bootstrap_max)
+        else:
+            try:
+                records, history_id = await reader.list_history(state.history_id)
+            except HistoryExpiredError:
+                logger.warning("MailMirror: history %s expired, resyncing", state.history_id)
+                result = await self._full_sync(reader, bootstrap_max)
+            else:
+                result = await self._apply_history(reader, records)
+                await self._save_state(history_id)
+        await self.session.flush()
+        logger.info(
+            "MailMirror: %s sync added=%d removed=%d relabeled=%d",
+            "full" if result.full else "incremental",
+            result.added, result.removed, result.relabeled,
+        )
+        return result
+
+    async def _full_sync(self, reader: GmailReader, bootstrap_max: int) -> MailSyncResult:
+        # Read the history id first: anything that changes while we list is
+        # replayed by the next incremental sync rather than lost
+        history_id = await reader.current_history_id()
+        ids = await reader.list_message_ids("", bootstrap_max)
+        messages = await reader.get_metadata(ids)
+        await self._upsert(messages)
+        kept = [m["id"] for m in messages]
+        result = await self.session.execute(
+            delete(MailMessage).where(MailMessage.id.not_in(kept))
+        )
+        await self._save_state(history_id, complete=len(ids) < bootstrap_max)
+        removed: int = result.rowcount  # type: ignore[attr-defined]
+        return MailSyncResult(full=True, added=len(messages), removed=removed)
+
+    async def _apply_history(
+        self, reader: GmailReader, records: list[dict[str, Any]]
+    ) -> MailSyncResult:
+        added: dict[str, None] = {}  # ordered set
+        deleted: set[str] = set()
+        label_ops: dict[str, list[tuple[bool, list[str]]]] = defaultdict(list)
+        for record in records:
+            for item in record.get("messagesAdded", []):
+                msg_id = item["message"]["id"]
+                added[msg_id] = None
+                deleted.discard(msg_id)
+            for item in record.get("messagesDeleted", []):
+                msg_id = item["message"]["id"]
+                deleted.add(msg_id)
+                added.pop(msg_id, None)
+            for key, adding in (("labelsAdded", True), ("labelsRemoved", False)):
+                for item in record.get(key, []):
+                    label_ops[item["message"]["id"]].append((adding, item.get("labelIds", [])))
+
+        # Fetched messages already carry their current labels
+        messages = await reader.get_metadata(list(added)) if added else []
+        await self._upsert(messages)
+        removed = 0
+        if deleted:
+            result = await self.session.execute(
+                delete(MailMessage).where(MailMessage.id.in_(deleted))
+            )
+            removed = result.rowcount  # type: ignore[attr-defined]
+
+        relabel_ids = [i for i in label_ops if i not in added and i not in deleted]
+        relabeled = 0
+        if relabel_ids:
+            rows = await self.session.execute(
+                select(MailMessage).where(MailMessage.id.in_(relabel_ids))
+            )
+            for message in rows.scalars():
+                labels = set(message.labels)
+                for adding, ids in label_ops[message.id]:
+                    labels = labels | set(ids) if adding else labels - set(ids)
+                message.set_labels(list(labels))
+                relabeled += 1
+        return MailSyncResult(full=False, added=len(messages), removed=removed, relabeled=relabeled)
+
+    async def _upsert(self, messages: list[dict[str, Any]]) -> None:
+        if not messages:
+            return
+        ids = [m["id"] for m in messages]
+        existing = {
+            m.id: m
+            for m in (
+                await self.session.execute(select(MailMessage).where(MailMessage.id.in_(ids)))
+            ).scalars()
+        }
+        for raw in messages:
+            summary = GmailReader._parse_summary(raw)
+            message = existing.get(summary.id)
+            if message is None:
+                message = MailMessage(id=summary.id)
+                self.session.add(message)
+            message.thread_id = summary.thread_id
+            message.sender = summary.sender
+            message.subject = summary.subject
+            message.snippet = summary.snippet
+            message.date = summary.date
+            message.received_at = _received_at(raw, summary.date)
+            message.set_labels(raw.get("labelIds", []))
+
+    async def _save_state(self, history_id: str, complete: bool | None = None) -> None:
+        """Record the sync; ``complete`` is only known after a full sync."""
+        now = datetime.datetime.now(datetime.UTC)
+        state = await self.session.get(MailSyncState, _STATE_ID)
+        if state is None:
+            state = MailSyncState(id=_STATE_ID, history_id=history_id, synced_at=now)
+            self.session.add(state)
+        else:
+            state.history_id = history_id
+            state.synced_at = now
+        if complete is not None:
+            state.complete = complete
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    async def is_fresh(self) -> bool:
+        """Whether the mirror has synced recently enough to answer reads."""
+        synced_at = (
+            await self.session.execute(
+                select(MailSyncState.synced_at).where(MailSyncState.id == _STATE_ID)
+            )
+        ).scalar_one_or_none()
+        if synced_at is None:
+            return False
+        if synced_at.tzinfo is None:
+            synced_at = synced_at.replace(tzinfo=datetime.UTC)
+        return datetime.datetime.now(datetime.UTC) - synced_at <= self.max_age
+
+    async def list_unread(self, limit: int) -> list[EmailSummary] | None:
+        """Unread messages newest first, or None if the mirror may be missing some."""
+        if not await self._covers(None):
+            return None
+        return await self._summaries([MailMessage.is_unread.is_(True)], limit)
+
+    async def search(self, query: str, limit: int) -> list[EmailSummary] | None:
+        """Messages matching a Gmail ``query``, or None if the mirror can't answer it.
+
+        The mirror can't answer operators it doesn't model, nor queries that
+        reach back past the mail it holds. ``is:unread`` alone does not limit
+        the period, because old mail can still be unread.
+        """
+        parsed = self._parse_query(query)
+        if parsed is None:
+            logger.debug("MailMirror: query %r needs Gmail", query)
+            return None
+        conditions, since = parsed
+        if not await self._covers(since):
+            logger.debug("MailMirror: query %r reaches past the mirror", query)
+            return None
+        return await self._summaries(conditions, limit)
+
+    async def _covers(self, since: datetime.datetime | None) -> bool:
+        """Whether the mirror holds every message received since ``since`` (None: ever)."""
+        complete = (
+            await self.session.execute(
+                select(MailSyncState.complete).where(MailSyncState.id == _STATE_ID)
+            )
+        ).scalar_one_or_none()
+        if complete:
+            return True
+        if since is None:
+            return False
+        oldest = _utc(
+            (await self.session.execute(select(func.min(MailMessage.received_at)))).scalar()
+        )
+        return oldest is not None and oldest <= since
+
+    async def list_undigested_unread(self, limit: int) -> list[EmailSummary]:
+        """Unread messages the Gmail digest hasn't reported yet, newest first."""
+        return await self._summaries(
+            [MailMessage.is_unread.is_(True), MailMessage.digested_at.is_(None)], limit
+        )
+
+    async def mark_digested(self, ids: list[str]) -> None:
+        if not ids:
+            return
+        await self.session.execute(
+            update(MailMessage)
+            .where(MailMessage.id.in_(ids))
+            .values(digested_at=datetime.datetime.now(datetime.UTC))
+        )
+
+    async def _summaries(
+        self, conditions: list[ColumnElement[bool]], limit: int
+    ) -> list[EmailSummary]:
+        stmt = (
+            select(
+                MailMessage.id,
+                MailMessage.thread_id,
+                MailMessage.subject,
+                MailMessage.sender,
+                MailMessage.snippet,
+                MailMessage.date,
+            )
+            .where(MailMessage.is_hidden.is_(False), *conditions)
+            .order_by(MailMessage.received_at.desc(), MailMessage.id.desc())
+            .limit(limit)
+        )
+        return [
+            EmailSummary(
+                id=row.id,
+                thread_id=row.thread_id,
+                subject=row.subject,
+                sender=row.sender,
+                snippet=row.snippet,
+                date=_utc(row.date),
+            )
+            for row in await self.session.execute(stmt)
+        ]
+
+    def _parse_query(
+        self, query: str
+    ) -> tuple[list[ColumnElement[bool]], datetime.datetime | None] | None:
+        """Conditions for ``query``, plus the period it is limited to.
+
+        Returns (conditions, newer_than cutoff or None), or None for syntax
+        the mirror doesn't model.
+        """
+        conditions: list[ColumnElement[bool]] = []
+        words: list[str] = []  # bare words and quoted phrases, unquoted
+        since: datetime.datetime | None = None
+        for match in _TOKEN.finditer(query):
+            op, value, phrase, word = match.groups()
+            if phrase is not None:
+                words.append(phrase)
+                continue
+            if word is not None:
+                if word in _SYNTAX or word[0] in "-({}" or word[-1] in ")}":
+                    return None
+                words.append(word)
+                continue
+            op = op.lower()
+            value = value.strip('"')
+            lowered = value.lower()
+            if op == "is" and lowered in ("unread", "read"):
+                conditions.append(MailMessage.is_unread.is_(lowered == "unread"))
+            elif op == "in" and lowered == "inbox":
+                conditions.append(MailMessage.in_inbox.is_(True))
+            elif op == "from":
+                conditions.append(MailMessage.sender.ilike(f"%{value}%"))
+            elif op == "subject":
+                conditions.append(MailMessage.subject.ilike(f"%{value}%"))
+            elif op in ("newer_than", "older_than") and (age := _AGE.fullmatch(lowered)):
+                cutoff = datetime.datetime.now(datetime.UTC) - datetime.timedelta(
+                    days=int(age.group(1)) * _AGE_DAYS[age.group(2)]
+                )
+                if op == "newer_than":
+                    conditions.append(MailMessage.received_at >= cutoff)
+                    since = cutoff if since is None else max(since, cutoff)
+                else:
+                    conditions.append(MailMessage.received_at < cutoff)
+            else:
+                return None
+        if words:
+            conditions.append(self._text_match(words))
+        return conditions, since
+
+    def _text_match(self, words: list[str]) -> ColumnElement[bool]:
+        if self.session.get_bind().dialect.name == "postgresql":
+            terms = " ".join(f'"{w}"' if " " in w else w for w in words)
+            tsquery = func.websearch_to_tsquery(_TS_CONFIG, terms)
+            return MailMessage.search_vector.op("@@")(tsquery)
+        # No full-text search elsewhere (the SQLite test database): every
+        # word must appear somewhere in the document
+        return and_(
+            *(
+                or_(*(column.ilike(f"%{w}%") for column in _DOCUMENT_COLUMNS))
+                for w in words
+            )
+        )
+
+
+def _received_at(raw: dict[str, Any], date: datetime.datetime | None) -> datetime.datetime:
+    internal = raw.get("internalDate")
+    if internal is not None:
+        return datetime.datetime.fromtimestamp(int(internal) / 1000, datetime.UTC)
+    return date or datetime.datetime.now(datetime.UTC)
+
+
+def _utc(value: datetime.datetime | None) -> datetime.datetime | None:
+    # SQLite hands back naive datetimes
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=datetime.UTC)
+    return value
@@ -1,20 +1,46 @@
 """Gmail reader tool — search inbox, list unread, fetch threads. Read-only."""
 
 import asyncio
-import base64
 import datetime
 import email.utils
 import logging
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+
+from istari.tools.gmail.mime import extract_text
+from istari.tools.google.services import get_service
+
+if TYPE_CHECKING:
+    from istari.tools.gmail.mirror import MailMirror
 
 logger = logging.getLogger(__name__)
 
+# Gmail accepts 100 calls per batch but throttles big ones; it recommends 50
+_BATCH_SIZE = 50
+# Per-message errors worth one more try; anything else drops the message
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+_RETRY_DELAY_SECONDS = 1.0
+_METADATA_HEADERS = ["Subject", "From", "Date"]
+# messages.list and history.list page size cap
+_PAGE_SIZE = 500
+# Per-message body caps: decoded text/plain, and text/html read for the fallback
+_BODY_MAX_BYTES = 32 * 1024
+_HTML_MAX_BYTES = 256 * 1024
+# Threads kept per process, and how long one is served without asking Gmail
+# whether it changed
+_THREAD_CACHE_SIZE = 64
+_THREAD_REVALIDATE_SECONDS = 60.0
+
+
+class HistoryExpiredError(Exception):
+    """The start historyId is older than Gmail keeps history for; resync fully."""
+
 
 @dataclass
 class EmailSummary:
@@ -42,10 +68,60 @@ class ThreadDetail:
     messages: list[ThreadMessage] = field(default_factory=list)
 
 
+@dataclass
+class _CachedThread:
+    history_id: str
+    detail: ThreadDetail
+    checked_at: float
+
+
+class _ThreadCache:
+    """Parsed threads keyed by thread id, valid while Gmail's historyId matches.
+
+    A thread's historyId moves whenever any of its messages is added,
+    deleted or relabeled. Shared by every reader in the process.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, _CachedThread] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, thread_id: str) -> _CachedThread | None:
+        with self._lock:
+            entry = self._entries.get(thread_id)
+            if entry is not None:
+                self._entries.move_to_end(thread_id)
+            return entry
+
+    def put(self, thread_id: str, history_id: str, detail: ThreadDetail) -> None:
+        with self._lock:
+            self._entries[thread_id] = _CachedThread(history_id, detail, time.monotonic())
+            self._entries.move_to_end(thread_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_thread_cache = _ThreadCache(_THREAD_CACHE_SIZE)
+
+
+def clear_thread_cache() -> None:
+    _thread_cache.clear()
+
+
 class GmailReader:
-    """Read-only Gmail API wrapper. Requires a saved OAuth token."""
+    """Read-only Gmail API wrapper. Requires a saved OAuth token.
 
-    def __init__(self, token_path: str) -> None:
+    Given a ``mirror``, ``list_unread`` and ``search`` are answered from the
+    local mail mirror while it is fresh and covers the request, and go to the
+    API otherwise — including searches the mirror finds nothing for.
+    """
+
+    def __init__(self, token_path: str, mirror: "MailMirror | None" = None) -> None:
         path = Path(token_path)
         logger.debug("GmailReader: loading token from %s", path)
         if not path.exists():
@@ -53,13 +129,9 @@ class GmailReader:
             raise FileNotFoundError(
                 f"Gmail token not found at {path}. Run: python scripts/setup_gmail.py"
             )
-        creds = Credentials.from_authorized_user_file(str(path))  # type: ignore[no-untyped-call]
-        if creds.expired and creds.refresh_token:
-            logger.info("GmailReader: refreshing expired token")
-            creds.refresh(Request())
-            path.write_text(creds.to_json())
-        self._service = build("gmail", "v1", credentials=creds)
-        logger.info("GmailReader: ready")
+        # Built once per process; refreshed credentials are written back to path
+        self._service = get_service("gmail", "v1", path)
+        self._mirror = mirror
 
     def _list_messages_sync(self, query: str, max_results: int) -> list[EmailSummary]:
         resp = (
@@ -68,37 +140,138 @@ class GmailReader:
             .list(userId="me", q=query, maxResults=max_results)
             .execute()
         )
-        messages = resp.get("messages", [])
-        if not messages:
+        ids = [m["id"] for m in resp.get("messages", [])]
+        if not ids:
             return []
+        found = self._get_metadata_sync(ids)
+        # Same order as the list call: newest first
+        return [self._parse_summary(found[i]) for i in ids if i in found]
+
+    def _get_metadata_sync(self, ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Fetch metadata for ``ids`` in batch requests, keyed by message id.
 
-        results: list[EmailSummary] = []
-        for msg_ref in messages:
-            msg = (
+        One HTTP round trip per ``_BATCH_SIZE`` messages. Messages whose call
+        fails with a retryable status get one more batch after a short delay;
+        messages that still fail, or fail otherwise (e.g. deleted since the
+        list call), are left out rather than failing the whole listing.
+        """
+        found: dict[str, dict[str, Any]] = {}
+        retry = self._fetch_batches_sync(list(dict.fromkeys(ids)), found, allow_retry=True)
+        if retry:
+            logger.info("GmailReader: retrying %d throttled message fetch(es)", len(retry))
+            time.sleep(_RETRY_DELAY_SECONDS)
+            self._fetch_batches_sync(retry, found, allow_retry=False)
+        return found
+
+    def _fetch_batches_sync(
+        self, ids: list[str], found: dict[str, dict[str, Any]], allow_retry: bool
+    ) -> list[str]:
+        """Add fetched messages to ``found``; return ids worth retrying."""
+        retry: list[str] = []
+
+        def _collect(request_id: str, response: Any, exception: Exception | None) -> None:
+            if exception is None:
+                found[request_id] = response
+            elif allow_retry and _status(exception) in _RETRYABLE_STATUS:
+                retry.append(request_id)
+            else:
+                logger.warning("GmailReader: skipping message %s (%s)", request_id, exception)
+
+        for start in range(0, len(ids), _BATCH_SIZE):
+            batch = self._service.new_batch_http_request(callback=_collect)
+            for msg_id in ids[start : start + _BATCH_SIZE]:
+                batch.add(
+                    self._service.users().messages().get(
+                        userId="me", id=msg_id, format="metadata",
+                        metadataHeaders=_METADATA_HEADERS,
+                    ),
+                    request_id=msg_id,
+                )
+            batch.execute()
+        return retry
+
+    def _list_ids_sync(self, query: str, max_results: int) -> list[str]:
+        ids: list[str] = []
+        page_token: str | None = None
+        while len(ids) < max_results:
+            resp = (
                 self._service.users()
                 .messages()
-                .get(userId="me", id=msg_ref["id"], format="metadata",
-                     metadataHeaders=["Subject", "From", "Date"])
+                .list(
+                    userId="me", q=query, pageToken=page_token,
+                    maxResults=min(_PAGE_SIZE, max_results - len(ids)),
+                )
                 .execute()
             )
-            results.append(self._parse_summary(msg))
-        return results
+            ids.extend(m["id"] for m in resp.get("messages", []))
+            page_token = resp.get("nextPageToken")
+            if not page_token:
+                break
+        return ids[:max_results]
+
+    def _get_history_id_sync(self) -> str:
+        profile = self._service.users().getProfile(userId="me").execute()
+        return str(profile["historyId"])
+
+    def _list_history_sync(self, start_history_id: str) -> tuple[list[dict[str, Any]], str]:
+        records: list[dict[str, Any]] = []
+        page_token: str | None = None
+        while True:
+            try:
+                resp = (
+                    self._service.users()
+                    .history()
+                    .list(
+                        userId="me", startHistoryId=start_history_id,
+                        pageToken=page_token, maxResults=_PAGE_SIZE,
+                    )
+                    .execute()
+                )
+            except HttpError as exc:
+                if exc.status_code == 404:
+                    raise HistoryExpiredError(start_history_id) from exc
+                raise
+            records.extend(resp.get("history", []))
+            page_token = resp.get("nextPageToken")
+            if not page_token:
+                return records, str(resp.get("historyId", start_history_id))
 
     def _get_thread_sync(self, thread_id: str) -> ThreadDetail:
+        cached = _thread_cache.get(thread_id)
+        if cached is not None:
+            if time.monotonic() - cached.checked_at < _THREAD_REVALIDATE_SECONDS:
+                return cached.detail
+            # A few bytes instead of every message body
+            current = (
+                self._service.users()
+                .threads()
+                .get(userId="me", id=thread_id, format="minimal", fields="historyId")
+                .execute()
+            )
+            if str(current.get("historyId", "")) == cached.history_id:
+                cached.checked_at = time.monotonic()
+                return cached.detail
+
         thread = (
             self._service.users()
             .threads()
             .get(userId="me", id=thread_id, format="full")
             .execute()
         )
+        detail = self._parse_thread(thread_id, thread)
+        _thread_cache.put(thread_id, str(thread.get("historyId", "")), detail)
+        return detail
+
+    @staticmethod
+    def _parse_thread(thread_id: str, thread: dict[str, Any]) -> ThreadDetail:
         messages: list[ThreadMessage] = []
         subject = ""
         for msg in thread.get("messages", []):
             headers = {h["name"]: h["value"] for h in msg.get("payload", {}).get("headers", [])}
             if not subject:
                 subject = headers.get("Subject", "(no subject)")
-            date = self._parse_date(headers.get("Date"))
-            body = self._extract_body(msg.get("payload", {}))
+            date = GmailReader._parse_date(headers.get("Date"))
+            body = GmailReader._extract_body(msg.get("payload", {}))
             messages.append(ThreadMessage(
                 id=msg["id"],
                 sender=headers.get("From", ""),
@@ -110,17 +283,51 @@ class GmailReader:
 
     async def list_unread(self, max_results: int = 20) -> list[EmailSummary]:
         logger.info("GmailReader: listing unread (max=%d)", max_results)
+        if self._mirror is not None and await self._mirror.is_fresh():
+            mirrored = await self._mirror.list_unread(max_results)
+            # None: the mirror is a partial copy that may miss older unread mail
+            if mirrored is not None:
+                logger.info(
+                    "GmailReader: list_unread served %d message(s) from mirror", len(mirrored)
+                )
+                return mirrored
         results = await asyncio.to_thread(self._list_messages_sync, "is:unread", max_results)
         logger.info("GmailReader: list_unread returned %d message(s)", len(results))
         return results
 
     async def search(self, query: str, max_results: int = 20) -> list[EmailSummary]:
         logger.info("GmailReader: searching query=%r (max=%d)", query, max_results)
+        if self._mirror is not None and await self._mirror.is_fresh():
+            mirrored = await self._mirror.search(query, max_results)
+            # Nothing found locally may still be in the bodies Gmail searches
+            if mirrored:
+                logger.info("GmailReader: search served %d message(s) from mirror", len(mirrored))
+                return mirrored
         results = await asyncio.to_thread(self._list_messages_sync, query, max_results)
         logger.info("GmailReader: search returned %d message(s)", len(results))
         return results
 
+    async def list_message_ids(self, query: str, max_results: int) -> list[str]:
+        """Ids of messages matching ``query``, newest first, across result pages."""
+        return await asyncio.to_thread(self._list_ids_sync, query, max_results)
+
+    async def get_metadata(self, ids: list[str]) -> list[dict[str, Any]]:
+        """Raw metadata-format messages for ``ids`` in that order, minus any that failed."""
+        found = await asyncio.to_thread(self._get_metadata_sync, ids)
+        return [found[i] for i in ids if i in found]
+
+    async def current_history_id(self) -> str:
+        return await asyncio.to_thread(self._get_history_id_sync)
+
+    async def list_history(self, start_history_id: str) -> tuple[list[dict[str, Any]], str]:
+        """History records since ``start_history_id`` and the historyId they bring us to.
+
+        Raises HistoryExpiredError when Gmail no longer has history that far back.
+        """
+        return await asyncio.to_thread(self._list_history_sync, start_history_id)
+
     async def get_thread(self, thread_id: str) -> ThreadDetail:
+        """Fetch and parse a thread; unchanged threads are served from the cache."""
         logger.info("GmailReader: fetching thread %s", thread_id)
         return await asyncio.to_thread(self._get_thread_sync, thread_id)
 
@@ -148,15 +355,12 @@ class GmailReader:
 
     @staticmethod
     def _extract_body(payload: dict[str, Any]) -> str:
-        """Extract plain text body from a message payload, handling multipart."""
-        mime = payload.get("mimeType", "")
-        if mime == "text/plain":
-            data = payload.get("body", {}).get("data", "")
-            if data:
-                return base64.urlsafe_b64decode(data).decode("utf-8", errors="replace")
-        if mime.startswith("multipart/"):
-            for part in payload.get("parts", []):
-                text = GmailReader._extract_body(part)
-                if text:
-                    return text
-        return ""
+        """Plain text body of a message payload, capped at _BODY_MAX_BYTES.
+
+        Falls back to a text rendering of the HTML part for HTML-only mail.
+        """
+        return extract_text(payload, _BODY_MAX_BYTES, _HTML_MAX_BYTES)
+
+
+def _status(exc: Exception) -> int | None:
+    return exc.status_code if isinstance(exc, HttpError) else None
@@ -0,0 +1,136 @@
+"""Process-wide Google API service cache shared by the Gmail and Calendar readers.
+
+Building a service used to cost a token-file read, a possible refresh and
+rewrite, and a parse of the discovery document on every tool call. Here each
+(API, token file) pair is built once per process:
+
+- Discovery documents come from the static copies bundled with
+  google-api-python-client, parsed once, so startup never touches the network.
+- Credentials are refreshed proactively, shortly before they expire, under a
+  per-service lock, and written back to the token file. A token file changed
+  on disk (e.g. by a setup script re-run) is reloaded on the next lookup.
+- httplib2 connections are not thread-safe and readers run on worker threads
+  via ``asyncio.to_thread``, so each thread keeps its own authorized transport
+  and reuses its connections across calls.
+"""
+
+import datetime
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.http import build_http
+
+logger = logging.getLogger(__name__)
+
+# Refresh this long before expiry so no request goes out with a dying token
+REFRESH_MARGIN = datetime.timedelta(minutes=5)
+
+_discovery_docs: dict[tuple[str, str], dict[str, Any]] = {}
+_services: dict[tuple[str, str, str], "_CachedService"] = {}
+_lock = threading.Lock()
+
+
+def _discovery_doc(api: str, version: str) -> dict[str, Any]:
+    key = (api, version)
+    if key not in _discovery_docs:
+        raw = get_static_doc(api, version)
+        if raw is None:
+            raise RuntimeError(f"No bundled discovery document for {api} {version}")
+        _discovery_docs[key] = json.loads(raw)
+    return _discovery_docs[key]
+
+
+class _ThreadLocalHttp:
+    """Hands each thread its own AuthorizedHttp over the shared credentials."""
+
+    def __init__(self, cached: "_CachedService") -> None:
+        self._cached = cached
+        self._local = threading.local()
+
+    def _http(self) -> AuthorizedHttp:
+        http: AuthorizedHttp | None = getattr(self._local, "http", None)
+        if http is None:
+            http = AuthorizedHttp(self._cached.credentials, http=build_http())
+            self._local.http = http
+        return http
+
+    def request(self, *args: Any, **kwargs: Any) -> Any:
+        self._cached.ensure_fresh()
+        return self._http().request(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._http(), name)
+
+
+@dataclass
+class _CachedService:
+    token_path: Path
+    credentials: Credentials
+    mtime: float
+    resource: Any = None
+    _refresh_lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def _needs_refresh(self) -> bool:
+        creds = self.credentials
+        if not creds.refresh_token:
+            return False
+        if creds.token is None or creds.expiry is None:
+            return creds.token is None
+        # google-auth keeps expiry as naive UTC
+        now = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+        return bool(creds.expiry - now <= REFRESH_MARGIN)
+
+    def ensure_fresh(self) -> None:
+        if not self._needs_refresh():
+            return
+        with self._refresh_lock:
+            if not self._needs_refresh():  # another thread got here first
+                return
+            logger.info("Google services: refreshing token %s", self.token_path.name)
+            self.credentials.refresh(Request())  # type: ignore[no-untyped-call]
+            self.token_path.write_text(self.credentials.to_json())  # type: ignore[no-untyped-call]
+            self.mtime = self.token_path.stat().st_mtime
+
+
+def get_service(
+    api: str, version: str, token_path: str | Path, scopes: list[str] | None = None
+) -> Any:
+    """Return the shared API resource for ``api``/``version`` authorized by ``token_path``.
+
+    Raises FileNotFoundError if the token file is missing.
+    """
+    path = Path(token_path)
+    mtime = path.stat().st_mtime
+    key = (api, version, str(path.resolve()))
+    cached = _services.get(key)
+    if cached is not None and cached.mtime == mtime:
+        cached.ensure_fresh()
+        return cached.resource
+
+    with _lock:
+        cached = _services.get(key)
+        if cached is None or cached.mtime != mtime:
+            logger.info("Google services: building %s %s from %s", api, version, path.name)
+            creds = Credentials.from_authorized_user_file(str(path), scopes)  # type: ignore[no-untyped-call]
+            cached = _CachedService(token_path=path, credentials=creds, mtime=mtime)
+            cached.resource = build_from_document(
+                _discovery_doc(api, version), http=_ThreadLocalHttp(cached)
+            )
+            _services[key] = cached
+    cached.ensure_fresh()
+    return cached.resource
+
+
+def clear_service_cache() -> None:
+    """Forget every built service (tests, or after revoking a token)."""
+    with _lock:
+        _services.clear()
@@ -1,24 +1,45 @@
 """Memory store tool — read/write/search the memory layer (internal write, not external)."""
 
+import datetime
 import logging
+from collections.abc import AsyncIterator
+from dataclasses import fields
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
 
+from istari.db.keyset import Page, SortKey, fetch_page, order_by
 from istari.llm.router import embedding as generate_embedding
 from istari.models.memory import Memory, MemoryType
+from istari.tools.memory import vector_cache
+from istari.tools.memory.vector_cache import MemoryRow
 
 logger = logging.getLogger(__name__)
 
+_ROW_COLUMNS = tuple(getattr(Memory, f.name) for f in fields(MemoryRow))
+_EXPLICIT_KEYS = (
+    SortKey(Memory.created_at, descending=True),
+    SortKey(Memory.id, descending=True),
+)
+
+# session.info key for memory ids surfaced by search since the last flush. Kept
+# per session so a chat turn costs one UPDATE for reference tracking instead of
+# one per memory, and hits from other requests are never credited to it.
+_REFERENCES_KEY = "memory_pending_references"
+
 
 class MemoryStore:
     """Explicit memory storage backed by SQLAlchemy."""
 
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
+        self._query_embedding: tuple[str, list[float]] | None = None
 
-    async def store(self, content: str, source: str = "chat") -> Memory:
-        """Store an explicit memory with confidence=1.0."""
+    async def store(
+        self, content: str, source: str = "chat", type: MemoryType = MemoryType.EXPLICIT
+    ) -> Memory:
+        """Store a memory (explicit unless ``type`` says otherwise) with confidence=1.0."""
         vec: list[float] | None = None
         try:
             vec = await generate_embedding(content)
@@ -26,7 +47,7 @@ class MemoryStore:
             logger.warning("Embedding generation failed; storing without vector", exc_info=True)
 
         memory = Memory(
-            type=MemoryType.EXPLICIT,
+            type=type,
             content=content,
             confidence=1.0,
             source=source,
@@ -34,33 +55,132 @@ class MemoryStore:
         )
         self.session.add(memory)
         await self.session.flush()
+        vector_cache.upsert_after_commit(self.session, memory)
         return memory
 
     async def list_explicit(self) -> list[Memory]:
+        result = await self.session.execute(self._explicit_stmt())
+        return list(result.scalars().all())
+
+    async def list_explicit_rows(self) -> list[MemoryRow]:
+        """list_explicit as a column projection, for list endpoints and prompt building."""
+        stmt = self._explicit_stmt().with_only_columns(*_ROW_COLUMNS)
+        result = await self.session.execute(stmt)
+        return [MemoryRow(*row) for row in result.all()]
+
+    async def list_explicit_page(
+        self, limit: int, cursor: str | None = None
+    ) -> Page:
+        """One keyset page of list_explicit; raises ValueError for a malformed cursor."""
+        stmt = self._explicit_stmt().with_only_columns(*_ROW_COLUMNS)
+        return await fetch_page(
+            self.session, stmt, _EXPLICIT_KEYS, limit, cursor, lambda r: MemoryRow(*r)
+        )
+
+    async def stream_explicit_rows(self, batch_size: int = 500) -> AsyncIterator[MemoryRow]:
+        """list_explicit as a server-side cursor, ``batch_size`` rows per fetch."""
         stmt = (
+            self._explicit_stmt()
+            .with_only_columns(*_ROW_COLUMNS)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(stmt)
+        async for row in result:
+            yield MemoryRow(*row)
+
+    @staticmethod
+    def _explicit_stmt() -> Select[Memory]:
+        return (
             select(Memory)
-            .where(Memory.type == MemoryType.EXPLICIT)
-            .order_by(Memory.created_at.desc(), Memory.id.desc())
+            .where(Memory.type == MemoryType.EXPLICIT, Memory.archived_at.is_(None))
+            .order_by(*order_by(_EXPLICIT_KEYS))
         )
-        result = await self.session.execute(stmt)
-        return list(result.scalars().all())
 
     async def search(self, query: str) -> list[Memory]:
         """Search memories by content. Uses cosine similarity when embeddings available, else ILIKE.
+
+        Returned memories are recorded as referenced; see ``flush_references``.
         """
+        results: list[Memory] = []
         try:
-            vec = await generate_embedding(query)
+            vec = await self._embed_query(query)
             results = await self._search_semantic(vec)
-            if results:
-                return results
         except Exception:
             logger.debug("Semantic search unavailable, using ILIKE fallback", exc_info=True)
-        return await self._search_ilike(query)
+        if not results:
+            results = await self._search_ilike(query)
+        self._reference(results)
+        return results
+
+    async def search_episodes(
+        self, query: str, top_k: int = 3, max_distance: float = 0.35
+    ) -> list[Memory]:
+        """Return episodic memories semantically close to ``query``, nearest first.
+
+        Episodes are only useful when they are actually relevant, so there is no
+        keyword fallback and anything beyond ``max_distance`` is dropped.
+        """
+        try:
+            vec = await self._embed_query(query)
+        except Exception:
+            logger.debug("Episode search unavailable without embeddings", exc_info=True)
+            return []
+        distance = Memory.embedding.cosine_distance(vec)
+        stmt = (
+            select(Memory)
+            .where(
+                Memory.type == MemoryType.EPISODIC,
+                Memory.archived_at.is_(None),
+                Memory.embedding.isnot(None),
+                distance < max_distance,
+            )
+            .order_by(distance)
+            .limit(top_k)
+        )
+        result = await self.session.execute(stmt)
+        episodes = list(result.scalars().all())
+        self._reference(episodes)
+        return episodes
+
+    async def _embed_query(self, query: str) -> list[float]:
+        """Embed a query once per store instance (the prompt builder searches twice)."""
+        if self._query_embedding is not None and self._query_embedding[0] == query:
+            return self._query_embedding[1]
+        vec = await generate_embedding(query)
+        self._query_embedding = (query, vec)
+        return vec
+
+    def _reference(self, memories: list[Memory]) -> None:
+        self.session.info.setdefault(_REFERENCES_KEY, set()).update(m.id for m in memories)
+
+    async def flush_references(self) -> int:
+        """Write this session's pending ``last_referenced_at`` stamps in a single UPDATE.
+
+        Does not commit — callers flush alongside their own writes. Hits recorded
+        on a session that is closed without flushing are dropped with it.
+        """
+        pending: set[int] = self.session.info.pop(_REFERENCES_KEY, set())
+        if not pending:
+            return 0
+        ids = sorted(pending)
+        await self.session.execute(
+            update(Memory)
+            .where(Memory.id.in_(ids))
+            .values(last_referenced_at=datetime.datetime.now(datetime.UTC))
+        )
+        return len(ids)
 
     async def _search_semantic(self, vec: list[float], top_k: int = 10) -> list[Memory]:
+        cache = vector_cache.get_active_cache()
+        if cache is not None:
+            return [c.to_memory() for c in cache.search(vec, top_k)]
         stmt = (
             select(Memory)
-            .where(Memory.type == MemoryType.EXPLICIT, Memory.embedding.isnot(None))
+            .where(
+                Memory.type == MemoryType.EXPLICIT,
+                Memory.archived_at.is_(None),
+                Memory.embedding.isnot(None),
+            )
             .order_by(Memory.embedding.cosine_distance(vec))
             .limit(top_k)
         )
@@ -70,7 +190,7 @@ class MemoryStore:
     async def _search_ilike(self, query: str, top_k: int = 10) -> list[Memory]:
         stmt = (
             select(Memory)
-            .where(Memory.content.ilike(f"%{query}%"))
+            .where(Memory.content.ilike(f"%{query}%"), Memory.archived_at.is_(None))
             .order_by(Memory.created_at.desc())
             .limit(top_k)
         )
@@ -0,0 +1,325 @@
+"""In-process vector cache — serves memory top-k cosine search from a NumPy matrix.
+
+Requires: pip install -e '.[vector-cache]'
+
+A single user's memory table is usually a few thousand rows, small enough to
+hold as a row-normalized float32 matrix. A semantic query then becomes one
+matrix-vector product instead of a pgvector round trip.
+
+The cache is loaded at API startup and refreshed incrementally. Each refresh
+compares the cached ids with the ids of live memories, which drops archived
+or deleted rows and loads rows that were missed. Edits are picked up from an
+(id, updated_at) watermark. Once the corpus outgrows ``memory_vector_cache_max_rows`` the cache
+stops serving and MemoryStore falls back to pgvector.
+"""
+
+import asyncio
+import datetime
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from istari.models.memory import Memory, MemoryType
+
+logger = logging.getLogger(__name__)
+
+# Edits committed by a transaction that started before the last refresh carry
+# an older updated_at; re-reading a short overlap window picks them up. Whether
+# a row is live at all is reconciled from the id set, not from this window.
+_WATERMARK_OVERLAP = datetime.timedelta(seconds=10)
+
+
+@dataclass(frozen=True, slots=True)
+class MemoryRow:
+    """The columns MemoryStore callers read — cache hits and list projections."""
+
+    id: int
+    type: MemoryType
+    content: str
+    confidence: float
+    source: str | None
+    created_at: datetime.datetime
+
+    def to_memory(self) -> Memory:
+        """Build a detached Memory — never add it to a session."""
+        return Memory(
+            id=self.id,
+            type=self.type,
+            content=self.content,
+            confidence=self.confidence,
+            source=self.source,
+            created_at=self.created_at,
+        )
+
+
+class MemoryVectorCache:
+    """Normalized embedding matrix for live explicit memories, keyed by memory id."""
+
+    def __init__(self, max_rows: int, dim: int = 768) -> None:
+        try:
+            import numpy
+        except ImportError as exc:
+            raise ImportError(
+                "The memory vector cache requires numpy. "
+                "Install with: pip install -e '.[vector-cache]'"
+            ) from exc
+
+        self._np: Any = numpy
+        self.max_rows = max_rows
+        self._dim = dim
+        self._matrix: Any = numpy.empty((0, dim), dtype=numpy.float32)
+        self._rows: list[MemoryRow] = []
+        self._pos: dict[int, int] = {}
+        self._max_id = 0
+        self._watermark: datetime.datetime | None = None
+        self.loaded = False
+
+    @property
+    def size(self) -> int:
+        return len(self._rows)
+
+    @property
+    def active(self) -> bool:
+        return self.loaded and self.size <= self.max_rows
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    async def refresh(self, session: AsyncSession) -> int:
+        """Load everything on first call; after that, only changed rows.
+
+        Changed rows are those past the watermark plus live ids the cache
+        lacks. Cached ids that are no longer live are dropped. Returns the
+        number of memory rows read from the database.
+        """
+        if not self.loaded:
+            count_stmt = select(func.count(Memory.id)).where(*self._live_filter())
+            total = (await session.execute(count_stmt)).scalar_one()
+            if total > self.max_rows:
+                logger.info(
+                    "Memory vector cache disabled: %d rows > max %d; using pgvector",
+                    total, self.max_rows,
+                )
+                return 0
+
+        stmt = select(
+            Memory.id,
+            Memory.type,
+            Memory.content,
+            Memory.confidence,
+            Memory.source,
+            Memory.created_at,
+            Memory.updated_at,
+            Memory.archived_at,
+            Memory.embedding,
+        )
+        if self.loaded and self._watermark is not None:
+            live_ids = set(
+                (await session.execute(select(Memory.id).where(*self._live_filter())))
+                .scalars()
+                .all()
+            )
+            for gone in self._pos.keys() - live_ids:
+                self._remove(gone)
+            changed = [
+                Memory.id > self._max_id,
+                Memory.updated_at >= self._watermark - _WATERMARK_OVERLAP,
+            ]
+            missing = live_ids - self._pos.keys()
+            if missing:
+                changed.append(Memory.id.in_(sorted(missing)))
+            stmt = stmt.where(or_(*changed))
+        else:
+            stmt = stmt.where(*self._live_filter())
+        rows = (await session.execute(stmt)).all()
+
+        appended: list[Any] = []
+        for row in rows:
+            live = (
+                row.type == MemoryType.EXPLICIT
+                and row.archived_at is None
+                and row.embedding is not None
+            )
+            if not live:
+                self._remove(row.id)
+                continue
+            cached = MemoryRow(
+                id=row.id,
+                type=row.type,
+                content=row.content,
+                confidence=row.confidence,
+                source=row.source,
+                created_at=row.created_at,
+            )
+            vec = self._normalize(row.embedding)
+            if row.id in self._pos:
+                pos = self._pos[row.id]
+                self._rows[pos] = cached
+                self._matrix[pos] = vec
+            else:
+                self._pos[row.id] = len(self._rows)
+                self._rows.append(cached)
+                appended.append(vec)
+            self._max_id = max(self._max_id, row.id)
+            if self._watermark is None or row.updated_at > self._watermark:
+                self._watermark = row.updated_at
+
+        if appended:
+            self._matrix = self._np.vstack([self._matrix, self._np.stack(appended)])
+        self.loaded = True
+        return len(rows)
+
+    def upsert(self, memory: Memory) -> None:
+        """Write-through for a committed memory; see ``upsert_after_commit``."""
+        entry = _entry(memory)
+        if entry is not None:
+            self._put(*entry)
+
+    def _put(self, cached: MemoryRow, embedding: list[float]) -> None:
+        vec = self._normalize(embedding)
+        if cached.id in self._pos:
+            pos = self._pos[cached.id]
+            self._rows[pos] = cached
+            self._matrix[pos] = vec
+        else:
+            self._pos[cached.id] = len(self._rows)
+            self._rows.append(cached)
+            self._matrix = self._np.vstack([self._matrix, vec[None, :]])
+        self._max_id = max(self._max_id, cached.id)
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+
+    def search(self, vec: list[float], top_k: int = 10) -> list[MemoryRow]:
+        """Return up to ``top_k`` memories by descending cosine similarity."""
+        n = self.size
+        if n == 0 or top_k <= 0:
+            return []
+        scores = self._matrix @ self._normalize(vec)
+        k = min(top_k, n)
+        top = self._np.argpartition(-scores, k - 1)[:k] if k < n else self._np.arange(n)
+        top = top[self._np.argsort(-scores[top], kind="stable")]
+        return [self._rows[i] for i in top]
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _live_filter() -> tuple[Any, ...]:
+        return (
+            Memory.type == MemoryType.EXPLICIT,
+            Memory.archived_at.is_(None),
+            Memory.embedding.isnot(None),
+        )
+
+    def _normalize(self, vec: Any) -> Any:
+        arr = self._np.asarray(vec, dtype=self._np.float32)
+        norm = self._np.linalg.norm(arr)
+        return arr / norm if norm > 0 else arr
+
+    def _remove(self, memory_id: int) -> None:
+        """Swap-remove: move the last row into the vacated slot."""
+        pos = self._pos.pop(memory_id, None)
+        if pos is None:
+            return
+        last = len(self._rows) - 1
+        if pos != last:
+            moved = self._rows[last]
+            self._rows[pos] = moved
+            self._matrix[pos] = self._matrix[last]
+            self._pos[moved.id] = pos
+        self._rows.pop()
+        self._matrix = self._matrix[:last]
+
+
+def _entry(memory: Memory) -> tuple[MemoryRow, list[float]] | None:
+    """Snapshot what the cache needs from ``memory``, or None if it is not cacheable."""
+    if memory.embedding is None or memory.type != MemoryType.EXPLICIT:
+        return None
+    cached = MemoryRow(
+        id=memory.id,
+        type=memory.type,
+        content=memory.content,
+        confidence=memory.confidence,
+        source=memory.source,
+        created_at=memory.created_at or datetime.datetime.now(datetime.UTC),
+    )
+    return cached, list(memory.embedding)
+
+
+_cache: MemoryVectorCache | None = None
+
+# session.info key for memories written in the open transaction
+_PENDING_KEY = "memory_vector_cache_pending"
+
+
+def upsert_after_commit(session: AsyncSession, memory: Memory) -> None:
+    """Add a just-flushed memory to the process cache once ``session`` commits.
+
+    A rollback discards it, so the cache never serves a memory that was not
+    stored. The snapshot is taken now: after commit the instance is expired.
+    """
+    if _cache is None:
+        return
+    entry = _entry(memory)
+    if entry is not None:
+        session.info.setdefault(_PENDING_KEY, []).append(entry)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, ())
+    if _cache is not None:
+        for entry in pending:
+            _cache._put(*entry)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def get_active_cache() -> MemoryVectorCache | None:
+    """Return the process cache if it is loaded and within its size limit."""
+    return _cache if _cache is not None and _cache.active else None
+
+
+def get_cache() -> MemoryVectorCache | None:
+    return _cache
+
+
+async def start_memory_vector_cache(
+    session_factory: async_sessionmaker[AsyncSession],
+    max_rows: int,
+    refresh_seconds: float,
+) -> asyncio.Task[None]:
+    """Load the process-wide cache and return its background refresh task."""
+    global _cache
+    cache = MemoryVectorCache(max_rows=max_rows)
+    async with session_factory() as session:
+        await cache.refresh(session)
+    _cache = cache
+    logger.info("Memory vector cache loaded: %d memories", cache.size)
+
+    async def _refresh_loop() -> None:
+        while True:
+            await asyncio.sleep(refresh_seconds)
+            try:
+                async with session_factory() as session:
+                    await cache.refresh(session)
+            except Exception:
+                logger.warning("Memory vector cache refresh failed", exc_info=True)
+
+    return asyncio.create_task(_refresh_loop())
+
+
+def stop_memory_vector_cache() -> None:
+    global _cache
+    _cache = None
@@ -1,14 +1,40 @@
 """Project manager — CRUD for the Projects table."""
 
 import datetime
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import Session, aliased, selectinload
+from sqlalchemy.sql import Select
 
+from istari.db.keyset import Page, SortKey, fetch_page, order_by
 from istari.models.project import Project, ProjectStatus
+from istari.models.project_stats import ProjectStats, diff_project_stats, refresh_project_stats
 from istari.models.todo import Todo, TodoStatus
 
+_LIST_KEYS = (
+    SortKey(Project.created_at, descending=True),
+    SortKey(Project.id, descending=True),
+)
+
+
+@dataclass(frozen=True)
+class ProjectSummary:
+    """A project with the figures list views show next to it."""
+
+    project: Project
+    next_action_title: str | None
+    next_action_status: TodoStatus | None
+    open_todo_count: int
+    last_activity: datetime.datetime
+
+
+def _utc(dt: datetime.datetime) -> datetime.datetime:
+    return dt if dt.tzinfo else dt.replace(tzinfo=datetime.UTC)
+
 
 class ProjectManager:
     """CRUD operations for Projects backed by SQLAlchemy."""
@@ -50,6 +76,62 @@ class ProjectManager:
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
+    async def list_summaries(self, include_inactive: bool = False) -> list[ProjectSummary]:
+        """Projects with next-action title, open-todo count and last activity.
+
+        One statement: the todo figures come from the maintained ProjectStats
+        row and the next action is a primary-key join, so the cost does not
+        grow with the number of projects or todos. Last activity is the newest
+        todo update, or the project's own update if that is later.
+        """
+        result = await self.session.execute(self._summaries_stmt(include_inactive))
+        return [self._summary(row) for row in result.all()]
+
+    async def list_summaries_page(
+        self, limit: int, cursor: str | None = None, include_inactive: bool = False
+    ) -> Page:
+        """One keyset page of list_summaries; raises ValueError for a malformed cursor."""
+        stmt = self._summaries_stmt(include_inactive)
+        return await fetch_page(self.session, stmt, _LIST_KEYS, limit, cursor, self._summary)
+
+    async def stream_summaries(
+        self, include_inactive: bool = False, batch_size: int = 500
+    ) -> AsyncIterator[ProjectSummary]:
+        """list_summaries as a server-side cursor, ``batch_size`` rows per fetch."""
+        stmt = self._summaries_stmt(include_inactive).execution_options(yield_per=batch_size)
+        result = await self.session.stream(stmt)
+        async for row in result:
+            yield self._summary(row)
+
+    @staticmethod
+    def _summaries_stmt(
+        include_inactive: bool,
+    ) -> Select[Project, str, TodoStatus, ProjectStats]:
+        next_action = aliased(Todo)
+        stmt = (
+            select(Project, next_action.title, next_action.status, ProjectStats)
+            .outerjoin(next_action, next_action.id == Project.next_action_id)
+            .outerjoin(ProjectStats, ProjectStats.project_id == Project.id)
+            .order_by(*order_by(_LIST_KEYS))
+        )
+        if not include_inactive:
+            stmt = stmt.where(Project.status == ProjectStatus.active)
+        return stmt
+
+    @staticmethod
+    def _summary(row: Sequence[Any]) -> ProjectSummary:
+        project, title, status, stats = row
+        return ProjectSummary(
+            project=project,
+            next_action_title=title,
+            next_action_status=status,
+            open_todo_count=stats.outstanding_count if stats else 0,
+            last_activity=max(
+                (t for t in (project.updated_at, stats and stats.last_activity) if t),
+                key=_utc,
+            ),
+        )
+
     async def get_by_name(self, query: str) -> list[Project]:
         """ILIKE search on project name."""
         stmt = (
@@ -87,31 +169,54 @@ class ProjectManager:
         return project
 
     async def get_stale(self, days: int = 7) -> list[Project]:
-        """Return active projects with no associated todo updated in the last N days."""
-        cutoff = datetime.datetime.now(datetime.UTC) - datetime.timedelta(days=days)
-
-        # Subquery: project IDs that have at least one recently-updated todo
-        recent_sub = (
-            select(Todo.project_id)
-            .where(
-                Todo.project_id.is_not(None),
-                Todo.status.in_((TodoStatus.OPEN, TodoStatus.IN_PROGRESS)),
-                Todo.updated_at >= cutoff,
-            )
-            .scalar_subquery()
-        )
+        """Return active projects with no open/in-progress todo updated in the last N days.
 
+        Reads ProjectStats.last_open_activity (indexed) rather than scanning todos.
+        Projects without a stats row have no todos at all and count as stale.
+        """
+        cutoff = datetime.datetime.now(datetime.UTC) - datetime.timedelta(days=days)
         stmt = (
             select(Project)
+            .outerjoin(ProjectStats, ProjectStats.project_id == Project.id)
             .where(
                 Project.status == ProjectStatus.active,
-                Project.id.not_in(recent_sub),
+                or_(
+                    ProjectStats.last_open_activity.is_(None),
+                    ProjectStats.last_open_activity < cutoff,
+                ),
             )
             .order_by(Project.updated_at.asc())
         )
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
+    async def next_stale_at(self, days: int = 7) -> datetime.datetime | None:
+        """When the next currently-fresh active project goes stale, absent writes."""
+        cutoff = datetime.datetime.now(datetime.UTC) - datetime.timedelta(days=days)
+        stmt = (
+            select(func.min(ProjectStats.last_open_activity))
+            .join(Project, Project.id == ProjectStats.project_id)
+            .where(
+                Project.status == ProjectStatus.active,
+                ProjectStats.last_open_activity >= cutoff,
+            )
+        )
+        oldest_fresh = (await self.session.execute(stmt)).scalar_one_or_none()
+        if oldest_fresh is None:
+            return None
+        return _utc(oldest_fresh) + datetime.timedelta(days=days)
+
+    async def repair_stats(self) -> list[int]:
+        """Recompute ProjectStats rows that drifted from the todos; returns their ids."""
+
+        def _repair(sync_session: Session) -> list[int]:
+            conn = sync_session.connection()
+            drifted = diff_project_stats(conn)
+            refresh_project_stats(conn, drifted)
+            return drifted
+
+        return await self.session.run_sync(_repair)
+
     async def get_with_todos(self, project_id: int) -> Project | None:
         """Eagerly load the todos relationship."""
         stmt = (
@@ -0,0 +1,123 @@
+"""Eisenhower classification queue — classifies new TODOs off the request path.
+
+Creating a TODO only stamps ``classification_requested_at``; the row itself is
+the queue entry, so nothing is lost if the process restarts before the local
+model gets to it. ``classify_pending`` drains a batch: it locks queued rows
+(SKIP LOCKED, so the API and worker never classify the same row twice), sends
+their titles to the model in one call, and writes urgent/important back with a
+single executemany UPDATE.
+
+Rows stay queued when the model call fails and are retried on the next drain.
+"""
+
+import json
+import logging
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from istari.llm.router import completion
+from istari.models.todo import Todo
+
+logger = logging.getLogger(__name__)
+
+_CLASSIFY_SYSTEM_PROMPT = """\
+You classify TODO items using the Eisenhower matrix.
+
+For each title return a JSON object with:
+- "title": the original title (unchanged)
+- "urgent": true if time-sensitive or immediately impactful, false if not, null if unclear
+- "important": true if significant to goals/values/outcomes, false if not, null if unclear
+- "uncertain": true if you genuinely cannot tell from the title alone
+
+Return a JSON array — one object per title, in order. No prose, no markdown fences.
+
+Example input: ["Call dentist", "Reorganize bookshelf", "Fix prod outage"]
+Example output:
+[
+  {"title": "Call dentist", "urgent": false, "important": true, "uncertain": false},
+  {"title": "Reorganize bookshelf", "urgent": false, "important": false, "uncertain": false},
+  {"title": "Fix prod outage", "urgent": true, "important": true, "uncertain": false}
+]"""
+
+
+@dataclass
+class ClassificationBatch:
+    """Outcome of one drain: which TODOs were classified and which the model was unsure of."""
+
+    classified_ids: list[int] = field(default_factory=list)
+    uncertain_titles: list[str] = field(default_factory=list)
+
+
+async def classify_titles(titles: list[str]) -> list[dict[str, Any]]:
+    """Call LLM to classify titles; returns empty list on any error."""
+    try:
+        resp = await completion(
+            "todo_classification",
+            messages=[
+                {"role": "system", "content": _CLASSIFY_SYSTEM_PROMPT},
+                {"role": "user", "content": json.dumps(titles)},
+            ],
+        )
+        raw = resp.choices[0].message.content or ""
+        raw = raw.strip()
+        if raw.startswith("```"):
+            raw = raw.split("```")[1]
+            if raw.startswith("json"):
+                raw = raw[4:]
+        parsed = json.loads(raw)
+        if isinstance(parsed, list):
+            return parsed
+    except Exception:
+        logger.debug("TODO classification failed", exc_info=True)
+    return []
+
+
+async def classify_pending(
+    session: AsyncSession, limit: int, ids: Sequence[int] | None = None
+) -> ClassificationBatch:
+    """Classify up to ``limit`` queued TODOs (optionally only ``ids``). Caller commits."""
+    stmt = (
+        select(Todo.id, Todo.title)
+        .where(Todo.classification_requested_at.isnot(None))
+        .order_by(Todo.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    if ids is not None:
+        stmt = stmt.where(Todo.id.in_(ids))
+    rows = (await session.execute(stmt)).all()
+    batch = ClassificationBatch()
+    if not rows:
+        return batch
+
+    results = await classify_titles([r.title for r in rows])
+    params: list[dict[str, Any]] = []
+    for row, cls in zip(rows, results, strict=False):
+        if not isinstance(cls, dict):
+            continue
+        params.append({
+            "id": row.id,
+            "urgent": cls.get("urgent"),
+            "important": cls.get("important"),
+            "classification_requested_at": None,
+        })
+        batch.classified_ids.append(row.id)
+        if cls.get("uncertain", False):
+            batch.uncertain_titles.append(row.title)
+
+    if params:
+        await session.execute(update(Todo), params)
+    return batch
+
+
+def uncertain_prompt(titles: list[str]) -> str:
+    """Follow-up question asked when the model could not classify some titles."""
+    listed = ", ".join(f'"{t}"' for t in titles)
+    return (
+        f"I wasn't sure how to classify: {listed}. "
+        "Are these urgent, important, both, or neither?"
+    )
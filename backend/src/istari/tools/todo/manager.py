@@ -2,17 +2,78 @@
 
 import datetime
 import logging
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass, fields
 from typing import Any
 
 from dateutil.rrule import rrulestr
-from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy import (
+    ColumnElement,
+    and_,
+    bindparam,
+    case,
+    func,
+    insert,
+    or_,
+    select,
+    union_all,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
 
+from istari.db.keyset import Page, SortKey, fetch_page, order_by
 from istari.models.todo import Todo, TodoStatus
+from istari.tools.todo.view_cache import encode_rows, get_view_cache, rows_decoder
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, slots=True)
+class TodoRow:
+    """The columns list endpoints and agent tools read — no embedding, no ORM state."""
+
+    id: int
+    title: str
+    body: str | None
+    status: TodoStatus
+    priority: int | None
+    urgent: bool | None
+    important: bool | None
+    source: str | None
+    source_link: str | None
+    due_date: datetime.datetime | None
+    recurrence_rule: str | None
+    today_date: datetime.date | None
+    tags: list[str] | None
+    project_id: int | None
+    created_at: datetime.datetime
+    updated_at: datetime.datetime
+
+
+_ROW_COLUMNS = tuple(getattr(Todo, f.name) for f in fields(TodoRow))
+_decode_rows = rows_decoder(TodoRow)
+
+
+def _utc(value: datetime.datetime | None) -> datetime.datetime | None:
+    # SQLite hands back naive datetimes
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=datetime.UTC)
+
+
+def _status_in(statuses: Sequence[TodoStatus]) -> ColumnElement[bool]:
+    """``status IN (...)`` rendered with literal values.
+
+    With bound parameters a prepared statement's generic plan cannot prove the
+    predicate of the partial indexes on todos, so the planner falls back to a scan.
+    """
+    values = bindparam(
+        None, list(statuses), expanding=True, literal_execute=True, type_=Todo.status.type
+    )
+    return Todo.status.in_(values)
+
+
 class TodoManager:
     """CRUD operations for TODOs backed by SQLAlchemy."""
 
@@ -28,59 +89,109 @@ class TodoManager:
         await self.session.flush()
         return todo
 
+    async def bulk_create(self, titles: Sequence[str], **kwargs: object) -> list[Todo]:
+        """Insert one TODO per title with a single INSERT ... RETURNING, in ``titles`` order."""
+        if not titles:
+            return []
+        rows = [{"title": title, "status": TodoStatus.OPEN, **kwargs} for title in titles]
+        stmt = insert(Todo).returning(Todo, sort_by_parameter_order=True)
+        result = await self.session.scalars(stmt, rows)
+        return list(result.all())
+
     async def get(self, todo_id: int) -> Todo | None:
         return await self.session.get(Todo, todo_id)
 
     async def list_open(self) -> list[Todo]:
-        stmt = (
+        result = await self.session.execute(self._open_stmt())
+        return list(result.scalars().all())
+
+    async def list_open_rows(self) -> list[TodoRow]:
+        return await self._rows(self._open_stmt())
+
+    def _open_stmt(self) -> Select[Todo]:
+        return (
             select(Todo)
-            .where(Todo.status.in_(self._ACTIONABLE))
+            .where(_status_in(self._ACTIONABLE))
             .order_by(Todo.created_at.desc())
         )
-        result = await self.session.execute(stmt)
-        return list(result.scalars().all())
 
-    def _quadrant_sort(self, urgent_days: int = 0) -> Any:
-        """Quadrant sort expression, optionally treating deadline-due todos as urgent."""
+    async def _rows(self, stmt: Select[Todo]) -> list[TodoRow]:
+        """Run a ``select(Todo)`` statement as a column projection onto TodoRow."""
+        result = await self.session.execute(stmt.with_only_columns(*_ROW_COLUMNS))
+        return [TodoRow(*row) for row in result.all()]
+
+    def _quadrant_sort(
+        self, urgent_days: int = 0, cutoff: datetime.datetime | None = None
+    ) -> Any:
+        """Quadrant sort key, optionally treating deadline-due todos as urgent.
+
+        Without deadlines this is the stored ``quadrant`` column. A deadline within
+        ``urgent_days`` makes a todo urgent: important ones move to Q1, the rest to Q3.
+        """
         if urgent_days > 0:
-            cutoff = datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=urgent_days)
+            cutoff = cutoff or self._cutoff(urgent_days)
             deadline_urgent = and_(Todo.due_date.isnot(None), Todo.due_date <= cutoff)
-            effective_urgent = or_(Todo.urgent == True, deadline_urgent)  # noqa: E712
             return case(
-                (and_(effective_urgent, Todo.important == True), 1),  # noqa: E712
-                (Todo.important == True, 2),  # noqa: E712
-                (effective_urgent, 3),
-                (and_(Todo.urgent.is_(None), Todo.important.is_(None)), 4),
-                else_=5,  # Q4: both false
+                (deadline_urgent, case((Todo.important == True, 1), else_=3)),  # noqa: E712
+                else_=Todo.quadrant,
             )
-        return case(
-            (and_(Todo.urgent == True, Todo.important == True), 1),  # noqa: E712
-            (Todo.important == True, 2),  # noqa: E712
-            (Todo.urgent == True, 3),  # noqa: E712
-            (and_(Todo.urgent.is_(None), Todo.important.is_(None)), 4),
-            else_=5,  # Q4: both false
-        )
+        return Todo.quadrant
+
+    @staticmethod
+    def _cutoff(days: int) -> datetime.datetime:
+        return datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=days)
 
     async def list_visible(self) -> list[Todo]:
         """Return all non-deferred TODOs: complete last, overdue first, then by quadrant."""
-        now = func.now()
+        result = await self.session.execute(self._visible_stmt())
+        return list(result.scalars().all())
+
+    async def list_visible_rows(self) -> list[TodoRow]:
+        """list_visible as lightweight rows, for list endpoints and tool output."""
+        return await self._rows(self._visible_stmt())
+
+    async def list_visible_page(self, limit: int, cursor: str | None = None) -> Page:
+        """One keyset page of list_visible; raises ValueError for a malformed cursor.
+
+        The overdue rank is computed at query time, so a todo that becomes
+        overdue between two page requests can move across the page boundary.
+        """
+        stmt = self._visible_stmt().with_only_columns(*_ROW_COLUMNS)
+        return await fetch_page(
+            self.session, stmt, self._visible_keys(), limit, cursor, lambda r: TodoRow(*r)
+        )
+
+    async def stream_visible_rows(self, batch_size: int = 500) -> AsyncIterator[TodoRow]:
+        """list_visible as a server-side cursor, ``batch_size`` rows per fetch."""
+        stmt = (
+            self._visible_stmt()
+            .with_only_columns(*_ROW_COLUMNS)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(stmt)
+        async for row in result:
+            yield TodoRow(*row)
+
+    def _visible_keys(self) -> list[SortKey]:
+        """Complete last, overdue first, then by quadrant, newest first; id breaks ties."""
         overdue_first = case(
-            (and_(Todo.due_date.isnot(None), Todo.due_date < now), 0),
+            (and_(Todo.due_date.isnot(None), Todo.due_date < func.now()), 0),
             else_=1,
         )
-        quadrant = self._quadrant_sort()
-        stmt = (
+        return [
+            SortKey(case((Todo.status == TodoStatus.COMPLETE, 1), else_=0)),
+            SortKey(overdue_first),
+            SortKey(self._quadrant_sort()),
+            SortKey(Todo.created_at, descending=True),
+            SortKey(Todo.id, descending=True),
+        ]
+
+    def _visible_stmt(self) -> Select[Todo]:
+        return (
             select(Todo)
-            .where(Todo.status.in_(self._VISIBLE))
-            .order_by(
-                (Todo.status == TodoStatus.COMPLETE).asc(),
-                overdue_first.asc(),
-                quadrant.asc(),
-                Todo.created_at.desc(),
-            )
+            .where(_status_in(self._VISIBLE))
+            .order_by(*order_by(self._visible_keys()))
         )
-        result = await self.session.execute(stmt)
-        return list(result.scalars().all())
 
     async def update(self, todo_id: int, **kwargs: object) -> Todo | None:
         todo = await self.get(todo_id)
@@ -92,6 +203,55 @@ class TodoManager:
         await self.session.flush()
         return todo
 
+    # ------------------------------------------------------------------
+    # Set-based mutations — one UPDATE ... RETURNING per call
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def match(
+        ids: Sequence[int] | None = None, title_query: str | None = None
+    ) -> ColumnElement[bool]:
+        """WHERE clause for an id list and/or a case-insensitive title substring."""
+        clauses: list[ColumnElement[bool]] = []
+        if ids is not None:
+            clauses.append(Todo.id.in_(ids))
+        if title_query is not None:
+            clauses.append(Todo.title.ilike(f"%{title_query}%"))
+        if not clauses:
+            raise ValueError("match() needs ids or title_query")
+        return and_(*clauses)
+
+    async def bulk_update(
+        self, where: ColumnElement[bool], **values: object
+    ) -> list[Todo]:
+        """Apply ``values`` to every TODO matching ``where``; returns the updated rows."""
+        stmt = (
+            update(Todo)
+            .where(where)
+            .values(**values)
+            .returning(Todo)
+            .execution_options(synchronize_session="fetch")
+        )
+        result = await self.session.scalars(stmt)
+        return sorted(result.all(), key=lambda t: t.id)
+
+    async def bulk_set_status(self, where: ColumnElement[bool], status: TodoStatus) -> list[Todo]:
+        """Set ``status`` on matching TODOs not already in it.
+
+        Completing recurring TODOs spawns their next instances in one INSERT.
+        Rows already at ``status`` are skipped, so re-completing never double-spawns.
+        """
+        updated = await self.bulk_update(and_(where, Todo.status != status), status=status)
+        if status == TodoStatus.COMPLETE:
+            recurring = [t for t in updated if t.recurrence_rule]
+            if recurring:
+                await self.bulk_create_next_recurrences(recurring)
+        return updated
+
+    async def bulk_set_today(self, where: ColumnElement[bool], flag: bool) -> list[Todo]:
+        """Set or clear today_date on every matching TODO."""
+        return await self.bulk_update(where, today_date=datetime.date.today() if flag else None)
+
     async def complete(self, todo_id: int) -> Todo | None:
         return await self.update(todo_id, status=TodoStatus.COMPLETE)
 
@@ -118,7 +278,7 @@ class TodoManager:
         stmt = (
             select(Todo)
             .where(
-                Todo.status.in_(self._ACTIONABLE),
+                _status_in(self._ACTIONABLE),
                 Todo.due_date.isnot(None),
                 Todo.due_date <= cutoff,
             )
@@ -130,32 +290,106 @@ class TodoManager:
     async def get_prioritized(
         self, limit: int = 3, exclude_ids: list[int] | None = None
     ) -> list[Todo]:
-        """Return top TODOs: deadline-due treated as urgent; Q1 → Q2 → Q3 → unclassified → Q4."""
+        """Return top TODOs: deadline-due treated as urgent; Q1 → Q2 → Q3 → unclassified → Q4.
+
+        Only todos due within ``deadline_urgent_days`` can sort differently from
+        their stored quadrant, so candidates come from two index-backed branches —
+        the (few) deadline-due todos and the first ``limit`` of everything else in
+        ix_todos_prioritized order — and the full ordering runs over at most
+        twice ``limit`` rows.
+        """
+        result = await self.session.execute(self._prioritized_stmt(limit, exclude_ids))
+        return list(result.scalars().all())
+
+    async def get_prioritized_rows(
+        self, limit: int = 3, exclude_ids: list[int] | None = None
+    ) -> list[TodoRow]:
+        """get_prioritized as rows, served from the todo view cache when current."""
+        from istari.config.settings import settings
+
+        async def _load() -> list[TodoRow]:
+            return await self._rows(self._prioritized_stmt(limit, exclude_ids))
+
+        cache = get_view_cache()
+        if cache is None:
+            return await _load()
+        urgent_days = settings.deadline_urgent_days
+        rows: list[TodoRow] = await cache.read_through(
+            self.session,
+            "prioritized",
+            (limit, sorted(exclude_ids or ()), urgent_days),
+            ("todos",),
+            _load,
+            encode_rows,
+            _decode_rows,
+            expires_at=lambda: self.next_deadline_crossing(urgent_days),
+        )
+        return rows
+
+    async def next_deadline_crossing(self, urgent_days: int) -> datetime.datetime | None:
+        """Next instant an actionable todo's deadline enters the urgency window or passes.
+
+        Prioritized order changes at these instants without any write.
+        """
+        now = datetime.datetime.now(datetime.UTC)
+        window = datetime.timedelta(days=urgent_days)
+        stmt = select(
+            func.min(Todo.due_date).filter(Todo.due_date > now),
+            func.min(Todo.due_date).filter(Todo.due_date > now + window),
+        ).where(_status_in(self._ACTIONABLE))
+        next_overdue, next_urgent = (await self.session.execute(stmt)).one()
+        next_urgent = _utc(next_urgent)
+        crossings = [_utc(next_overdue), next_urgent - window if next_urgent else None]
+        return min((c for c in crossings if c is not None), default=None)
+
+    def _prioritized_stmt(self, limit: int, exclude_ids: list[int] | None) -> Select[Todo]:
         from istari.config.settings import settings
 
-        quadrant = self._quadrant_sort(urgent_days=settings.deadline_urgent_days)
+        cutoff = self._cutoff(settings.deadline_urgent_days)
+        quadrant = self._quadrant_sort(urgent_days=settings.deadline_urgent_days, cutoff=cutoff)
         now = func.now()
         overdue_first = case(
             (and_(Todo.due_date.isnot(None), Todo.due_date < now), 0),
             else_=1,
         )
-        filters = [Todo.status.in_((TodoStatus.OPEN, TodoStatus.IN_PROGRESS))]
+        order = (
+            quadrant.asc(),
+            overdue_first.asc(),
+            Todo.priority.asc().nulls_last(),
+            Todo.due_date.asc().nulls_last(),
+            Todo.created_at.desc(),
+        )
+        filters = [_status_in((TodoStatus.OPEN, TodoStatus.IN_PROGRESS))]
         if exclude_ids:
             filters.append(Todo.id.not_in(exclude_ids))
-        stmt = (
-            select(Todo)
-            .where(*filters)
+
+        deadline_due = (
+            select(Todo.id)
+            .where(*filters, Todo.due_date.isnot(None), Todo.due_date <= cutoff)
+            .order_by(*order)
+            .limit(limit)
+            .subquery()
+        )
+        # Not deadline-due → never overdue, sort key is the stored quadrant
+        rest = (
+            select(Todo.id)
+            .where(*filters, or_(Todo.due_date.is_(None), Todo.due_date > cutoff))
             .order_by(
-                quadrant.asc(),
-                overdue_first.asc(),
+                Todo.quadrant.asc(),
                 Todo.priority.asc().nulls_last(),
                 Todo.due_date.asc().nulls_last(),
                 Todo.created_at.desc(),
             )
             .limit(limit)
+            .subquery()
+        )
+        candidates = union_all(select(deadline_due.c.id), select(rest.c.id)).subquery()
+        return (
+            select(Todo)
+            .join(candidates, Todo.id == candidates.c.id)
+            .order_by(*order)
+            .limit(limit)
         )
-        result = await self.session.execute(stmt)
-        return list(result.scalars().all())
 
     async def set_urgency_importance(
         self,
@@ -168,37 +402,56 @@ class TodoManager:
 
     async def list_today(self) -> list[Todo]:
         """Return actionable TODOs focused for today, sorted by quadrant then recency."""
+        result = await self.session.execute(self._today_stmt())
+        return list(result.scalars().all())
+
+    async def list_today_rows(self) -> list[TodoRow]:
+        """list_today as rows, served from the todo view cache when current."""
+
+        async def _load() -> list[TodoRow]:
+            return await self._rows(self._today_stmt())
+
+        cache = get_view_cache()
+        if cache is None:
+            return await _load()
+        # Keyed by date: the filter is today_date <= today, and entries expire at midnight
+        rows: list[TodoRow] = await cache.read_through(
+            self.session,
+            "today",
+            (datetime.date.today(),),
+            ("todos",),
+            _load,
+            encode_rows,
+            _decode_rows,
+        )
+        return rows
+
+    def _today_stmt(self) -> Select[Todo]:
         today = datetime.date.today()
-        quadrant = self._quadrant_sort()
-        stmt = (
+        return (
             select(Todo)
-            .where(Todo.today_date <= today, Todo.status.in_(self._ACTIONABLE))
-            .order_by(quadrant.asc(), Todo.created_at.desc())
+            .where(Todo.today_date <= today, _status_in(self._ACTIONABLE))
+            .order_by(self._quadrant_sort().asc(), Todo.created_at.desc())
         )
-        result = await self.session.execute(stmt)
-        return list(result.scalars().all())
 
     async def set_today(self, todo_id: int, flag: bool) -> Todo | None:
         """Set or clear today_date on a TODO. flag=True sets today; flag=False clears."""
         value = datetime.date.today() if flag else None
         return await self.update(todo_id, today_date=value)
 
-    async def create_next_recurrence(self, todo: Todo) -> Todo:
-        """Create the next recurrence instance for a completed recurring todo.
+    @staticmethod
+    def next_due_date(todo: Todo) -> datetime.datetime:
+        """Next occurrence of todo.recurrence_rule after its due date (or now).
 
-        Parses the RRULE from todo.recurrence_rule, finds the next occurrence
-        after the current due date (or now), and creates a new Todo inheriting key fields.
+        Falls back to one week from now when the rule cannot be parsed or is exhausted.
         """
-        if not todo.recurrence_rule:
-            raise ValueError("Todo has no recurrence_rule")
-
         now = datetime.datetime.now(datetime.UTC)
         base_dt = todo.due_date if todo.due_date else now
 
         try:
             # Strip timezone for rrulestr (it returns naive datetimes)
             base_naive = base_dt.replace(tzinfo=None) if base_dt.tzinfo else base_dt
-            rule = rrulestr(todo.recurrence_rule, dtstart=base_naive, ignoretz=True)
+            rule = rrulestr(todo.recurrence_rule or "", dtstart=base_naive, ignoretz=True)
             # Find next occurrence strictly after base (or after now if base is past)
             after_naive = max(base_naive, now.replace(tzinfo=None))
             next_dt_naive = rule.after(after_naive, inc=False)
@@ -215,17 +468,36 @@ class TodoManager:
             next_dt_naive = now.replace(tzinfo=None) + datetime.timedelta(days=7)
 
         # Restore UTC timezone
-        next_dt = next_dt_naive.replace(tzinfo=datetime.UTC)
-
-        new_todo = await self.create(
-            title=todo.title,
-            body=todo.body,
-            source=todo.source,
-            source_link=todo.source_link,
-            due_date=next_dt,
-            recurrence_rule=todo.recurrence_rule,
-            urgent=todo.urgent,
-            important=todo.important,
-            project_id=todo.project_id,
-        )
-        return new_todo
+        return next_dt_naive.replace(tzinfo=datetime.UTC)
+
+    @staticmethod
+    def _recurrence_values(todo: Todo) -> dict[str, Any]:
+        return {
+            "title": todo.title,
+            "body": todo.body,
+            "source": todo.source,
+            "source_link": todo.source_link,
+            "due_date": TodoManager.next_due_date(todo),
+            "recurrence_rule": todo.recurrence_rule,
+            "urgent": todo.urgent,
+            "important": todo.important,
+            "project_id": todo.project_id,
+        }
+
+    async def create_next_recurrence(self, todo: Todo) -> Todo:
+        """Create the next recurrence instance for a completed recurring todo.
+
+        Parses the RRULE from todo.recurrence_rule, finds the next occurrence
+        after the current due date (or now), and creates a new Todo inheriting key fields.
+        """
+        if not todo.recurrence_rule:
+            raise ValueError("Todo has no recurrence_rule")
+        return await self.create(**self._recurrence_values(todo))
+
+    async def bulk_create_next_recurrences(self, todos: Sequence[Todo]) -> list[Todo]:
+        """Create the next instance of every recurring todo in a single INSERT."""
+        rows = [self._recurrence_values(t) for t in todos if t.recurrence_rule]
+        if not rows:
+            return []
+        result = await self.session.scalars(insert(Todo).returning(Todo), rows)
+        return list(result.all())
@@ -0,0 +1,250 @@
+"""Read-through cache for the prioritized and today-focus views.
+
+Optional Redis backend: pip install -e '.[redis]'
+
+The sidebar and the agent read the same few views far more often than todos
+change. Entries are keyed by the collection version counters of everything
+a view reads (istari.models.collection_version), so any committed write —
+from the API or the worker — moves readers to a fresh key; stale entries are
+never served, they just age out. The key also carries the settings and
+arguments the view depends on.
+
+Views also depend on the clock: the today list on the date, the
+prioritized order on deadlines entering the urgency window or passing. Each
+entry therefore expires at the next local midnight or the next such crossing,
+whichever comes first (and at most ``todo_view_cache_max_seconds`` out).
+
+A session with uncommitted writes to a view's collections bypasses the cache
+both ways: it sees rows nobody else can yet, and may still roll back.
+
+The default backend is an in-process LRU. Set ``todo_view_cache_url`` to a
+redis:// URL to share entries between the API and worker processes.
+"""
+
+import dataclasses
+import datetime
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any, Protocol
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from istari.db.changes import has_uncommitted_writes
+from istari.models.collection_version import read_versions
+from istari.models.todo import TodoStatus
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> str | None: ...
+
+    async def set(self, key: str, value: str, ttl_seconds: float) -> None: ...
+
+    async def clear(self) -> None: ...
+
+
+class MemoryBackend:
+    """Bounded in-process LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    async def get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+class RedisBackend:
+    """Any client with redis-py's asyncio ``get``/``set(px=)``/``scan_iter``/``delete``."""
+
+    _PREFIX = "istari:view:"
+
+    def __init__(self, client: Any) -> None:
+        self._client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        try:
+            from redis.asyncio import Redis
+        except ImportError as exc:
+            raise ImportError(
+                "A redis:// todo_view_cache_url requires redis. "
+                "Install with: pip install -e '.[redis]'"
+            ) from exc
+        return cls(Redis.from_url(url, decode_responses=True))
+
+    async def get(self, key: str) -> str | None:
+        value = await self._client.get(self._PREFIX + key)
+        return None if value is None else str(value)
+
+    async def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        await self._client.set(self._PREFIX + key, value, px=max(1, int(ttl_seconds * 1000)))
+
+    async def clear(self) -> None:
+        keys = [key async for key in self._client.scan_iter(match=self._PREFIX + "*")]
+        if keys:
+            await self._client.delete(*keys)
+
+
+class ViewCache:
+    def __init__(self, backend: CacheBackend, max_seconds: float = 3600) -> None:
+        self.backend = backend
+        self.max_seconds = max_seconds
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+
+    async def read_through(
+        self,
+        session: AsyncSession,
+        view: str,
+        params: Sequence[object],
+        collections: tuple[str, ...],
+        load: Callable[[], Awaitable[Any]],
+        encode: Callable[[Any], str],
+        decode: Callable[[str], Any],
+        expires_at: Callable[[], Awaitable[datetime.datetime | None]] | None = None,
+    ) -> Any:
+        """Return ``load()``'s result for this view, from the cache when current.
+
+        ``expires_at``, awaited only on a miss, returns the next instant the view
+        would change without any write; omit it for views that only roll over
+        at midnight.
+        """
+        # Reading versions autoflushes, so pending writes are flagged first
+        versions = await read_versions(session, collections)
+        if has_uncommitted_writes(session.sync_session, collections):
+            self.bypasses += 1
+            return await load()
+
+        key = json.dumps(
+            [view, [versions[name] for name in collections], [str(p) for p in params]],
+            separators=(",", ":"),
+        )
+        try:
+            raw = await self.backend.get(key)
+        except Exception:
+            logger.warning("Todo view cache read failed; querying directly", exc_info=True)
+            raw = None
+        if raw is not None:
+            self.hits += 1
+            return decode(raw)
+
+        self.misses += 1
+        value = await load()
+        now = datetime.datetime.now(datetime.UTC)
+        expiry = min(_next_local_midnight(), now + datetime.timedelta(seconds=self.max_seconds))
+        crossing = await expires_at() if expires_at is not None else None
+        if crossing is not None:
+            expiry = min(expiry, crossing)
+        ttl = (expiry - now).total_seconds()
+        if ttl > 0:
+            try:
+                await self.backend.set(key, encode(value), ttl)
+            except Exception:
+                logger.warning("Todo view cache write failed", exc_info=True)
+        return value
+
+
+def _next_local_midnight() -> datetime.datetime:
+    # datetime.date.today() — which the today view filters on — is local time
+    tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+    return datetime.datetime.combine(tomorrow, datetime.time()).astimezone(datetime.UTC)
+
+
+# ---------------------------------------------------------------------------
+# TodoRow codec
+# ---------------------------------------------------------------------------
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime.datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"d": value.isoformat()}
+    if isinstance(value, TodoStatus):
+        return value.value
+    return value
+
+
+def _decode_value(name: str, value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.datetime.fromisoformat(value["dt"])
+        return datetime.date.fromisoformat(value["d"])
+    if name == "status":
+        return TodoStatus(value)
+    return value
+
+
+def encode_rows(rows: Sequence[Any]) -> str:
+    return json.dumps(
+        [
+            {f.name: _encode_value(getattr(row, f.name)) for f in dataclasses.fields(row)}
+            for row in rows
+        ],
+        separators=(",", ":"),
+    )
+
+
+def rows_decoder(row_type: type) -> Callable[[str], list[Any]]:
+    def _decode(raw: str) -> list[Any]:
+        return [
+            row_type(**{name: _decode_value(name, v) for name, v in item.items()})
+            for item in json.loads(raw)
+        ]
+
+    return _decode
+
+
+# ---------------------------------------------------------------------------
+# Process-wide instance
+# ---------------------------------------------------------------------------
+
+_cache: ViewCache | None = None
+_configured = False
+
+
+def get_view_cache() -> ViewCache | None:
+    """The configured cache, or None when ``todo_view_cache_enabled`` is off."""
+    global _cache, _configured
+    if not _configured:
+        from istari.config.settings import settings
+
+        _configured = True
+        if settings.todo_view_cache_enabled:
+            backend: CacheBackend = (
+                RedisBackend.from_url(settings.todo_view_cache_url)
+                if settings.todo_view_cache_url
+                else MemoryBackend()
+            )
+            _cache = ViewCache(backend, max_seconds=settings.todo_view_cache_max_seconds)
+    return _cache
+
+
+def reset_view_cache() -> None:
+    """Drop the instance so the next call re-reads settings (tests, reconfiguration)."""
+    global _cache, _configured
+    _cache = None
+    _configured = False
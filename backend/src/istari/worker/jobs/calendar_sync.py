@@ -0,0 +1,30 @@
+"""Calendar store sync — pulls Google Calendar changes into the local event store."""
+
+import asyncio
+import logging
+
+from istari.config.settings import settings
+from istari.db.session import async_session_factory
+from istari.tools.calendar.reader import CalendarReader
+from istari.tools.calendar.store import CalendarStore
+
+logger = logging.getLogger(__name__)
+
+
+async def sync_calendar_store() -> None:
+    """Apply changes since each calendar's last syncToken to the store."""
+    if not settings.calendar_store_enabled or settings.calendar_backend != "google":
+        return
+    try:
+        reader = CalendarReader(settings.calendar_token_path)
+    except FileNotFoundError:
+        logger.info("Calendar sync: no Calendar token — skipping")
+        return
+    async with async_session_factory() as session:
+        await CalendarStore(session).sync(reader)
+        await session.commit()
+
+
+def calendar_sync_sync() -> None:
+    """Sync wrapper for APScheduler."""
+    asyncio.run(sync_calendar_store())
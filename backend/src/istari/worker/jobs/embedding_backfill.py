@@ -0,0 +1,235 @@
+"""Embedding backfill — fills NULL vectors on memories and todos.
+
+MemoryStore.store() saves embedding=None when Ollama is unavailable, and todos
+are never embedded at write time. This job walks each table in id order
+(keyset pagination), embeds a batch of rows in one request, and writes the
+vectors back with a single executemany UPDATE per batch.
+
+Progress is committed after every batch as a ``UserSetting`` cursor, so a run
+interrupted by a restart or an Ollama outage resumes where it stopped. A batch
+the model rejects is retried row by row; rows that still fail (e.g. too long
+for the model) are skipped until the next pass so they cannot stall the rest.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from istari.config.settings import settings
+from istari.db.session import async_session_factory
+from istari.llm.router import embedding_batch, is_unreachable
+from istari.models.memory import Memory
+from istari.models.todo import Todo
+from istari.models.user import UserSetting
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BackfillTarget:
+    """A table with a nullable ``embedding`` column and how to build its text."""
+
+    table: str
+    model: Any
+    columns: tuple[Any, ...]
+    to_text: Callable[..., str]
+
+    @property
+    def cursor_key(self) -> str:
+        return f"embedding_backfill.{self.table}.last_id"
+
+
+@dataclass
+class BackfillStats:
+    table: str
+    embedded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    batches: int = 0
+    elapsed: float = 0.0
+
+
+def _todo_text(title: str, body: str | None) -> str:
+    return f"{title}\n\n{body}" if body else title
+
+
+TARGETS: tuple[BackfillTarget, ...] = (
+    BackfillTarget("memories", Memory, (Memory.content,), lambda content: content),
+    BackfillTarget("todos", Todo, (Todo.title, Todo.body), _todo_text),
+)
+
+
+async def _load_cursor(session: AsyncSession, key: str) -> int:
+    row = await session.get(UserSetting, key)
+    try:
+        return int(row.value) if row else 0
+    except ValueError:
+        return 0
+
+
+async def _save_cursor(session: AsyncSession, key: str, last_id: int) -> None:
+    row = await session.get(UserSetting, key)
+    if row is None:
+        session.add(UserSetting(key=key, value=str(last_id)))
+    else:
+        row.value = str(last_id)
+
+
+async def _embed_rows(
+    target: BackfillTarget, rows: Sequence[Any], stats: BackfillStats
+) -> tuple[list[dict[str, Any]], int | None]:
+    """Embed a batch the model rejected one row at a time, skipping rows that still fail.
+
+    Returns the UPDATE parameters and the id of the last row dealt with, or
+    None in place of the id if the service went away before any row was.
+    """
+    values: list[dict[str, Any]] = []
+    done: int | None = None
+    for i, row in enumerate(rows):
+        try:
+            (vec,) = await embedding_batch([target.to_text(*row[1:])])
+        except Exception as exc:
+            if is_unreachable(exc):
+                stats.failed += len(rows) - i
+                break
+            logger.warning(
+                "Embedding backfill | %s | skipping id=%d until the next pass: %s",
+                target.table, row[0], exc,
+            )
+            stats.skipped += 1
+        else:
+            values.append({"id": row[0], "embedding": vec})
+        done = row[0]
+    return values, done
+
+
+async def _write_embeddings(
+    session: AsyncSession, model: Any, rows: list[dict[str, Any]]
+) -> None:
+    """Bulk UPDATE by primary key — one executemany round trip per batch.
+
+    Written against the table rather than the mapper, with ``updated_at`` pinned
+    to itself: filling in a vector is not an edit, so it must not reset
+    staleness, project activity, the change feed or collection versions.
+    """
+    table = model.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .values(
+            embedding=bindparam("vector", type_=table.c.embedding.type),
+            updated_at=table.c.updated_at,
+        )
+    )
+    await session.execute(
+        stmt, [{"row_id": r["id"], "vector": r["embedding"]} for r in rows]
+    )
+
+
+async def backfill_table(
+    session: AsyncSession,
+    target: BackfillTarget,
+    *,
+    batch_size: int,
+    min_interval: float = 0.0,
+) -> BackfillStats:
+    """Embed every row of ``target`` whose embedding is NULL, resuming from the saved cursor.
+
+    Stops early (leaving the cursor in place) if the embedding service is
+    unreachable, so the next run retries the same batch. A batch that fails for
+    any other reason is retried row by row and the rows that fail are skipped.
+    ``min_interval`` is the minimum number of seconds between batch starts.
+    """
+    stats = BackfillStats(table=target.table)
+    model = target.model
+    start = time.monotonic()
+    last_id = await _load_cursor(session, target.cursor_key)
+
+    while True:
+        batch_start = time.monotonic()
+        stmt = (
+            select(model.id, *target.columns)
+            .where(model.embedding.is_(None), model.id > last_id)
+            .order_by(model.id)
+            .limit(batch_size)
+        )
+        rows = (await session.execute(stmt)).all()
+        if not rows:
+            # Pass complete — next run starts from the beginning again
+            await _save_cursor(session, target.cursor_key, 0)
+            await session.commit()
+            break
+
+        done: int | None = rows[-1][0]
+        try:
+            vectors = await embedding_batch([target.to_text(*row[1:]) for row in rows])
+        except Exception as exc:
+            if is_unreachable(exc):
+                logger.warning(
+                    "Embedding backfill | %s | batch after id=%d failed; will resume next run",
+                    target.table, last_id, exc_info=True,
+                )
+                stats.failed += len(rows)
+                break
+            logger.warning(
+                "Embedding backfill | %s | batch after id=%d rejected (%s); retrying row by row",
+                target.table, last_id, exc,
+            )
+            values, done = await _embed_rows(target, rows, stats)
+        else:
+            values = [
+                {"id": row[0], "embedding": vec} for row, vec in zip(rows, vectors, strict=True)
+            ]
+
+        if values:
+            await _write_embeddings(session, model, values)
+        if done is not None:
+            last_id = done
+            await _save_cursor(session, target.cursor_key, last_id)
+            await session.commit()
+            stats.embedded += len(values)
+            stats.batches += 1
+        if done != rows[-1][0]:
+            break  # the service went away part-way through the batch
+
+        if len(rows) < batch_size:
+            continue  # next query returns nothing and resets the cursor
+        wait = min_interval - (time.monotonic() - batch_start)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    stats.elapsed = time.monotonic() - start
+    return stats
+
+
+async def run_embedding_backfill() -> None:
+    """Backfill NULL embeddings on all targets and log one metrics line per table."""
+    per_minute = settings.embedding_backfill_batches_per_minute
+    min_interval = 60.0 / per_minute if per_minute > 0 else 0.0
+
+    async with async_session_factory() as session:
+        for target in TARGETS:
+            stats = await backfill_table(
+                session,
+                target,
+                batch_size=settings.embedding_backfill_batch_size,
+                min_interval=min_interval,
+            )
+            rate = stats.embedded / stats.elapsed if stats.elapsed > 0 else 0.0
+            logger.info(
+                "Embedding backfill | %s | embedded=%d failed=%d skipped=%d batches=%d"
+                " | %.1fs (%.1f rows/s)",
+                stats.table, stats.embedded, stats.failed, stats.skipped, stats.batches,
+                stats.elapsed, rate,
+            )
+
+
+def embedding_backfill_sync() -> None:
+    """Sync wrapper for APScheduler."""
+    asyncio.run(run_embedding_backfill())
@@ -0,0 +1,152 @@
+"""Episode builder — turns finished conversations into episodic memories.
+
+The chat agent only sees the last 40 messages. Everything older is summarized
+here: messages are read past a stored watermark, split into conversations at
+idle gaps of ``episode_gap_minutes`` (and at ``episode_max_messages``), and
+each finished episode is summarized by the local model, embedded, and stored
+as a ``MemoryType.EPISODIC`` memory. build_system_prompt then retrieves the
+few episodes relevant to the current message.
+
+A conversation still in progress (last message newer than the gap) is left
+for the next run, as is one that runs past the ``_READ_LIMIT`` messages read
+in a run.
+"""
+
+import asyncio
+import datetime
+import logging
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from istari.config.settings import settings
+from istari.db.session import async_session_factory
+from istari.llm.router import completion
+from istari.models.conversation import ConversationMessage
+from istari.models.memory import MemoryType
+from istari.models.user import UserSetting
+from istari.tools.memory.store import MemoryStore
+
+logger = logging.getLogger(__name__)
+
+_CURSOR_KEY = "episodes.last_message_id"
+_READ_LIMIT = 500           # messages summarized per run, at most
+_MAX_MESSAGE_CHARS = 1000   # per message, in the summarization transcript
+
+_SUMMARY_PROMPT = """\
+Summarize this past conversation between the user and their assistant so it can be
+recalled later. Write 2-4 sentences covering what the user asked about or shared,
+decisions made, and anything left open. Mention concrete names, dates, and places.
+Output only the summary.
+
+{transcript}
+"""
+
+
+def _utc(dt: datetime.datetime) -> datetime.datetime:
+    return dt if dt.tzinfo else dt.replace(tzinfo=datetime.UTC)
+
+
+def split_episodes(
+    messages: list[ConversationMessage],
+    gap: datetime.timedelta,
+    max_messages: int,
+    now: datetime.datetime,
+) -> list[list[ConversationMessage]]:
+    """Split chronological messages into finished episodes.
+
+    A new episode starts after an idle gap longer than ``gap`` or once the
+    current one reaches ``max_messages``. The trailing episode is only returned
+    if it is already idle for longer than ``gap`` or is full.
+    """
+    episodes: list[list[ConversationMessage]] = []
+    current: list[ConversationMessage] = []
+    for msg in messages:
+        if current and (
+            len(current) >= max_messages
+            or _utc(msg.created_at) - _utc(current[-1].created_at) > gap
+        ):
+            episodes.append(current)
+            current = []
+        current.append(msg)
+    if current and (len(current) >= max_messages or now - _utc(current[-1].created_at) > gap):
+        episodes.append(current)
+    return episodes
+
+
+async def _summarize(episode: list[ConversationMessage]) -> str:
+    transcript = "\n".join(
+        f"{m.role.capitalize()}: {m.content[:_MAX_MESSAGE_CHARS]}" for m in episode
+    )
+    result = await completion(
+        "episode_summary",
+        [{"role": "user", "content": _SUMMARY_PROMPT.format(transcript=transcript)}],
+    )
+    return (result.choices[0].message.content or "").strip()
+
+
+async def _save_cursor(session: AsyncSession, last_id: int) -> None:
+    row = await session.get(UserSetting, _CURSOR_KEY)
+    if row is None:
+        session.add(UserSetting(key=_CURSOR_KEY, value=str(last_id)))
+    else:
+        row.value = str(last_id)
+
+
+async def build_episodes_in_session(session: AsyncSession) -> int:
+    """Summarize finished conversations past the watermark; returns episodes stored."""
+    row = await session.get(UserSetting, _CURSOR_KEY)
+    last_id = int(row.value) if row and row.value.isdigit() else 0
+
+    stmt = (
+        select(ConversationMessage)
+        .where(ConversationMessage.id > last_id)
+        .order_by(ConversationMessage.id)
+        .limit(_READ_LIMIT + 1)
+    )
+    messages = list((await session.execute(stmt)).scalars().all())
+    episodes = split_episodes(
+        messages,
+        gap=datetime.timedelta(minutes=settings.episode_gap_minutes),
+        max_messages=settings.episode_max_messages,
+        now=datetime.datetime.now(datetime.UTC),
+    )
+    if len(messages) > _READ_LIMIT:
+        # The extra message only shows whether the one before it ends a
+        # conversation; the episode holding it may run on past the read
+        episodes = [e for e in episodes if e[-1] is not messages[-1]]
+
+    store = MemoryStore(session)
+    stored = 0
+    for episode in episodes:
+        try:
+            summary = await _summarize(episode)
+        except Exception:
+            logger.warning("Episode summary failed; will retry next run", exc_info=True)
+            break
+        first, last = episode[0], episode[-1]
+        if summary:
+            day = _utc(first.created_at).date().isoformat()
+            await store.store(
+                f"[{day}] {summary}",
+                source=f"conversation:{first.id}-{last.id}",
+                type=MemoryType.EPISODIC,
+            )
+            stored += 1
+        await _save_cursor(session, last.id)
+        await session.commit()
+    return stored
+
+
+async def build_episodes() -> None:
+    """Scheduled entry point — one metrics line per run."""
+    start = time.monotonic()
+    async with async_session_factory() as session:
+        stored = await build_episodes_in_session(session)
+    logger.info("Episode builder | stored %d episode(s) | %.1fs", stored, time.monotonic() - start)
+
+
+def episodes_sync() -> None:
+    """Sync wrapper for APScheduler."""
+    asyncio.run(build_episodes())
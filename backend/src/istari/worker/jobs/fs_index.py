@@ -0,0 +1,22 @@
+"""Filesystem index refresh — re-indexes files changed under the configured roots."""
+
+import asyncio
+import logging
+
+from istari.config.settings import settings
+from istari.tools.filesystem.index import get_file_index
+
+logger = logging.getLogger(__name__)
+
+
+async def refresh_file_index() -> None:
+    """Scan ``fs_index_roots`` by mtime and update the search index."""
+    index = get_file_index()
+    if index is None:
+        return
+    await asyncio.to_thread(index.refresh, settings.fs_index_roots)
+
+
+def fs_index_sync() -> None:
+    """Sync wrapper for APScheduler."""
+    asyncio.run(refresh_file_index())
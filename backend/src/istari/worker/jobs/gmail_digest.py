@@ -2,25 +2,61 @@
 
 import asyncio
 import logging
+from dataclasses import asdict
+from typing import Any
 
 from istari.agents.proactive import proactive_graph
 from istari.config.settings import settings
 from istari.db.session import async_session_factory
+from istari.tools.gmail.mirror import MailMirror
+from istari.tools.gmail.reader import GmailReader
 from istari.tools.notification.manager import NotificationManager
 
 logger = logging.getLogger(__name__)
 
 
+async def _undigested_from_mirror() -> list[dict[str, Any]] | None:
+    """Sync the mail mirror and return unread mail no digest has reported yet.
+
+    None when the mirror is off or unavailable; the graph then scans Gmail.
+    """
+    if not settings.gmail_mirror_enabled:
+        return None
+    try:
+        reader = GmailReader(settings.gmail_token_path)
+    except FileNotFoundError:
+        return None
+    try:
+        async with async_session_factory() as session:
+            mirror = MailMirror(session)
+            await mirror.sync(reader, settings.gmail_mirror_bootstrap_max)
+            await session.commit()
+            emails = await mirror.list_undigested_unread(settings.gmail_max_results)
+    except Exception:
+        logger.exception("Gmail mirror sync failed — scanning Gmail directly")
+        return None
+    return [asdict(e) for e in emails]
+
+
 async def run_gmail_digest() -> None:
-    """Scan Gmail, produce actionable digest, queue as notification."""
-    result = await proactive_graph.ainvoke({
+    """Scan Gmail, produce actionable digest, queue as notification.
+
+    With the mail mirror available, only mail that arrived (unread) since
+    the last digest is summarized, and is marked digested afterwards.
+    """
+    state: dict[str, Any] = {
         "task_type": "gmail_digest",
         "gmail_token_path": settings.gmail_token_path,
         "gmail_max_results": settings.gmail_max_results,
-    })
+    }
+    emails = await _undigested_from_mirror()
+    if emails is not None:
+        state["emails"] = emails
+    result = await proactive_graph.ainvoke(state)
 
     notifications = result.get("notifications", [])
-    if not notifications:
+    digested = [e["id"] for e in emails or []]
+    if not notifications and not digested:
         logger.info("Gmail digest produced no notifications")
         return
 
@@ -28,8 +64,12 @@ async def run_gmail_digest() -> None:
         mgr = NotificationManager(session)
         for notif in notifications:
             await mgr.create(type=notif["type"], content=notif["content"])
+        await MailMirror(session).mark_digested(digested)
         await session.commit()
-        logger.info("Gmail digest created %d notification(s)", len(notifications))
+        logger.info(
+            "Gmail digest created %d notification(s) covering %d new email(s)",
+            len(notifications), len(digested),
+        )
 
 
 def gmail_digest_sync() -> None:
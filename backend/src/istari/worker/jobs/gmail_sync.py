@@ -0,0 +1,30 @@
+"""Gmail mirror sync — pulls Gmail changes into the local mail mirror every few minutes."""
+
+import asyncio
+import logging
+
+from istari.config.settings import settings
+from istari.db.session import async_session_factory
+from istari.tools.gmail.mirror import MailMirror
+from istari.tools.gmail.reader import GmailReader
+
+logger = logging.getLogger(__name__)
+
+
+async def sync_gmail_mirror() -> None:
+    """Apply Gmail history since the last sync to the mirror."""
+    if not settings.gmail_mirror_enabled:
+        return
+    try:
+        reader = GmailReader(settings.gmail_token_path)
+    except FileNotFoundError:
+        logger.info("Gmail sync: no Gmail token — skipping")
+        return
+    async with async_session_factory() as session:
+        await MailMirror(session).sync(reader, settings.gmail_mirror_bootstrap_max)
+        await session.commit()
+
+
+def gmail_sync_sync() -> None:
+    """Sync wrapper for APScheduler."""
+    asyncio.run(sync_gmail_mirror())
@@ -1,6 +1,222 @@
-"""Pattern learning update — runs periodically to update user preference model."""
+"""Pattern learning update — runs overnight to keep the memory layer small and high-signal.
+
+Memories only ever accumulate at write time, so this job consolidates them:
+  1. Cluster near-duplicate memories by embedding distance (pgvector kNN per memory)
+  2. Merge each cluster into one fact with the local model; archive the originals
+  3. Decay confidence of memories not referenced in ``memory_decay_days``
+  4. Archive auto-extracted memories whose confidence fell below the threshold
+
+Facts the user stated explicitly (source="chat") decay but are never evicted.
+Episodic memories are left alone: they are the long-term record of past
+conversations, recalled by similarity rather than kept small.
+"""
+
+import asyncio
+import datetime
+import logging
+import time
+from collections.abc import Iterable
+
+from sqlalchemy import func, or_, select, true, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from istari.config.settings import settings
+from istari.db.session import async_session_factory
+from istari.llm.router import completion
+from istari.llm.router import embedding as generate_embedding
+from istari.models.memory import Memory, MemoryType
+
+logger = logging.getLogger(__name__)
+
+_PROTECTED_SOURCE = "chat"
+_MAX_CLUSTER = 8  # larger clusters are merged over several nights
+# Nearest neighbours looked up per memory when finding duplicates
+_NEIGHBOURS = _MAX_CLUSTER
+
+_MERGE_PROMPT = """\
+The following stored facts about the user overlap or repeat each other.
+Rewrite them as ONE concise fact that keeps every distinct detail.
+If they conflict, prefer the most specific statement.
+Output only the fact — no preamble, no bullet, no quotes.
+
+{facts}
+"""
+
+
+def cluster_pairs(pairs: Iterable[tuple[int, int]]) -> list[list[int]]:
+    """Group linked id pairs around seeds, smallest id first.
+
+    Each pair links two memories within the duplicate distance. A cluster
+    is a seed plus every unclustered id linked to the seed itself. Links
+    through other members are not followed, so a chain of small steps can't
+    pull in facts far from the seed.
+    """
+    links: dict[int, set[int]] = {}
+    for a, b in pairs:
+        links.setdefault(a, set()).add(b)
+        links.setdefault(b, set()).add(a)
+
+    clustered: set[int] = set()
+    clusters: list[list[int]] = []
+    for seed in sorted(links):
+        if seed in clustered:
+            continue
+        members = sorted(links[seed] - clustered)
+        if members:
+            cluster = [seed, *members]
+            clustered.update(cluster)
+            clusters.append(cluster)
+    return clusters
+
+
+async def find_duplicate_pairs(session: AsyncSession, max_distance: float) -> list[tuple[int, int]]:
+    """Return (id, id) pairs of live non-episodic memories within ``max_distance``.
+
+    Each memory looks up its ``_NEIGHBOURS`` nearest of the same type through
+    the embedding index (a LATERAL ORDER BY <=> LIMIT k), so the job does N
+    index probes rather than comparing every pair.
+    """
+    m = aliased(Memory)
+    n = aliased(Memory)
+    distance = n.embedding.cosine_distance(m.embedding)
+    nearest = (
+        select(n.id.label("id"), distance.label("distance"))
+        .where(
+            n.id != m.id,
+            n.type == m.type,
+            n.archived_at.is_(None),
+            n.embedding.isnot(None),
+        )
+        .order_by(distance)
+        .limit(_NEIGHBOURS)
+        .correlate(m)
+        .lateral()
+    )
+    stmt = (
+        select(m.id, nearest.c.id)
+        .join(nearest, true())
+        .where(
+            m.archived_at.is_(None),
+            m.embedding.isnot(None),
+            m.type != MemoryType.EPISODIC,
+            nearest.c.distance < max_distance,
+        )
+    )
+    result = await session.execute(stmt)
+    # A pair is usually found from both ends
+    return sorted({(min(a, b), max(a, b)) for a, b in result.all()})
+
+
+async def _merge_text(contents: list[str]) -> str:
+    """Ask the local model for a single merged fact; empty string on failure."""
+    facts = "\n".join(f"- {c}" for c in contents)
+    try:
+        result = await completion(
+            "memory_consolidation",
+            [{"role": "user", "content": _MERGE_PROMPT.format(facts=facts)}],
+        )
+        return (result.choices[0].message.content or "").strip().strip('"')
+    except Exception:
+        logger.warning("Memory consolidation LLM call failed", exc_info=True)
+        return ""
+
+
+async def merge_cluster(session: AsyncSession, ids: list[int]) -> Memory | None:
+    """Replace a cluster of memories with one merged memory; originals are archived."""
+    result = await session.execute(
+        select(Memory).where(Memory.id.in_(ids)).order_by(Memory.created_at, Memory.id)
+    )
+    members = list(result.scalars().all())
+    if len(members) < 2:
+        return None
+
+    content = await _merge_text([m.content for m in members])
+    if not content:
+        return None
+
+    vec: list[float] | None = None
+    try:
+        vec = await generate_embedding(content)
+    except Exception:
+        logger.debug("Merged memory stored without vector; backfill will embed it", exc_info=True)
+
+    referenced = [m.last_referenced_at for m in members if m.last_referenced_at is not None]
+    sources = {m.source for m in members}
+    merged = Memory(
+        type=members[0].type,
+        content=content,
+        confidence=max(m.confidence for m in members),
+        last_referenced_at=max(referenced) if referenced else None,
+        source=_PROTECTED_SOURCE if _PROTECTED_SOURCE in sources else "consolidated",
+        embedding=vec,
+    )
+    session.add(merged)
+
+    now = datetime.datetime.now(datetime.UTC)
+    for m in members:
+        m.archived_at = now
+    await session.flush()
+    return merged
+
+
+async def decay_unreferenced(session: AsyncSession, days: int, factor: float) -> int:
+    """Multiply confidence by ``factor`` for non-episodic memories unreferenced for ``days``."""
+    cutoff = datetime.datetime.now(datetime.UTC) - datetime.timedelta(days=days)
+    stmt = (
+        update(Memory)
+        .where(
+            Memory.type != MemoryType.EPISODIC,
+            Memory.archived_at.is_(None),
+            func.coalesce(Memory.last_referenced_at, Memory.created_at) < cutoff,
+        )
+        .values(confidence=Memory.confidence * factor)
+    )
+    result = await session.execute(stmt)
+    return result.rowcount  # type: ignore[attr-defined, no-any-return]
+
+
+async def archive_low_confidence(session: AsyncSession, threshold: float) -> int:
+    """Archive live non-episodic, non-user-stated memories with confidence below ``threshold``."""
+    stmt = (
+        update(Memory)
+        .where(
+            Memory.type != MemoryType.EPISODIC,
+            Memory.archived_at.is_(None),
+            Memory.confidence < threshold,
+            or_(Memory.source.is_(None), Memory.source != _PROTECTED_SOURCE),
+        )
+        .values(archived_at=datetime.datetime.now(datetime.UTC))
+    )
+    result = await session.execute(stmt)
+    return result.rowcount  # type: ignore[attr-defined, no-any-return]
 
 
 async def update_learned_patterns() -> None:
-    """Analyze user behavior and update inferred preferences."""
-    raise NotImplementedError
+    """Consolidate, decay, and evict memories so prompt injection stays bounded."""
+    start = time.monotonic()
+
+    async with async_session_factory() as session:
+        pairs = await find_duplicate_pairs(session, settings.memory_duplicate_distance)
+        clusters = cluster_pairs(pairs)
+        merged = 0
+        for ids in clusters:
+            if await merge_cluster(session, ids[:_MAX_CLUSTER]) is not None:
+                merged += 1
+                await session.commit()
+
+        decayed = await decay_unreferenced(
+            session, settings.memory_decay_days, settings.memory_decay_factor
+        )
+        archived = await archive_low_confidence(session, settings.memory_archive_confidence)
+        await session.commit()
+
+    logger.info(
+        "Memory consolidation | clusters=%d merged=%d decayed=%d archived=%d | %.1fs",
+        len(clusters), merged, decayed, archived, time.monotonic() - start,
+    )
+
+
+def learning_sync() -> None:
+    """Sync wrapper for APScheduler."""
+    asyncio.run(update_learned_patterns())
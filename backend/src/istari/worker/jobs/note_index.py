@@ -0,0 +1,28 @@
+"""Note index refresh — re-chunks changed notes and embeds chunks missing vectors."""
+
+import asyncio
+import logging
+
+from istari.config.settings import settings
+from istari.db.session import async_session_factory
+from istari.tools.filesystem.semantic import NoteIndex
+
+logger = logging.getLogger(__name__)
+
+
+async def refresh_note_index() -> None:
+    """Bring the semantic note index up to date with ``note_index_roots``."""
+    if not settings.note_index_enabled:
+        return
+    async with async_session_factory() as session:
+        r = await NoteIndex(session).refresh()
+    logger.info(
+        "Note index | scanned=%d changed=%d removed=%d chunks=%d reused=%d "
+        "embedded=%d pending=%d | %.1fs",
+        r.scanned, r.changed, r.removed, r.chunks, r.reused, r.embedded, r.failed, r.seconds,
+    )
+
+
+def note_index_sync() -> None:
+    """Sync wrapper for APScheduler."""
+    asyncio.run(refresh_note_index())
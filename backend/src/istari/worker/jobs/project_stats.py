@@ -0,0 +1,32 @@
+"""Project stats consistency check — repairs drift in the project_stats table.
+
+ProjectStats rows are recomputed by the ORM write paths as todos and projects
+change. Raw SQL, manual edits, or a write that bypassed the session hooks can
+still leave a row behind; this job compares every row against a fresh
+aggregate and rewrites the ones that differ.
+"""
+
+import asyncio
+import logging
+
+from istari.db.session import async_session_factory
+from istari.tools.project.manager import ProjectManager
+
+logger = logging.getLogger(__name__)
+
+
+async def repair_project_stats() -> None:
+    """Recompute drifted project stats rows; logs a warning when any are found."""
+    async with async_session_factory() as session:
+        drifted = await ProjectManager(session).repair_stats()
+        await session.commit()
+
+    if drifted:
+        logger.warning("Project stats repair: fixed %d drifted row(s): %s", len(drifted), drifted)
+    else:
+        logger.info("Project stats repair: no drift")
+
+
+def project_stats_sync() -> None:
+    """Sync wrapper for APScheduler."""
+    asyncio.run(repair_project_stats())
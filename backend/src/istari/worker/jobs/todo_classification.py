@@ -0,0 +1,45 @@
+"""Todo classification sweep — drains the Eisenhower classification queue.
+
+The chat API classifies todos it just created right after responding. This job
+picks up whatever is still queued: todos created while Ollama was down, or when
+the API process restarted before getting to them.
+"""
+
+import asyncio
+import logging
+
+from istari.config.settings import settings
+from istari.db.session import async_session_factory
+from istari.tools.notification.manager import NotificationManager
+from istari.tools.todo.classification import classify_pending, uncertain_prompt
+
+logger = logging.getLogger(__name__)
+
+_MAX_BATCHES = 10  # per run; the rest waits for the next run
+
+
+async def drain_classification_queue() -> None:
+    """Classify queued todos batch by batch until the queue is empty or the model fails."""
+    classified = 0
+    uncertain: list[str] = []
+    async with async_session_factory() as session:
+        for _ in range(_MAX_BATCHES):
+            batch = await classify_pending(session, limit=settings.todo_classification_batch_size)
+            await session.commit()
+            if not batch.classified_ids:
+                break
+            classified += len(batch.classified_ids)
+            uncertain.extend(batch.uncertain_titles)
+
+        if uncertain:
+            await NotificationManager(session).create(
+                type="todo_classification", content=uncertain_prompt(uncertain)
+            )
+            await session.commit()
+
+    logger.info("Todo classification: %d classified, %d uncertain", classified, len(uncertain))
+
+
+def todo_classification_sync() -> None:
+    """Sync wrapper for APScheduler."""
+    asyncio.run(drain_classification_queue())
@@ -65,10 +65,19 @@ def main() -> None:
     logger.info("Starting Istari worker")
 
     from istari.worker.jobs.backup import backup_sync
+    from istari.worker.jobs.calendar_sync import calendar_sync_sync
     from istari.worker.jobs.deadline_nudge import deadline_nudge_sync
+    from istari.worker.jobs.embedding_backfill import embedding_backfill_sync
+    from istari.worker.jobs.episodes import episodes_sync
+    from istari.worker.jobs.fs_index import fs_index_sync
     from istari.worker.jobs.gmail_digest import gmail_digest_sync
+    from istari.worker.jobs.gmail_sync import gmail_sync_sync
+    from istari.worker.jobs.learning import learning_sync
+    from istari.worker.jobs.note_index import note_index_sync
     from istari.worker.jobs.project_staleness import project_staleness_sync
+    from istari.worker.jobs.project_stats import project_stats_sync
     from istari.worker.jobs.staleness import staleness_sync
+    from istari.worker.jobs.todo_classification import todo_classification_sync
 
     scheduler = BlockingScheduler()
 
@@ -93,6 +102,34 @@ def main() -> None:
         CronTrigger.from_crontab(afternoon_cron),
         id="gmail_digest_afternoon",
     )
+    # Keeps the mail mirror fresh for chat searches; runs through quiet hours
+    # so the morning digest only has the night's delta to pull
+    gmail_sync_cron = schedules.get("gmail_sync", {}).get("cron", "*/5 * * * *")
+    scheduler.add_job(
+        gmail_sync_sync,
+        CronTrigger.from_crontab(gmail_sync_cron),
+        id="gmail_sync",
+    )
+    calendar_sync_cron = schedules.get("calendar_sync", {}).get("cron", "*/5 * * * *")
+    scheduler.add_job(
+        calendar_sync_sync,
+        CronTrigger.from_crontab(calendar_sync_cron),
+        id="calendar_sync",
+    )
+    # Incremental: an unchanged tree costs one stat per file
+    fs_index_cron = schedules.get("fs_index", {}).get("cron", "*/10 * * * *")
+    scheduler.add_job(
+        fs_index_sync,
+        CronTrigger.from_crontab(fs_index_cron),
+        id="fs_index",
+    )
+    # Unchanged notes cost one stat; only changed chunks are re-embedded
+    note_index_cron = schedules.get("note_index", {}).get("cron", "*/15 * * * *")
+    scheduler.add_job(
+        note_index_sync,
+        CronTrigger.from_crontab(note_index_cron),
+        id="note_index",
+    )
     scheduler.add_job(
         respect_quiet_hours(staleness_sync),
         CronTrigger.from_crontab(staleness_cron),
@@ -117,6 +154,42 @@ def main() -> None:
         id="backup_daily",
     )
 
+    embedding_backfill_cron = schedules.get("embedding_backfill", {}).get("cron", "*/30 * * * *")
+    scheduler.add_job(
+        embedding_backfill_sync,
+        CronTrigger.from_crontab(embedding_backfill_cron),
+        id="embedding_backfill",
+    )
+
+    classification_cron = schedules.get("todo_classification", {}).get("cron", "*/5 * * * *")
+    scheduler.add_job(
+        todo_classification_sync,
+        CronTrigger.from_crontab(classification_cron),
+        id="todo_classification",
+    )
+
+    episode_cron = schedules.get("episode_builder", {}).get("cron", "20 * * * *")
+    scheduler.add_job(
+        episodes_sync,
+        CronTrigger.from_crontab(episode_cron),
+        id="episode_builder",
+    )
+
+    project_stats_cron = schedules.get("project_stats_repair", {}).get("cron", "40 2 * * *")
+    scheduler.add_job(
+        project_stats_sync,
+        CronTrigger.from_crontab(project_stats_cron),
+        id="project_stats_repair",
+    )
+
+    # Overnight memory consolidation — runs inside quiet hours by design
+    learning_cron = schedules.get("learning_update", {}).get("cron", "0 3 * * *")
+    scheduler.add_job(
+        learning_sync,
+        CronTrigger.from_crontab(learning_cron),
+        id="learning_update",
+    )
+
     logger.info(
         "Worker scheduler starting with %d jobs (quiet hours %d:00-%d:00)",
         len(scheduler.get_jobs()),
@@ -1,9 +1,11 @@
 """Shared test fixtures: test DB, sessions, mocks."""
 
+import json
+
 import pytest
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import Text, event
-from sqlalchemy.dialects.postgresql import ARRAY, JSON
+from sqlalchemy import Text, TypeDecorator, event
+from sqlalchemy.dialects.postgresql import ARRAY, JSON, TSVECTOR
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
 
@@ -28,12 +30,54 @@ def mock_generate_embedding_global(monkeypatch):
     monkeypatch.setattr("istari.tools.memory.store.generate_embedding", _no_embed)
 
 
+@pytest.fixture(autouse=True)
+def fresh_todo_view_cache():
+    """Give each test its own todo view cache.
+
+    Every test database starts its collection versions from zero, so entries
+    cached by one test would be current for the next.
+    """
+    from istari.tools.todo.view_cache import reset_view_cache
+
+    reset_view_cache()
+    yield
+    reset_view_cache()
+
+
+@pytest.fixture(autouse=True)
+def isolated_file_index(tmp_path, monkeypatch):
+    """Point the filesystem search index at a per-test file, never the real one."""
+    from istari.config.settings import settings
+    from istari.tools.filesystem.index import reset_file_index
+
+    monkeypatch.setattr(settings, "fs_index_path", str(tmp_path / "fs_index.sqlite3"))
+    reset_file_index()
+    yield
+    reset_file_index()
+
+
+class _VectorText(TypeDecorator):  # type: ignore[type-arg]
+    """pgvector column stand-in: vectors round-trip as JSON text."""
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):  # type: ignore[no-untyped-def]
+        return None if value is None else json.dumps([float(x) for x in value])
+
+    def process_result_value(self, value, dialect):  # type: ignore[no-untyped-def]
+        return None if value is None else json.loads(value)
+
+
 @pytest.fixture
 async def db_session():
     """Async SQLite session for unit tests.
 
     Adapts PostgreSQL-specific column types (Vector, ARRAY, JSON) to
     SQLite-compatible equivalents so models can be tested without PostgreSQL.
+    Vectors are stored as JSON text; vector operators are Postgres-only.
+    Generated TSVECTOR columns become plain nullable text; full-text search
+    itself is Postgres-only.
     """
     from istari.models.base import Base
 
@@ -52,8 +96,14 @@ async def db_session():
         def _create_tables(sync_conn):  # type: ignore[no-untyped-def]
             for table in Base.metadata.tables.values():
                 for column in table.columns:
-                    if isinstance(column.type, (Vector, ARRAY, JSON)):
+                    if isinstance(column.type, Vector):
+                        column.type = _VectorText()
+                    elif isinstance(column.type, (ARRAY, JSON)):
+                        column.type = Text()
+                    elif isinstance(column.type, TSVECTOR):
                         column.type = Text()
+                        column.computed = None
+                        column.server_default = None
             Base.metadata.create_all(sync_conn)
 
         await conn.run_sync(_create_tables)
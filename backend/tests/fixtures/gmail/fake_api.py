@@ -0,0 +1,244 @@
+"""Fake Gmail API — an in-memory mailbox behind a local HTTP server.
+
+Speaks enough of the Gmail v1 REST API for GmailReader: messages.list,
+batched messages.get (metadata), users.getProfile and history.list, with
+history ids, history expiry and injectable per-message failures. Every HTTP
+round trip is recorded, and each one sleeps ``latency`` seconds.
+
+``serve_fake_gmail`` points the shared Google service cache at the server,
+so a real GmailReader built inside it talks to the fake over HTTP.
+"""
+
+import datetime
+import email.parser
+import json
+import re
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+from istari.tools.google import services
+from istari.tools.google.services import clear_service_cache
+
+_EPOCH = datetime.datetime(2025, 2, 10, 9, 0, tzinfo=datetime.UTC)
+
+
+class FakeGmail:
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.messages: dict[str, dict[str, Any]] = {}
+        self.order: list[str] = []  # newest first, as Gmail lists
+        self.history: list[dict[str, Any]] = []
+        self.history_id = 1000
+        self.oldest_history_id = 1000
+        self.round_trips: list[str] = []
+        # message id -> statuses to answer with, in order, before succeeding
+        self.failures: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    # --- Mailbox changes -------------------------------------------------
+
+    def add_message(
+        self,
+        subject: str = "Hello",
+        sender: str = "sender@test.com",
+        snippet: str = "",
+        labels: Iterable[str] = ("INBOX", "UNREAD"),
+        msg_id: str | None = None,
+    ) -> str:
+        with self._lock:
+            self._next_id += 1
+            msg_id = msg_id or f"m{self._next_id:03d}"
+            received = _EPOCH + datetime.timedelta(minutes=self._next_id)
+            self.messages[msg_id] = {
+                "id": msg_id,
+                "threadId": f"t{msg_id}",
+                "labelIds": list(labels),
+                "snippet": snippet or f"snippet {msg_id}",
+                "internalDate": str(int(received.timestamp() * 1000)),
+                "payload": {"headers": [
+                    {"name": "Subject", "value": subject},
+                    {"name": "From", "value": sender},
+                    {"name": "Date", "value": received.strftime("%a, %d %b %Y %H:%M:%S +0000")},
+                ]},
+            }
+            self.order.insert(0, msg_id)
+            self._record("messagesAdded", msg_id)
+        return msg_id
+
+    def delete_message(self, msg_id: str) -> None:
+        with self._lock:
+            self._record("messagesDeleted", msg_id)
+            del self.messages[msg_id]
+            self.order.remove(msg_id)
+
+    def modify_labels(
+        self, msg_id: str, add: Iterable[str] = (), remove: Iterable[str] = ()
+    ) -> None:
+        add, remove = list(add), list(remove)
+        with self._lock:
+            message = self.messages[msg_id]
+            labels = [label for label in message["labelIds"] if label not in remove]
+            message["labelIds"] = labels + [label for label in add if label not in labels]
+            if add:
+                self._record("labelsAdded", msg_id, add)
+            if remove:
+                self._record("labelsRemoved", msg_id, remove)
+
+    def expire_history(self) -> None:
+        """Forget all history so far, as Gmail does after about a week."""
+        with self._lock:
+            self.oldest_history_id = self.history_id + 1
+            self.history.clear()
+
+    def _record(self, kind: str, msg_id: str, label_ids: list[str] | None = None) -> None:
+        self.history_id += 1
+        message = self.messages[msg_id]
+        item: dict[str, Any] = {"message": {
+            "id": msg_id, "threadId": message["threadId"], "labelIds": list(message["labelIds"]),
+        }}
+        if label_ids is not None:
+            item["labelIds"] = label_ids
+        self.history.append({"id": str(self.history_id), kind: [item]})
+
+    # --- API responses ---------------------------------------------------
+
+    def list_messages(self, query: dict[str, list[str]]) -> dict[str, Any]:
+        q = query.get("q", [""])[0]
+        limit = int(query.get("maxResults", ["100"])[0])
+        start = int(query.get("pageToken", ["0"])[0])
+        with self._lock:
+            ids = [
+                i for i in self.order
+                if not {"SPAM", "TRASH"} & set(self.messages[i]["labelIds"])
+                and ("is:unread" not in q or "UNREAD" in self.messages[i]["labelIds"])
+            ]
+        page = ids[start : start + limit]
+        body: dict[str, Any] = {"messages": [{"id": i, "threadId": f"t{i}"} for i in page]}
+        if start + limit < len(ids):
+            body["nextPageToken"] = str(start + limit)
+        return body
+
+    def get_message(self, msg_id: str) -> tuple[int, dict[str, Any]]:
+        with self._lock:
+            pending = self.failures.get(msg_id)
+            if pending:
+                status = pending.pop(0)
+                return status, {"error": {"code": status, "message": "fake failure"}}
+            message = self.messages.get(msg_id)
+            if message is None:
+                return 404, {"error": {"code": 404, "message": "Not Found"}}
+            return 200, dict(message, historyId=str(self.history_id))
+
+    def list_history(self, query: dict[str, list[str]]) -> tuple[int, dict[str, Any]]:
+        start = int(query["startHistoryId"][0])
+        limit = int(query.get("maxResults", ["100"])[0])
+        offset = int(query.get("pageToken", ["0"])[0])
+        with self._lock:
+            if start < self.oldest_history_id:
+                return 404, {"error": {"code": 404, "message": "Requested entity was not found."}}
+            records = [r for r in self.history if int(r["id"]) > start]
+            body: dict[str, Any] = {
+                "history": records[offset : offset + limit],
+                "historyId": str(self.history_id),
+            }
+        if offset + limit < len(records):
+            body["nextPageToken"] = str(offset + limit)
+        return 200, body
+
+
+def _handler(fake: FakeGmail) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+        def _send(self, status: int, content_type: str, body: bytes) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _json(self, status: int, body: dict[str, Any]) -> None:
+            self._send(status, "application/json", json.dumps(body).encode())
+
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            kind = url.path.rsplit("/", 1)[-1]
+            fake.round_trips.append(kind)
+            time.sleep(fake.latency)
+            if url.path == "/gmail/v1/users/me/messages":
+                self._json(200, fake.list_messages(query))
+            elif url.path == "/gmail/v1/users/me/profile":
+                self._json(200, {"emailAddress": "me@test.com", "historyId": str(fake.history_id)})
+            elif url.path == "/gmail/v1/users/me/history":
+                self._json(*fake.list_history(query))
+            else:
+                self._json(404, {"error": {"code": 404, "message": "Not Found"}})
+
+        def do_POST(self) -> None:
+            fake.round_trips.append("batch")
+            time.sleep(fake.latency)
+            raw = self.rfile.read(int(self.headers["Content-Length"]))
+            header = f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode()
+            request = email.parser.BytesParser().parsebytes(header + raw)
+            boundary = "fake-batch-response"
+            out = []
+            for part in request.get_payload():
+                content_id = part["Content-ID"].strip("<>")
+                request_line = part.get_payload().splitlines()[0]
+                match = re.search(r"/messages/([^?\s]+)", request_line)
+                assert match is not None, request_line
+                status, body = fake.get_message(match.group(1))
+                out.append(
+                    f"--{boundary}\r\n"
+                    "Content-Type: application/http\r\n"
+                    f"Content-ID: <response-{content_id}>\r\n\r\n"
+                    f"HTTP/1.1 {status} X\r\n"
+                    "Content-Type: application/json\r\n\r\n"
+                    f"{json.dumps(body)}\r\n"
+                )
+            out.append(f"--{boundary}--\r\n")
+            self._send(200, f"multipart/mixed; boundary={boundary}", "".join(out).encode())
+
+    return Handler
+
+
+@contextmanager
+def serve_fake_gmail(fake: FakeGmail, token_dir: Path) -> Iterator[str]:
+    """Serve ``fake`` locally and yield a token path whose Gmail service targets it."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(fake))
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+
+    token = token_dir / "gmail_token.json"
+    expiry = datetime.datetime.now(datetime.UTC) + datetime.timedelta(hours=1)
+    token.write_text(json.dumps({
+        "token": "access",
+        "refresh_token": "refresh",
+        "client_id": "x",
+        "client_secret": "y",
+        "expiry": expiry.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }))
+    doc = dict(
+        services._discovery_doc("gmail", "v1"),
+        rootUrl=f"http://127.0.0.1:{server.server_port}/",
+    )
+    clear_service_cache()
+    try:
+        with patch.object(services, "_discovery_doc", return_value=doc):
+            yield str(token)
+    finally:
+        clear_service_cache()
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,26 @@
+"""Fixtures for tests that need a real PostgreSQL database.
+
+Set ``TEST_DATABASE_URL`` (asyncpg URL) to a database migrated with
+``alembic upgrade head``; without it these tests are skipped. Each test runs
+in a transaction that is rolled back.
+"""
+
+import os
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+
+@pytest.fixture
+async def pg_session():
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_async_engine(url)
+    async with engine.connect() as conn:
+        await conn.begin()
+        session = AsyncSession(bind=conn, expire_on_commit=False)
+        yield session
+        await session.close()
+        await conn.rollback()
+    await engine.dispose()
@@ -0,0 +1,33 @@
+"""ConversationStore full-text search against PostgreSQL's search_vector."""
+
+import pytest
+
+from istari.tools.conversation.store import ConversationStore
+
+pytestmark = pytest.mark.postgres
+
+
+class TestFullTextSearch:
+    async def test_stemmed_match_with_highlighted_snippet(self, pg_session):
+        store = ConversationStore(pg_session)
+        await store.save_message("user", "I moved my dentist appointments to Friday")
+        await store.save_message("user", "Groceries: milk and eggs")
+
+        hits = await store.search("dentist appointment")
+
+        assert len(hits) == 1
+        assert "**dentist**" in hits[0].snippet
+        assert "**appointments**" in hits[0].snippet
+
+    async def test_cursor_and_ranking(self, pg_session):
+        store = ConversationStore(pg_session)
+        await store.save_message("user", "dentist")
+        await store.save_message("user", "dentist dentist, the dentist again")
+        await store.save_message("user", "a note that mentions the dentist once among many words")
+
+        newest = await store.search("dentist", limit=1)
+        older = await store.search("dentist", limit=5, before_id=newest[0].id)
+        ranked = await store.search_ranked("dentist", limit=1)
+
+        assert all(h.id < newest[0].id for h in older)
+        assert "again" in ranked[0].snippet
@@ -178,6 +178,48 @@ class TestUpdateTodoStatusTool:
         assert "No TODOs found" in result
         assert ctx.todo_updated is False
 
+    async def test_complete_recurring_spawns_next_instance(self, db_session):
+        mgr = TodoManager(db_session)
+        await mgr.create("Water plants", recurrence_rule="FREQ=WEEKLY")
+        await db_session.flush()
+
+        ctx = AgentContext()
+        tools = {t.name: t for t in make_todo_tools(db_session, ctx)}
+        await tools["update_todo_status"].fn(query="water plants", status="done")
+
+        (spawned,) = await mgr.list_open()
+        assert spawned.title == "Water plants"
+        assert spawned.due_date is not None
+
+    async def test_update_already_in_status(self, db_session):
+        mgr = TodoManager(db_session)
+        todo = await mgr.create("Pay bills")
+        await mgr.set_status(todo.id, TodoStatus.COMPLETE)
+        await db_session.flush()
+
+        ctx = AgentContext()
+        tools = {t.name: t for t in make_todo_tools(db_session, ctx)}
+        result = await tools["update_todo_status"].fn(query=str(todo.id), status="complete")
+
+        assert "already complete" in result
+        assert ctx.todo_updated is False
+
+    async def test_already_in_status_id_does_not_fall_back_to_titles(self, db_session):
+        mgr = TodoManager(db_session)
+        todo = await mgr.create("Pay bills")
+        await mgr.set_status(todo.id, TodoStatus.COMPLETE)
+        other = await mgr.create(f"Pay invoice {todo.id}")
+        await db_session.flush()
+
+        ctx = AgentContext()
+        tools = {t.name: t for t in make_todo_tools(db_session, ctx)}
+        result = await tools["update_todo_status"].fn(query=str(todo.id), status="complete")
+
+        assert "already complete" in result
+        assert ctx.todo_updated is False
+        await db_session.refresh(other)
+        assert other.status == TodoStatus.OPEN
+
     async def test_update_invalid_status_returns_message(self, db_session):
         ctx = AgentContext()
         tools = {t.name: t for t in make_todo_tools(db_session, ctx)}
@@ -353,7 +395,9 @@ class TestGmailTools:
         email = self._make_email()
         mock_reader = self._mock_reader([email])
 
-        monkeypatch.setattr("istari.agents.tools.gmail.GmailReader", lambda token: mock_reader)
+        monkeypatch.setattr(
+            "istari.agents.tools.gmail.GmailReader", lambda token, mirror=None: mock_reader
+        )
         monkeypatch.setattr("istari.agents.tools.gmail.settings.gmail_token_path", "/fake/token")
 
         tools = {t.name: t for t in make_gmail_tools()}
@@ -367,7 +411,9 @@ class TestGmailTools:
         email = self._make_email()
         mock_reader = self._mock_reader([email])
 
-        monkeypatch.setattr("istari.agents.tools.gmail.GmailReader", lambda token: mock_reader)
+        monkeypatch.setattr(
+            "istari.agents.tools.gmail.GmailReader", lambda token, mirror=None: mock_reader
+        )
         monkeypatch.setattr("istari.agents.tools.gmail.settings.gmail_token_path", "/fake/token")
 
         tools = {t.name: t for t in make_gmail_tools()}
@@ -380,7 +426,9 @@ class TestGmailTools:
         email = self._make_email(thread_id="abc123")
         mock_reader = self._mock_reader([email])
 
-        monkeypatch.setattr("istari.agents.tools.gmail.GmailReader", lambda token: mock_reader)
+        monkeypatch.setattr(
+            "istari.agents.tools.gmail.GmailReader", lambda token, mirror=None: mock_reader
+        )
         monkeypatch.setattr("istari.agents.tools.gmail.settings.gmail_token_path", "/fake/token")
 
         tools = {t.name: t for t in make_gmail_tools()}
@@ -429,7 +477,7 @@ class TestCalendarTools:
         mock_reader = self._mock_reader([event])
 
         monkeypatch.setattr(
-            "istari.agents.tools.calendar.CalendarReader", lambda token: mock_reader
+            "istari.agents.tools.calendar.CalendarReader", lambda token, store=None: mock_reader
         )
         monkeypatch.setattr(
             "istari.agents.tools.calendar.settings.calendar_token_path", "/fake/token"
@@ -453,7 +501,7 @@ class TestCalendarTools:
         mock_reader = self._mock_reader([event])
 
         monkeypatch.setattr(
-            "istari.agents.tools.calendar.CalendarReader", lambda token: mock_reader
+            "istari.agents.tools.calendar.CalendarReader", lambda token, store=None: mock_reader
         )
         monkeypatch.setattr(
             "istari.agents.tools.calendar.settings.calendar_token_path", "/fake/token"
@@ -471,6 +519,35 @@ class TestCalendarTools:
         assert "Team standup" in result
         assert "](http" not in result  # no markdown link
 
+    async def test_find_free_slots_schedules_todos(self, db_session, monkeypatch):
+        from istari.tools.calendar import freebusy
+        from istari.tools.calendar.freebusy import BusyIndex
+
+        monday = datetime.datetime(2026, 10, 19, tzinfo=datetime.UTC)
+        real_plan = freebusy.plan_slots
+
+        async def fake_load(start, end, session=None):
+            return BusyIndex([(monday.replace(hour=9), monday.replace(hour=11))]), "store"
+
+        async def plan_monday(session, days, min_minutes, tasks=None, now=None):
+            return await real_plan(session, days, min_minutes, tasks, now=monday.replace(hour=8))
+
+        monkeypatch.setattr(freebusy, "load_busy_index", fake_load)
+        monkeypatch.setattr("istari.agents.tools.calendar.plan_slots", plan_monday)
+        monkeypatch.setattr("istari.agents.tools.calendar.settings.user_timezone", "UTC")
+        monkeypatch.setattr("istari.agents.tools.calendar.settings.working_hours_start", 9)
+        monkeypatch.setattr("istari.agents.tools.calendar.settings.working_hours_end", 17)
+        todo = await TodoManager(db_session).create(title="Draft proposal")
+
+        tools = {t.name: t for t in make_calendar_tools(db_session)}
+        result = await tools["find_free_slots"].fn(
+            days=1, todos=[{"id": todo.id, "minutes": 90}, {"id": 999}]
+        )
+
+        assert f"#{todo.id} Draft proposal (90 min): Mon 19 Oct 11:00-12:30" in result
+        assert "Not found: #999" in result
+        assert "- Mon 19 Oct 11:00-17:00 (360 min)" in result
+
 
 # ---------------------------------------------------------------------------
 # Tool schema format
@@ -600,3 +677,59 @@ class TestRunAgent:
         call_messages = mock_llm.call_args.kwargs["messages"]
         system_msg = call_messages[0]
         assert "Cody" in system_msg["content"]
+
+
+# ---------------------------------------------------------------------------
+# Conversation search tool
+# ---------------------------------------------------------------------------
+
+class TestSearchConversationsTool:
+    def _tool(self, db_session):  # type: ignore[no-untyped-def]
+        from istari.agents.tools.conversation import make_conversation_tools
+
+        (tool,) = make_conversation_tools(db_session)
+        return tool
+
+    async def test_formats_ranked_snippets_with_timestamps(self, db_session, monkeypatch):
+        from istari.tools.conversation.store import ConversationHit, ConversationStore
+
+        when = datetime.datetime(2026, 9, 1, 9, 30, tzinfo=datetime.UTC)
+
+        async def fake_ranked(self, query, limit=5):  # type: ignore[no-untyped-def]
+            return [
+                ConversationHit(1, "user", when, "moved the **dentist** to Friday", 0.4),
+                ConversationHit(2, "assistant", when, "**Dentist** reminder set", 0.2),
+            ]
+
+        monkeypatch.setattr(ConversationStore, "search_ranked", fake_ranked)
+
+        result = await self._tool(db_session).fn(query="dentist")
+
+        assert "[2026-09-01 09:30 UTC] User: moved the **dentist** to Friday" in result
+        assert result.index("User:") < result.index("Assistant:")
+
+    async def test_no_matches(self, db_session, monkeypatch):
+        from istari.tools.conversation.store import ConversationStore
+
+        async def fake_ranked(self, query, limit=5):  # type: ignore[no-untyped-def]
+            return []
+
+        monkeypatch.setattr(ConversationStore, "search_ranked", fake_ranked)
+
+        result = await self._tool(db_session).fn(query="zebra")
+
+        assert "No past messages" in result
+
+    async def test_searches_stored_messages(self, db_session):
+        from istari.tools.conversation.store import ConversationStore
+
+        await ConversationStore(db_session).save_turn(
+            "Moved the dentist to Friday", "Noted, dentist on Friday"
+        )
+        await ConversationStore(db_session).save_turn("Groceries tonight", "Added milk")
+
+        result = await self._tool(db_session).fn(query="dentist friday", limit=50)
+
+        assert "User: Moved the dentist to Friday" in result
+        assert "Assistant: Noted, dentist on Friday" in result
+        assert "Groceries" not in result
@@ -2,6 +2,7 @@
 
 
 from istari.agents.chat import _FALLBACK_SOUL, build_system_prompt
+from istari.models.memory import Memory, MemoryType
 from istari.tools.memory.store import MemoryStore
 
 
@@ -174,3 +175,33 @@ class TestBuildSystemPromptMemories:
 
         assert search_calls == []  # search not called without user_message
         assert "jazz" in prompt  # list_explicit used instead
+
+
+class TestBuildSystemPromptEpisodes:
+    async def test_injects_relevant_episodes(self, db_session, tmp_path, monkeypatch):
+        monkeypatch.setattr("istari.agents.chat._MEMORY_DIR", tmp_path)
+        (tmp_path / "SOUL.md").write_text("You are Istari.")
+
+        episode = Memory(
+            type=MemoryType.EPISODIC, content="[2026-04-02] Booked the dentist for May."
+        )
+
+        async def mock_episodes(self, query: str, top_k: int = 3, max_distance: float = 0.35):
+            return [episode]
+
+        monkeypatch.setattr("istari.tools.memory.store.MemoryStore.search_episodes", mock_episodes)
+
+        prompt = await build_system_prompt(db_session, user_message="when is the dentist?")
+
+        assert "Relevant past conversations" in prompt
+        assert "Booked the dentist" in prompt
+
+    async def test_no_episode_section_without_user_message(
+        self, db_session, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr("istari.agents.chat._MEMORY_DIR", tmp_path)
+        (tmp_path / "SOUL.md").write_text("You are Istari.")
+
+        prompt = await build_system_prompt(db_session)
+
+        assert "Relevant past conversations" not in prompt
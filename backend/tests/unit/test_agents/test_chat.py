@@ -288,6 +288,10 @@ class TestFormatToolStatus:
     def test_search_files_no_args(self):
         assert _format_tool_status("search_files", {}) == "Searching files..."
 
+    def test_semantic_search_files(self):
+        result = _format_tool_status("semantic_search_files", {"query": "kitchen plans"})
+        assert result == "Searching notes for 'kitchen plans'..."
+
     def test_unknown_tool_fallback(self):
         result = _format_tool_status("some_custom_tool", {})
         assert result == "Running Some Custom Tool..."
@@ -66,6 +66,43 @@ class TestReadFileTool:
 
         assert "relative content" in result
 
+    async def test_large_file_reports_size_and_next_offset(self, tmp_path, tools):
+        f = tmp_path / "app.log"
+        f.write_text("".join(f"event {i}\n" for i in range(5000)))
+
+        result = await tools["read_file"].fn(path=str(f))
+
+        assert result.startswith("event 0\n")
+        assert f"of {f.stat().st_size:,}" in result
+        assert "offset=" in result and "start_line=" in result
+
+    async def test_offset_and_length_page(self, tmp_path, tools):
+        f = tmp_path / "page.txt"
+        f.write_text("0123456789" * 2000)
+
+        result = await tools["read_file"].fn(path=str(f), offset=19_990, length=100)
+
+        assert result.startswith("0123456789")
+        assert "end of file" in result
+
+    async def test_line_range(self, tmp_path, tools):
+        f = tmp_path / "lines.txt"
+        f.write_text("".join(f"row {i}\n" for i in range(1, 101)))
+
+        result = await tools["read_file"].fn(path=str(f), start_line=40, end_line=41)
+
+        assert result.startswith("row 40\nrow 41\n")
+        assert "lines 40-41" in result
+        assert "start_line=42" in result
+
+    async def test_offset_with_line_range_is_rejected(self, tmp_path, tools):
+        f = tmp_path / "x.txt"
+        f.write_text("x")
+
+        result = await tools["read_file"].fn(path=str(f), offset=0, start_line=2)
+
+        assert "not both" in result
+
 
 # ---------------------------------------------------------------------------
 # search_files
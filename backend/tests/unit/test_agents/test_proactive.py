@@ -50,6 +50,16 @@ async def test_scan_gmail_node_token_not_found():
     assert result["emails"] == []
 
 
+@pytest.mark.asyncio
+async def test_scan_gmail_node_keeps_supplied_emails():
+    supplied = [{"id": "m9", "subject": "From mirror", "sender": "a@b.com", "snippet": ""}]
+    with patch("istari.tools.gmail.reader.GmailReader") as mock_cls:
+        result = await scan_gmail_node({"task_type": "gmail_digest", "emails": supplied})
+
+    mock_cls.assert_not_called()
+    assert result["emails"] == supplied
+
+
 @pytest.mark.asyncio
 async def test_check_staleness_node_with_session():
     mock_todo = MagicMock()
@@ -74,6 +74,22 @@ class TestListProjectsTool:
 
         assert "The next task" in result
 
+    async def test_list_counts_open_todos(self, db_session):
+        proj_mgr = ProjectManager(db_session)
+        todo_mgr = TodoManager(db_session)
+
+        project = await proj_mgr.create("Counted project")
+        for title in ("One", "Two", "Three"):
+            todo = await todo_mgr.create(title)
+            todo.project_id = project.id
+        await db_session.flush()
+
+        ctx = AgentContext()
+        tools = {t.name: t for t in make_project_tools(db_session, ctx)}
+        result = await tools["list_projects"].fn()
+
+        assert "next: none set | 3 open todos" in result
+
     async def test_list_all_includes_complete(self, db_session):
         from istari.models.project import ProjectStatus
 
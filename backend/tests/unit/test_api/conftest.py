@@ -0,0 +1,26 @@
+"""Shared fixtures for API route tests."""
+
+import httpx
+import pytest
+
+from istari.api.deps import get_db
+
+
+@pytest.fixture()
+def client_factory(db_session, monkeypatch: pytest.MonkeyPatch):  # type: ignore[no-untyped-def]
+    """Build clients for the app with auth off and ``db_session`` as the database."""
+    from istari.api.main import app
+    from istari.config import settings as settings_module
+
+    monkeypatch.setattr(settings_module.settings, "app_secret_key", "")
+
+    async def _db():  # type: ignore[no-untyped-def]
+        yield db_session
+
+    app.dependency_overrides[get_db] = _db
+
+    def _make() -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+    yield _make
+    app.dependency_overrides.pop(get_db, None)
@@ -0,0 +1,78 @@
+"""Tests for the free-slots endpoint."""
+
+import datetime
+
+import pytest
+
+from istari.models.todo import Todo
+from istari.tools.calendar import freebusy
+from istari.tools.calendar.freebusy import BusyIndex
+
+# A Monday, 9:00 UTC
+_NOW = datetime.datetime(2026, 10, 19, 9, tzinfo=datetime.UTC)
+
+
+def _t(hour: int, minute: int = 0, day: int = 0) -> datetime.datetime:
+    return _NOW.replace(hour=hour, minute=minute) + datetime.timedelta(days=day)
+
+
+@pytest.fixture(autouse=True)
+def _working_week(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Nine-to-five UTC weekdays at ``_NOW``, with a fixed busy calendar."""
+    from istari.config import settings as settings_module
+
+    monkeypatch.setattr(settings_module.settings, "user_timezone", "UTC")
+    monkeypatch.setattr(settings_module.settings, "working_hours_start", 9)
+    monkeypatch.setattr(settings_module.settings, "working_hours_end", 17)
+    monkeypatch.setattr(settings_module.settings, "working_days", [0, 1, 2, 3, 4])
+
+    real_plan = freebusy.plan_slots
+
+    async def plan_at_now(session, days, min_minutes, tasks=None, now=None):  # type: ignore[no-untyped-def]
+        return await real_plan(session, days, min_minutes, tasks, now=_NOW)
+
+    async def fake_load(start, end, session=None):  # type: ignore[no-untyped-def]
+        busy = [(_t(9), _t(12)), (_t(13), _t(17)), (_t(9, day=1), _t(16, day=1))]
+        return BusyIndex(busy), "store"
+
+    monkeypatch.setattr("istari.api.routes.calendar.plan_slots", plan_at_now)
+    monkeypatch.setattr(freebusy, "load_busy_index", fake_load)
+
+
+class TestFreeSlots:
+    async def test_slots_and_placements(self, client_factory, db_session):
+        report = Todo(title="Write report", due_date=_t(0, day=2))
+        email = Todo(title="Reply to Sam")
+        db_session.add_all([report, email])
+        await db_session.flush()
+
+        async with client_factory() as client:
+            r = await client.post("/api/calendar/free-slots", json={
+                "days": 2,
+                "duration_minutes": 60,
+                "todos": [
+                    {"todo_id": email.id},
+                    {"todo_id": report.id, "minutes": 90},
+                    {"todo_id": 999},
+                ],
+            })
+
+        assert r.status_code == 200
+        body = r.json()
+        assert body["source"] == "store"
+        assert [(s["start"][11:16], s["minutes"]) for s in body["slots"]] == [
+            ("12:00", 60), ("16:00", 60),
+        ]
+        placed = {p["todo_id"]: p for p in body["placements"]}
+        # No gap in the two days is 90 minutes long
+        assert placed[report.id]["start"] is None
+        # The default 30-minute estimate fits at noon
+        assert placed[email.id]["start"][11:16] == "12:00"
+        assert placed[email.id]["minutes"] == 30
+        assert body["missing_todo_ids"] == [999]
+
+    async def test_rejects_bad_range(self, client_factory):
+        async with client_factory() as client:
+            r = await client.post("/api/calendar/free-slots", json={"days": 1000})
+
+        assert r.status_code == 400
@@ -0,0 +1,176 @@
+"""Tests for the change feed: write hooks, the hub, and the SSE stream."""
+
+import asyncio
+import json
+
+import pytest
+from sqlalchemy import update
+
+from istari.api.routes.events import event_stream
+from istari.db.changes import RESYNC, Change, ChangeHub, change_hub
+from istari.models.todo import Todo
+from istari.tools.digest.manager import DigestManager
+from istari.tools.notification.manager import NotificationManager
+from istari.tools.project.manager import ProjectManager
+from istari.tools.todo.manager import TodoManager
+
+
+def _drain(queue: asyncio.Queue[Change]) -> list[Change]:
+    out = []
+    while not queue.empty():
+        out.append(queue.get_nowait())
+    return out
+
+
+class TestChange:
+    def test_json_round_trip(self):
+        change = Change("todos", "updated", (3, 7))
+        assert Change.from_json(change.to_json()) == change
+
+    def test_unknown_ids_round_trip(self):
+        change = Change("notifications", "updated")
+        assert json.loads(change.to_json())["ids"] is None
+        assert Change.from_json(change.to_json()) == change
+
+
+class TestChangeHub:
+    def test_publish_fans_out(self):
+        hub = ChangeHub()
+        with hub.subscription() as a, hub.subscription() as b:
+            hub.publish(Change("todos", "created", (1,)))
+            assert _drain(a) == _drain(b) == [Change("todos", "created", (1,))]
+        assert hub.subscriber_count == 0
+
+    def test_full_queue_collapses_to_resync(self):
+        hub = ChangeHub(max_queue=2)
+        with hub.subscription() as queue:
+            for i in range(3):
+                hub.publish(Change("todos", "updated", (i,)))
+            assert _drain(queue) == [RESYNC]
+
+    def test_malformed_payload_ignored(self):
+        hub = ChangeHub()
+        with hub.subscription() as queue:
+            hub.publish_payload("not json")
+            hub.publish_payload('{"op": "updated"}')
+            assert _drain(queue) == []
+
+
+class TestWriteHooks:
+    @pytest.fixture
+    def feed(self):
+        with change_hub.subscription() as queue:
+            yield queue
+
+    @pytest.mark.asyncio
+    async def test_nothing_published_before_commit(self, db_session, feed):
+        await TodoManager(db_session).create(title="Draft")
+        assert _drain(feed) == []
+
+    @pytest.mark.asyncio
+    async def test_todo_create_and_update(self, db_session, feed):
+        mgr = TodoManager(db_session)
+        todo = await mgr.create(title="Write report")
+        await db_session.commit()
+        assert _drain(feed) == [Change("todos", "created", (todo.id,))]
+
+        await mgr.update(todo.id, title="Write the report")
+        await db_session.commit()
+        assert _drain(feed) == [Change("todos", "updated", (todo.id,))]
+
+    @pytest.mark.asyncio
+    async def test_rollback_discards_changes(self, db_session, feed):
+        await TodoManager(db_session).create(title="Never mind")
+        await db_session.rollback()
+        await db_session.commit()
+        assert _drain(feed) == []
+
+    @pytest.mark.asyncio
+    async def test_project_delete(self, db_session, feed):
+        mgr = ProjectManager(db_session)
+        project = await mgr.create(name="Garden")
+        await db_session.commit()
+        _drain(feed)
+
+        await db_session.delete(project)
+        await db_session.commit()
+        assert Change("projects", "deleted", (project.id,)) in _drain(feed)
+
+    @pytest.mark.asyncio
+    async def test_notification_and_digest_writes(self, db_session, feed):
+        notification = await NotificationManager(db_session).create(
+            type="digest", content="Morning digest"
+        )
+        digest = await DigestManager(db_session).create(source="gmail", content_summary="Inbox")
+        await db_session.commit()
+        changes = _drain(feed)
+        assert Change("notifications", "created", (notification.id,)) in changes
+        assert Change("digests", "created", (digest.id,)) in changes
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_without_ids(self, db_session, feed):
+        await NotificationManager(db_session).create(type="digest", content="x")
+        await db_session.commit()
+        _drain(feed)
+
+        await NotificationManager(db_session).mark_all_read()
+        await db_session.commit()
+        assert _drain(feed) == [Change("notifications", "updated")]
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_by_primary_key(self, db_session, feed):
+        mgr = TodoManager(db_session)
+        a = await mgr.create(title="A")
+        b = await mgr.create(title="B")
+        await db_session.commit()
+        _drain(feed)
+
+        await db_session.execute(
+            update(Todo), [{"id": a.id, "urgent": True}, {"id": b.id, "urgent": False}]
+        )
+        await db_session.commit()
+        assert _drain(feed) == [Change("todos", "updated", tuple(sorted((a.id, b.id))))]
+
+    @pytest.mark.asyncio
+    async def test_untracked_models_ignored(self, db_session, feed):
+        from istari.tools.memory.store import MemoryStore
+
+        await MemoryStore(db_session).store("Likes tea")
+        await db_session.commit()
+        assert _drain(feed) == []
+
+    @pytest.mark.asyncio
+    async def test_unmodified_dirty_objects_ignored(self, db_session, feed):
+        notification = await NotificationManager(db_session).create(type="digest", content="x")
+        await db_session.commit()
+        _drain(feed)
+
+        notification.content = "x"  # same value: dirty, but not modified
+        await db_session.commit()
+        assert _drain(feed) == []
+
+
+class TestEventStream:
+    @pytest.mark.asyncio
+    async def test_streams_changes_as_sse(self):
+        hub = ChangeHub()
+        stream = event_stream(hub, heartbeat_seconds=5)
+        assert await anext(stream) == "retry: 5000\n\n"
+        assert hub.subscriber_count == 1
+
+        hub.publish(Change("todos", "deleted", (4,)))
+        frame = await anext(stream)
+        assert frame.startswith("event: change\ndata: ")
+        assert Change.from_json(frame.split("data: ", 1)[1].strip()) == Change(
+            "todos", "deleted", (4,)
+        )
+
+        await stream.aclose()
+        assert hub.subscriber_count == 0
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_when_idle(self):
+        stream = event_stream(ChangeHub(), heartbeat_seconds=0.01)
+        await anext(stream)
+        assert await anext(stream) == ": keepalive\n\n"
+        await stream.aclose()
@@ -0,0 +1,54 @@
+"""Tests for the conversation full-text search endpoint."""
+
+import datetime
+
+from istari.tools.conversation.store import ConversationHit, ConversationStore
+
+_T = datetime.datetime(2026, 9, 1, 9, 30, tzinfo=datetime.UTC)
+
+
+def _hit(msg_id: int) -> ConversationHit:
+    return ConversationHit(
+        id=msg_id, role="user", created_at=_T, snippet="the **dentist** on Friday", rank=0.1
+    )
+
+
+class TestChatSearch:
+    async def test_full_page_returns_cursor(self, client_factory, monkeypatch):
+        calls: list[tuple[str, int, int | None]] = []
+
+        async def fake_search(self, query, limit=20, before_id=None):  # type: ignore[no-untyped-def]
+            calls.append((query, limit, before_id))
+            return [_hit(9), _hit(7)]
+
+        monkeypatch.setattr(ConversationStore, "search", fake_search)
+
+        async with client_factory() as client:
+            r = await client.get("/api/chat/search", params={"q": "dentist", "limit": 2})
+
+        assert r.status_code == 200
+        body = r.json()
+        assert [h["id"] for h in body["results"]] == [9, 7]
+        assert body["results"][0]["snippet"] == "the **dentist** on Friday"
+        assert body["next_cursor"] == 7
+        assert calls == [("dentist", 2, None)]
+
+    async def test_short_page_ends_pagination(self, client_factory, monkeypatch):
+        calls: list[int | None] = []
+
+        async def fake_search(self, query, limit=20, before_id=None):  # type: ignore[no-untyped-def]
+            calls.append(before_id)
+            return [_hit(3)]
+
+        monkeypatch.setattr(ConversationStore, "search", fake_search)
+
+        async with client_factory() as client:
+            r = await client.get("/api/chat/search", params={"q": "dentist", "cursor": 7})
+
+        assert r.json()["next_cursor"] is None
+        assert calls == [7]
+
+    async def test_empty_query_rejected(self, client_factory):
+        async with client_factory() as client:
+            r = await client.get("/api/chat/search", params={"q": ""})
+        assert r.status_code == 422
@@ -0,0 +1,122 @@
+"""Tests for conditional GET on the list endpoints."""
+
+import pytest
+from sqlalchemy import event
+
+from istari.api.etags import etag_stats, reset_etag_stats
+from istari.tools.notification.manager import NotificationManager
+from istari.tools.project.manager import ProjectManager
+from istari.tools.todo.manager import TodoManager
+
+
+@pytest.fixture(autouse=True)
+def _fresh_stats() -> None:
+    reset_etag_stats()
+
+
+@pytest.fixture()
+def statements(db_session):  # type: ignore[no-untyped-def]
+    """SQL statements issued on the test connection, in order."""
+    captured: list[str] = []
+    engine = db_session.bind.engine.sync_engine
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        captured.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    yield captured
+    event.remove(engine, "before_cursor_execute", _capture)
+
+
+_LIST_PATHS = [
+    "/api/todos/",
+    "/api/todos/today",
+    "/api/todos/prioritized",
+    "/api/projects/",
+    "/api/notifications/",
+]
+
+
+class TestConditionalGet:
+    @pytest.mark.parametrize("path", _LIST_PATHS)
+    async def test_unchanged_list_returns_304(self, client_factory, path):
+        async with client_factory() as client:
+            first = await client.get(path)
+            assert first.status_code == 200
+            etag = first.headers["etag"]
+            assert first.headers["cache-control"] == "no-cache"
+
+            second = await client.get(path, headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+
+    async def test_304_skips_the_list_query(self, client_factory, db_session, statements):
+        await TodoManager(db_session).create(title="Buy milk")
+        await db_session.commit()
+        async with client_factory() as client:
+            etag = (await client.get("/api/todos/")).headers["etag"]
+            statements.clear()
+            r = await client.get("/api/todos/", headers={"If-None-Match": etag})
+        assert r.status_code == 304
+        assert len(statements) == 1
+        assert "collection_versions" in statements[0]
+        assert "FROM todos" not in statements[0]
+
+    async def test_todo_write_changes_todo_and_project_etags(self, client_factory, db_session):
+        async with client_factory() as client:
+            todos_etag = (await client.get("/api/todos/")).headers["etag"]
+            projects_etag = (await client.get("/api/projects/")).headers["etag"]
+            notifications_etag = (await client.get("/api/notifications/")).headers["etag"]
+
+            created = await client.post("/api/todos/", json={"title": "Call plumber"})
+            assert created.status_code == 201
+
+            todos = await client.get("/api/todos/", headers={"If-None-Match": todos_etag})
+            projects = await client.get("/api/projects/", headers={"If-None-Match": projects_etag})
+            notifications = await client.get(
+                "/api/notifications/", headers={"If-None-Match": notifications_etag}
+            )
+        assert todos.status_code == 200
+        assert [t["title"] for t in todos.json()["todos"]] == ["Call plumber"]
+        assert projects.status_code == 200
+        assert notifications.status_code == 304
+
+    async def test_worker_style_write_changes_etag(self, client_factory, db_session):
+        async with client_factory() as client:
+            etag = (await client.get("/api/notifications/")).headers["etag"]
+            await NotificationManager(db_session).create(type="digest", content="Inbox")
+            await db_session.commit()
+            r = await client.get("/api/notifications/", headers={"If-None-Match": etag})
+        assert r.status_code == 200
+        assert len(r.json()["notifications"]) == 1
+
+    async def test_query_string_is_part_of_the_etag(self, client_factory, db_session):
+        await ProjectManager(db_session).create(name="Garden")
+        await db_session.commit()
+        async with client_factory() as client:
+            active = (await client.get("/api/projects/")).headers["etag"]
+            everything = (await client.get("/api/projects/?status=all")).headers["etag"]
+        assert active != everything
+
+    async def test_weak_and_listed_validators_match(self, client_factory):
+        async with client_factory() as client:
+            etag = (await client.get("/api/todos/today")).headers["etag"]
+            weak = await client.get("/api/todos/today", headers={"If-None-Match": f"W/{etag}"})
+            listed = await client.get(
+                "/api/todos/today", headers={"If-None-Match": f'"stale", {etag}'}
+            )
+            stale = await client.get("/api/todos/today", headers={"If-None-Match": '"stale"'})
+        assert weak.status_code == 304
+        assert listed.status_code == 304
+        assert stale.status_code == 200
+
+    async def test_hit_rate_metric(self, client_factory):
+        async with client_factory() as client:
+            etag = (await client.get("/api/todos/")).headers["etag"]
+            for _ in range(3):
+                await client.get("/api/todos/", headers={"If-None-Match": etag})
+            r = await client.get("/api/debug/etag-stats")
+        assert r.status_code == 200
+        assert r.json()["paths"]["/api/todos/"] == {"hits": 3, "misses": 1, "hit_rate": 0.75}
+        assert etag_stats()["/api/todos/"]["hits"] == 3
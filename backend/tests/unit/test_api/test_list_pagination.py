@@ -0,0 +1,127 @@
+"""Tests for keyset pagination and NDJSON export on the list endpoints."""
+
+import datetime
+import json
+
+import httpx
+import pytest
+
+from istari.db.keyset import encode_cursor
+from istari.models.todo import TodoStatus
+from istari.tools.memory.store import MemoryStore
+from istari.tools.project.manager import ProjectManager
+from istari.tools.todo.manager import TodoManager
+
+
+# Explicit timestamps: SQLite's CURRENT_TIMESTAMP default is stored in a
+# different text format than bound datetimes, which breaks seeking on it.
+# Pairs share a timestamp so the id tie-breaker is exercised too.
+def _at(i: int) -> datetime.datetime:
+    return datetime.datetime(2026, 5, 1, tzinfo=datetime.UTC) + datetime.timedelta(hours=i // 2)
+
+
+async def _walk(client: httpx.AsyncClient, path: str, key: str, limit: int) -> list[int]:
+    ids: list[int] = []
+    params: dict[str, str | int] = {"limit": limit}
+    for _ in range(20):
+        r = await client.get(path, params=params)
+        assert r.status_code == 200
+        body = r.json()
+        assert len(body[key]) <= limit
+        ids.extend(item["id"] for item in body[key])
+        if body["next_cursor"] is None:
+            return ids
+        params = {"limit": limit, "cursor": body["next_cursor"]}
+    raise AssertionError("pagination did not terminate")
+
+
+class TestKeysetPagination:
+    async def test_todo_pages_cover_full_list_in_order(self, client_factory, db_session):
+        mgr = TodoManager(db_session)
+        for i in range(7):
+            todo = await mgr.create(
+                f"Task {i}", urgent=i % 2 == 0, important=i % 3 == 0, created_at=_at(i)
+            )
+            if i == 5:
+                await mgr.set_status(todo.id, TodoStatus.COMPLETE)
+
+        async with client_factory() as client:
+            full = (await client.get("/api/todos/")).json()
+            paged = await _walk(client, "/api/todos/", "todos", limit=3)
+
+        assert full["next_cursor"] is None
+        assert paged == [t["id"] for t in full["todos"]]
+
+    async def test_memory_pages(self, client_factory, db_session):
+        store = MemoryStore(db_session)
+        for i in range(5):
+            memory = await store.store(f"Fact {i}")
+            memory.created_at = _at(i)
+        await db_session.flush()
+
+        async with client_factory() as client:
+            full = (await client.get("/api/memory/")).json()
+            paged = await _walk(client, "/api/memory/", "memories", limit=2)
+
+        assert len(paged) == 5
+        assert paged == [m["id"] for m in full["memories"]]
+
+    async def test_project_pages(self, client_factory, db_session):
+        mgr = ProjectManager(db_session)
+        for i in range(4):
+            project = await mgr.create(f"Project {i}")
+            project.created_at = _at(i)
+        await db_session.flush()
+
+        async with client_factory() as client:
+            full = (await client.get("/api/projects/")).json()
+            paged = await _walk(client, "/api/projects/", "projects", limit=3)
+
+        assert paged == [p["id"] for p in full["projects"]]
+
+    async def test_malformed_cursor_is_rejected(self, client_factory):
+        async with client_factory() as client:
+            r = await client.get("/api/todos/", params={"cursor": "not-a-cursor"})
+
+        assert r.status_code == 400
+
+    @pytest.mark.parametrize(
+        "values",
+        [
+            ["2026-05-01", 3],  # created_at without its datetime tag
+            [{"dt": "2026-05-01T00:00:00+00:00"}, "3"],
+            [{"dt": "2026-05-01T00:00:00+00:00"}, None],
+            [{"dt": "2026-05-01T00:00:00+00:00"}, True],
+        ],
+    )
+    async def test_cursor_with_wrong_value_types_is_rejected(self, client_factory, values):
+        async with client_factory() as client:
+            r = await client.get("/api/projects/", params={"cursor": encode_cursor(values)})
+
+        assert r.status_code == 400
+
+
+class TestNdjsonExport:
+    async def test_todo_export_streams_one_object_per_line(self, client_factory, db_session):
+        mgr = TodoManager(db_session)
+        await mgr.create("First")
+        await mgr.create("Second")
+
+        async with client_factory() as client:
+            full = (await client.get("/api/todos/")).json()
+            r = await client.get("/api/todos/export")
+
+        assert r.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in r.text.splitlines()]
+        assert [t["id"] for t in lines] == [t["id"] for t in full["todos"]]
+
+    async def test_memory_and_project_exports(self, client_factory, db_session):
+        await MemoryStore(db_session).store("Likes tea")
+        await ProjectManager(db_session).create("Garden")
+
+        async with client_factory() as client:
+            memories = (await client.get("/api/memory/export")).text.splitlines()
+            projects = (await client.get("/api/projects/export")).text.splitlines()
+
+        assert json.loads(memories[0])["content"] == "Likes tea"
+        assert json.loads(projects[0])["name"] == "Garden"
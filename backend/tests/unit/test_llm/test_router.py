@@ -125,3 +125,27 @@ class TestEmbedding:
         call_kwargs = mock_client.embeddings.create.call_args
         # bare model name (prefix stripped)
         assert call_kwargs.kwargs["model"] == "nomic-embed-text"
+
+
+class TestEmbeddingBatch:
+    async def test_returns_vectors_in_input_order(self):
+        from istari.llm.router import embedding_batch
+
+        first, second = MagicMock(), MagicMock()
+        first.index, first.embedding = 0, [0.1] * 768
+        second.index, second.embedding = 1, [0.2] * 768
+        client = _mock_client()
+        client.embeddings.create.return_value.data = [second, first]
+
+        with patch("istari.llm.router.AsyncOpenAI", return_value=client):
+            result = await embedding_batch(["a", "b"])
+
+        assert result == [[0.1] * 768, [0.2] * 768]
+        call_kwargs = client.embeddings.create.call_args
+        assert call_kwargs.kwargs["input"] == ["a", "b"]
+
+    async def test_empty_input_skips_request(self, mock_client):
+        from istari.llm.router import embedding_batch
+
+        assert await embedding_batch([]) == []
+        mock_client.embeddings.create.assert_not_called()
@@ -1,11 +1,12 @@
 """Tests for CalendarReader — all Google API calls are mocked."""
 
 import datetime
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from istari.tools.calendar.reader import CalendarEvent, CalendarReader
+from istari.tools.google.services import clear_service_cache
 
 
 @pytest.fixture()
@@ -23,16 +24,18 @@ def reader(tmp_path, mock_service):
         ' "client_id": "x", "client_secret": "y",'
         ' "scopes": ["https://www.googleapis.com/auth/calendar.readonly"]}'
     )
-    creds_path = "istari.tools.calendar.reader.Credentials.from_authorized_user_file"
+    creds_path = "istari.tools.google.services.Credentials.from_authorized_user_file"
+    clear_service_cache()
     with (
         patch(creds_path) as mock_creds_cls,
-        patch("istari.tools.calendar.reader.build", return_value=mock_service),
+        patch("istari.tools.google.services.build_from_document", return_value=mock_service),
     ):
         mock_creds = MagicMock()
-        mock_creds.expired = False
+        mock_creds.expiry = None
         mock_creds_cls.return_value = mock_creds
         r = CalendarReader(str(token_file))
-    return r
+    yield r
+    clear_service_cache()
 
 
 def _make_event(
@@ -199,3 +202,91 @@ def test_parse_event_html_link():
     }
     result = CalendarReader._parse_event(event)
     assert result.html_link == "https://calendar.google.com/event?eid=e7"
+
+
+@pytest.mark.asyncio
+async def test_list_changes_pages_and_returns_sync_token(reader, mock_service):
+    events = mock_service.events.return_value
+    events.list.return_value.execute.side_effect = [
+        {"items": [{"id": "e1"}], "nextPageToken": "p2"},
+        {"items": [{"id": "e2"}], "nextSyncToken": "tok-2"},
+    ]
+
+    items, token = await reader.list_changes("work@test.com", "tok-1")
+
+    assert [i["id"] for i in items] == ["e1", "e2"]
+    assert token == "tok-2"
+    first, second = (c.kwargs for c in events.list.call_args_list)
+    assert first["syncToken"] == "tok-1" and first["singleEvents"] is False
+    assert second["pageToken"] == "p2"
+
+
+@pytest.mark.asyncio
+async def test_list_changes_expired_token(reader, mock_service):
+    from googleapiclient.errors import HttpError
+    from httplib2 import Response
+
+    from istari.tools.calendar.reader import SyncTokenExpiredError
+
+    mock_service.events.return_value.list.return_value.execute.side_effect = HttpError(
+        Response({"status": 410}), b'{"error": {"code": 410, "message": "Gone"}}'
+    )
+
+    with pytest.raises(SyncTokenExpiredError):
+        await reader.list_changes("primary", "stale")
+
+
+@pytest.mark.asyncio
+async def test_list_calendars_pages(reader, mock_service):
+    mock_service.calendarList.return_value.list.return_value.execute.side_effect = [
+        {"items": [{"id": "primary"}], "nextPageToken": "p2"},
+        {"items": [{"id": "team@group.calendar.google.com"}]},
+    ]
+
+    calendars = await reader.list_calendars()
+
+    assert [c["id"] for c in calendars] == ["primary", "team@group.calendar.google.com"]
+
+
+@pytest.mark.asyncio
+async def test_fresh_store_serves_reads(reader):
+    store = MagicMock()
+    store.is_fresh = AsyncMock(return_value=True)
+    store.list_upcoming = AsyncMock(return_value=[])
+    store.search = AsyncMock(return_value=[])
+    reader._store = store
+
+    await reader.list_upcoming(days=3, max_results=5)
+    await reader.search("standup", max_results=4)
+
+    store.list_upcoming.assert_awaited_once_with(3, 5)
+    store.search.assert_awaited_once_with("standup", 4)
+    reader._service.events.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_free_busy_queries_shown_calendars_in_chunks(reader, mock_service):
+    mock_service.calendarList.return_value.list.return_value.execute.return_value = {
+        "items": [
+            {"id": "primary", "primary": True},
+            {"id": "team", "selected": True},
+            {"id": "holidays"},
+        ]
+    }
+    query = mock_service.freebusy.return_value.query
+    query.return_value.execute.return_value = {"calendars": {
+        "primary": {"busy": [{"start": "2026-10-20T09:00:00Z", "end": "2026-10-20T10:00:00Z"}]},
+        "team": {"busy": []},
+    }}
+    start = datetime.datetime(2026, 10, 19, tzinfo=datetime.UTC)
+
+    busy = await reader.free_busy(start, start + datetime.timedelta(days=90))
+
+    bodies = [c.kwargs["body"] for c in query.call_args_list]
+    assert len(bodies) == 2  # 60-day spans
+    assert bodies[0]["items"] == [{"id": "primary"}, {"id": "team"}]
+    assert bodies[1]["timeMax"] == (start + datetime.timedelta(days=90)).isoformat()
+    assert busy[0] == (
+        datetime.datetime(2026, 10, 20, 9, tzinfo=datetime.UTC),
+        datetime.datetime(2026, 10, 20, 10, tzinfo=datetime.UTC),
+    )
@@ -0,0 +1,344 @@
+"""Tests for the local calendar store, synced from a stub Calendar reader."""
+
+import datetime
+from typing import Any
+
+import pytest
+from sqlalchemy import select, update
+
+from istari.models.calendar_event import CalendarEntry, CalendarOccurrence, CalendarSource
+from istari.tools.calendar import freebusy
+from istari.tools.calendar.freebusy import load_busy_index
+from istari.tools.calendar.reader import SyncTokenExpiredError
+from istari.tools.calendar.store import CalendarStore
+
+_NOW = datetime.datetime.now(datetime.UTC).replace(microsecond=0)
+
+
+def _at(days: float, hour: int = 9) -> datetime.datetime:
+    day = (_NOW + datetime.timedelta(days=days)).date()
+    return datetime.datetime.combine(day, datetime.time(hour), datetime.UTC)
+
+
+def _event(
+    event_id: str,
+    summary: str,
+    start: datetime.datetime,
+    minutes: int = 30,
+    **extra: Any,
+) -> dict[str, Any]:
+    end = start + datetime.timedelta(minutes=minutes)
+    return {
+        "id": event_id,
+        "status": "confirmed",
+        "summary": summary,
+        "start": {"dateTime": start.isoformat(), "timeZone": "UTC"},
+        "end": {"dateTime": end.isoformat(), "timeZone": "UTC"},
+        "htmlLink": f"https://calendar.google.com/event?eid={event_id}",
+        **extra,
+    }
+
+
+class StubCalendar:
+    """Just enough of CalendarReader for the store: calendars and syncToken deltas."""
+
+    def __init__(self) -> None:
+        self.calendars: dict[str, dict[str, Any]] = {
+            "primary": {
+                "id": "primary", "summary": "Me", "timeZone": "UTC", "primary": True,
+            },
+        }
+        # calendar id -> list of (version, event), newest change last
+        self.changes: dict[str, list[tuple[int, dict[str, Any]]]] = {"primary": []}
+        self.version = 0
+        self.expired: set[str] = set()
+        self.calls: list[tuple[str, str | None]] = []
+
+    def put(self, event: dict[str, Any], calendar_id: str = "primary") -> None:
+        self.version += 1
+        self.changes.setdefault(calendar_id, []).append((self.version, event))
+
+    def cancel(self, event_id: str, calendar_id: str = "primary", **extra: Any) -> None:
+        self.put({"id": event_id, "status": "cancelled", **extra}, calendar_id)
+
+    async def list_calendars(self) -> list[dict[str, Any]]:
+        return list(self.calendars.values())
+
+    async def list_changes(
+        self, calendar_id: str, sync_token: str | None
+    ) -> tuple[list[dict[str, Any]], str]:
+        self.calls.append((calendar_id, sync_token))
+        if sync_token is not None and calendar_id in self.expired:
+            self.expired.discard(calendar_id)
+            raise SyncTokenExpiredError(calendar_id)
+        since = int(sync_token.split(":")[1]) if sync_token else 0
+        latest: dict[str, dict[str, Any]] = {}
+        for version, event in self.changes.get(calendar_id, []):
+            if version > since:
+                latest[event["id"]] = event
+        items = list(latest.values())
+        if sync_token is None:
+            # A full listing leaves out deleted events
+            items = [e for e in items if e.get("status") != "cancelled" or "recurringEventId" in e]
+        return items, f"{calendar_id}:{self.version}"
+
+    async def free_busy(
+        self, start: datetime.datetime, end: datetime.datetime
+    ) -> list[tuple[datetime.datetime, datetime.datetime]]:
+        """Google's freeBusy over single events: shown calendars, opaque, not declined."""
+        busy = []
+        for calendar_id, info in self.calendars.items():
+            if not (info.get("selected") or info.get("primary")):
+                continue
+            latest = {e["id"]: e for _, e in self.changes.get(calendar_id, [])}
+            for event in latest.values():
+                declined = any(
+                    a.get("self") and a.get("responseStatus") == "declined"
+                    for a in event.get("attendees", [])
+                )
+                if event["status"] == "cancelled" or declined:
+                    continue
+                if event.get("transparency") == "transparent":
+                    continue
+                lo = datetime.datetime.fromisoformat(event["start"]["dateTime"])
+                hi = datetime.datetime.fromisoformat(event["end"]["dateTime"])
+                if hi > start and lo < end:
+                    busy.append((lo, hi))
+        return busy
+
+
+@pytest.fixture()
+def calendar():
+    stub = StubCalendar()
+    stub.put(_event("standup", "Team standup", _at(1)))
+    stub.put(_event("review", "Design review", _at(2, 14), 60, location="Room 4"))
+    return stub
+
+
+@pytest.fixture()
+def store(db_session):
+    return CalendarStore(db_session)
+
+
+async def _occurrences(db_session, event_id: str) -> list[datetime.datetime]:
+    rows = await db_session.execute(
+        select(CalendarOccurrence.start_at)
+        .join(CalendarEntry, CalendarEntry.id == CalendarOccurrence.entry_id)
+        .where(CalendarEntry.event_id == event_id)
+        .order_by(CalendarOccurrence.start_at)
+    )
+    return [s.replace(tzinfo=datetime.UTC) for s in rows.scalars()]
+
+
+class TestSync:
+    async def test_first_sync_is_full(self, db_session, store, calendar):
+        result = await store.sync(calendar)
+
+        assert result.full_syncs == ["primary"]
+        assert result.changed == 2
+        assert calendar.calls == [("primary", None)]
+        source = await db_session.get(CalendarSource, "primary")
+        assert source.sync_token == "primary:2"
+        assert await _occurrences(db_session, "standup") == [_at(1)]
+
+    async def test_incremental_sync_sends_token(self, db_session, store, calendar):
+        await store.sync(calendar)
+        calendar.put(_event("standup", "Team standup (moved)", _at(1, 10)))
+        calendar.cancel("review")
+        calendar.put(_event("lunch", "Lunch", _at(3, 12)))
+
+        result = await store.sync(calendar)
+
+        assert result.full_syncs == []
+        assert result.changed == 3
+        assert calendar.calls[-1] == ("primary", "primary:2")
+        assert await _occurrences(db_session, "standup") == [_at(1, 10)]
+        assert await _occurrences(db_session, "review") == []
+        entries = (await db_session.execute(select(CalendarEntry.event_id))).scalars().all()
+        assert sorted(entries) == ["lunch", "standup"]
+
+    async def test_expired_token_resyncs_fully(self, db_session, store, calendar):
+        await store.sync(calendar)
+        calendar.changes["primary"] = [
+            (v, e) for v, e in calendar.changes["primary"] if e["id"] != "review"
+        ]
+        calendar.expired.add("primary")
+
+        result = await store.sync(calendar)
+
+        assert result.full_syncs == ["primary"]
+        assert calendar.calls[-2:] == [("primary", "primary:2"), ("primary", None)]
+        assert await _occurrences(db_session, "review") == []
+        assert await _occurrences(db_session, "standup") == [_at(1)]
+
+    async def test_all_subscribed_calendars(self, db_session, store, calendar):
+        calendar.calendars["team"] = {
+            "id": "team", "summary": "Team", "timeZone": "UTC", "selected": True,
+        }
+        calendar.put(_event("offsite", "Offsite", _at(5)), calendar_id="team")
+
+        await store.sync(calendar)
+        assert [e.summary for e in await store.list_upcoming(7, 10)] == [
+            "Team standup", "Design review", "Offsite",
+        ]
+
+        del calendar.calendars["team"]
+        await store.sync(calendar)
+        assert await db_session.get(CalendarSource, "team") is None
+        assert await _occurrences(db_session, "offsite") == []
+
+
+class TestRecurrence:
+    async def test_weekly_series_is_expanded(self, db_session, store, calendar):
+        calendar.put(_event("weekly", "1:1", _at(0, 15), recurrence=["RRULE:FREQ=WEEKLY;COUNT=4"]))
+
+        await store.sync(calendar)
+
+        assert await _occurrences(db_session, "weekly") == [_at(7 * i, 15) for i in range(4)]
+
+    async def test_exceptions_replace_their_occurrence(self, db_session, store, calendar):
+        calendar.put(_event("daily", "Standup", _at(1), recurrence=["RRULE:FREQ=DAILY;COUNT=5"]))
+        await store.sync(calendar)
+        original = {"originalStartTime": {"dateTime": _at(2).isoformat()}}
+        calendar.put(_event("daily_2", "Standup (late)", _at(2, 11),
+                            recurringEventId="daily", **original))
+        calendar.cancel("daily_3", recurringEventId="daily",
+                        originalStartTime={"dateTime": _at(3).isoformat()})
+
+        await store.sync(calendar)
+
+        assert await _occurrences(db_session, "daily") == [_at(1), _at(4), _at(5)]
+        assert await _occurrences(db_session, "daily_2") == [_at(2, 11)]
+        upcoming = [e.summary for e in await store.list_upcoming(3, 10)]
+        assert upcoming == ["Team standup", "Standup", "Standup (late)", "Design review"]
+
+    async def test_cancelled_series_drops_its_exceptions(self, db_session, store, calendar):
+        calendar.put(_event("daily", "Standup", _at(1), recurrence=["RRULE:FREQ=DAILY;COUNT=3"]))
+        calendar.put(_event("daily_2", "Moved", _at(2, 11), recurringEventId="daily",
+                            originalStartTime={"dateTime": _at(2).isoformat()}))
+        await store.sync(calendar)
+
+        calendar.cancel("daily")
+        await store.sync(calendar)
+
+        assert await _occurrences(db_session, "daily") == []
+        assert await _occurrences(db_session, "daily_2") == []
+
+    async def test_series_keeps_wall_clock_across_dst(self, db_session, store):
+        stub = StubCalendar()
+        est = datetime.timezone(-datetime.timedelta(hours=5))
+        start = datetime.datetime(2026, 3, 5, 9, tzinfo=est)
+        stub.put({
+            "id": "ny", "status": "confirmed", "summary": "NY sync",
+            "start": {"dateTime": start.isoformat(), "timeZone": "America/New_York"},
+            "end": {"dateTime": (start + datetime.timedelta(hours=1)).isoformat(),
+                    "timeZone": "America/New_York"},
+            "recurrence": ["RRULE:FREQ=WEEKLY;UNTIL=20260320"],
+        })
+        wide = CalendarStore(db_session, expand_past_days=3650)
+
+        await wide.sync(stub)
+
+        hours = [s.hour for s in await _occurrences(db_session, "ny")]
+        assert hours == [14, 13, 13]  # 9:00 EST, then 9:00 EDT after March 8
+
+    async def test_expansion_is_bounded_by_window(self, db_session, calendar):
+        calendar.put(_event("forever", "Daily", _at(0, 8), recurrence=["RRULE:FREQ=DAILY"]))
+        store = CalendarStore(db_session, expand_days=10, expand_past_days=1)
+
+        await store.sync(calendar)
+
+        assert len(await _occurrences(db_session, "forever")) in (10, 11)
+
+    async def test_window_slides_forward(self, db_session, calendar):
+        calendar.put(_event("forever", "Daily", _at(0, 8), recurrence=["RRULE:FREQ=DAILY"]))
+        store = CalendarStore(db_session, expand_days=10, expand_past_days=1)
+        await store.sync(calendar)
+        before = await _occurrences(db_session, "forever")
+        stale = _NOW - datetime.timedelta(days=5)
+        await db_session.execute(update(CalendarSource).values(expanded_until=stale))
+
+        await store.sync(calendar)
+
+        assert await _occurrences(db_session, "forever") == before
+        source = await db_session.get(CalendarSource, "primary")
+        assert source.expanded_until.replace(tzinfo=datetime.UTC) > _NOW
+
+
+class TestReads:
+    async def test_freshness(self, db_session, store, calendar):
+        assert not await store.is_fresh()
+        await store.sync(calendar)
+        assert await store.is_fresh()
+
+        stale = _NOW - store.max_age - datetime.timedelta(minutes=1)
+        await db_session.execute(update(CalendarSource).values(synced_at=stale))
+        assert not await store.is_fresh()
+
+    async def test_list_upcoming_window_and_limit(self, store, calendar):
+        calendar.put(_event("far", "Far away", _at(20)))
+        await store.sync(calendar)
+
+        assert [e.id for e in await store.list_upcoming(7, 10)] == ["standup", "review"]
+        assert [e.id for e in await store.list_upcoming(7, 1)] == ["standup"]
+
+    async def test_search(self, store, calendar):
+        calendar.put(_event("old", "Old review", _at(-3)))
+        await store.sync(calendar)
+
+        assert [e.id for e in await store.search("review", 10)] == ["review"]
+        assert [e.id for e in await store.search("room 4", 10)] == ["review"]
+        assert await store.search("nothing", 10) == []
+
+    async def test_recurring_occurrence_ids_and_all_day(self, store):
+        stub = StubCalendar()
+        day = _at(1).date()
+        stub.put({
+            "id": "holiday", "status": "confirmed", "summary": "Holiday",
+            "start": {"date": day.isoformat()},
+            "end": {"date": (day + datetime.timedelta(days=1)).isoformat()},
+            "recurrence": ["RRULE:FREQ=YEARLY"],
+        })
+        await store.sync(stub)
+
+        (event,) = await store.list_upcoming(3, 10)
+
+        assert event.all_day
+        assert event.start == day
+        assert event.id == f"holiday_{day:%Y%m%d}"
+
+    async def test_busy_intervals_skip_transparent(self, store, calendar):
+        calendar.put(_event("focus", "Focus", _at(1, 13), transparency="transparent"))
+        await store.sync(calendar)
+
+        busy = await store.occurrences_between(_at(0, 0), _at(3, 0))
+
+        assert [start for start, _, _ in busy] == [_at(1), _at(2, 14)]
+
+
+class TestBusyAgreesWithGoogle:
+    async def test_store_and_freebusy_count_the_same_events(
+        self, db_session, store, calendar, monkeypatch
+    ):
+        monkeypatch.setattr(freebusy.settings, "calendar_backend", "google")
+        monkeypatch.setattr(freebusy.settings, "calendar_store_enabled", True)
+        monkeypatch.setattr(
+            "istari.tools.calendar.reader.CalendarReader", lambda *a, **k: calendar
+        )
+        calendar.calendars["holidays"] = {"id": "holidays", "summary": "Holidays"}
+        calendar.put(_event("parade", "Parade", _at(3, 9), 480), calendar_id="holidays")
+        calendar.put(_event("sync", "Vendor sync", _at(1, 11), attendees=[
+            {"email": "me@example.com", "self": True, "responseStatus": "declined"},
+        ]))
+        calendar.put(_event("retro", "Retro", _at(1, 15), attendees=[
+            {"email": "me@example.com", "self": True, "responseStatus": "accepted"},
+        ]))
+        await store.sync(calendar)
+        start, end = _at(0, 0), _at(6, 0)
+
+        from_store, source = await load_busy_index(start, end, db_session)
+        from_google, fallback = await load_busy_index(start, end)
+
+        assert (source, fallback) == ("store", "google")
+        assert from_store.intervals == from_google.intervals
+        assert [s.start for s in from_store.intervals] == [_at(1), _at(1, 15), _at(2, 14)]
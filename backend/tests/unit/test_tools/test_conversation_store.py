@@ -87,3 +87,41 @@ class TestConversationStore:
 
         roles = [m["role"] for m in history]
         assert roles == ["user", "assistant"]
+
+
+class TestSearch:
+    async def _messages(self, store, *contents):  # type: ignore[no-untyped-def]
+        for content in contents:
+            await store.save_message("user", content)
+        history = await store.load_history()
+        return [int(m["id"]) for m in history]
+
+    async def test_every_word_must_match_newest_first(self, db_session):
+        store = ConversationStore(db_session)
+        ids = await self._messages(
+            store, "Dentist on Friday", "friday standup", "Call the DENTIST, friday works"
+        )
+
+        hits = await store.search("dentist friday")
+
+        assert [h.id for h in hits] == [ids[2], ids[0]]
+        assert hits[0].snippet == "Call the DENTIST, friday works"
+
+    async def test_cursor_continues_below_before_id(self, db_session):
+        store = ConversationStore(db_session)
+        ids = await self._messages(store, *(f"dentist note {i}" for i in range(5)))
+
+        first = await store.search("dentist", limit=2)
+        second = await store.search("dentist", limit=2, before_id=first[-1].id)
+        last = await store.search("dentist", limit=2, before_id=second[-1].id)
+
+        assert [h.id for h in first + second + last] == ids[::-1]
+
+    async def test_long_message_snippet_is_trimmed(self, db_session):
+        store = ConversationStore(db_session)
+        await self._messages(store, "dentist " + "word " * 100)
+
+        (hit,) = await store.search_ranked("dentist")
+
+        assert hit.snippet.endswith(" ...")
+        assert len(hit.snippet.split()) == 31
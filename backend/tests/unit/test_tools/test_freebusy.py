@@ -0,0 +1,225 @@
+"""Tests for the free/busy index, working hours and fitting todos into free slots."""
+
+import datetime
+import random
+import time
+import zoneinfo
+
+import pytest
+
+from istari.models.calendar_event import CalendarEntry, CalendarOccurrence, CalendarSource
+from istari.tools.calendar import freebusy
+from istari.tools.calendar.freebusy import (
+    BusyIndex,
+    Slot,
+    Task,
+    WorkingHours,
+    deadline,
+    fit_tasks,
+    load_busy_index,
+    plan_slots,
+)
+
+UTC = datetime.UTC
+# A Monday
+_MON = datetime.datetime(2026, 10, 19, tzinfo=UTC)
+
+
+def _t(day: int, hour: int, minute: int = 0) -> datetime.datetime:
+    return _MON + datetime.timedelta(days=day, hours=hour, minutes=minute)
+
+
+_NINE_TO_FIVE = WorkingHours(
+    start=datetime.time(9), end=datetime.time(17), days=frozenset(range(5)), tz=UTC
+)
+
+
+class TestBusyIndex:
+    def test_merges_overlapping_and_touching(self):
+        index = BusyIndex([
+            (_t(0, 10), _t(0, 11)),
+            (_t(0, 9), _t(0, 10)),
+            (_t(0, 10, 30), _t(0, 12)),
+            (_t(0, 14), _t(0, 15)),
+            (_t(0, 16), _t(0, 16)),  # empty
+        ])
+
+        assert index.intervals == [Slot(_t(0, 9), _t(0, 12)), Slot(_t(0, 14), _t(0, 15))]
+
+    def test_busy_between_clips(self):
+        index = BusyIndex([(_t(0, 9), _t(0, 12)), (_t(0, 14), _t(0, 15)), (_t(1, 9), _t(1, 10))])
+
+        assert index.busy_between(_t(0, 11), _t(0, 14, 30)) == [
+            Slot(_t(0, 11), _t(0, 12)), Slot(_t(0, 14), _t(0, 14, 30)),
+        ]
+        assert index.busy_between(_t(0, 12), _t(0, 14)) == []
+        assert index.is_free(_t(0, 12), _t(0, 14))
+
+    def test_naive_times_are_utc(self):
+        naive = _t(0, 9).replace(tzinfo=None)
+        index = BusyIndex([(naive, naive + datetime.timedelta(hours=1))])
+
+        assert index.intervals == [Slot(_t(0, 9), _t(0, 10))]
+
+
+class TestFreeSlots:
+    def test_gaps_within_working_hours(self):
+        index = BusyIndex(
+            [(_t(0, 8), _t(0, 10)), (_t(0, 12), _t(0, 13)), (_t(0, 16, 45), _t(0, 18))]
+        )
+
+        slots = index.free_slots(_t(0, 0), _t(1, 0), _NINE_TO_FIVE)
+
+        assert slots == [Slot(_t(0, 10), _t(0, 12)), Slot(_t(0, 13), _t(0, 16, 45))]
+
+    def test_min_duration_and_weekends(self):
+        index = BusyIndex([(_t(4, 9, 30), _t(4, 17))])
+
+        slots = index.free_slots(
+            _t(4, 0), _t(7, 0), _NINE_TO_FIVE, datetime.timedelta(minutes=45)
+        )
+
+        assert slots == []  # Friday has 30 free minutes; Sat/Sun are not working days
+
+    def test_ends_rounded_up(self):
+        index = BusyIndex([(_t(0, 9), _t(0, 9, 52))])
+
+        (first, *_) = index.free_slots(_t(0, 9), _t(0, 17), _NINE_TO_FIVE)
+
+        assert first.start == _t(0, 9, 55)
+
+    def test_working_hours_in_user_zone_across_dst(self):
+        berlin = zoneinfo.ZoneInfo("Europe/Berlin")
+        hours = WorkingHours(datetime.time(9), datetime.time(17), frozenset(range(7)), berlin)
+
+        # Clocks go back on Sunday 25 October 2026
+        windows = list(hours.windows(_t(5, 0), _t(7, 0)))
+
+        assert [w.start.hour for w in windows] == [7, 8]
+        assert all(w.minutes == 480 for w in windows)
+
+    def test_months_of_events_are_fast(self):
+        rng = random.Random(7)
+        events = []
+        for day in range(180):
+            for _ in range(20):
+                start = _t(day, rng.randrange(7, 19), rng.choice((0, 15, 30, 45)))
+                events.append((start, start + datetime.timedelta(minutes=rng.choice((15, 30, 60)))))
+
+        began = time.perf_counter()
+        index = BusyIndex(events)
+        slots = index.free_slots(_t(0, 0), _t(180, 0), _NINE_TO_FIVE)
+        for day in range(180):
+            index.busy_between(_t(day, 9), _t(day, 17))
+        elapsed = time.perf_counter() - began
+
+        assert slots
+        assert all(index.is_free(s.start, s.end) for s in slots)
+        assert elapsed < 1.0
+
+
+class TestFitTasks:
+    def test_earliest_due_first_and_no_overlap(self):
+        slots = [Slot(_t(0, 10), _t(0, 11)), Slot(_t(0, 14), _t(0, 17))]
+        tasks = [
+            Task(1, "Whenever", 60),
+            Task(2, "Due tomorrow", 45, due=_t(1, 0)),
+            Task(3, "Due today 12:00", 30, due=_t(0, 12)),
+        ]
+
+        placed = {p.task.id: p.slot for p in fit_tasks(tasks, slots)}
+
+        assert placed[3] == Slot(_t(0, 10), _t(0, 10, 30))
+        assert placed[2] == Slot(_t(0, 14), _t(0, 14, 45))  # 30 min left at 10:30 is too short
+        assert placed[1] == Slot(_t(0, 14, 45), _t(0, 15, 45))
+
+    def test_unplaceable_before_due(self):
+        slots = [Slot(_t(0, 10), _t(0, 10, 30)), Slot(_t(1, 10), _t(1, 12))]
+
+        (placement,) = fit_tasks([Task(1, "Long", 90, due=_t(1, 0))], slots)
+
+        assert placement.slot is None
+
+    def test_date_only_due_means_end_of_day(self, monkeypatch):
+        monkeypatch.setattr(freebusy.settings, "user_timezone", "America/New_York")
+
+        assert deadline(_t(2, 0)) == datetime.datetime(
+            2026, 10, 22, tzinfo=zoneinfo.ZoneInfo("America/New_York")
+        )
+        assert deadline(_t(2, 15)) == _t(2, 15)
+        assert deadline(None) is None
+
+
+class TestLoadBusy:
+    @pytest.fixture(autouse=True)
+    def _google(self, monkeypatch):
+        monkeypatch.setattr(freebusy.settings, "calendar_backend", "google")
+        monkeypatch.setattr(freebusy.settings, "calendar_store_enabled", True)
+
+    async def _store_rows(self, db_session, now, synced_at=None):
+        source = CalendarSource(
+            id="primary", synced_at=synced_at or now,
+            expanded_until=now + datetime.timedelta(days=365),
+        )
+        entry = CalendarEntry(calendar_id="primary", event_id="e1", summary="Busy")
+        free = CalendarEntry(calendar_id="primary", event_id="e2", transparent=True)
+        db_session.add_all([source, entry, free])
+        await db_session.flush()
+        start = now + datetime.timedelta(hours=2)
+        db_session.add_all([
+            CalendarOccurrence(entry_id=entry.id, start_at=start,
+                               end_at=start + datetime.timedelta(hours=1)),
+            CalendarOccurrence(entry_id=free.id, start_at=start,
+                               end_at=start + datetime.timedelta(hours=5)),
+        ])
+        await db_session.flush()
+        return start
+
+    async def test_fresh_store_is_used(self, db_session, monkeypatch):
+        now = datetime.datetime.now(UTC).replace(microsecond=0)
+        start = await self._store_rows(db_session, now)
+        monkeypatch.setattr(
+            "istari.tools.calendar.reader.CalendarReader",
+            lambda *a, **k: pytest.fail("API used"),
+        )
+
+        index, source = await load_busy_index(now, now + datetime.timedelta(days=7), db_session)
+
+        assert source == "store"
+        assert index.intervals == [Slot(start, start + datetime.timedelta(hours=1))]
+
+    async def test_stale_store_falls_back_to_freebusy(self, db_session, monkeypatch):
+        now = datetime.datetime.now(UTC).replace(microsecond=0)
+        await self._store_rows(db_session, now, synced_at=now - datetime.timedelta(days=1))
+        busy = [(now, now + datetime.timedelta(minutes=30))]
+
+        class FakeReader:
+            def __init__(self, token_path):
+                pass
+
+            async def free_busy(self, start, end):
+                return busy
+
+        monkeypatch.setattr("istari.tools.calendar.reader.CalendarReader", FakeReader)
+
+        index, source = await load_busy_index(now, now + datetime.timedelta(days=7), db_session)
+
+        assert source == "google"
+        assert index.intervals == [Slot(*busy[0])]
+
+    async def test_plan_fits_tasks_into_all_gaps(self, monkeypatch):
+        monkeypatch.setattr(freebusy.settings, "user_timezone", "UTC")
+        monkeypatch.setattr(freebusy.settings, "working_hours_start", 9)
+        monkeypatch.setattr(freebusy.settings, "working_hours_end", 17)
+        monkeypatch.setattr(freebusy.settings, "working_days", [0, 1, 2, 3, 4])
+
+        async def fake_load(start, end, session=None):
+            return BusyIndex([(_t(0, 9, 20), _t(0, 16))]), "google"
+
+        monkeypatch.setattr(freebusy, "load_busy_index", fake_load)
+
+        plan = await plan_slots(None, 1, 30, [Task(1, "Quick call", 15)], now=_t(0, 9))
+
+        # The 20-minute gap is below the listing threshold but fits the 15-minute task
+        assert plan.slots == [Slot(_t(0, 16), _t(0, 17))]
+        assert plan.placements[0].slot == Slot(_t(0, 9), _t(0, 9, 15))
@@ -0,0 +1,202 @@
+"""Tests for the persistent trigram file index."""
+
+import os
+import time
+
+import pytest
+
+from istari.tools.filesystem import search
+from istari.tools.filesystem.index import FileIndex, walk_files
+
+
+@pytest.fixture()
+def tree(tmp_path):
+    root = tmp_path / "docs"
+    (root / "notes").mkdir(parents=True)
+    (root / "notes" / "meeting.md").write_text("Agenda\nAction: @cody review PR by Friday\n")
+    (root / "notes" / "groceries.txt").write_text("milk\neggs\nPR coffee beans\n")
+    (root / "report.py").write_text("def review():\n    return 'Review the PR'\n")
+    (root / "photo.png").write_bytes(b"\x89PNG\x00\x00 review PR")
+    for skipped in (".git", "node_modules", ".hidden", "build"):
+        (root / skipped).mkdir()
+        (root / skipped / "match.txt").write_text("review PR")
+    (root / ".gitignore").write_text("# build output\nbuild/\n*.log\n")
+    (root / "debug.log").write_text("review PR")
+    return root
+
+
+@pytest.fixture()
+def index(tmp_path):
+    idx = FileIndex(tmp_path / "index.sqlite3")
+    yield idx
+    idx.close()
+
+
+def _touch_later(path, text):
+    path.write_text(text)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+
+
+class TestRefresh:
+    def test_walk_prunes_skipped_and_ignored(self, tree):
+        names = sorted(os.path.relpath(e.path, tree) for e in walk_files(str(tree)))
+
+        assert names == [
+            ".gitignore", "notes/groceries.txt", "notes/meeting.md", "photo.png", "report.py",
+        ]
+
+    def test_first_refresh_indexes_text(self, index, tree):
+        result = index.refresh([str(tree)])
+
+        assert (result.scanned, result.indexed, result.removed) == (5, 5, 0)
+        assert index.stats() == {"files": 5, "text_files": 4}  # the PNG is metadata only
+
+    def test_unchanged_tree_reads_nothing(self, index, tree):
+        index.refresh([str(tree)])
+
+        result = index.refresh([str(tree)])
+
+        assert (result.scanned, result.indexed, result.removed) == (5, 0, 0)
+
+    def test_changes_and_deletions(self, index, tree):
+        index.refresh([str(tree)])
+        _touch_later(tree / "notes" / "groceries.txt", "bread\n")
+        (tree / "report.py").unlink()
+        (tree / "new.md").write_text("fresh review notes")
+
+        result = index.refresh([str(tree)])
+
+        assert (result.indexed, result.removed) == (2, 1)
+        assert {h.path for h in index.search("review", tree)} == {
+            str(tree / "new.md"), str(tree / "notes" / "meeting.md"),
+        }
+        assert index.search("coffee", tree) == []
+
+    def test_dropped_root_is_forgotten(self, index, tree, tmp_path):
+        other = tmp_path / "other"
+        other.mkdir()
+        (other / "a.txt").write_text("review PR")
+        index.refresh([str(tree), str(other)])
+
+        result = index.refresh([str(tree)])
+
+        assert result.removed == 1
+        assert not index.covers(other)
+
+    def test_large_file_indexed_up_to_cap(self, tmp_path):
+        root = tmp_path / "big"
+        root.mkdir()
+        (root / "log.txt").write_text("head marker\n" + "x" * 5000 + "\ntail marker\n")
+        idx = FileIndex(tmp_path / "cap.sqlite3", max_file_bytes=1024)
+        idx.refresh([str(root)])
+
+        assert [h.preview for h in idx.search("head marker", root)] == ["head marker"]
+        assert idx.search("tail marker", root) == []
+
+
+class TestSearch:
+    def test_case_insensitive_with_preview(self, index, tree):
+        index.refresh([str(tree)])
+
+        hits = index.search("action: @CODY", tree)
+
+        assert [(h.path, h.preview) for h in hits] == [
+            (str(tree / "notes" / "meeting.md"), "Action: @cody review PR by Friday"),
+        ]
+
+    def test_scoped_to_directory_and_extensions(self, index, tree):
+        index.refresh([str(tree)])
+
+        in_notes = {h.path for h in index.search("PR", tree / "notes")}
+        python_only = [h.path for h in index.search("review", tree, ["py"])]
+
+        assert in_notes == {
+            str(tree / "notes" / "meeting.md"), str(tree / "notes" / "groceries.txt"),
+        }
+        assert python_only == [str(tree / "report.py")]
+
+    def test_never_returns_skipped_files(self, index, tree):
+        index.refresh([str(tree)])
+
+        paths = {h.path for h in index.search("review PR", tree, max_results=50)}
+
+        assert paths == {str(tree / "notes" / "meeting.md")}
+
+    def test_edit_since_refresh_is_rechecked(self, index, tree):
+        index.refresh([str(tree)])
+        _touch_later(tree / "notes" / "meeting.md", "Agenda\nnothing to see\n")
+
+        assert index.search("@cody", tree) == []
+
+    def test_special_characters(self, index, tree):
+        (tree / "q.txt").write_text('He said "100%_done" today')
+        index.refresh([str(tree)])
+
+        assert [h.path for h in index.search('"100%_done"', tree)] == [str(tree / "q.txt")]
+        assert [h.path for h in index.search("%_", tree)] == [str(tree / "q.txt")]
+
+    def test_ranked_by_bm25_with_name_boost(self, index, tmp_path):
+        root = tmp_path / "ranked"
+        root.mkdir()
+        (root / "once.txt").write_text("zephyr\n" + "filler words here\n" * 40)
+        (root / "often.txt").write_text("zephyr zephyr zephyr\nfiller\n")
+        (root / "zephyr.txt").write_text("zephyr\n" + "filler words here\n" * 40)
+        index.refresh([str(root)])
+
+        hits = index.search("zephyr", root)
+
+        assert [os.path.basename(h.path) for h in hits] == ["zephyr.txt", "often.txt", "once.txt"]
+        assert hits[0].rank > hits[1].rank > hits[2].rank
+
+    def test_stale_hits_do_not_shrink_the_page(self, index, tmp_path):
+        root = tmp_path / "stale"
+        root.mkdir()
+        for n in range(30):
+            (root / f"n{n}.txt").write_text("marker " * (30 - n))
+        index.refresh([str(root)])
+        for n in range(25):
+            _touch_later(root / f"n{n}.txt", "gone\n")
+
+        hits = index.search("marker", root, max_results=3)
+
+        assert sorted(os.path.basename(h.path) for h in hits) == ["n25.txt", "n26.txt", "n27.txt"]
+
+    def test_many_files_answer_quickly(self, index, tmp_path):
+        root = tmp_path / "many"
+        for d in range(20):
+            (root / f"d{d}").mkdir(parents=True)
+            for f in range(100):
+                (root / f"d{d}" / f"n{f}.md").write_text(f"note {d}-{f}\nplain words here\n")
+        (root / "d7" / "needle.md").write_text("the quarterly zephyr budget\n")
+        index.refresh([str(root)])
+
+        began = time.perf_counter()
+        for _ in range(20):
+            hits = index.search("zephyr budget", root)
+        per_query = (time.perf_counter() - began) / 20
+
+        assert [h.path for h in hits] == [str(root / "d7" / "needle.md")]
+        assert per_query < 0.05
+
+
+class TestRouting:
+    def test_indexed_root_uses_index(self, tree, monkeypatch):
+        from istari.tools.filesystem.index import get_file_index
+
+        index = get_file_index()
+        index.refresh([str(tree)])
+        monkeypatch.setattr(
+            search, "search_text_in_files", lambda *a, **k: pytest.fail("scanned")
+        )
+
+        results = search.search_files("@cody", str(tree / "notes"))
+
+        assert results == [
+            (str(tree / "notes" / "meeting.md"), "Action: @cody review PR by Friday"),
+        ]
+
+    def test_unindexed_directory_is_scanned(self, tree):
+        results = search.search_files("@cody", str(tree))
+
+        assert [p for p, _ in results] == [str(tree / "notes" / "meeting.md")]
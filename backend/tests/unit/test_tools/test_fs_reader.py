@@ -0,0 +1,126 @@
+"""Tests for paged file reads."""
+
+import pytest
+
+from istari.tools.filesystem import reader
+from istari.tools.filesystem.reader import BinaryFileError, read_lines, read_range
+
+
+@pytest.fixture()
+def numbered(tmp_path):
+    path = tmp_path / "numbered.txt"
+    path.write_text("".join(f"line {i}\n" for i in range(1, 1001)))
+    return path
+
+
+class TestReadRange:
+    def test_small_file_is_one_complete_page(self, tmp_path):
+        path = tmp_path / "a.md"
+        path.write_text("hello\nworld\n")
+
+        page = read_range(path)
+
+        assert page.complete
+        assert (page.text, page.size, page.first_line, page.last_line) == (
+            "hello\nworld\n", 12, 1, 2,
+        )
+
+    def test_page_ends_on_a_line_and_continues_from_there(self, numbered):
+        first = read_range(numbered, length=100)
+        second = read_range(numbered, offset=first.end, length=100)
+
+        assert first.text.endswith("\n") and not first.complete
+        assert first.size == numbered.stat().st_size
+        assert second.text.startswith("line ")
+        assert (first.text + second.text).startswith("line 1\nline 2\n")
+        assert second.first_line is None  # unknown without counting from the start
+
+    def test_offset_inside_a_character_skips_to_the_next(self, tmp_path):
+        path = tmp_path / "accents.txt"
+        path.write_text("é" * 10)  # 2 bytes each
+
+        page = read_range(path, offset=3, length=4)
+
+        assert page.text == "é"
+        assert (page.start, page.end) == (4, 6)
+
+    def test_offset_past_end_is_empty(self, numbered):
+        page = read_range(numbered, offset=10**9)
+
+        assert page.text == ""
+        assert page.start == page.end == page.size
+
+    def test_reads_only_the_page_of_a_large_file(self, tmp_path, monkeypatch):
+        path = tmp_path / "big.log"
+        path.write_bytes(b"2026-10-19 12:00:00 INFO request handled\n" * 150_000)  # ~6 MB
+        reads = []
+        real_open = open
+
+        def tracking_open(*args, **kwargs):
+            f = real_open(*args, **kwargs)
+            real_read = f.read
+            f.read = lambda n=-1: reads.append(n) or real_read(n)
+            return f
+
+        monkeypatch.setattr(reader, "open", tracking_open, raising=False)
+        page = read_range(path, offset=41 * 70_000)  # the start of line 70,001
+
+        assert page.size == path.stat().st_size
+        assert page.text.startswith("2026-10-19") and len(page.text) <= reader.PAGE_BYTES
+        assert sum(reads) == reader.SNIFF_BYTES + reader.PAGE_BYTES
+
+    def test_length_is_capped(self, tmp_path):
+        path = tmp_path / "long.txt"
+        path.write_text("x" * (reader.MAX_PAGE_BYTES * 2))
+
+        page = read_range(path, length=10**9)
+
+        assert page.end - page.start == reader.MAX_PAGE_BYTES
+
+    @pytest.mark.parametrize("head", [b"\x00\x01\x02", b"\xff\xfe bad utf-8"])
+    def test_binary_is_detected_from_the_prefix(self, tmp_path, head):
+        path = tmp_path / "blob.bin"
+        path.write_bytes(head + b"text" * 100)
+
+        with pytest.raises(BinaryFileError):
+            read_range(path)
+
+
+class TestReadLines:
+    def test_line_range(self, numbered):
+        page = read_lines(numbered, 500, 502)
+
+        assert page.text == "line 500\nline 501\nline 502\n"
+        assert (page.first_line, page.last_line) == (500, 502)
+        assert page.start == len("".join(f"line {i}\n" for i in range(1, 500)))
+
+    def test_line_range_across_chunks(self, numbered, monkeypatch):
+        monkeypatch.setattr(reader, "_CHUNK_BYTES", 7)
+
+        page = read_lines(numbered, 998)
+
+        assert page.text == "line 998\nline 999\nline 1000\n"
+        assert page.end == page.size
+
+    def test_open_range_stops_at_page_size(self, numbered):
+        page = read_lines(numbered, 10, max_bytes=50)
+
+        assert page.text.startswith("line 10\n") and page.text.endswith("\n")
+        assert len(page.text) <= 50
+        assert page.end < page.size
+
+    def test_last_line_without_newline(self, tmp_path):
+        path = tmp_path / "end.txt"
+        path.write_text("a\nb\nc")
+
+        page = read_lines(path, 3)
+
+        assert (page.text, page.first_line, page.last_line) == ("c", 3, 3)
+
+    def test_past_end_is_empty(self, tmp_path):
+        path = tmp_path / "short.txt"
+        path.write_text("a\nb\n")
+
+        page = read_lines(path, 3)
+
+        assert page.text == "" and page.start == page.size
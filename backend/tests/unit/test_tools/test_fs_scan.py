@@ -0,0 +1,92 @@
+"""Tests for the parallel un-indexed filesystem scan."""
+
+import pytest
+
+from istari.tools.filesystem import scan
+from istari.tools.filesystem.index import walk_files
+from istari.tools.filesystem.scan import scan_text
+
+
+@pytest.fixture()
+def tree(tmp_path):
+    root = tmp_path / "docs"
+    (root / "notes").mkdir(parents=True)
+    (root / "notes" / "meeting.md").write_text("Agenda\nAction: @cody review PR by Friday\n")
+    (root / "notes" / "groceries.txt").write_text("milk\neggs\n")
+    (root / "photo.png").write_bytes(b"\x89PNG\x00\x00 review PR")
+    for skipped in (".git", "node_modules"):
+        (root / skipped).mkdir()
+        (root / skipped / "match.txt").write_text("review PR")
+    return root
+
+
+class TestScanText:
+    def test_finds_match_with_preview(self, tree):
+        result = scan_text("REVIEW pr", str(tree))
+
+        assert result.matches == [
+            (str(tree / "notes" / "meeting.md"), "Action: @cody review PR by Friday"),
+        ]
+
+    def test_skips_binary_and_pruned_directories(self, tree):
+        result = scan_text("review PR", str(tree))
+
+        assert [p for p, _ in result.matches] == [str(tree / "notes" / "meeting.md")]
+        assert result.scanned == 3  # meeting, groceries, photo; nothing under .git
+
+    def test_extension_filter(self, tree):
+        result = scan_text("review", str(tree), extensions="txt, png")
+
+        assert result.matches == []
+        assert result.scanned == 2
+
+    def test_needle_across_chunk_boundary_previews_whole_line(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(scan, "_CHUNK_BYTES", 64)
+        (tmp_path / "long.txt").write_text("x" * 50 + "\nthe quarterly zephyr budget\n")
+
+        result = scan_text("zephyr", str(tmp_path))
+
+        assert result.matches == [(str(tmp_path / "long.txt"), "the quarterly zephyr budget")]
+
+    def test_non_ascii_needle_is_case_insensitive(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(scan, "_CHUNK_BYTES", 16)
+        (tmp_path / "cafe.md").write_text("menu\n" + "é" * 20 + " CRÈME BRÛLÉE\n")
+
+        result = scan_text("crème brûlée", str(tmp_path))
+
+        assert [p for p, _ in result.matches] == [str(tmp_path / "cafe.md")]
+
+    def test_size_cap_stops_reading(self, tmp_path):
+        (tmp_path / "big.log").write_text("a" * 10_000 + "needle\n")
+
+        result = scan_text("needle", str(tmp_path), max_file_bytes=4096)
+
+        assert result.matches == []
+        assert result.bytes_read == 4096
+
+    def test_results_in_walk_order_and_stop_early(self, tmp_path):
+        for i in range(200):
+            (tmp_path / f"n{i:03d}.md").write_text(f"note {i}\nneedle\n")
+        walk_order = [e.path for e in walk_files(str(tmp_path))]
+
+        result = scan_text("needle", str(tmp_path), max_results=5, workers=4)
+
+        assert [p for p, _ in result.matches] == walk_order[:5]
+        assert result.scanned < 200
+
+    def test_max_files_caps_the_scan(self, tmp_path):
+        for i in range(30):
+            (tmp_path / f"n{i:02d}.md").write_text("nothing here")
+
+        result = scan_text("needle", str(tmp_path), max_files=10)
+
+        assert result.scanned == 10
+
+    def test_time_budget_exhausted(self, tree):
+        result = scan_text("review", str(tree), time_budget=0)
+
+        assert result.timed_out
+        assert result.matches == []
+
+    def test_missing_directory(self, tmp_path):
+        assert scan_text("x", str(tmp_path / "nope")).matches == []
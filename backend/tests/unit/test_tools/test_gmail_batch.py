@@ -0,0 +1,76 @@
+"""GmailReader against the fake Gmail API — real HTTP, no network.
+
+Requests go through googleapiclient's real list and batch code paths. The
+fake adds fixed latency per round trip and counts them.
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from fixtures.gmail.fake_api import FakeGmail, serve_fake_gmail
+from istari.tools.gmail import reader as reader_module
+from istari.tools.gmail.reader import GmailReader
+
+LATENCY_SECONDS = 0.05
+
+
+@pytest.fixture()
+def fake():
+    fake = FakeGmail(latency=LATENCY_SECONDS)
+    for _ in range(40):
+        fake.add_message()
+    return fake
+
+
+@pytest.fixture()
+def reader(tmp_path, fake):
+    with (
+        serve_fake_gmail(fake, tmp_path) as token_path,
+        patch.object(reader_module, "_RETRY_DELAY_SECONDS", 0.0),
+    ):
+        yield GmailReader(token_path)
+
+
+async def test_one_batch_round_trip_in_list_order(reader, fake):
+    start = time.perf_counter()
+    results = await reader.list_unread(max_results=40)
+    elapsed = time.perf_counter() - start
+
+    assert [r.id for r in results] == fake.order
+    assert results[0].id == "m040"
+    assert results[0].thread_id == "tm040"
+    # One list call and one batch instead of 1 + 40 sequential gets
+    assert fake.round_trips == ["messages", "batch"]
+    assert elapsed < 41 * LATENCY_SECONDS / 2
+
+
+async def test_chunks_of_fifty(reader, fake):
+    for _ in range(80):
+        fake.add_message()
+
+    results = await reader.search("label:inbox", max_results=120)
+
+    assert [r.id for r in results] == fake.order
+    assert fake.round_trips == ["messages", "batch", "batch", "batch"]
+
+
+async def test_missing_message_is_skipped(reader, fake):
+    fake.failures = {"m038": [404, 404]}
+
+    results = await reader.list_unread(max_results=10)
+
+    assert [r.id for r in results] == [i for i in fake.order[:10] if i != "m038"]
+    assert fake.round_trips == ["messages", "batch"]
+
+
+async def test_throttled_messages_retried_once(reader, fake):
+    fake.failures = {"m039": [429], "m036": [503], "m033": [429, 429]}
+
+    results = await reader.list_unread(max_results=10)
+
+    # m039 and m036 recover on the retry batch, in their original places;
+    # m033 is throttled twice and dropped
+    assert [r.id for r in results] == [i for i in fake.order[:10] if i != "m033"]
+    assert fake.round_trips == ["messages", "batch", "batch"]
@@ -0,0 +1,88 @@
+"""Tests for bounded body extraction from Gmail payloads."""
+
+import base64
+
+from istari.tools.gmail.mime import TRUNCATED, decode_part, extract_text, html_to_text
+
+
+def _part(mime: str, body: bytes, charset: str | None = None, filename: str = "") -> dict:
+    headers = []
+    if charset:
+        headers.append({"name": "Content-Type", "value": f'{mime}; charset="{charset}"'})
+    return {
+        "mimeType": mime,
+        "filename": filename,
+        "headers": headers,
+        "body": {"data": base64.urlsafe_b64encode(body).decode().rstrip("=")},
+    }
+
+
+def _multipart(*parts: dict) -> dict:
+    return {"mimeType": "multipart/alternative", "parts": list(parts)}
+
+
+class TestExtractText:
+    def test_prefers_plain_text(self):
+        payload = _multipart(
+            _part("text/plain", b"plain body"), _part("text/html", b"<p>html body</p>")
+        )
+        assert extract_text(payload, 1024, 4096) == "plain body"
+
+    def test_html_only_falls_back_to_text(self):
+        html = (
+            b"<html><head><style>p{color:red}</style><title>T</title></head><body>"
+            b"<h1>News</h1><p>Hello&nbsp;&amp; welcome</p><script>alert(1)</script>"
+            b"<ul><li>One</li><li>Two</li></ul></body></html>"
+        )
+        text = extract_text(_multipart(_part("text/html", html)), 1024, 4096)
+        assert text == "News\n\nHello\xa0& welcome\n\nOne\n\nTwo"
+
+    def test_plain_text_capped(self):
+        text = extract_text(_part("text/plain", b"x" * 10_000), 100, 4096)
+        assert text == "x" * 100 + TRUNCATED
+
+    def test_html_capped_before_and_after_rendering(self):
+        html = b"<p>" + b"word " * 10_000 + b"</p>"
+        text = extract_text(_part("text/html", html), 200, 1000)
+        assert text.endswith(TRUNCATED)
+        assert len(text.encode()) <= 200 + len(TRUNCATED.encode())
+
+    def test_attachments_are_not_decoded(self):
+        payload = {
+            "mimeType": "multipart/mixed",
+            "parts": [
+                _part("text/plain", b"attached notes", filename="notes.txt"),
+                _multipart(_part("text/plain", b"the message")),
+            ],
+        }
+        assert extract_text(payload, 1024, 4096) == "the message"
+
+    def test_no_text_part(self):
+        assert extract_text(_part("image/png", b"\x89PNG"), 1024, 4096) == ""
+
+
+class TestDecodePart:
+    def test_decodes_only_needed_prefix(self):
+        part = _part("text/plain", b"a" * 3_000_000)
+        text, cut = decode_part(part, 64)
+        assert (text, cut) == ("a" * 64, True)
+
+    def test_exact_fit_is_not_cut(self):
+        assert decode_part(_part("text/plain", b"abcdef"), 6) == ("abcdef", False)
+
+    def test_split_multibyte_character_dropped(self):
+        # "é" is two bytes in UTF-8; a 3-byte cap lands inside the second one
+        text, cut = decode_part(_part("text/plain", "éé".encode()), 3)
+        assert (text, cut) == ("é", True)
+
+    def test_declared_charset(self):
+        part = _part("text/plain", "café".encode("latin-1"), charset="iso-8859-1")
+        assert decode_part(part, 1024) == ("café", False)
+
+    def test_unknown_charset_falls_back_to_utf8(self):
+        part = _part("text/plain", "café".encode(), charset="x-unknown")
+        assert decode_part(part, 1024) == ("café", False)
+
+
+def test_html_to_text_collapses_whitespace():
+    assert html_to_text("<div>  a \n b </div><div></div><div>c</div>") == "a\nb\n\nc"
@@ -0,0 +1,273 @@
+"""Tests for the local Gmail mirror, synced from the fake Gmail API."""
+
+import datetime
+
+import pytest
+from sqlalchemy import select, update
+
+from fixtures.gmail.fake_api import FakeGmail, serve_fake_gmail
+from istari.models.mail import MailMessage, MailSyncState
+from istari.tools.gmail.mirror import MailMirror
+from istari.tools.gmail.reader import GmailReader
+
+
+@pytest.fixture()
+def fake():
+    fake = FakeGmail()
+    fake.add_message(subject="Quarterly invoice", sender="billing@acme.com")
+    fake.add_message(subject="Lunch?", sender="alice@test.com", labels=["INBOX"])
+    fake.add_message(subject="Build failed", sender="ci@example.com")
+    return fake
+
+
+@pytest.fixture()
+def token_path(tmp_path, fake):
+    with serve_fake_gmail(fake, tmp_path) as path:
+        yield path
+
+
+@pytest.fixture()
+def mirror(db_session):
+    return MailMirror(db_session)
+
+
+async def _mirrored(db_session) -> dict[str, MailMessage]:
+    rows = await db_session.execute(select(MailMessage))
+    return {m.id: m for m in rows.scalars()}
+
+
+class TestSync:
+    async def test_first_sync_copies_mailbox(self, db_session, mirror, fake, token_path):
+        result = await mirror.sync(GmailReader(token_path))
+
+        assert result.full
+        assert result.added == 3
+        rows = await _mirrored(db_session)
+        assert set(rows) == {"m001", "m002", "m003"}
+        assert rows["m001"].subject == "Quarterly invoice"
+        assert rows["m001"].is_unread and rows["m001"].in_inbox
+        assert not rows["m002"].is_unread
+        state = await db_session.get(MailSyncState, 1)
+        assert state.history_id == str(fake.history_id)
+
+    async def test_incremental_sync_applies_only_history(
+        self, db_session, mirror, fake, token_path
+    ):
+        reader = GmailReader(token_path)
+        await mirror.sync(reader)
+        new_id = fake.add_message(subject="Offer letter")
+        fake.delete_message("m003")
+        fake.modify_labels("m001", remove=["UNREAD"])
+        fake.modify_labels("m002", add=["STARRED", "UNREAD"])
+        fake.round_trips.clear()
+
+        result = await mirror.sync(reader)
+
+        assert not result.full
+        assert (result.added, result.removed, result.relabeled) == (1, 1, 2)
+        # One history page and one batch for the single new message
+        assert fake.round_trips == ["history", "batch"]
+        rows = await _mirrored(db_session)
+        assert set(rows) == {"m001", "m002", new_id}
+        assert not rows["m001"].is_unread
+        assert rows["m002"].is_unread
+        assert "STARRED" in rows["m002"].labels
+
+    async def test_no_changes_costs_one_round_trip(self, mirror, fake, token_path):
+        reader = GmailReader(token_path)
+        await mirror.sync(reader)
+        fake.round_trips.clear()
+
+        result = await mirror.sync(reader)
+
+        assert (result.added, result.removed, result.relabeled) == (0, 0, 0)
+        assert fake.round_trips == ["history"]
+
+    async def test_message_added_then_deleted_is_not_fetched(
+        self, db_session, mirror, fake, token_path
+    ):
+        reader = GmailReader(token_path)
+        await mirror.sync(reader)
+        gone = fake.add_message()
+        fake.delete_message(gone)
+        fake.round_trips.clear()
+
+        await mirror.sync(reader)
+
+        assert fake.round_trips == ["history"]
+        assert gone not in await _mirrored(db_session)
+
+    async def test_expired_history_resyncs_fully(self, db_session, mirror, fake, token_path):
+        reader = GmailReader(token_path)
+        await mirror.sync(reader)
+        fake.delete_message("m001")
+        fake.expire_history()
+
+        result = await mirror.sync(reader)
+
+        assert result.full
+        assert result.removed == 1
+        assert set(await _mirrored(db_session)) == {"m002", "m003"}
+
+    async def test_resync_keeps_digest_marks(self, db_session, mirror, fake, token_path):
+        reader = GmailReader(token_path)
+        await mirror.sync(reader)
+        await mirror.mark_digested(["m001"])
+        fake.expire_history()
+
+        await mirror.sync(reader)
+
+        rows = await _mirrored(db_session)
+        assert rows["m001"].digested_at is not None
+
+    async def test_spam_and_trash_hidden(self, db_session, mirror, fake, token_path):
+        reader = GmailReader(token_path)
+        await mirror.sync(reader)
+        fake.modify_labels("m003", add=["TRASH"], remove=["INBOX"])
+
+        await mirror.sync(reader)
+
+        assert [e.id for e in await mirror.list_unread(10)] == ["m001"]
+
+
+class TestReads:
+    async def test_freshness(self, db_session, mirror, token_path):
+        assert not await mirror.is_fresh()
+        await mirror.sync(GmailReader(token_path))
+        assert await mirror.is_fresh()
+
+        stale = datetime.datetime.now(datetime.UTC) - mirror.max_age - datetime.timedelta(1)
+        await db_session.execute(update(MailSyncState).values(synced_at=stale))
+        assert not await mirror.is_fresh()
+
+    async def test_list_unread_newest_first(self, mirror, token_path):
+        await mirror.sync(GmailReader(token_path))
+
+        emails = await mirror.list_unread(10)
+
+        assert [e.id for e in emails] == ["m003", "m001"]
+        assert emails[0].subject == "Build failed"
+        assert emails[0].thread_id == "tm003"
+        assert emails[0].date is not None and emails[0].date.tzinfo is not None
+
+    @pytest.mark.parametrize(
+        ("query", "expected"),
+        [
+            ("invoice", ["m001"]),
+            ('"build failed"', ["m003"]),
+            ("from:alice", ["m002"]),
+            ("subject:lunch", ["m002"]),
+            ("is:unread", ["m003", "m001"]),
+            ("is:read in:inbox", ["m002"]),
+            ("is:unread acme", ["m001"]),
+            ("newer_than:1d", []),
+            ("older_than:1d", ["m003", "m002", "m001"]),
+        ],
+    )
+    async def test_search(self, mirror, token_path, query, expected):
+        await mirror.sync(GmailReader(token_path))
+
+        emails = await mirror.search(query, 10)
+
+        assert emails is not None
+        assert [e.id for e in emails] == expected
+
+    @pytest.mark.parametrize(
+        "query",
+        ["has:attachment", "label:work", "invoice OR receipt", "-invoice", "to:me", "{a b}"],
+    )
+    async def test_search_outside_mirror_returns_none(self, mirror, token_path, query):
+        await mirror.sync(GmailReader(token_path))
+
+        assert await mirror.search(query, 10) is None
+
+    @pytest.mark.parametrize(
+        ("query", "expected"),
+        [
+            ("from:billing", None),
+            ("invoice", None),
+            ("older_than:1d", None),
+            ("is:unread", None),
+            ("is:unread build", None),
+            ("newer_than:1d", []),
+            ("is:unread newer_than:1d", []),
+        ],
+    )
+    async def test_partial_mirror_only_answers_its_period(
+        self, db_session, mirror, fake, token_path, query, expected
+    ):
+        # Two of three messages: m001 (the oldest) was never mirrored
+        await mirror.sync(GmailReader(token_path), bootstrap_max=2)
+        state = await db_session.get(MailSyncState, 1)
+        assert state is not None and not state.complete
+
+        emails = await mirror.search(query, 10)
+
+        assert (None if emails is None else [e.id for e in emails]) == expected
+
+    async def test_partial_mirror_does_not_list_unread(self, mirror, token_path):
+        await mirror.sync(GmailReader(token_path), bootstrap_max=2)
+
+        assert await mirror.list_unread(10) is None
+
+    async def test_digest_delta(self, mirror, fake, token_path):
+        reader = GmailReader(token_path)
+        await mirror.sync(reader)
+        await mirror.mark_digested(["m001", "m003"])
+        fake.add_message(subject="New since digest")
+        await mirror.sync(reader)
+
+        emails = await mirror.list_undigested_unread(10)
+
+        assert [e.subject for e in emails] == ["New since digest"]
+
+
+class TestReaderUsesMirror:
+    async def test_fresh_mirror_serves_without_api_calls(self, mirror, fake, token_path):
+        await mirror.sync(GmailReader(token_path))
+        fake.round_trips.clear()
+        reader = GmailReader(token_path, mirror=mirror)
+
+        unread = await reader.list_unread(max_results=10)
+        found = await reader.search("from:billing", max_results=10)
+
+        assert [e.id for e in unread] == ["m003", "m001"]
+        assert [e.id for e in found] == ["m001"]
+        assert fake.round_trips == []
+
+    async def test_unsupported_query_goes_to_api(self, mirror, fake, token_path):
+        await mirror.sync(GmailReader(token_path))
+        fake.round_trips.clear()
+        reader = GmailReader(token_path, mirror=mirror)
+
+        await reader.search("has:attachment", max_results=10)
+
+        assert fake.round_trips == ["messages", "batch"]
+
+    async def test_nothing_found_in_mirror_goes_to_api(self, mirror, fake, token_path):
+        await mirror.sync(GmailReader(token_path))
+        fake.round_trips.clear()
+        reader = GmailReader(token_path, mirror=mirror)
+
+        await reader.search("from:nobody", max_results=10)
+
+        assert fake.round_trips == ["messages", "batch"]
+
+    async def test_partial_mirror_lists_unread_from_api(self, mirror, fake, token_path):
+        await mirror.sync(GmailReader(token_path), bootstrap_max=2)
+        fake.round_trips.clear()
+        reader = GmailReader(token_path, mirror=mirror)
+
+        emails = await reader.list_unread(max_results=10)
+
+        # m001 is unread but older than anything the mirror copied
+        assert [e.id for e in emails] == ["m003", "m001"]
+        assert fake.round_trips == ["messages", "batch"]
+
+    async def test_never_synced_mirror_goes_to_api(self, mirror, fake, token_path):
+        reader = GmailReader(token_path, mirror=mirror)
+
+        emails = await reader.list_unread(max_results=10)
+
+        assert [e.id for e in emails] == ["m003", "m001"]
+        assert fake.round_trips == ["messages", "batch"]
@@ -5,7 +5,9 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from istari.tools.gmail.reader import EmailSummary, GmailReader, ThreadDetail
+from istari.tools.gmail import reader as reader_module
+from istari.tools.gmail.reader import EmailSummary, GmailReader, ThreadDetail, clear_thread_cache
+from istari.tools.google.services import clear_service_cache
 
 
 @pytest.fixture()
@@ -23,15 +25,43 @@ def reader(tmp_path, mock_service):
         '{"token": "fake", "refresh_token": "fake",'
         ' "client_id": "x", "client_secret": "y"}'
     )
+    creds_path = "istari.tools.google.services.Credentials.from_authorized_user_file"
+    clear_service_cache()
+    clear_thread_cache()
     with (
-        patch("istari.tools.gmail.reader.Credentials.from_authorized_user_file") as mock_creds_cls,
-        patch("istari.tools.gmail.reader.build", return_value=mock_service),
+        patch(creds_path) as mock_creds_cls,
+        patch("istari.tools.google.services.build_from_document", return_value=mock_service),
     ):
         mock_creds = MagicMock()
-        mock_creds.expired = False
+        mock_creds.expiry = None
         mock_creds_cls.return_value = mock_creds
         r = GmailReader(str(token_file))
-    return r
+    yield r
+    clear_service_cache()
+    clear_thread_cache()
+
+
+class _FakeBatch:
+    """Stands in for a BatchHttpRequest: answers each added call by request id."""
+
+    def __init__(self, messages: dict, callback) -> None:  # type: ignore[no-untyped-def]
+        self._messages = messages
+        self._callback = callback
+        self._ids: list[str] = []
+
+    def add(self, request, request_id: str) -> None:  # type: ignore[no-untyped-def]
+        self._ids.append(request_id)
+
+    def execute(self) -> None:
+        for msg_id in self._ids:
+            self._callback(msg_id, self._messages[msg_id], None)
+
+
+def _serve_batches(mock_service, *messages: dict) -> None:  # type: ignore[no-untyped-def]
+    by_id = {m["id"]: m for m in messages}
+    mock_service.new_batch_http_request.side_effect = (
+        lambda callback: _FakeBatch(by_id, callback)
+    )
 
 
 def _make_message(msg_id: str, thread_id: str, subject: str, sender: str, snippet: str) -> dict:
@@ -54,10 +84,11 @@ async def test_list_unread(reader, mock_service):
     mock_service.users().messages().list().execute.return_value = {
         "messages": [{"id": "m1"}, {"id": "m2"}]
     }
-    mock_service.users().messages().get().execute.side_effect = [
+    _serve_batches(
+        mock_service,
         _make_message("m1", "t1", "Hello", "alice@test.com", "Hi there"),
         _make_message("m2", "t2", "Meeting", "bob@test.com", "Let's meet"),
-    ]
+    )
 
     results = await reader.list_unread(max_results=5)
 
@@ -82,8 +113,8 @@ async def test_search(reader, mock_service):
     mock_service.users().messages().list().execute.return_value = {
         "messages": [{"id": "m3"}]
     }
-    mock_service.users().messages().get().execute.return_value = _make_message(
-        "m3", "t3", "Invoice", "billing@test.com", "Your invoice"
+    _serve_batches(
+        mock_service, _make_message("m3", "t3", "Invoice", "billing@test.com", "Your invoice")
     )
 
     results = await reader.search("from:billing", max_results=10)
@@ -124,6 +155,58 @@ async def test_get_thread(reader, mock_service):
     assert result.messages[0].body == "Hello, how are you?"
 
 
+def _thread(history_id: str, text: str) -> dict:
+    import base64
+
+    return {
+        "id": "t1",
+        "historyId": history_id,
+        "messages": [{
+            "id": "m1",
+            "payload": {
+                "mimeType": "text/plain",
+                "headers": [{"name": "Subject", "value": "Greetings"}],
+                "body": {"data": base64.urlsafe_b64encode(text.encode()).decode()},
+            },
+        }],
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_thread_repeat_read_is_free(reader, mock_service):
+    threads = mock_service.users().threads()
+    threads.get().execute.return_value = _thread("100", "first")
+    threads.get.reset_mock()
+
+    first = await reader.get_thread("t1")
+    second = await reader.get_thread("t1")
+
+    assert second is first
+    assert threads.get.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_thread_revalidates_by_history_id(reader, mock_service, monkeypatch):
+    monkeypatch.setattr(reader_module, "_THREAD_REVALIDATE_SECONDS", 0.0)
+    threads = mock_service.users().threads()
+    threads.get().execute.side_effect = [
+        _thread("100", "first"),
+        {"historyId": "100"},  # unchanged: served from cache
+        {"historyId": "105"},  # a reply arrived: refetched
+        _thread("105", "second"),
+    ]
+    threads.get.reset_mock()
+
+    first = await reader.get_thread("t1")
+    unchanged = await reader.get_thread("t1")
+    changed = await reader.get_thread("t1")
+
+    assert unchanged is first
+    assert changed.messages[0].body == "second"
+    formats = [c.kwargs["format"] for c in threads.get.call_args_list]
+    assert formats == ["full", "minimal", "minimal", "full"]
+
+
 def test_token_not_found():
     with pytest.raises(FileNotFoundError, match="Gmail token not found"):
         GmailReader("/nonexistent/token.json")
@@ -0,0 +1,133 @@
+"""Tests for the shared Google API service cache — no network access."""
+
+import datetime
+import json
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from istari.tools.google import services
+from istari.tools.google.services import _ThreadLocalHttp, clear_service_cache, get_service
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_service_cache()
+    yield
+    clear_service_cache()
+
+
+def _write_token(path, expires_in: datetime.timedelta) -> None:  # type: ignore[no-untyped-def]
+    expiry = datetime.datetime.now(datetime.UTC).replace(tzinfo=None) + expires_in
+    path.write_text(json.dumps({
+        "token": "access",
+        "refresh_token": "refresh",
+        "client_id": "x",
+        "client_secret": "y",
+        "expiry": expiry.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }))
+
+
+def _fake_refresh(calls: list[int]):  # type: ignore[no-untyped-def]
+    def _refresh(self, request):  # type: ignore[no-untyped-def]
+        calls.append(1)
+        time.sleep(0.05)  # widen the race window
+        self.token = "refreshed"
+        self.expiry = datetime.datetime.now(datetime.UTC).replace(tzinfo=None) + datetime.timedelta(
+            hours=1
+        )
+
+    return _refresh
+
+
+class TestGetService:
+    def test_builds_once_from_bundled_discovery(self, tmp_path):
+        token = tmp_path / "token.json"
+        _write_token(token, datetime.timedelta(hours=1))
+        with patch.object(
+            services, "build_from_document", wraps=services.build_from_document
+        ) as build:
+            first = get_service("gmail", "v1", token)
+            second = get_service("gmail", "v1", str(token))
+        assert first is second
+        assert build.call_count == 1
+        assert hasattr(first, "users")
+
+    def test_separate_apis_and_tokens(self, tmp_path):
+        gmail_token = tmp_path / "gmail.json"
+        calendar_token = tmp_path / "calendar.json"
+        _write_token(gmail_token, datetime.timedelta(hours=1))
+        _write_token(calendar_token, datetime.timedelta(hours=1))
+        gmail = get_service("gmail", "v1", gmail_token)
+        calendar = get_service("calendar", "v3", calendar_token)
+        assert gmail is not calendar
+        assert hasattr(calendar, "events")
+
+    def test_token_file_change_rebuilds(self, tmp_path):
+        token = tmp_path / "token.json"
+        _write_token(token, datetime.timedelta(hours=1))
+        first = get_service("gmail", "v1", token)
+        _write_token(token, datetime.timedelta(hours=2))
+        stat = token.stat()
+        os.utime(token, (stat.st_atime, stat.st_mtime + 10))
+        assert get_service("gmail", "v1", token) is not first
+
+    def test_missing_token(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            get_service("gmail", "v1", tmp_path / "missing.json")
+
+
+class TestCredentialRefresh:
+    def test_refreshes_before_expiry_and_saves_token(self, tmp_path):
+        token = tmp_path / "token.json"
+        _write_token(token, datetime.timedelta(minutes=2))  # inside the refresh margin
+        calls: list[int] = []
+        with patch("google.oauth2.credentials.Credentials.refresh", _fake_refresh(calls)):
+            first = get_service("gmail", "v1", token)
+            # The saved token no longer counts as a change on disk
+            assert get_service("gmail", "v1", token) is first
+        assert calls == [1]
+        assert json.loads(token.read_text())["token"] == "refreshed"
+
+    def test_fresh_token_is_not_refreshed(self, tmp_path):
+        token = tmp_path / "token.json"
+        _write_token(token, datetime.timedelta(hours=1))
+        calls: list[int] = []
+        with patch("google.oauth2.credentials.Credentials.refresh", _fake_refresh(calls)):
+            get_service("gmail", "v1", token)
+        assert calls == []
+
+    def test_concurrent_requests_refresh_once(self, tmp_path):
+        token = tmp_path / "token.json"
+        _write_token(token, datetime.timedelta(hours=1))
+        get_service("gmail", "v1", token)
+        cached = next(iter(services._services.values()))
+        cached.credentials.expiry = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+
+        calls: list[int] = []
+        with patch("google.oauth2.credentials.Credentials.refresh", _fake_refresh(calls)):
+            threads = [threading.Thread(target=cached.ensure_fresh) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        assert calls == [1]
+
+
+class TestThreadLocalHttp:
+    def test_one_transport_per_thread(self, tmp_path):
+        token = tmp_path / "token.json"
+        _write_token(token, datetime.timedelta(hours=1))
+        get_service("gmail", "v1", token)
+        http = _ThreadLocalHttp(next(iter(services._services.values())))
+
+        main = http._http()
+        assert http._http() is main
+        other: list[object] = []
+        worker = threading.Thread(target=lambda: other.append(http._http()))
+        worker.start()
+        worker.join()
+        assert other[0] is not main
@@ -1,6 +1,9 @@
 """Tests for MemoryStore — store, list, search."""
 
+import datetime
+
 import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from istari.tools.memory.store import MemoryStore
 
@@ -42,6 +45,16 @@ class TestMemoryStore:
         memories = await store.list_explicit()
         assert memories[0].content == "Second"
 
+    async def test_list_explicit_rows(self, db_session):
+        store = MemoryStore(db_session)
+        await store.store("First")
+        await store.store("Second")
+
+        rows = await store.list_explicit_rows()
+
+        assert [r.content for r in rows] == ["Second", "First"]
+        assert [r.id for r in rows] == [m.id for m in await store.list_explicit()]
+
     async def test_search_finds_match(self, db_session):
         store = MemoryStore(db_session)
         await store.store("I prefer morning meetings")
@@ -111,3 +124,38 @@ class TestMemoryStore:
         results = await store.search("morning")
         assert len(calls) == 2
         assert len(results) == 1
+
+
+class TestMemoryArchiveAndReferences:
+    async def test_archived_memories_hidden_from_list_and_search(self, db_session):
+        store = MemoryStore(db_session)
+        live = await store.store("Prefers tea")
+        archived = await store.store("Prefers tea in the morning")
+        archived.archived_at = datetime.datetime.now(datetime.UTC)
+        await db_session.flush()
+
+        assert [m.id for m in await store.list_explicit()] == [live.id]
+        assert [m.id for m in await store.search("tea")] == [live.id]
+
+    async def test_flush_references_stamps_search_hits(self, db_session):
+        store = MemoryStore(db_session)
+        hit = await store.store("Allergic to peanuts")
+        miss = await store.store("Lives in Boston")
+        await store.search("peanuts")
+
+        assert await store.flush_references() == 1
+        await db_session.refresh(hit)
+        await db_session.refresh(miss)
+        assert hit.last_referenced_at is not None
+        assert miss.last_referenced_at is None
+
+    async def test_flush_references_noop_when_nothing_pending(self, db_session):
+        assert await MemoryStore(db_session).flush_references() == 0
+
+    async def test_references_stay_with_their_session(self, db_session):
+        await MemoryStore(db_session).store("Allergic to peanuts")
+        await MemoryStore(db_session).search("peanuts")
+
+        async with AsyncSession(db_session.bind) as other_request:
+            assert await MemoryStore(other_request).flush_references() == 0
+        assert await MemoryStore(db_session).flush_references() == 1
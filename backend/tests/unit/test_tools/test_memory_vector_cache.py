@@ -0,0 +1,171 @@
+"""Tests for the in-process memory vector cache."""
+
+import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import delete, update
+
+from istari.models.memory import Memory, MemoryType
+from istari.tools.memory import vector_cache
+from istari.tools.memory.store import MemoryStore
+from istari.tools.memory.vector_cache import MemoryVectorCache
+
+pytest.importorskip("numpy")
+
+_NOW = datetime.datetime(2026, 1, 1, tzinfo=datetime.UTC)
+
+
+def _memory(memory_id: int, vec: list[float], content: str = "") -> Memory:
+    return Memory(
+        id=memory_id,
+        type=MemoryType.EXPLICIT,
+        content=content or f"memory {memory_id}",
+        confidence=1.0,
+        source="chat",
+        created_at=_NOW,
+        embedding=vec,
+    )
+
+
+async def _stored(session, vec: list[float]) -> Memory:  # type: ignore[no-untyped-def]
+    memory = Memory(type=MemoryType.EXPLICIT, content="stored", embedding=vec)
+    session.add(memory)
+    await session.flush()
+    return memory
+
+
+def _session(rows: list[SimpleNamespace], count: int | None = None) -> MagicMock:
+    result = MagicMock()
+    result.all.return_value = rows
+    result.scalar_one.return_value = len(rows) if count is None else count
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+
+class TestSearch:
+    def test_ranks_by_cosine_similarity(self):
+        cache = MemoryVectorCache(max_rows=100, dim=3)
+        cache.upsert(_memory(1, [1.0, 0.0, 0.0]))
+        cache.upsert(_memory(2, [0.0, 1.0, 0.0]))
+        cache.upsert(_memory(3, [0.7, 0.7, 0.0]))
+
+        hits = cache.search([1.0, 0.1, 0.0], top_k=2)
+
+        assert [h.id for h in hits] == [1, 3]
+
+    def test_magnitude_does_not_affect_rank(self):
+        cache = MemoryVectorCache(max_rows=100, dim=2)
+        cache.upsert(_memory(1, [10.0, 0.0]))
+        cache.upsert(_memory(2, [0.1, 0.1]))
+
+        assert [h.id for h in cache.search([1.0, 1.0])] == [2, 1]
+
+    def test_empty_cache(self):
+        assert MemoryVectorCache(max_rows=100, dim=2).search([1.0, 0.0]) == []
+
+    def test_upsert_replaces_existing_row(self):
+        cache = MemoryVectorCache(max_rows=100, dim=2)
+        cache.upsert(_memory(1, [1.0, 0.0], content="old"))
+        cache.upsert(_memory(1, [0.0, 1.0], content="new"))
+
+        assert cache.size == 1
+        assert cache.search([0.0, 1.0])[0].content == "new"
+
+
+class TestRefresh:
+    async def test_initial_load_and_incremental_archive(self, db_session):
+        first = await _stored(db_session, [1.0, 0.0])
+        second = await _stored(db_session, [0.0, 1.0])
+        cache = MemoryVectorCache(max_rows=100, dim=2)
+        await cache.refresh(db_session)
+        assert cache.size == 2
+        assert cache.active
+
+        first.archived_at = datetime.datetime.now(datetime.UTC)
+        third = await _stored(db_session, [1.0, 1.0])
+        await cache.refresh(db_session)
+
+        assert sorted(h.id for h in cache.search([1.0, 0.0])) == sorted([second.id, third.id])
+
+    async def test_changes_behind_the_watermark_are_reconciled(self, db_session):
+        kept = await _stored(db_session, [1.0, 0.0])
+        archived = await _stored(db_session, [0.0, 1.0])
+        deleted = await _stored(db_session, [1.0, 1.0])
+        cache = MemoryVectorCache(max_rows=100, dim=2)
+        await cache.refresh(db_session)
+
+        # A long transaction commits after the refresh, stamped well before it
+        long_ago = datetime.datetime.now(datetime.UTC) - datetime.timedelta(hours=1)
+        await db_session.execute(
+            update(Memory)
+            .where(Memory.id == archived.id)
+            .values(archived_at=long_ago, updated_at=long_ago)
+        )
+        await db_session.execute(delete(Memory).where(Memory.id == deleted.id))
+        late = Memory(
+            type=MemoryType.EXPLICIT, content="late", embedding=[0.0, 1.0],
+            created_at=long_ago, updated_at=long_ago,
+        )
+        db_session.add(late)
+        await db_session.flush()
+        cache._max_id = late.id  # its id was handed out before the last refresh
+        await cache.refresh(db_session)
+
+        assert sorted(h.id for h in cache.search([1.0, 0.0])) == sorted([kept.id, late.id])
+
+    async def test_oversized_corpus_is_not_loaded(self):
+        cache = MemoryVectorCache(max_rows=10, dim=2)
+        session = _session([], count=11)
+
+        assert await cache.refresh(session) == 0
+        assert not cache.active
+        session.execute.assert_awaited_once()  # count only, no row fetch
+
+
+class TestMemoryStoreIntegration:
+    @pytest.fixture
+    def cache(self, monkeypatch):
+        cache = MemoryVectorCache(max_rows=100, dim=2)
+        cache.loaded = True
+        monkeypatch.setattr(vector_cache, "_cache", cache)
+        return cache
+
+    async def test_semantic_search_served_from_cache(self, db_session, cache, monkeypatch):
+        async def _embed(text: str) -> list[float]:
+            return [1.0, 0.0]
+
+        monkeypatch.setattr("istari.tools.memory.store.generate_embedding", _embed)
+        cache.upsert(_memory(41, [1.0, 0.0], content="Cached fact"))
+
+        results = await MemoryStore(db_session).search("anything")
+
+        assert [m.content for m in results] == ["Cached fact"]
+
+    async def test_inactive_cache_falls_back(self, db_session, cache):
+        cache.max_rows = 0
+        cache.upsert(_memory(41, [1.0, 0.0], content="Cached fact"))
+        await MemoryStore(db_session).store("Stored fact")
+
+        # Embedding is mocked out → ILIKE fallback against the database
+        results = await MemoryStore(db_session).search("Stored")
+
+        assert [m.content for m in results] == ["Stored fact"]
+
+    async def test_store_reaches_cache_only_on_commit(self, db_session, cache, monkeypatch):
+        async def _embed(text: str) -> list[float]:
+            return [1.0, 0.0]
+
+        monkeypatch.setattr("istari.tools.memory.store.generate_embedding", _embed)
+        store = MemoryStore(db_session)
+
+        await store.store("Rolled back")
+        assert cache.size == 0
+        await db_session.rollback()
+        assert cache.size == 0
+
+        memory = await store.store("Committed")
+        await db_session.commit()
+        assert [h.id for h in cache.search([1.0, 0.0])] == [memory.id]
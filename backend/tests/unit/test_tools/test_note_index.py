@@ -0,0 +1,237 @@
+"""Tests for the semantic note index."""
+
+import hashlib
+import math
+import os
+import re
+
+import pytest
+from sqlalchemy import func, select
+
+from istari.agents.tools.filesystem import make_filesystem_tools
+from istari.models.note import NoteChunk, NoteFile
+from istari.tools.filesystem import semantic
+from istari.tools.filesystem.semantic import NoteIndex, chunk_text
+
+
+def hashed_embedding(text: str, dim: int = 768) -> list[float]:
+    """Deterministic stand-in for the embedding model: hashed bag of words."""
+    vec = [0.0] * dim
+    for word in re.findall(r"[a-z0-9]+", text.lower()):
+        digest = hashlib.blake2b(word.encode(), digest_size=8).digest()
+        bucket = int.from_bytes(digest[:4], "little") % dim
+        vec[bucket] += 1.0 if digest[4] & 1 else -1.0
+    norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+    return [v / norm for v in vec]
+
+
+@pytest.fixture()
+def embed_calls(monkeypatch):
+    """Route the index through hashed_embedding; records each batch's size."""
+    calls: list[int] = []
+
+    async def _batch(texts: list[str]) -> list[list[float]]:
+        calls.append(len(texts))
+        return [hashed_embedding(t) for t in texts]
+
+    async def _one(text: str) -> list[float]:
+        return hashed_embedding(text)
+
+    monkeypatch.setattr(semantic, "embedding_batch", _batch)
+    monkeypatch.setattr(semantic, "generate_embedding", _one)
+    return calls
+
+
+@pytest.fixture()
+def notes(tmp_path):
+    root = tmp_path / "Documents"
+    (root / "home").mkdir(parents=True)
+    (root / "home" / "kitchen.md").write_text(
+        "# Kitchen renovation\n"
+        "Quotes from three contractors for cabinets and countertops.\n"
+        "\n"
+        "# Decision\n"
+        "We chose oak cabinets and a quartz countertop.\n"
+    )
+    (root / "work.txt").write_text("Quarterly budget review with finance on Monday.\n")
+    (root / "photo.png").write_bytes(b"\x89PNG\x00 kitchen")
+    (root / ".git").mkdir()
+    (root / ".git" / "notes.md").write_text("kitchen cabinets")
+    return root
+
+
+def _touch_later(path, text):
+    path.write_text(text)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+
+
+class TestChunkText:
+    def test_headings_start_chunks_with_line_ranges(self):
+        chunks = chunk_text("# A\none\ntwo\n\n# B\nthree\n", max_chars=1000)
+
+        assert [(c.start_line, c.end_line, c.content) for c in chunks] == [
+            (1, 3, "# A\none\ntwo"),
+            (5, 6, "# B\nthree"),
+        ]
+
+    def test_long_text_splits_at_paragraphs_within_size(self):
+        text = "\n\n".join(f"paragraph {i} " + "word " * 20 for i in range(30))
+
+        chunks = chunk_text(text, max_chars=400)
+
+        assert len(chunks) > 1
+        assert all(len(c.content) <= 400 for c in chunks)
+        assert all(c.content.startswith("paragraph") for c in chunks)
+        assert chunks[-1].end_line == len(text.splitlines())
+
+
+    def test_long_line_is_cut_to_size(self):
+        chunks = chunk_text("intro\n" + "x" * 250 + "\noutro\n", max_chars=100)
+
+        assert [(c.start_line, c.end_line, len(c.content)) for c in chunks] == [
+            (1, 1, 5), (2, 2, 100), (2, 2, 100), (2, 2, 50), (3, 3, 5),
+        ]
+
+
+class TestRefresh:
+    async def test_indexes_and_embeds_notes(self, db_session, notes, embed_calls):
+        result = await NoteIndex(db_session).refresh([str(notes)])
+
+        paths = (await db_session.execute(select(NoteFile.path))).scalars().all()
+        assert sorted(paths) == [str(notes / "home" / "kitchen.md"), str(notes / "work.txt")]
+        assert (result.scanned, result.changed, result.chunks) == (2, 2, 3)
+        assert (result.embedded, result.failed) == (3, 0)
+
+    async def test_unchanged_notes_are_not_read(self, db_session, notes, embed_calls, monkeypatch):
+        index = NoteIndex(db_session)
+        await index.refresh([str(notes)])
+        monkeypatch.setattr(semantic, "_read_text", lambda *a: pytest.fail("read"))
+
+        result = await index.refresh([str(notes)])
+
+        assert (result.changed, result.embedded) == (0, 0)
+
+    async def test_touched_but_identical_is_not_rechunked(self, db_session, notes, embed_calls):
+        index = NoteIndex(db_session)
+        await index.refresh([str(notes)])
+        _touch_later(notes / "work.txt", (notes / "work.txt").read_text())
+
+        result = await index.refresh([str(notes)])
+
+        assert (result.changed, result.embedded) == (0, 0)
+
+    async def test_edit_reembeds_only_changed_chunks(self, db_session, notes, embed_calls):
+        index = NoteIndex(db_session)
+        await index.refresh([str(notes)])
+        kitchen = notes / "home" / "kitchen.md"
+        _touch_later(kitchen, kitchen.read_text().replace("oak", "walnut"))
+
+        result = await index.refresh([str(notes)])
+
+        assert (result.changed, result.chunks, result.reused, result.embedded) == (1, 2, 1, 1)
+
+    async def test_deleted_note_is_dropped(self, db_session, notes, embed_calls):
+        index = NoteIndex(db_session)
+        await index.refresh([str(notes)])
+        (notes / "home" / "kitchen.md").unlink()
+
+        result = await index.refresh([str(notes)])
+        await db_session.rollback()  # a job's session rolls back whatever was left uncommitted
+
+        assert result.removed == 1
+        paths = (await db_session.execute(select(NoteFile.path))).scalars().all()
+        assert paths == [str(notes / "work.txt")]
+        count = select(func.count()).select_from(NoteChunk)
+        assert (await db_session.execute(count)).scalar_one() == 1
+
+    async def test_embedding_outage_resumes_next_run(self, db_session, notes, monkeypatch):
+        async def _down(texts):
+            raise ConnectionError("ollama down")
+
+        monkeypatch.setattr(semantic, "embedding_batch", _down)
+        index = NoteIndex(db_session)
+        first = await index.refresh([str(notes)])
+
+        async def _up(texts):
+            return [hashed_embedding(t) for t in texts]
+
+        monkeypatch.setattr(semantic, "embedding_batch", _up)
+        second = await index.refresh([str(notes)])
+
+        assert (first.chunks, first.embedded, first.failed) == (3, 0, 3)
+        assert (second.changed, second.embedded, second.failed) == (0, 3, 0)
+
+    async def test_rejected_chunk_does_not_block_the_rest(self, db_session, tmp_path, monkeypatch):
+        async def _picky(texts: list[str]) -> list[list[float]]:
+            if any("poison" in t for t in texts):
+                raise ValueError("input too long")
+            return [hashed_embedding(t) for t in texts]
+
+        monkeypatch.setattr(semantic, "embedding_batch", _picky)
+        monkeypatch.setattr(semantic.settings, "note_embed_batch_size", 2)
+        for i, word in enumerate(["alpha", "poison", "gamma", "delta"]):
+            (tmp_path / f"n{i}.md").write_text(f"{word} note")
+
+        result = await NoteIndex(db_session).refresh([str(tmp_path)])
+
+        assert (result.embedded, result.failed) == (3, 1)
+
+    async def test_embeds_in_batches(self, db_session, tmp_path, embed_calls, monkeypatch):
+        monkeypatch.setattr(semantic.settings, "note_embed_batch_size", 4)
+        for i in range(10):
+            (tmp_path / f"n{i}.md").write_text(f"note number {i}")
+
+        result = await NoteIndex(db_session).refresh([str(tmp_path)])
+
+        assert result.embedded == 10
+        assert embed_calls == [4, 4, 2]
+
+
+class TestSearch:
+    async def test_returns_nearest_chunk_with_line_range(self, db_session, notes, embed_calls):
+        index = NoteIndex(db_session)
+        await index.refresh([str(notes)])
+
+        hits = await index.search("which cabinets did we choose", top_k=2)
+
+        assert (hits[0].path, hits[0].start_line, hits[0].end_line) == (
+            str(notes / "home" / "kitchen.md"), 4, 5,
+        )
+        assert hits[0].score > hits[1].score
+
+    async def test_directory_filter(self, db_session, notes, embed_calls):
+        index = NoteIndex(db_session)
+        await index.refresh([str(notes)])
+
+        everywhere = await index.search("budget review", top_k=1)
+        in_home = await index.search("budget review", directory=str(notes / "home"))
+
+        assert everywhere[0].path == str(notes / "work.txt")
+        assert {h.path for h in in_home} == {str(notes / "home" / "kitchen.md")}
+
+
+class TestSemanticSearchTool:
+    def test_needs_a_session(self, db_session):
+        assert "semantic_search_files" not in {t.name for t in make_filesystem_tools()}
+        assert "semantic_search_files" in {t.name for t in make_filesystem_tools(db_session)}
+
+    async def test_formats_hits(self, db_session, notes, embed_calls):
+        await NoteIndex(db_session).refresh([str(notes)])
+        tool = {t.name: t for t in make_filesystem_tools(db_session)}["semantic_search_files"]
+
+        result = await tool.fn(query="quartz countertop decision", top_k=1)
+
+        assert f"{notes / 'home' / 'kitchen.md'} (lines 4-5" in result
+        assert "quartz countertop" in result
+
+    async def test_embedding_unavailable(self, db_session, monkeypatch):
+        async def _down(text):
+            raise ConnectionError("ollama down")
+
+        monkeypatch.setattr(semantic, "generate_embedding", _down)
+        tool = {t.name: t for t in make_filesystem_tools(db_session)}["semantic_search_files"]
+
+        result = await tool.fn(query="anything")
+
+        assert "unavailable" in result
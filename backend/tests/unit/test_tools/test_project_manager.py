@@ -3,8 +3,10 @@
 import datetime
 
 import pytest
+from sqlalchemy import event
 
 from istari.models.project import ProjectStatus
+from istari.models.todo import TodoStatus
 from istari.tools.project.manager import ProjectManager
 from istari.tools.todo.manager import TodoManager
 
@@ -177,3 +179,80 @@ class TestProjectManagerStale:
 
         stale = await proj_mgr.get_stale(days=7)
         assert any(p.id == project.id for p in stale)
+
+
+class TestProjectManagerSummaries:
+    async def test_summary_figures(self, db_session):
+        proj_mgr = ProjectManager(db_session)
+        todo_mgr = TodoManager(db_session)
+
+        project = await proj_mgr.create("Kitchen remodel")
+        first = await todo_mgr.create("Pick cabinets")
+        second = await todo_mgr.create("Call plumber")
+        done = await todo_mgr.create("Measure walls")
+        for todo in (first, second, done):
+            todo.project_id = project.id
+        await todo_mgr.set_status(done.id, TodoStatus.COMPLETE)
+        await proj_mgr.set_next_action(project.id, second.id)
+        await proj_mgr.create("Empty project")
+
+        summaries = {s.project.name: s for s in await proj_mgr.list_summaries()}
+
+        kitchen = summaries["Kitchen remodel"]
+        assert kitchen.next_action_title == "Call plumber"
+        assert kitchen.next_action_status == TodoStatus.OPEN
+        assert kitchen.open_todo_count == 2
+        empty = summaries["Empty project"]
+        assert empty.next_action_title is None
+        assert empty.open_todo_count == 0
+        assert empty.last_activity is not None
+
+    async def test_last_activity_follows_newest_todo(self, db_session):
+        proj_mgr = ProjectManager(db_session)
+        todo_mgr = TodoManager(db_session)
+
+        project = await proj_mgr.create("Garden")
+        project.updated_at = datetime.datetime(2026, 1, 1, tzinfo=datetime.UTC)
+        todo = await todo_mgr.create("Plant tomatoes")
+        todo.project_id = project.id
+        todo.updated_at = datetime.datetime(2026, 3, 1, tzinfo=datetime.UTC)
+        await db_session.flush()
+
+        [summary] = await proj_mgr.list_summaries()
+
+        assert summary.last_activity.replace(tzinfo=None) == datetime.datetime(2026, 3, 1)
+
+    async def test_inactive_projects_only_on_request(self, db_session):
+        mgr = ProjectManager(db_session)
+        done = await mgr.create("Done project")
+        await mgr.set_status(done.id, ProjectStatus.complete)
+
+        assert await mgr.list_summaries() == []
+        assert [s.project.name for s in await mgr.list_summaries(include_inactive=True)] == [
+            "Done project"
+        ]
+
+    async def test_single_statement_regardless_of_project_count(self, db_session):
+        proj_mgr = ProjectManager(db_session)
+        todo_mgr = TodoManager(db_session)
+        for i in range(5):
+            project = await proj_mgr.create(f"Project {i}")
+            todo = await todo_mgr.create(f"Task {i}")
+            todo.project_id = project.id
+            await proj_mgr.set_next_action(project.id, todo.id)
+        await db_session.flush()
+
+        statements: list[str] = []
+        engine = db_session.bind.sync_engine
+
+        def _count(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _count)
+        try:
+            summaries = await proj_mgr.list_summaries()
+        finally:
+            event.remove(engine, "before_cursor_execute", _count)
+
+        assert len(summaries) == 5
+        assert len(statements) == 1
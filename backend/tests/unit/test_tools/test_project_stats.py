@@ -0,0 +1,97 @@
+"""Tests for the project_stats aggregate table and its write-path maintenance."""
+
+from sqlalchemy import update
+
+from istari.models.project_stats import ProjectStats
+from istari.models.todo import TodoStatus
+from istari.tools.project.manager import ProjectManager
+from istari.tools.todo.manager import TodoManager
+
+
+async def _stats(session, project_id: int) -> ProjectStats:
+    stats = await session.get(ProjectStats, project_id, populate_existing=True)
+    assert stats is not None
+    return stats
+
+
+class TestWritePathMaintenance:
+    async def test_new_project_gets_empty_row(self, db_session):
+        project = await ProjectManager(db_session).create("Empty")
+        await db_session.flush()
+
+        stats = await _stats(db_session, project.id)
+        assert stats.outstanding_count == 0
+        assert stats.last_activity is None
+
+    async def test_counts_follow_todo_writes(self, db_session):
+        project = await ProjectManager(db_session).create("Move house")
+        todo_mgr = TodoManager(db_session)
+        a = await todo_mgr.create("Book movers")
+        b = await todo_mgr.create("Pack books")
+        a.project_id = b.project_id = project.id
+        await db_session.flush()
+        await todo_mgr.set_status(b.id, TodoStatus.IN_PROGRESS)
+
+        stats = await _stats(db_session, project.id)
+        assert (stats.open_count, stats.in_progress_count) == (1, 1)
+        assert stats.last_open_activity is not None
+
+    async def test_bulk_update_and_reassignment(self, db_session):
+        proj_mgr = ProjectManager(db_session)
+        first = await proj_mgr.create("First")
+        second = await proj_mgr.create("Second")
+        todo_mgr = TodoManager(db_session)
+        todos = await todo_mgr.bulk_create(["One", "Two", "Three"], project_id=first.id)
+        assert (await _stats(db_session, first.id)).open_count == 3
+
+        await todo_mgr.bulk_set_status(
+            todo_mgr.match(ids=[todos[0].id]), TodoStatus.BLOCKED
+        )
+        await todo_mgr.bulk_update(todo_mgr.match(ids=[todos[1].id]), project_id=second.id)
+
+        first_stats = await _stats(db_session, first.id)
+        assert (first_stats.open_count, first_stats.blocked_count) == (1, 1)
+        assert (await _stats(db_session, second.id)).open_count == 1
+
+    async def test_next_action_status_tracks_todo(self, db_session):
+        proj_mgr = ProjectManager(db_session)
+        todo_mgr = TodoManager(db_session)
+        project = await proj_mgr.create("Taxes")
+        # Next action need not belong to the project
+        todo = await todo_mgr.create("Find receipts")
+        await proj_mgr.set_next_action(project.id, todo.id)
+        assert (await _stats(db_session, project.id)).next_action_status == TodoStatus.OPEN
+
+        await todo_mgr.set_status(todo.id, TodoStatus.COMPLETE)
+
+        assert (await _stats(db_session, project.id)).next_action_status == TodoStatus.COMPLETE
+
+
+class TestRepair:
+    async def test_repair_fixes_drift(self, db_session):
+        proj_mgr = ProjectManager(db_session)
+        project = await proj_mgr.create("Drifting")
+        todo = await TodoManager(db_session).create("Real work")
+        todo.project_id = project.id
+        await db_session.flush()
+        # A write that bypassed the ORM hooks
+        conn = await db_session.connection()
+        await conn.execute(
+            update(ProjectStats.__table__)
+            .where(ProjectStats.__table__.c.project_id == project.id)
+            .values(open_count=7)
+        )
+
+        assert await proj_mgr.repair_stats() == [project.id]
+        assert (await _stats(db_session, project.id)).open_count == 1
+        assert await proj_mgr.repair_stats() == []
+
+    async def test_repair_restores_missing_row(self, db_session):
+        proj_mgr = ProjectManager(db_session)
+        project = await proj_mgr.create("Lost row")
+        await db_session.flush()
+        conn = await db_session.connection()
+        await conn.execute(ProjectStats.__table__.delete())
+
+        assert await proj_mgr.repair_stats() == [project.id]
+        assert (await _stats(db_session, project.id)).outstanding_count == 0
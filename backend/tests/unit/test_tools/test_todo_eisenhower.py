@@ -5,8 +5,8 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 from istari.tools.todo.manager import TodoManager
 
-# ─── Patch target for LLM calls inside todo agent tools ───────────────────────
-_CLASSIFY = "istari.agents.tools.todo.completion"
+# ─── Patch target for Eisenhower classification LLM calls ─────────────────────
+_CLASSIFY = "istari.tools.todo.classification.completion"
 
 
 def _llm_response(data: list[dict]) -> MagicMock:
@@ -94,8 +94,37 @@ class TestEisenhowerSorting:
         ids = [t.id for t in prioritized]
         assert ids == [q1.id, q2.id, q3.id, unc.id, q4.id]
 
+    async def test_stored_quadrant_follows_classification(self, db_session):
+        mgr = TodoManager(db_session)
+        todo = await mgr.create("Plan offsite")
+        await db_session.refresh(todo)
+        assert todo.quadrant == 4
+
+        (updated,) = await mgr.bulk_update(
+            TodoManager.match(ids=[todo.id]), urgent=False, important=True
+        )
+        assert updated.quadrant == 2
+
+    async def test_deadline_candidates_merge_with_rest(self, db_session):
+        import datetime
+
+        mgr = TodoManager(db_session)
+        soon = datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=1)
+        later = datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=30)
+        q2_far = await mgr.create("Q2 far", urgent=False, important=True, due_date=later)
+        q2_soon = await mgr.create("Q2 soon", urgent=False, important=True, due_date=soon)
+        q4_soon = await mgr.create("Q4 soon", urgent=False, important=False, due_date=soon)
+        await mgr.create("Q4 none", urgent=False, important=False)
+        await mgr.create("Unclassified")
+        await db_session.flush()
 
-# ─── Agent tool: create_todos with auto-classification ────────────────────────
+        prioritized = await mgr.get_prioritized(limit=3)
+
+        # Deadline lifts Q2 → Q1 and Q4 → Q3
+        assert [t.id for t in prioritized] == [q2_soon.id, q2_far.id, q4_soon.id]
+
+
+# ─── Agent tool: create_todos queues classification ───────────────────────────
 
 
 class TestCreateTodosClassification:
@@ -103,63 +132,104 @@ class TestCreateTodosClassification:
         from istari.agents.tools.base import AgentContext
         return AgentContext()
 
-    def _make_session_mock(self, created_todo):
-        session = AsyncMock()
-        session.add = MagicMock()
-        session.flush = AsyncMock()
-        session.commit = AsyncMock()
-        session.get = AsyncMock(return_value=created_todo)
-        return session
-
-    async def test_classifies_and_updates_on_create(self, db_session):
+    async def test_create_does_not_wait_for_llm(self, db_session):
         from istari.agents.tools.todo import make_todo_tools
 
         context = self._make_context()
+        with patch(_CLASSIFY, new_callable=AsyncMock) as mock_llm:
+            tools = make_todo_tools(db_session, context)
+            create_fn = next(t.fn for t in tools if t.name == "create_todos")
+            result = await create_fn(titles=["Buy milk", "Call mom"])
+
+        mock_llm.assert_not_awaited()
+        assert 'Added 2 TODOs: "Buy milk", "Call mom"' in result
+        todos = await TodoManager(db_session).list_open()
+        assert len(context.classification_queued) == 2
+        assert set(context.classification_queued) == {t.id for t in todos}
+        assert all(t.classification_requested_at is not None for t in todos)
+        assert all(t.source == "chat" for t in todos)
+
+
+# ─── Classification queue ─────────────────────────────────────────────────────
+
+
+class TestClassifyPending:
+    async def _queue(self, db_session, *titles: str):  # type: ignore[no-untyped-def]
+        import datetime
+
+        return await TodoManager(db_session).bulk_create(
+            list(titles), classification_requested_at=datetime.datetime.now(datetime.UTC)
+        )
+
+    async def test_classifies_and_dequeues(self, db_session):
+        from istari.tools.todo.classification import classify_pending
+
+        (todo,) = await self._queue(db_session, "Buy milk")
         cls_result = [{"title": "Buy milk", "urgent": False, "important": True, "uncertain": False}]
 
         with patch(_CLASSIFY, new_callable=AsyncMock) as mock_llm:
             mock_llm.return_value = _llm_response(cls_result)
-            tools = make_todo_tools(db_session, context)
-            create_fn = next(t.fn for t in tools if t.name == "create_todos")
-            result = await create_fn(titles=["Buy milk"])
+            batch = await classify_pending(db_session, limit=10)
 
-        assert 'Added TODO: "Buy milk"' in result
-        assert "urgent" not in result  # no uncertain flag
+        assert batch.classified_ids == [todo.id]
+        assert batch.uncertain_titles == []
+        await db_session.refresh(todo)
+        assert todo.important is True
+        assert todo.urgent is False
+        assert todo.classification_requested_at is None
 
-        # Verify fields were set
-        from istari.tools.todo.manager import TodoManager
-        mgr = TodoManager(db_session)
-        todos = await mgr.list_open()
-        assert todos[0].important is True
-        assert todos[0].urgent is False
+    async def test_one_llm_call_per_batch(self, db_session):
+        from istari.tools.todo.classification import classify_pending
 
-    async def test_flags_uncertain_for_user_clarification(self, db_session):
-        from istari.agents.tools.todo import make_todo_tools
+        await self._queue(db_session, "A", "B", "C")
+        cls_result = [
+            {"title": t, "urgent": True, "important": True, "uncertain": False} for t in "ABC"
+        ]
 
-        context = self._make_context()
+        with patch(_CLASSIFY, new_callable=AsyncMock) as mock_llm:
+            mock_llm.return_value = _llm_response(cls_result)
+            batch = await classify_pending(db_session, limit=10)
+
+        assert mock_llm.await_count == 1
+        assert len(batch.classified_ids) == 3
+
+    async def test_reports_uncertain_titles(self, db_session):
+        from istari.tools.todo.classification import classify_pending, uncertain_prompt
+
+        await self._queue(db_session, "Foo bar")
         cls_result = [{"title": "Foo bar", "urgent": None, "important": None, "uncertain": True}]
 
         with patch(_CLASSIFY, new_callable=AsyncMock) as mock_llm:
             mock_llm.return_value = _llm_response(cls_result)
-            tools = make_todo_tools(db_session, context)
-            create_fn = next(t.fn for t in tools if t.name == "create_todos")
-            result = await create_fn(titles=["Foo bar"])
+            batch = await classify_pending(db_session, limit=10)
 
-        assert "wasn't sure" in result
-        assert "Foo bar" in result
+        assert batch.uncertain_titles == ["Foo bar"]
+        assert "wasn't sure" in uncertain_prompt(batch.uncertain_titles)
 
-    async def test_classification_failure_does_not_raise(self, db_session):
-        from istari.agents.tools.todo import make_todo_tools
+    async def test_llm_failure_leaves_rows_queued(self, db_session):
+        from istari.tools.todo.classification import classify_pending
 
-        context = self._make_context()
+        (todo,) = await self._queue(db_session, "Safe task")
 
         with patch(_CLASSIFY, new_callable=AsyncMock) as mock_llm:
             mock_llm.side_effect = Exception("LLM down")
-            tools = make_todo_tools(db_session, context)
-            create_fn = next(t.fn for t in tools if t.name == "create_todos")
-            result = await create_fn(titles=["Safe task"])
+            batch = await classify_pending(db_session, limit=10)
+
+        assert batch.classified_ids == []
+        await db_session.refresh(todo)
+        assert todo.classification_requested_at is not None
+
+    async def test_ids_restrict_the_batch(self, db_session):
+        from istari.tools.todo.classification import classify_pending
+
+        _, second = await self._queue(db_session, "First", "Second")
+        cls_result = [{"title": "Second", "urgent": True, "important": False, "uncertain": False}]
+
+        with patch(_CLASSIFY, new_callable=AsyncMock) as mock_llm:
+            mock_llm.return_value = _llm_response(cls_result)
+            batch = await classify_pending(db_session, limit=10, ids=[second.id])
 
-        assert "Added TODO" in result  # still created
+        assert batch.classified_ids == [second.id]
 
 
 # ─── Agent tool: update_todo_priority ─────────────────────────────────────────
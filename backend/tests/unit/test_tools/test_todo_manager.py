@@ -2,8 +2,11 @@
 
 import datetime
 
-from istari.models.todo import TodoStatus
-from istari.tools.todo.manager import TodoManager
+from sqlalchemy import inspect, select
+
+from istari.api.schemas import TodoResponse
+from istari.models.todo import Todo, TodoStatus
+from istari.tools.todo.manager import TodoManager, TodoRow
 
 
 class TestTodoManagerCRUD:
@@ -159,3 +162,104 @@ class TestTodayFocus:
         results = await mgr.list_today()
         assert len(results) == 1
         assert results[0].id == todo.id
+
+
+class TestBulkMutations:
+    async def test_bulk_update_by_title_returns_only_matches(self, db_session):
+        mgr = TodoManager(db_session)
+        a = await mgr.create("Buy groceries")
+        b = await mgr.create("Groceries for the party")
+        await mgr.create("Walk the dog")
+
+        updated = await mgr.bulk_update(TodoManager.match(title_query="groceries"), priority=1)
+
+        assert [t.id for t in updated] == [a.id, b.id]
+        assert all(t.priority == 1 for t in updated)
+
+    async def test_bulk_update_syncs_loaded_objects(self, db_session):
+        mgr = TodoManager(db_session)
+        todo = await mgr.create("Pay rent")
+
+        await mgr.bulk_update(TodoManager.match(ids=[todo.id]), urgent=True, important=True)
+
+        assert todo.urgent is True
+        assert todo.important is True
+
+    async def test_bulk_set_status_skips_rows_already_in_status(self, db_session):
+        mgr = TodoManager(db_session)
+        done = await mgr.create("Old groceries run")
+        await mgr.set_status(done.id, TodoStatus.COMPLETE)
+        todo = await mgr.create("Buy groceries")
+
+        updated = await mgr.bulk_set_status(
+            TodoManager.match(title_query="groceries"), TodoStatus.COMPLETE
+        )
+
+        assert [t.id for t in updated] == [todo.id]
+
+    async def test_bulk_complete_spawns_next_recurrences(self, db_session):
+        mgr = TodoManager(db_session)
+        due = datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=1)
+        await mgr.create("Water plants", recurrence_rule="FREQ=WEEKLY", due_date=due)
+        await mgr.create("Take out trash", recurrence_rule="FREQ=DAILY", due_date=due)
+        await mgr.create("One-off errand")
+
+        updated = await mgr.bulk_set_status(
+            TodoManager.match(ids=[t.id for t in await mgr.list_open()]), TodoStatus.COMPLETE
+        )
+        assert len(updated) == 3
+
+        spawned = await mgr.list_open()
+        assert sorted(t.title for t in spawned) == ["Take out trash", "Water plants"]
+        assert all(t.recurrence_rule for t in spawned)
+        assert all(t.due_date is not None for t in spawned)
+
+    async def test_bulk_set_today(self, db_session):
+        mgr = TodoManager(db_session)
+        a = await mgr.create("Draft email")
+        b = await mgr.create("Draft proposal")
+
+        await mgr.bulk_set_today(TodoManager.match(ids=[a.id, b.id]), True)
+
+        assert {t.id for t in await mgr.list_today()} == {a.id, b.id}
+
+
+class TestRowProjections:
+    async def _seed(self, mgr):
+        a = await mgr.create("Plan trip", urgent=True, important=True)
+        b = await mgr.create("Read paper", important=True)
+        c = await mgr.create("Done already")
+        await mgr.set_status(c.id, TodoStatus.COMPLETE)
+        await mgr.set_today(b.id, True)
+        return a, b, c
+
+    async def test_rows_match_orm_lists(self, db_session):
+        mgr = TodoManager(db_session)
+        await self._seed(mgr)
+
+        for orm_list, row_list in (
+            (mgr.list_visible, mgr.list_visible_rows),
+            (mgr.list_open, mgr.list_open_rows),
+            (mgr.list_today, mgr.list_today_rows),
+            (mgr.get_prioritized, mgr.get_prioritized_rows),
+        ):
+            rows = await row_list()
+            assert all(isinstance(r, TodoRow) for r in rows)
+            assert [r.id for r in rows] == [t.id for t in await orm_list()]
+
+    async def test_row_validates_as_response(self, db_session):
+        mgr = TodoManager(db_session)
+        a, _, _ = await self._seed(mgr)
+
+        [row] = await mgr.get_prioritized_rows(limit=1)
+        response = TodoResponse.model_validate(row)
+
+        assert (response.id, response.title, response.status) == (a.id, "Plan trip", "open")
+
+    async def test_embedding_is_deferred(self, db_session):
+        todo = await TodoManager(db_session).create("Has a vector")
+        db_session.expunge_all()
+
+        loaded = (await db_session.execute(select(Todo).where(Todo.id == todo.id))).scalar_one()
+
+        assert "embedding" in inspect(loaded).unloaded
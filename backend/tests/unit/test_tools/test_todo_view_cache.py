@@ -0,0 +1,245 @@
+"""Tests for the read-through todo view cache."""
+
+import datetime
+
+import pytest
+
+from istari.agents.tools.base import AgentContext
+from istari.agents.tools.todo import make_todo_tools
+from istari.config.settings import settings
+from istari.models.todo import TodoStatus
+from istari.tools.project.manager import ProjectManager
+from istari.tools.todo import view_cache
+from istari.tools.todo.manager import TodoManager, TodoRow
+from istari.tools.todo.view_cache import (
+    MemoryBackend,
+    RedisBackend,
+    encode_rows,
+    get_view_cache,
+    rows_decoder,
+)
+
+
+def _cache() -> view_cache.ViewCache:
+    cache = get_view_cache()
+    assert cache is not None
+    return cache
+
+
+async def _committed_todos(db_session, *titles: str, **kwargs: object) -> list[int]:
+    mgr = TodoManager(db_session)
+    ids = [(await mgr.create(title=t, **kwargs)).id for t in titles]
+    await db_session.commit()
+    return ids
+
+
+class TestReadThrough:
+    async def test_second_read_is_a_hit(self, db_session):
+        await _committed_todos(db_session, "Pay rent", urgent=True, important=True)
+        mgr = TodoManager(db_session)
+
+        first = await mgr.get_prioritized_rows(limit=5)
+        second = await mgr.get_prioritized_rows(limit=5)
+
+        assert [t.title for t in second] == [t.title for t in first] == ["Pay rent"]
+        assert isinstance(second[0], TodoRow)
+        assert (_cache().misses, _cache().hits) == (1, 1)
+
+    async def test_committed_write_invalidates(self, db_session):
+        await _committed_todos(db_session, "First")
+        mgr = TodoManager(db_session)
+        assert [t.title for t in await mgr.get_prioritized_rows(limit=5)] == ["First"]
+
+        await _committed_todos(db_session, "Second", urgent=True, important=True)
+        titles = [t.title for t in await mgr.get_prioritized_rows(limit=5)]
+        assert titles == ["Second", "First"]
+        assert _cache().hits == 0
+
+    async def test_uncommitted_write_bypasses_and_rollback_does_not_poison(self, db_session):
+        await _committed_todos(db_session, "Kept")
+        mgr = TodoManager(db_session)
+
+        await mgr.create(title="Tentative")
+        titles = {t.title for t in await mgr.get_prioritized_rows(limit=5)}
+        assert titles == {"Kept", "Tentative"}
+        assert _cache().bypasses == 1
+
+        await db_session.rollback()
+        assert [t.title for t in await mgr.get_prioritized_rows(limit=5)] == ["Kept"]
+
+    async def test_key_includes_arguments_and_settings(self, db_session, monkeypatch):
+        await _committed_todos(db_session, "A", "B", "C")
+        mgr = TodoManager(db_session)
+
+        assert len(await mgr.get_prioritized_rows(limit=2)) == 2
+        assert len(await mgr.get_prioritized_rows(limit=3)) == 3
+        monkeypatch.setattr(settings, "deadline_urgent_days", 10)
+        await mgr.get_prioritized_rows(limit=3)
+        assert (_cache().misses, _cache().hits) == (3, 0)
+
+    async def test_today_view_round_trips_dates(self, db_session):
+        ids = await _committed_todos(db_session, "Focus")
+        mgr = TodoManager(db_session)
+        await mgr.set_today(ids[0], True)
+        await db_session.commit()
+
+        first = await mgr.list_today_rows()
+        second = await mgr.list_today_rows()
+        assert second == first
+        assert second[0].today_date == datetime.date.today()
+        assert second[0].status is TodoStatus.OPEN
+        assert _cache().hits == 1
+
+    async def test_backend_failure_falls_back_to_query(self, db_session, monkeypatch):
+        await _committed_todos(db_session, "Still works")
+
+        async def _broken(*args: object) -> None:
+            raise ConnectionError("cache down")
+
+        monkeypatch.setattr(_cache().backend, "get", _broken)
+        monkeypatch.setattr(_cache().backend, "set", _broken)
+        rows = await TodoManager(db_session).get_prioritized_rows(limit=5)
+        assert [t.title for t in rows] == ["Still works"]
+
+    async def test_disabled(self, db_session, monkeypatch):
+        monkeypatch.setattr(settings, "todo_view_cache_enabled", False)
+        view_cache.reset_view_cache()
+        await _committed_todos(db_session, "Uncached")
+        assert get_view_cache() is None
+        assert len(await TodoManager(db_session).get_prioritized_rows(limit=5)) == 1
+
+
+class TestExpiry:
+    async def test_next_deadline_crossing(self, db_session):
+        now = datetime.datetime.now(datetime.UTC)
+        await _committed_todos(db_session, "Soon", due_date=now + datetime.timedelta(hours=5))
+        await _committed_todos(db_session, "Later", due_date=now + datetime.timedelta(days=5))
+        done = TodoManager(db_session)
+        todo = await done.create(title="Done", due_date=now + datetime.timedelta(hours=1))
+        await done.update(todo.id, status=TodoStatus.COMPLETE)
+        await db_session.commit()
+        crossing = await TodoManager(db_session).next_deadline_crossing(urgent_days=3)
+        assert crossing is not None
+        # "Later" enters the 3-day window in 2 days; "Soon" passes due in 5 hours
+        expected = now + datetime.timedelta(hours=5)
+        assert abs((crossing - expected).total_seconds()) < 5
+
+    async def test_entry_expires_at_crossing(self, db_session, monkeypatch):
+        now = datetime.datetime.now(datetime.UTC)
+        await _committed_todos(db_session, "Due", due_date=now + datetime.timedelta(minutes=10))
+        stored: list[float] = []
+        backend = _cache().backend
+        original_set = backend.set
+
+        async def _spy(key: str, value: str, ttl_seconds: float) -> None:
+            stored.append(ttl_seconds)
+            await original_set(key, value, ttl_seconds)
+
+        monkeypatch.setattr(backend, "set", _spy)
+        await TodoManager(db_session).get_prioritized_rows(limit=5)
+        assert 590 < stored[0] <= 600
+
+    async def test_memory_backend_expiry_and_lru(self, monkeypatch):
+        clock = [100.0]
+        monkeypatch.setattr(view_cache.time, "monotonic", lambda: clock[0])
+        backend = MemoryBackend(max_entries=2)
+        await backend.set("a", "1", ttl_seconds=10)
+        await backend.set("b", "2", ttl_seconds=10)
+        assert await backend.get("a") == "1"
+        await backend.set("c", "3", ttl_seconds=10)
+        assert await backend.get("b") is None  # least recently used
+        clock[0] = 111.0
+        assert await backend.get("a") is None
+
+    async def test_next_stale_at(self, db_session):
+        mgr = ProjectManager(db_session)
+        project = await mgr.create(name="Garden")
+        await TodoManager(db_session).create(title="Weed", project_id=project.id)
+        await db_session.commit()
+        stale_at = await mgr.next_stale_at(days=7)
+        assert stale_at is not None
+        expected = datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=7)
+        assert abs((stale_at - expected).total_seconds()) < 60
+
+
+class FakeRedis:
+    """Just the redis-py asyncio surface RedisBackend uses."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+        self.px: dict[str, int] = {}
+
+    async def get(self, key: str) -> str | None:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: str, px: int) -> None:
+        self.data[key] = value
+        self.px[key] = px
+
+    async def scan_iter(self, match: str):  # type: ignore[no-untyped-def]
+        for key in list(self.data):
+            if key.startswith(match.rstrip("*")):
+                yield key
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.data.pop(key, None)
+
+
+class TestRedisBackend:
+    async def test_prefixes_keys_and_sets_ttl(self):
+        client = FakeRedis()
+        backend = RedisBackend(client)
+        await backend.set("k", "v", ttl_seconds=1.5)
+        assert client.data == {"istari:view:k": "v"}
+        assert client.px["istari:view:k"] == 1500
+        assert await backend.get("k") == "v"
+        await backend.clear()
+        assert client.data == {}
+
+    async def test_shared_between_caches(self, db_session):
+        await _committed_todos(db_session, "Shared")
+        client = FakeRedis()
+        api = view_cache.ViewCache(RedisBackend(client))
+        worker = view_cache.ViewCache(RedisBackend(client))
+        mgr = TodoManager(db_session)
+
+        async def _load() -> list[TodoRow]:
+            return await mgr._rows(mgr._today_stmt().where(False))
+
+        for cache in (api, worker):
+            await cache.read_through(
+                db_session, "v", (), ("todos",), _load, encode_rows, rows_decoder(TodoRow)
+            )
+        assert (api.misses, worker.hits) == (1, 1)
+
+    def test_missing_redis_package_is_explained(self, monkeypatch):
+        import builtins
+
+        real_import = builtins.__import__
+
+        def _no_redis(name: str, *args, **kwargs):  # type: ignore[no-untyped-def]
+            if name.startswith("redis"):
+                raise ImportError(name)
+            return real_import(name, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "__import__", _no_redis)
+        with pytest.raises(ImportError, match=r"\[redis\]"):
+            RedisBackend.from_url("redis://localhost:6379/0")
+
+
+class TestGetPrioritiesTool:
+    async def test_output_is_cached_until_a_write(self, db_session):
+        await _committed_todos(db_session, "Write essay", urgent=True, important=True)
+        tools = {t.name: t for t in make_todo_tools(db_session, AgentContext())}
+
+        first = await tools["get_priorities"].fn()
+        hits = _cache().hits
+        second = await tools["get_priorities"].fn()
+        assert second == first
+        assert "Write essay" in second
+        assert _cache().hits == hits + 1
+
+        await _committed_todos(db_session, "Call mum", urgent=True, important=True)
+        third = await tools["get_priorities"].fn()
+        assert "Call mum" in third
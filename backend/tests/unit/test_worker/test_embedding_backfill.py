@@ -0,0 +1,131 @@
+"""Tests for the embedding backfill worker job."""
+
+import datetime
+
+import pytest
+from sqlalchemy import select, update
+
+from istari.models.memory import Memory
+from istari.models.todo import Todo
+from istari.models.user import UserSetting
+from istari.tools.memory.store import MemoryStore
+from istari.tools.todo.manager import TodoManager
+from istari.worker.jobs import embedding_backfill
+from istari.worker.jobs.embedding_backfill import TARGETS, backfill_table
+
+_MEMORIES, _TODOS = TARGETS
+
+
+@pytest.fixture
+def embed_calls(monkeypatch) -> list[list[str]]:
+    calls: list[list[str]] = []
+
+    async def _embed(texts: list[str]) -> list[list[float]]:
+        calls.append(texts)
+        if any("too long" in t for t in texts):
+            raise ValueError("input exceeds the model's context length")
+        return [[float(len(t))] for t in texts]
+
+    monkeypatch.setattr(embedding_backfill, "embedding_batch", _embed)
+    return calls
+
+
+async def _embedded(session) -> dict[int, list[float] | None]:  # type: ignore[no-untyped-def]
+    """Memory vectors as stored — read back through the test database's vector type."""
+    rows = await session.execute(select(Memory.id, Memory.embedding).order_by(Memory.id))
+    return {row.id: row.embedding for row in rows}
+
+
+class TestBackfillTable:
+    async def test_embeds_in_keyset_batches(self, db_session, embed_calls):
+        store = MemoryStore(db_session)
+        memories = [await store.store(f"fact {i}") for i in range(5)]
+
+        stats = await backfill_table(db_session, _MEMORIES, batch_size=2)
+
+        assert [len(c) for c in embed_calls] == [2, 2, 1]
+        assert await _embedded(db_session) == {m.id: [6.0] for m in memories}
+        assert stats.embedded == 5
+        assert stats.batches == 3
+        assert stats.failed == 0
+
+    async def test_todo_text_includes_body(self, db_session, embed_calls):
+        mgr = TodoManager(db_session)
+        await mgr.create("Call dentist", body="Ask about the crown")
+        await mgr.create("Buy milk")
+
+        await backfill_table(db_session, _TODOS, batch_size=10)
+
+        assert embed_calls == [["Call dentist\n\nAsk about the crown", "Buy milk"]]
+
+    async def test_resumes_from_saved_cursor(self, db_session, embed_calls):
+        store = MemoryStore(db_session)
+        first = await store.store("already processed")
+        second = await store.store("pending")
+        db_session.add(UserSetting(key=_MEMORIES.cursor_key, value=str(first.id)))
+        await db_session.flush()
+
+        await backfill_table(db_session, _MEMORIES, batch_size=10)
+
+        assert embed_calls == [["pending"]]
+        assert await _embedded(db_session) == {first.id: None, second.id: [7.0]}
+
+    async def test_completed_pass_resets_cursor(self, db_session, embed_calls):
+        store = MemoryStore(db_session)
+        await store.store("fact")
+
+        await backfill_table(db_session, _MEMORIES, batch_size=10)
+
+        cursor = await db_session.get(UserSetting, _MEMORIES.cursor_key)
+        assert cursor is not None
+        assert cursor.value == "0"
+
+    async def test_embedding_outage_keeps_cursor(self, db_session, monkeypatch):
+        async def _down(texts: list[str]) -> list[list[float]]:
+            raise ConnectionError("ollama down")
+
+        monkeypatch.setattr(embedding_backfill, "embedding_batch", _down)
+        store = MemoryStore(db_session)
+        await store.store("fact")
+
+        stats = await backfill_table(db_session, _MEMORIES, batch_size=10)
+
+        assert stats.failed == 1
+        assert stats.embedded == 0
+        assert list((await _embedded(db_session)).values()) == [None]
+        assert await db_session.get(UserSetting, _MEMORIES.cursor_key) is None
+
+    async def test_rejected_row_is_skipped_not_retried_forever(self, db_session, embed_calls):
+        store = MemoryStore(db_session)
+        ok = await store.store("fine")
+        bad = await store.store("too long")
+        later = await store.store("also fine")
+
+        stats = await backfill_table(db_session, _MEMORIES, batch_size=2)
+
+        # The rejected batch is retried row by row; the next batch still runs
+        assert embed_calls == [["fine", "too long"], ["fine"], ["too long"], ["also fine"]]
+        assert (stats.embedded, stats.skipped, stats.failed) == (2, 1, 0)
+        assert await _embedded(db_session) == {ok.id: [4.0], bad.id: None, later.id: [9.0]}
+        cursor = await db_session.get(UserSetting, _MEMORIES.cursor_key)
+        assert cursor is not None and cursor.value == "0"  # the pass completed
+
+    async def test_nothing_to_do(self, db_session, embed_calls):
+        stats = await backfill_table(db_session, _MEMORIES, batch_size=10)
+        assert stats.embedded == 0
+        assert embed_calls == []
+
+    async def test_backfill_does_not_touch_updated_at(self, db_session, embed_calls):
+        old = datetime.datetime(2025, 1, 1, tzinfo=datetime.UTC)
+        todo = await TodoManager(db_session).create("Call dentist")
+        await db_session.execute(update(Todo).values(updated_at=old))
+
+        await backfill_table(db_session, _TODOS, batch_size=10)
+
+        row = (
+            await db_session.execute(
+                select(Todo.embedding, Todo.updated_at).where(Todo.id == todo.id)
+            )
+        ).one()
+        assert row.embedding == [12.0]
+        assert row.updated_at.replace(tzinfo=datetime.UTC) == old
@@ -0,0 +1,107 @@
+"""Tests for the episode builder worker job."""
+
+import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy import select
+
+from istari.models.conversation import ConversationMessage
+from istari.models.memory import Memory, MemoryType
+from istari.models.user import UserSetting
+from istari.worker.jobs.episodes import build_episodes_in_session, split_episodes
+
+_LLM = "istari.worker.jobs.episodes.completion"
+_NOW = datetime.datetime(2026, 5, 1, 12, 0, tzinfo=datetime.UTC)
+_GAP = datetime.timedelta(minutes=60)
+
+
+def _make_llm_response(content: str):
+    msg = MagicMock()
+    msg.content = content
+    choice = MagicMock()
+    choice.message = msg
+    resp = MagicMock()
+    resp.choices = [choice]
+    return resp
+
+
+def _msg(msg_id: int, minutes_ago: int, role: str = "user") -> ConversationMessage:
+    return ConversationMessage(
+        id=msg_id,
+        role=role,
+        content=f"message {msg_id}",
+        created_at=_NOW - datetime.timedelta(minutes=minutes_ago),
+    )
+
+
+class TestSplitEpisodes:
+    def test_splits_on_idle_gap(self):
+        msgs = [_msg(1, 300), _msg(2, 299), _msg(3, 120), _msg(4, 119)]
+        episodes = split_episodes(msgs, _GAP, max_messages=20, now=_NOW)
+        assert [[m.id for m in e] for e in episodes] == [[1, 2], [3, 4]]
+
+    def test_active_conversation_left_for_next_run(self):
+        msgs = [_msg(1, 300), _msg(2, 299), _msg(3, 5), _msg(4, 1)]
+        episodes = split_episodes(msgs, _GAP, max_messages=20, now=_NOW)
+        assert [[m.id for m in e] for e in episodes] == [[1, 2]]
+
+    def test_caps_episode_length(self):
+        msgs = [_msg(i, 10 - i) for i in range(1, 6)]
+        episodes = split_episodes(msgs, _GAP, max_messages=2, now=_NOW)
+        assert [[m.id for m in e] for e in episodes] == [[1, 2], [3, 4]]
+
+
+class TestBuildEpisodes:
+    async def _seed(self, session, minutes_ago: list[int]) -> None:  # type: ignore[no-untyped-def]
+        now = datetime.datetime.now(datetime.UTC)
+        for i, ago in enumerate(minutes_ago):
+            session.add(ConversationMessage(
+                role="user" if i % 2 == 0 else "assistant",
+                content=f"message {i}",
+                created_at=now - datetime.timedelta(minutes=ago),
+            ))
+        await session.flush()
+
+    async def test_stores_episodic_memory_and_advances_cursor(self, db_session):
+        await self._seed(db_session, [600, 599, 10])
+
+        llm = AsyncMock(return_value=_make_llm_response("Talked about the dentist."))
+        with patch(_LLM, new=llm):
+            stored = await build_episodes_in_session(db_session)
+
+        assert stored == 1
+        result = await db_session.execute(select(Memory))
+        (episode,) = result.scalars().all()
+        assert episode.type == MemoryType.EPISODIC
+        assert episode.content.endswith("Talked about the dentist.")
+        assert episode.source is not None
+        assert episode.source.startswith("conversation:")
+        cursor = await db_session.get(UserSetting, "episodes.last_message_id")
+        assert cursor is not None
+        assert int(cursor.value) == int(episode.source.split("-")[-1])
+
+    async def test_summary_failure_keeps_cursor(self, db_session):
+        await self._seed(db_session, [600, 599])
+
+        with patch(_LLM, new=AsyncMock(side_effect=RuntimeError("ollama down"))):
+            stored = await build_episodes_in_session(db_session)
+
+        assert stored == 0
+        assert await db_session.get(UserSetting, "episodes.last_message_id") is None
+
+    async def test_read_limit_stops_at_a_conversation_boundary(self, db_session, monkeypatch):
+        monkeypatch.setattr("istari.worker.jobs.episodes._READ_LIMIT", 3)
+        # Two idle conversations of two messages; the limit falls inside the second
+        await self._seed(db_session, [600, 599, 300, 299, 298])
+
+        llm = AsyncMock(return_value=_make_llm_response("Summary."))
+        with patch(_LLM, new=llm):
+            first_run = await build_episodes_in_session(db_session)
+            second_run = await build_episodes_in_session(db_session)
+
+        result = await db_session.execute(select(Memory.source).order_by(Memory.id))
+        sources = list(result.scalars())
+        assert (first_run, second_run) == (1, 1)
+        ids = [int(i) for source in sources for i in source.split(":")[1].split("-")]
+        assert ids[1] - ids[0] == 1  # first episode: the first two messages
+        assert ids[3] - ids[2] == 2  # second episode: all three, not cut at the limit
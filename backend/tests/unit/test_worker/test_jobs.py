@@ -48,6 +48,113 @@ async def test_run_gmail_digest_no_notifications():
         # Should not attempt DB writes
 
 
+@pytest.mark.asyncio
+async def test_run_gmail_digest_summarizes_mirror_delta_and_marks_it():
+    delta = [{"id": "m7", "subject": "New", "sender": "a@b.com", "snippet": "Hi"}]
+    mock_session = AsyncMock()
+    mock_session_factory = AsyncMock()
+    mock_session_factory.__aenter__ = AsyncMock(return_value=mock_session)
+    mock_session_factory.__aexit__ = AsyncMock(return_value=False)
+
+    with (
+        patch("istari.worker.jobs.gmail_digest._undigested_from_mirror",
+              AsyncMock(return_value=delta)),
+        patch("istari.worker.jobs.gmail_digest.proactive_graph") as mock_graph,
+        patch("istari.worker.jobs.gmail_digest.async_session_factory",
+              return_value=mock_session_factory),
+        patch("istari.worker.jobs.gmail_digest.NotificationManager") as mock_mgr_cls,
+        patch("istari.worker.jobs.gmail_digest.MailMirror") as mock_mirror_cls,
+    ):
+        mock_graph.ainvoke = AsyncMock(return_value={
+            "emails": delta,
+            "notifications": [{"type": "gmail_digest", "content": "1 new email."}],
+        })
+        mock_mgr_cls.return_value.create = AsyncMock()
+        mock_mirror_cls.return_value.mark_digested = AsyncMock()
+
+        from istari.worker.jobs.gmail_digest import run_gmail_digest
+
+        await run_gmail_digest()
+
+        assert mock_graph.ainvoke.call_args.args[0]["emails"] == delta
+        mock_mirror_cls.return_value.mark_digested.assert_awaited_once_with(["m7"])
+        mock_session.commit.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_sync_gmail_mirror_commits():
+    mock_session = AsyncMock()
+    mock_session_factory = AsyncMock()
+    mock_session_factory.__aenter__ = AsyncMock(return_value=mock_session)
+    mock_session_factory.__aexit__ = AsyncMock(return_value=False)
+
+    with (
+        patch("istari.worker.jobs.gmail_sync.GmailReader") as mock_reader_cls,
+        patch("istari.worker.jobs.gmail_sync.async_session_factory",
+              return_value=mock_session_factory),
+        patch("istari.worker.jobs.gmail_sync.MailMirror") as mock_mirror_cls,
+    ):
+        mock_mirror_cls.return_value.sync = AsyncMock()
+
+        from istari.worker.jobs.gmail_sync import sync_gmail_mirror
+
+        await sync_gmail_mirror()
+
+        mock_mirror_cls.return_value.sync.assert_awaited_once()
+        assert mock_mirror_cls.return_value.sync.call_args.args[0] is mock_reader_cls.return_value
+        mock_session.commit.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_sync_gmail_mirror_without_token():
+    with (
+        patch("istari.worker.jobs.gmail_sync.GmailReader", side_effect=FileNotFoundError),
+        patch("istari.worker.jobs.gmail_sync.async_session_factory") as mock_factory,
+    ):
+        from istari.worker.jobs.gmail_sync import sync_gmail_mirror
+
+        await sync_gmail_mirror()
+
+        mock_factory.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_sync_calendar_store_commits():
+    mock_session = AsyncMock()
+    mock_session_factory = AsyncMock()
+    mock_session_factory.__aenter__ = AsyncMock(return_value=mock_session)
+    mock_session_factory.__aexit__ = AsyncMock(return_value=False)
+
+    with (
+        patch("istari.worker.jobs.calendar_sync.CalendarReader") as mock_reader_cls,
+        patch("istari.worker.jobs.calendar_sync.async_session_factory",
+              return_value=mock_session_factory),
+        patch("istari.worker.jobs.calendar_sync.CalendarStore") as mock_store_cls,
+        patch("istari.worker.jobs.calendar_sync.settings.calendar_backend", "google"),
+    ):
+        mock_store_cls.return_value.sync = AsyncMock()
+
+        from istari.worker.jobs.calendar_sync import sync_calendar_store
+
+        await sync_calendar_store()
+
+        mock_store_cls.return_value.sync.assert_awaited_once_with(mock_reader_cls.return_value)
+        mock_session.commit.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_sync_calendar_store_skips_apple_backend():
+    with (
+        patch("istari.worker.jobs.calendar_sync.CalendarReader") as mock_reader_cls,
+        patch("istari.worker.jobs.calendar_sync.settings.calendar_backend", "apple"),
+    ):
+        from istari.worker.jobs.calendar_sync import sync_calendar_store
+
+        await sync_calendar_store()
+
+        mock_reader_cls.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_check_stale_todos_creates_notifications():
     mock_result = {
@@ -0,0 +1,129 @@
+"""Tests for the memory consolidation (learning_update) worker job."""
+
+import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy import select
+
+from istari.models.memory import Memory, MemoryType
+from istari.worker.jobs.learning import (
+    archive_low_confidence,
+    cluster_pairs,
+    decay_unreferenced,
+    merge_cluster,
+)
+
+_LLM = "istari.worker.jobs.learning.completion"
+
+
+def _make_llm_response(content: str):
+    msg = MagicMock()
+    msg.content = content
+    choice = MagicMock()
+    choice.message = msg
+    resp = MagicMock()
+    resp.choices = [choice]
+    return resp
+
+
+async def _memory(session, content: str, **kwargs) -> Memory:  # type: ignore[no-untyped-def]
+    kwargs.setdefault("type", MemoryType.EXPLICIT)
+    memory = Memory(content=content, **kwargs)
+    session.add(memory)
+    await session.flush()
+    return memory
+
+
+class TestClusterPairs:
+    def test_groups_around_seed(self):
+        assert cluster_pairs([(1, 2), (1, 3), (5, 6)]) == [[1, 2, 3], [5, 6]]
+
+    def test_chain_does_not_join_far_members(self):
+        # 1~2 and 2~3 are close, but 3 was never compared close to the seed 1
+        assert cluster_pairs([(1, 2), (2, 3), (3, 4)]) == [[1, 2], [3, 4]]
+
+    def test_member_of_earlier_cluster_is_not_reused(self):
+        assert cluster_pairs([(4, 9), (1, 2), (2, 9)]) == [[1, 2], [4, 9]]
+
+    def test_no_pairs(self):
+        assert cluster_pairs([]) == []
+
+
+class TestMergeCluster:
+    async def test_merges_and_archives_originals(self, db_session):
+        a = await _memory(db_session, "Likes lattes", confidence=0.6, source="auto")
+        b = await _memory(db_session, "Drinks oat milk lattes", confidence=0.8, source="auto")
+
+        llm_resp = _make_llm_response("Drinks oat-milk lattes every morning")
+        with patch(_LLM, new=AsyncMock(return_value=llm_resp)):
+            merged = await merge_cluster(db_session, [a.id, b.id])
+
+        assert merged is not None
+        assert merged.content == "Drinks oat-milk lattes every morning"
+        assert merged.confidence == 0.8
+        assert merged.source == "consolidated"
+        assert a.archived_at is not None
+        assert b.archived_at is not None
+        assert merged.archived_at is None
+
+    async def test_user_stated_source_survives_merge(self, db_session):
+        a = await _memory(db_session, "Dog is Rex", source="chat")
+        b = await _memory(db_session, "Has a dog", source="auto")
+
+        llm_resp = _make_llm_response("Has a dog named Rex")
+        with patch(_LLM, new=AsyncMock(return_value=llm_resp)):
+            merged = await merge_cluster(db_session, [a.id, b.id])
+
+        assert merged is not None
+        assert merged.source == "chat"
+
+    async def test_llm_failure_leaves_cluster_untouched(self, db_session):
+        a = await _memory(db_session, "Likes lattes")
+        b = await _memory(db_session, "Likes coffee")
+
+        with patch(_LLM, new=AsyncMock(side_effect=RuntimeError("ollama down"))):
+            assert await merge_cluster(db_session, [a.id, b.id]) is None
+        assert a.archived_at is None
+        assert b.archived_at is None
+
+
+class TestDecayAndArchive:
+    async def test_decays_only_unreferenced(self, db_session):
+        old = datetime.datetime.now(datetime.UTC) - datetime.timedelta(days=60)
+        stale = await _memory(db_session, "Stale fact", confidence=1.0, created_at=old)
+        await _memory(
+            db_session,
+            "Recently used fact",
+            confidence=1.0,
+            created_at=old,
+            last_referenced_at=datetime.datetime.now(datetime.UTC),
+        )
+
+        assert await decay_unreferenced(db_session, days=30, factor=0.5) == 1
+        await db_session.refresh(stale)
+        assert stale.confidence == 0.5
+
+    async def test_archives_low_confidence_except_user_stated(self, db_session):
+        auto = await _memory(db_session, "Maybe likes jazz", confidence=0.1, source="auto")
+        await _memory(db_session, "Birthday is May 3", confidence=0.1, source="chat")
+        await _memory(db_session, "Works at Acme", confidence=0.9, source="auto")
+
+        assert await archive_low_confidence(db_session, threshold=0.3) == 1
+        result = await db_session.execute(select(Memory.id).where(Memory.archived_at.isnot(None)))
+        assert list(result.scalars()) == [auto.id]
+
+    async def test_episodic_memories_are_not_decayed_or_archived(self, db_session):
+        old = datetime.datetime.now(datetime.UTC) - datetime.timedelta(days=60)
+        episode = await _memory(
+            db_session,
+            "Talked through the kitchen renovation",
+            type=MemoryType.EPISODIC,
+            confidence=0.1,
+            source="auto",
+            created_at=old,
+        )
+
+        assert await decay_unreferenced(db_session, days=30, factor=0.5) == 0
+        assert await archive_low_confidence(db_session, threshold=0.3) == 0
+        await db_session.refresh(episode)
+        assert (episode.confidence, episode.archived_at) == (0.1, None)
@@ -0,0 +1,28 @@
+"""Tests for the project stats repair job."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from istari.worker.jobs.project_stats import repair_project_stats
+
+
+async def test_repair_commits_and_reports_drift(caplog):
+    mock_session = AsyncMock()
+    mock_session_factory = AsyncMock()
+    mock_session_factory.__aenter__ = AsyncMock(return_value=mock_session)
+    mock_session_factory.__aexit__ = AsyncMock(return_value=False)
+
+    with (
+        patch(
+            "istari.worker.jobs.project_stats.async_session_factory",
+            return_value=mock_session_factory,
+        ),
+        patch("istari.worker.jobs.project_stats.ProjectManager") as mock_proj_cls,
+    ):
+        mock_proj_mgr = MagicMock()
+        mock_proj_mgr.repair_stats = AsyncMock(return_value=[3, 8])
+        mock_proj_cls.return_value = mock_proj_mgr
+
+        await repair_project_stats()
+
+    mock_session.commit.assert_awaited_once()
+    assert "fixed 2 drifted row(s)" in caplog.text
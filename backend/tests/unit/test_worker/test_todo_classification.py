@@ -0,0 +1,54 @@
+"""Tests for the todo classification sweep worker job."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from istari.tools.todo.classification import ClassificationBatch
+
+_JOB = "istari.worker.jobs.todo_classification"
+
+
+def _session_factory(session: AsyncMock) -> MagicMock:
+    ctx = AsyncMock()
+    ctx.__aenter__ = AsyncMock(return_value=session)
+    ctx.__aexit__ = AsyncMock(return_value=False)
+    return MagicMock(return_value=ctx)
+
+
+async def test_drains_until_queue_empty_and_notifies_uncertain():
+    session = AsyncMock()
+    batches = [
+        ClassificationBatch(classified_ids=[1, 2], uncertain_titles=["Foo bar"]),
+        ClassificationBatch(classified_ids=[3]),
+        ClassificationBatch(),
+    ]
+
+    with (
+        patch(f"{_JOB}.async_session_factory", new=_session_factory(session)),
+        patch(f"{_JOB}.classify_pending", new=AsyncMock(side_effect=batches)) as classify,
+        patch(f"{_JOB}.NotificationManager") as notif_cls,
+    ):
+        notif_cls.return_value.create = AsyncMock()
+        from istari.worker.jobs.todo_classification import drain_classification_queue
+
+        await drain_classification_queue()
+
+    assert classify.await_count == 3
+    notif_cls.return_value.create.assert_awaited_once()
+    kwargs = notif_cls.return_value.create.call_args.kwargs
+    assert kwargs["type"] == "todo_classification"
+    assert "Foo bar" in kwargs["content"]
+
+
+async def test_no_notification_when_nothing_uncertain():
+    session = AsyncMock()
+
+    with (
+        patch(f"{_JOB}.async_session_factory", new=_session_factory(session)),
+        patch(f"{_JOB}.classify_pending", new=AsyncMock(return_value=ClassificationBatch())),
+        patch(f"{_JOB}.NotificationManager") as notif_cls,
+    ):
+        from istari.worker.jobs.todo_classification import drain_classification_queue
+
+        await drain_classification_queue()
+
+    notif_cls.assert_not_called()
@@ -0,0 +1,83 @@
+import type { ChangeEntity, ChangeEvent } from "../types/change";
+
+/**
+ * One shared EventSource on /api/events for the whole tab, opened on the
+ * first subscription and closed after the last one leaves. EventSource
+ * reconnects by itself; every reopen after the first is reported to all
+ * listeners as a resync, since changes made in the gap were missed.
+ */
+
+type Listener = (event: ChangeEvent) => void;
+type StatusListener = (connected: boolean) => void;
+
+interface Subscription {
+  entities: ReadonlySet<ChangeEntity>;
+  listener: Listener;
+}
+
+const RESYNC: ChangeEvent = { entity: "*", op: "resync", ids: null };
+
+const subscriptions = new Set<Subscription>();
+const statusListeners = new Set<StatusListener>();
+let source: EventSource | null = null;
+let connected = false;
+let hasOpened = false;
+
+function setConnected(value: boolean) {
+  if (connected === value) return;
+  connected = value;
+  statusListeners.forEach((fn) => fn(value));
+}
+
+function dispatch(event: ChangeEvent) {
+  subscriptions.forEach(({ entities, listener }) => {
+    if (event.entity === "*" || entities.has(event.entity)) listener(event);
+  });
+}
+
+function open() {
+  if (source || typeof EventSource === "undefined") return;
+  const es = new EventSource("/api/events/");
+  es.onopen = () => {
+    setConnected(true);
+    if (hasOpened) dispatch(RESYNC);
+    hasOpened = true;
+  };
+  es.onerror = () => setConnected(false);
+  es.addEventListener("change", (message) => {
+    try {
+      dispatch(JSON.parse((message as MessageEvent<string>).data) as ChangeEvent);
+    } catch {
+      // ignore malformed frames
+    }
+  });
+  source = es;
+}
+
+function close() {
+  source?.close();
+  source = null;
+  hasOpened = false;
+  setConnected(false);
+}
+
+export function subscribeChanges(entities: ChangeEntity[], listener: Listener): () => void {
+  const subscription: Subscription = { entities: new Set(entities), listener };
+  subscriptions.add(subscription);
+  open();
+  return () => {
+    subscriptions.delete(subscription);
+    if (subscriptions.size === 0) close();
+  };
+}
+
+export function isChangeFeedConnected(): boolean {
+  return connected;
+}
+
+export function onChangeFeedStatus(listener: StatusListener): () => void {
+  statusListeners.add(listener);
+  return () => {
+    statusListeners.delete(listener);
+  };
+}
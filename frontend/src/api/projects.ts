@@ -1,5 +1,5 @@
 import { apiFetch } from "./client";
-import type { Project, ProjectWithTodos } from "../types/project";
+import type { Project, ProjectSummary, ProjectWithTodos } from "../types/project";
 
 export interface ProjectUpdatePayload {
   name?: string;
@@ -8,7 +8,7 @@ export interface ProjectUpdatePayload {
   status?: "active" | "paused" | "complete";
 }
 
-export async function listProjects(status = "active"): Promise<{ projects: Project[] }> {
+export async function listProjects(status = "active"): Promise<{ projects: ProjectSummary[] }> {
   return apiFetch(`/projects/?status=${status}`);
 }
 
@@ -0,0 +1,53 @@
+import { useEffect, useRef } from "react";
+import type { ChangeEntity } from "../types/change";
+import { isChangeFeedConnected, onChangeFeedStatus, subscribeChanges } from "../api/events";
+
+// Changes arriving within this window (e.g. one bulk edit) trigger one refresh
+const COALESCE_MS = 100;
+
+/**
+ * Calls `refresh` when the server reports a change to any of `entities`.
+ * While the change feed is down, falls back to polling every `fallbackMs`.
+ */
+export function useChangeFeed(
+  entities: ChangeEntity[],
+  refresh: () => unknown,
+  fallbackMs: number,
+) {
+  const refreshRef = useRef(refresh);
+  refreshRef.current = refresh;
+  const key = [...entities].sort().join(",");
+
+  useEffect(() => {
+    let pending: ReturnType<typeof setTimeout> | null = null;
+    let poll: ReturnType<typeof setInterval> | null = null;
+
+    const schedule = () => {
+      if (pending) return;
+      pending = setTimeout(() => {
+        pending = null;
+        void refreshRef.current();
+      }, COALESCE_MS);
+    };
+
+    const setPolling = (live: boolean) => {
+      if (live && poll) {
+        clearInterval(poll);
+        poll = null;
+      } else if (!live && !poll) {
+        poll = setInterval(() => void refreshRef.current(), fallbackMs);
+      }
+    };
+
+    const unsubscribe = subscribeChanges(key.split(",") as ChangeEntity[], schedule);
+    const unwatch = onChangeFeedStatus(setPolling);
+    setPolling(isChangeFeedConnected());
+
+    return () => {
+      unsubscribe();
+      unwatch();
+      if (pending) clearTimeout(pending);
+      if (poll) clearInterval(poll);
+    };
+  }, [key, fallbackMs]);
+}
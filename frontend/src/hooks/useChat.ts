@@ -57,6 +57,19 @@ export function useChat({ onTodoCreated, onMemoryCreated, onAuthFailure }: UseCh
         return;
       }
 
+      // Background Eisenhower classification finished for todos created earlier.
+      // Refresh the todo list; show the follow-up question if the model was unsure.
+      if (data.type === "todos_classified") {
+        callbacksRef.current.onTodoCreated?.();
+        if (data.content) {
+          setMessages((prev) => [
+            ...prev,
+            { id: data.id, role: "assistant", content: data.content, createdAt: data.created_at },
+          ]);
+        }
+        return;
+      }
+
       const msg: Message = {
         id: data.id,
         role: "assistant",
@@ -1,13 +1,14 @@
-import { useCallback, useEffect, useRef, useState } from "react";
+import { useCallback, useEffect, useState } from "react";
 import type { Digest } from "../types/digest";
 import { listDigests, markReviewed as apiMarkReviewed } from "../api/digests";
+import { useChangeFeed } from "./useChangeFeed";
 
-const POLL_INTERVAL_MS = 60_000;
+// Polling only while the change feed is down
+const FALLBACK_POLL_MS = 60_000;
 
 export function useDigests() {
   const [digests, setDigests] = useState<Digest[]>([]);
   const [isLoading, setIsLoading] = useState(true);
-  const intervalRef = useRef<ReturnType<typeof setInterval> | null>(null);
 
   const refresh = useCallback(async () => {
     try {
@@ -20,16 +21,10 @@ export function useDigests() {
 
   useEffect(() => {
     refresh().finally(() => setIsLoading(false));
-
-    intervalRef.current = setInterval(() => {
-      void refresh();
-    }, POLL_INTERVAL_MS);
-
-    return () => {
-      if (intervalRef.current) clearInterval(intervalRef.current);
-    };
   }, [refresh]);
 
+  useChangeFeed(["digests"], refresh, FALLBACK_POLL_MS);
+
   const markReviewed = useCallback(
     async (id: number) => {
       await apiMarkReviewed(id);
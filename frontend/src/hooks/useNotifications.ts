@@ -1,4 +1,4 @@
-import { useState, useEffect, useCallback, useRef } from "react";
+import { useState, useEffect, useCallback } from "react";
 import type { Notification } from "../types/notification";
 import {
   listNotifications,
@@ -7,14 +7,15 @@ import {
   markAllRead as apiMarkAllRead,
   completeNotification as apiCompleteNotification,
 } from "../api/notifications";
+import { useChangeFeed } from "./useChangeFeed";
 
-const POLL_INTERVAL_MS = 60_000;
+// Polling only while the change feed is down
+const FALLBACK_POLL_MS = 60_000;
 
 export function useNotifications() {
   const [notifications, setNotifications] = useState<Notification[]>([]);
   const [unreadCount, setUnreadCount] = useState(0);
   const [isLoading, setIsLoading] = useState(true);
-  const intervalRef = useRef<ReturnType<typeof setInterval> | null>(null);
 
   const refresh = useCallback(async () => {
     try {
@@ -31,16 +32,10 @@ export function useNotifications() {
 
   useEffect(() => {
     refresh().finally(() => setIsLoading(false));
-
-    intervalRef.current = setInterval(() => {
-      void refresh();
-    }, POLL_INTERVAL_MS);
-
-    return () => {
-      if (intervalRef.current) clearInterval(intervalRef.current);
-    };
   }, [refresh]);
 
+  useChangeFeed(["notifications"], refresh, FALLBACK_POLL_MS);
+
   const markRead = useCallback(
     async (id: number) => {
       await markNotificationRead(id);
@@ -1,18 +1,19 @@
-import { useCallback, useEffect, useRef, useState } from "react";
+import { useCallback, useEffect, useState } from "react";
 import type { Project } from "../types/project";
 import {
   listProjects,
   updateProject as apiUpdateProject,
   type ProjectUpdatePayload,
 } from "../api/projects";
+import { useChangeFeed } from "./useChangeFeed";
 
-const POLL_INTERVAL_MS = 30_000;
+// Polling only while the change feed is down
+const FALLBACK_POLL_MS = 30_000;
 
 export function useProjects() {
   const [projects, setProjects] = useState<Project[]>([]);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
-  const intervalRef = useRef<ReturnType<typeof setInterval> | null>(null);
 
   const refresh = useCallback(async () => {
     try {
@@ -26,16 +27,10 @@ export function useProjects() {
 
   useEffect(() => {
     refresh().finally(() => setIsLoading(false));
-
-    intervalRef.current = setInterval(() => {
-      void refresh();
-    }, POLL_INTERVAL_MS);
-
-    return () => {
-      if (intervalRef.current) clearInterval(intervalRef.current);
-    };
   }, [refresh]);
 
+  useChangeFeed(["projects", "todos"], refresh, FALLBACK_POLL_MS);
+
   const updateProject = useCallback(
     async (id: number, updates: ProjectUpdatePayload) => {
       await apiUpdateProject(id, updates);
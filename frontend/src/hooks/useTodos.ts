@@ -8,6 +8,10 @@ import {
   toggleTodayFocus as apiToggleTodayFocus,
   type TodoUpdatePayload,
 } from "../api/todos";
+import { useChangeFeed } from "./useChangeFeed";
+
+// Polling only while the change feed is down
+const FALLBACK_POLL_MS = 15_000;
 
 export function useTodos() {
   const [todos, setTodos] = useState<Todo[]>([]);
@@ -27,10 +31,10 @@ export function useTodos() {
 
   useEffect(() => {
     refresh();
-    const id = setInterval(refresh, 15_000);
-    return () => clearInterval(id);
   }, [refresh]);
 
+  useChangeFeed(["todos"], refresh, FALLBACK_POLL_MS);
+
   const completeTodo = useCallback(
     async (id: number) => {
       await apiCompleteTodo(id);
@@ -0,0 +1,8 @@
+export type ChangeEntity = "todos" | "projects" | "notifications" | "digests";
+
+/** One entity-level delta from /api/events. `ids: null` means "refetch". */
+export interface ChangeEvent {
+  entity: ChangeEntity | "*";
+  op: "created" | "updated" | "deleted" | "resync";
+  ids: number[] | null;
+}
@@ -11,6 +11,12 @@ export interface Project {
   updated_at: string;
 }
 
+export interface ProjectSummary extends Project {
+  next_action_title: string | null;
+  open_todo_count: number;
+  last_activity: string | null;
+}
+
 export interface ProjectWithTodos extends Project {
   todos: Todo[];
 }
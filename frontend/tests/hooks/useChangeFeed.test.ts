@@ -0,0 +1,132 @@
+/**
+ * Tests for the shared change feed and useChangeFeed.
+ *
+ * Uses a manual EventSource mock to verify that:
+ *   - one EventSource is shared by every subscriber and closed after the last
+ *   - change events refresh only hooks subscribed to that entity
+ *   - bursts of changes are coalesced into one refresh
+ *   - polling runs only while the feed is disconnected
+ *   - a reconnect triggers a resync refresh
+ */
+
+import { renderHook, act } from "@testing-library/react";
+import { describe, it, expect, vi, beforeEach, afterEach } from "vitest";
+import { useChangeFeed } from "../../src/hooks/useChangeFeed";
+
+// ── EventSource mock ──────────────────────────────────────────────────────────
+
+class MockEventSource {
+  static instances: MockEventSource[] = [];
+  onopen: ((e: Event) => void) | null = null;
+  onerror: ((e: Event) => void) | null = null;
+  listeners = new Map<string, (e: MessageEvent) => void>();
+  close = vi.fn();
+
+  constructor(public url: string) {
+    MockEventSource.instances.push(this);
+  }
+
+  addEventListener(type: string, fn: (e: MessageEvent) => void) {
+    this.listeners.set(type, fn);
+  }
+
+  simulateOpen() {
+    this.onopen?.({} as Event);
+  }
+
+  simulateError() {
+    this.onerror?.({} as Event);
+  }
+
+  simulateChange(data: object) {
+    this.listeners.get("change")?.({ data: JSON.stringify(data) } as MessageEvent);
+  }
+}
+
+beforeEach(() => {
+  vi.useFakeTimers();
+  MockEventSource.instances = [];
+  vi.stubGlobal("EventSource", MockEventSource);
+});
+
+afterEach(() => {
+  vi.useRealTimers();
+  vi.unstubAllGlobals();
+});
+
+function source() {
+  expect(MockEventSource.instances).toHaveLength(1);
+  return MockEventSource.instances[0];
+}
+
+// ── Tests ─────────────────────────────────────────────────────────────────────
+
+describe("useChangeFeed", () => {
+  it("shares one EventSource and closes it with the last subscriber", () => {
+    const a = renderHook(() => useChangeFeed(["todos"], vi.fn(), 15_000));
+    const b = renderHook(() => useChangeFeed(["digests"], vi.fn(), 60_000));
+    expect(source().url).toBe("/api/events/");
+
+    a.unmount();
+    expect(source().close).not.toHaveBeenCalled();
+    b.unmount();
+    expect(source().close).toHaveBeenCalled();
+  });
+
+  it("refreshes only subscribers of the changed entity", () => {
+    const todos = vi.fn();
+    const digests = vi.fn();
+    renderHook(() => useChangeFeed(["todos"], todos, 15_000));
+    renderHook(() => useChangeFeed(["digests"], digests, 60_000));
+    act(() => source().simulateOpen());
+
+    act(() => source().simulateChange({ entity: "todos", op: "updated", ids: [1] }));
+    act(() => vi.advanceTimersByTime(200));
+
+    expect(todos).toHaveBeenCalledTimes(1);
+    expect(digests).not.toHaveBeenCalled();
+  });
+
+  it("coalesces a burst of changes into one refresh", () => {
+    const refresh = vi.fn();
+    renderHook(() => useChangeFeed(["todos"], refresh, 15_000));
+    act(() => source().simulateOpen());
+
+    act(() => {
+      source().simulateChange({ entity: "todos", op: "created", ids: [1] });
+      source().simulateChange({ entity: "todos", op: "updated", ids: null });
+    });
+    act(() => vi.advanceTimersByTime(200));
+
+    expect(refresh).toHaveBeenCalledTimes(1);
+  });
+
+  it("polls only while the feed is disconnected", () => {
+    const refresh = vi.fn();
+    renderHook(() => useChangeFeed(["notifications"], refresh, 1_000));
+
+    act(() => vi.advanceTimersByTime(2_500));
+    expect(refresh).toHaveBeenCalledTimes(2);
+
+    act(() => source().simulateOpen());
+    act(() => vi.advanceTimersByTime(5_000));
+    expect(refresh).toHaveBeenCalledTimes(2);
+
+    act(() => source().simulateError());
+    act(() => vi.advanceTimersByTime(1_000));
+    expect(refresh).toHaveBeenCalledTimes(3);
+  });
+
+  it("resyncs every subscriber after a reconnect", () => {
+    const refresh = vi.fn();
+    renderHook(() => useChangeFeed(["projects", "todos"], refresh, 30_000));
+    act(() => source().simulateOpen());
+    act(() => vi.advanceTimersByTime(200));
+    expect(refresh).not.toHaveBeenCalled();
+
+    act(() => source().simulateError());
+    act(() => source().simulateOpen());
+    act(() => vi.advanceTimersByTime(200));
+    expect(refresh).toHaveBeenCalledTimes(1);
+  });
+});
@@ -228,3 +228,39 @@ describe("useChat — history message handling", () => {
     expect(result.current.currentStatus).toBe("");
   });
 });
+
+describe("useChat — todos_classified handling", () => {
+  it("refreshes todos without adding a message when nothing was uncertain", () => {
+    const onTodoCreated = vi.fn();
+    const { result } = renderHook(() => useChat({ onTodoCreated }));
+    act(() => mockWs.simulateOpen());
+
+    sendServerMessage({
+      type: "todos_classified",
+      todo_ids: [1, 2],
+      id: "c-1",
+      content: "",
+      created_at: "2026-03-15T08:00:02Z",
+    });
+
+    expect(onTodoCreated).toHaveBeenCalledTimes(1);
+    expect(result.current.messages).toHaveLength(0);
+  });
+
+  it("shows the follow-up question when some titles were uncertain", () => {
+    const result = renderUseChat();
+
+    sendServerMessage({
+      type: "todos_classified",
+      todo_ids: [3],
+      id: "c-2",
+      content: 'I wasn\'t sure how to classify: "Foo bar".',
+      created_at: "2026-03-15T08:00:02Z",
+    });
+
+    expect(result.current.messages).toHaveLength(1);
+    expect(result.current.messages[0].role).toBe("assistant");
+    expect(result.current.messages[0].content).toContain("Foo bar");
+    expect(result.current.isLoading).toBe(false);
+  });
+});
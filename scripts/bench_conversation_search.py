@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Benchmark full-text conversation search on a synthetic message table.
+
+Builds ``bench.conversation_messages`` as a copy of the real table definition
+(generated search_vector column and indexes included), fills it with synthetic
+messages, then times ConversationStore.search / search_ranked against it.
+The real conversation history is never touched.
+
+Usage (from the repo root, with the database running):
+    python scripts/bench_conversation_search.py              # 1,000,000 rows
+    python scripts/bench_conversation_search.py --rows 100000 --keep
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend" / "src"))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from istari.config.settings import settings
+from istari.tools.conversation.store import ConversationStore
+
+# Every word is common at this scale; "zebra" below exercises the empty-result path.
+_VOCAB = [
+    "meeting", "project", "email", "dentist", "appointment", "groceries", "budget",
+    "report", "deadline", "travel", "flight", "hotel", "birthday", "gift", "doctor",
+    "insurance", "invoice", "taxes", "garden", "recipe", "workout", "running", "coffee",
+    "lunch", "dinner", "weekend", "vacation", "review", "design", "deploy", "server",
+    "backup", "family", "school", "homework", "car", "repair", "mortgage", "bank", "call",
+    "schedule", "reminder", "notes", "idea",
+]
+
+_QUERIES = (
+    "dentist",
+    "dentist appointment",
+    '"flight hotel"',
+    "mortgage -bank",
+    "meeting OR review",
+    "zebra",  # no matches
+)
+
+
+async def _populate(conn, rows: int) -> None:  # type: ignore[no-untyped-def]
+    await conn.execute(text("CREATE SCHEMA IF NOT EXISTS bench"))
+    await conn.execute(text("DROP TABLE IF EXISTS bench.conversation_messages"))
+    await conn.execute(text(
+        "CREATE TABLE bench.conversation_messages "
+        "(LIKE public.conversation_messages INCLUDING ALL)"
+    ))
+    # 8-24 random words per message, one message a minute going back in time
+    await conn.execute(
+        text("""
+            INSERT INTO bench.conversation_messages (id, role, content, created_at)
+            SELECT g,
+                   CASE WHEN g % 2 = 0 THEN 'user' ELSE 'assistant' END,
+                   (SELECT string_agg(v[1 + floor(random() * array_length(v, 1))::int], ' ')
+                      FROM generate_series(1, 8 + (g * 7) % 17)),
+                   now() - make_interval(mins => :rows - g)
+              FROM generate_series(1, :rows) AS g,
+                   CAST(:vocab AS text[]) AS v
+        """),
+        {"vocab": list(_VOCAB), "rows": rows},
+    )
+    await conn.execute(text("ANALYZE bench.conversation_messages"))
+
+
+async def _time(fn, repeat: int) -> tuple[float, float, int]:  # type: ignore[no-untyped-def]
+    samples = []
+    hits = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        hits = len(await fn())
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1], hits
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="reuse/keep the bench table")
+    args = parser.parse_args()
+
+    engine = create_async_engine(
+        settings.database_url, connect_args={"server_settings": {"search_path": "bench,public"}}
+    )
+    async with engine.begin() as conn:
+        exists = (await conn.execute(text(
+            "SELECT count(*) FROM information_schema.tables "
+            "WHERE table_schema = 'bench' AND table_name = 'conversation_messages'"
+        ))).scalar_one()
+        if not (args.keep and exists):
+            start = time.perf_counter()
+            await _populate(conn, args.rows)
+            print(f"Populated {args.rows:,} messages in {time.perf_counter() - start:.1f}s")
+
+    async with engine.connect() as conn:
+        session = AsyncSession(bind=conn)
+        store = ConversationStore(session)
+        print(f"{'query':<24} {'mode':<8} {'p50 ms':>8} {'p95 ms':>8} {'hits':>5}")
+        for q in _QUERIES:
+            for mode, fn in (
+                ("recent", lambda q=q: store.search(q, limit=20)),
+                ("ranked", lambda q=q: store.search_ranked(q, limit=5)),
+            ):
+                p50, p95, hits = await _time(fn, args.repeat)
+                print(f"{q:<24} {mode:<8} {p50:>8.1f} {p95:>8.1f} {hits:>5}")
+
+        plan = await conn.execute(text(
+            "EXPLAIN (ANALYZE, BUFFERS) SELECT id FROM conversation_messages "
+            "WHERE search_vector @@ websearch_to_tsquery('english', 'dentist appointment') "
+            "ORDER BY id DESC LIMIT 20"
+        ))
+        print("\n".join(row[0] for row in plan))
+        await session.close()
+
+    if not args.keep:
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP TABLE bench.conversation_messages"))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Benchmark the filesystem search index on a generated tree.
+
+Generates ``--files`` text files (plus a .git and node_modules directory the
+index must skip) in a temporary directory, then times a full refresh, a
+no-change refresh, a refresh after touching 1% of files, and searches.
+Nothing outside the temporary directory is touched.
+
+Usage (from the repo root):
+    python scripts/bench_fs_index.py                  # 100,000 files
+    python scripts/bench_fs_index.py --files 20000 --keep /tmp/fsbench
+"""
+
+import argparse
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend" / "src"))
+
+from istari.tools.filesystem.index import FileIndex
+
+_VOCAB = [
+    "meeting", "project", "email", "dentist", "appointment", "groceries", "budget",
+    "report", "deadline", "travel", "flight", "hotel", "birthday", "gift", "doctor",
+    "insurance", "invoice", "taxes", "garden", "recipe", "workout", "review", "design",
+    "deploy", "server", "backup", "family", "school", "mortgage", "schedule", "notes",
+]
+
+_QUERIES = ("dentist", "flight hotel", "quarterly zephyr", "TODO:", "zz")
+
+
+def _generate(root: Path, files: int, rng: random.Random) -> None:
+    per_dir = 200
+    for i in range(files):
+        d = root / f"dir{i // per_dir:04d}"
+        if i % per_dir == 0:
+            d.mkdir(parents=True, exist_ok=True)
+        lines = [
+            " ".join(rng.choice(_VOCAB) for _ in range(rng.randint(6, 14)))
+            for _ in range(rng.randint(5, 60))
+        ]
+        if i % 997 == 0:
+            lines.append("TODO: quarterly zephyr budget")
+        (d / f"note{i:06d}.md").write_text("\n".join(lines))
+    for skipped in (".git/objects", "node_modules/pkg"):
+        (root / skipped).mkdir(parents=True, exist_ok=True)
+        for j in range(files // 20):
+            (root / skipped / f"f{j}.txt").write_text("quarterly zephyr budget")
+
+
+def _time_queries(index: FileIndex, root: Path, repeat: int) -> None:
+    print(f"{'query':<20} {'p50 ms':>8} {'p95 ms':>8} {'hits':>5}")
+    for q in _QUERIES:
+        samples = []
+        hits = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            hits = len(index.search(q, root, max_results=20))
+            samples.append((time.perf_counter() - start) * 1000)
+        samples.sort()
+        p95 = samples[max(int(len(samples) * 0.95) - 1, 0)]
+        print(f"{q:<20} {statistics.median(samples):>8.2f} {p95:>8.2f} {hits:>5}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--keep", metavar="DIR", help="build in DIR and leave it there")
+    args = parser.parse_args()
+
+    base = Path(args.keep) if args.keep else Path(tempfile.mkdtemp(prefix="fsbench-"))
+    root = base / "tree"
+    rng = random.Random(42)
+    try:
+        if not root.exists():
+            start = time.perf_counter()
+            _generate(root, args.files, rng)
+            print(f"Generated {args.files:,} files in {time.perf_counter() - start:.1f}s")
+        index = FileIndex(base / "index.sqlite3")
+
+        for label in ("full refresh", "no-change refresh"):
+            result = index.refresh([str(root)])
+            rate = result.scanned / result.seconds if result.seconds else 0
+            print(
+                f"{label:<20} {result.seconds:>7.2f}s  scanned {result.scanned:,} "
+                f"({rate:,.0f} files/s), indexed {result.indexed:,}"
+            )
+
+        touched = rng.sample(sorted(root.glob("dir*/*.md")), max(args.files // 100, 1))
+        for path in touched:
+            path.write_text(path.read_text() + "\nedited")
+        result = index.refresh([str(root)])
+        print(
+            f"{'1% changed refresh':<20} {result.seconds:>7.2f}s  "
+            f"indexed {result.indexed:,}"
+        )
+
+        _time_queries(index, root, args.repeat)
+        index.close()
+    finally:
+        if not args.keep:
+            shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
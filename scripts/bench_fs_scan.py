@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Benchmark the parallel un-indexed filesystem scan on a generated tree.
+
+Generates ``--files`` text files (plus binaries, a few large logs and a
+node_modules directory the scan must skip) in a temporary directory, then
+times full scans for a needle that is almost nowhere, and early-exit scans
+for a common one, at several worker counts. The previous implementation
+(``rglob``, whole-file decode) runs as the baseline. Nothing outside the
+temporary directory is touched.
+
+The first pass over a freshly generated tree is served from the page cache;
+drop caches between runs to measure a cold disk.
+
+Usage (from the repo root):
+    python scripts/bench_fs_scan.py                  # 20,000 files
+    python scripts/bench_fs_scan.py --files 100000 --workers 1,4,8,16
+"""
+
+import argparse
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend" / "src"))
+
+from istari.tools.filesystem.scan import scan_text
+
+_VOCAB = [
+    "meeting", "project", "email", "dentist", "appointment", "groceries", "budget",
+    "report", "deadline", "travel", "flight", "hotel", "birthday", "gift", "doctor",
+    "insurance", "invoice", "taxes", "garden", "recipe", "workout", "review", "design",
+]
+
+
+def _generate(root: Path, files: int, rng: random.Random) -> None:
+    per_dir = 200
+    for i in range(files):
+        d = root / f"dir{i // per_dir:04d}"
+        if i % per_dir == 0:
+            d.mkdir(parents=True, exist_ok=True)
+        if i % 50 == 0:
+            (d / f"blob{i:06d}.bin").write_bytes(rng.randbytes(64 * 1024))
+            continue
+        lines = [
+            " ".join(rng.choice(_VOCAB) for _ in range(rng.randint(6, 14)))
+            for _ in range(rng.randint(5, 60))
+        ]
+        if i == files - 1:
+            lines.append("the quarterly zephyr budget")
+        (d / f"note{i:06d}.md").write_text("\n".join(lines))
+    for i in range(5):
+        (root / f"big{i}.log").write_text("dentist report\n" * 400_000)  # ~6 MB each
+    (root / "node_modules" / "pkg").mkdir(parents=True)
+    for j in range(files // 10):
+        (root / "node_modules" / "pkg" / f"f{j}.js").write_text("module.exports = {};\n")
+
+
+def _legacy_scan(query: str, root: Path, max_files: int, max_results: int) -> int:
+    """The pre-scanner search_text_in_files loop, for comparison; returns files read."""
+    needle = query.lower()
+    scanned = found = 0
+    for path in root.rglob("*"):
+        if scanned >= max_files or found >= max_results:
+            break
+        if not path.is_file():
+            continue
+        scanned += 1
+        try:
+            text = path.read_bytes().decode("utf-8", errors="strict")
+        except (UnicodeDecodeError, OSError):
+            continue
+        if needle in text.lower():
+            found += 1
+            next(line for line in text.splitlines() if needle in line.lower())
+    return scanned
+
+
+def _row(label: str, samples: list[float], files: int) -> None:
+    p50 = statistics.median(samples)
+    rate = files / p50 if p50 else 0
+    print(f"{label:<28} {p50 * 1000:>9.1f} {max(samples) * 1000:>9.1f} {files:>8,} {rate:>10,.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", default="1,4,8", help="comma-separated pool sizes")
+    parser.add_argument("--keep", metavar="DIR", help="build in DIR and leave it there")
+    args = parser.parse_args()
+
+    base = Path(args.keep) if args.keep else Path(tempfile.mkdtemp(prefix="fsscan-"))
+    root = base / "tree"
+    limit = args.files * 2
+    try:
+        if not root.exists():
+            start = time.perf_counter()
+            _generate(root, args.files, random.Random(42))
+            print(f"Generated {args.files:,} files in {time.perf_counter() - start:.1f}s")
+
+        print(f"{'scan':<28} {'p50 ms':>9} {'max ms':>9} {'files':>8} {'files/s':>10}")
+        for query, kind in (("quarterly zephyr", "full"), ("dentist", "early")):
+            samples = []
+            scanned = 0
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                scanned = _legacy_scan(query, root, limit, max_results=10)
+                samples.append(time.perf_counter() - start)
+            _row(f"{kind}: legacy", samples, scanned)
+            for workers in (int(w) for w in args.workers.split(",")):
+                samples = []
+                for _ in range(args.repeat):
+                    result = scan_text(
+                        query, str(root), max_files=limit, max_results=10,
+                        time_budget=600, workers=workers,
+                    )
+                    samples.append(result.seconds)
+                _row(f"{kind}: {workers} workers", samples, result.scanned)
+    finally:
+        if not args.keep:
+            shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
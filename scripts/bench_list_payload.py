@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Benchmark list queries with and without the 768-dimension embedding column.
+
+Builds ``bench.todos`` and ``bench.memories`` as copies of the real tables, fills
+them with synthetic rows that all carry an embedding, then compares three ways
+of reading the same list:
+
+    eager     select(Model) with the embedding undeferred (the old default)
+    deferred  select(Model) as the managers issue it now
+    rows      the TodoRow / MemoryRow column projection used by list endpoints
+
+For each it prints median wall time and the peak Python allocation
+(tracemalloc) while decoding the result. The real tables are never touched.
+
+Usage (from the repo root, with the database running and migrated):
+    python scripts/bench_list_payload.py              # 10,000 rows each
+    python scripts/bench_list_payload.py --rows 50000 --keep
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend" / "src"))
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import undefer
+
+from istari.config.settings import settings
+from istari.models.memory import Memory, MemoryType
+from istari.models.todo import Todo, TodoStatus
+from istari.tools.memory.store import MemoryStore
+from istari.tools.todo.manager import TodoManager
+
+
+async def _populate(conn: Any, rows: int) -> None:
+    await conn.execute(text("CREATE SCHEMA IF NOT EXISTS bench"))
+    for table in ("todos", "memories"):
+        await conn.execute(text(f"DROP TABLE IF EXISTS bench.{table}"))
+        await conn.execute(text(f"CREATE TABLE bench.{table} (LIKE public.{table} INCLUDING ALL)"))
+        # The copied id default would draw from the real sequence
+        await conn.execute(text(f"ALTER TABLE bench.{table} ALTER COLUMN id DROP DEFAULT"))
+    # "+ g * 0" keeps the vector subquery correlated, so every row gets its own
+    await conn.execute(
+        text("""
+            INSERT INTO bench.todos (id, title, status, created_at, updated_at, embedding)
+            SELECT g, 'Synthetic todo ' || g, 'open', now() - make_interval(mins => g),
+                   now(), (SELECT array_agg(random() + g * 0)::vector(768)
+                             FROM generate_series(1, 768))
+              FROM generate_series(1, :rows) AS g
+        """),
+        {"rows": rows},
+    )
+    await conn.execute(
+        text("""
+            INSERT INTO bench.memories (id, type, content, confidence, source,
+                                        created_at, updated_at, embedding)
+            SELECT g, 'explicit', 'Synthetic fact ' || g, 1.0, 'chat',
+                   now() - make_interval(mins => g), now(),
+                   (SELECT array_agg(random() + g * 0)::vector(768)
+                      FROM generate_series(1, 768))
+              FROM generate_series(1, :rows) AS g
+        """),
+        {"rows": rows},
+    )
+    await conn.execute(text("ANALYZE bench.todos"))
+    await conn.execute(text("ANALYZE bench.memories"))
+
+
+async def _measure(
+    session: AsyncSession, fn: Callable[[], Awaitable[list[Any]]], repeat: int
+) -> tuple[float, float, int]:
+    """Median ms, peak MiB allocated during one call, and the row count."""
+    samples = []
+    rows = 0
+    for _ in range(repeat):
+        session.expunge_all()
+        start = time.perf_counter()
+        rows = len(await fn())
+        samples.append((time.perf_counter() - start) * 1000)
+    session.expunge_all()
+    tracemalloc.start()
+    await fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(samples), peak / 2**20, rows
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--keep", action="store_true", help="reuse/keep the bench tables")
+    args = parser.parse_args()
+
+    engine = create_async_engine(
+        settings.database_url, connect_args={"server_settings": {"search_path": "bench,public"}}
+    )
+    async with engine.begin() as conn:
+        exists = await conn.execute(text("SELECT to_regclass('bench.memories') IS NOT NULL"))
+        if not (args.keep and exists.scalar_one()):
+            start = time.perf_counter()
+            await _populate(conn, args.rows)
+            print(f"Populated {args.rows:,} todos and memories in "
+                  f"{time.perf_counter() - start:.1f}s")
+
+    async with AsyncSession(engine) as session:
+        todos = TodoManager(session)
+        memories = MemoryStore(session)
+
+        async def _eager(stmt: Any) -> list[Any]:
+            return list((await session.execute(stmt)).scalars().all())
+
+        open_todos = select(Todo).where(Todo.status == TodoStatus.OPEN)
+        explicit = select(Memory).where(Memory.type == MemoryType.EXPLICIT)
+        cases: list[tuple[str, str, Callable[[], Awaitable[list[Any]]]]] = [
+            ("list_open", "eager", lambda: _eager(open_todos.options(undefer(Todo.embedding)))),
+            ("list_open", "deferred", todos.list_open),
+            ("list_open", "rows", todos.list_open_rows),
+            ("list_explicit", "eager",
+             lambda: _eager(explicit.options(undefer(Memory.embedding)))),
+            ("list_explicit", "deferred", memories.list_explicit),
+            ("list_explicit", "rows", memories.list_explicit_rows),
+        ]
+        print(f"{'query':<14} {'mode':<9} {'p50 ms':>8} {'peak MiB':>9} {'rows':>7}")
+        for name, mode, fn in cases:
+            p50, peak, rows = await _measure(session, fn, args.repeat)
+            print(f"{name:<14} {mode:<9} {p50:>8.1f} {peak:>9.1f} {rows:>7}")
+
+    if not args.keep:
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP TABLE bench.todos"))
+            await conn.execute(text("DROP TABLE bench.memories"))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Benchmark semantic note indexing and search on a generated notes tree.
+
+Generates ``--notes`` markdown files in a temporary directory and indexes
+them into ``bench.note_files`` / ``bench.note_chunks``, copies of the real
+tables (HNSW index included). It times a full refresh, a no-change refresh
+and a refresh after editing 1% of the notes, then measures query latency.
+The real note index is never touched.
+
+Embeddings come from a deterministic hashed bag-of-words stand-in (the one
+the unit tests use), so the numbers measure chunking, the database and
+pgvector rather than the embedding model. Pass ``--ollama`` to embed with
+the configured model instead.
+
+Usage (from the repo root, with the database running):
+    python scripts/bench_note_index.py                  # 5,000 notes
+    python scripts/bench_note_index.py --notes 20000 --ollama
+"""
+
+import argparse
+import asyncio
+import hashlib
+import math
+import random
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend" / "src"))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from istari.config.settings import settings
+from istari.tools.filesystem import semantic
+from istari.tools.filesystem.semantic import NoteIndex, NoteIndexResult
+
+_VOCAB = [
+    "meeting", "project", "email", "dentist", "appointment", "groceries", "budget",
+    "report", "deadline", "travel", "flight", "hotel", "birthday", "gift", "doctor",
+    "insurance", "invoice", "taxes", "garden", "recipe", "workout", "review", "design",
+    "deploy", "server", "backup", "family", "school", "mortgage", "kitchen", "contractor",
+]
+
+_QUERIES = (
+    "what did the contractor quote for the kitchen",
+    "flight and hotel for the trip",
+    "mortgage and taxes paperwork",
+    "dentist appointment",
+)
+
+
+def hashed_embedding(value: str, dim: int = 768) -> list[float]:
+    vec = [0.0] * dim
+    for word in re.findall(r"[a-z0-9]+", value.lower()):
+        digest = hashlib.blake2b(word.encode(), digest_size=8).digest()
+        bucket = int.from_bytes(digest[:4], "little") % dim
+        vec[bucket] += 1.0 if digest[4] & 1 else -1.0
+    norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+    return [v / norm for v in vec]
+
+
+async def _batch(texts: list[str]) -> list[list[float]]:
+    return [hashed_embedding(t) for t in texts]
+
+
+async def _one(value: str) -> list[float]:
+    return hashed_embedding(value)
+
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(rng.choice(_VOCAB) for _ in range(rng.randint(20, 80)))
+
+
+def _generate(root: Path, notes: int, rng: random.Random) -> None:
+    per_dir = 200
+    for i in range(notes):
+        d = root / f"folder{i // per_dir:03d}"
+        if i % per_dir == 0:
+            d.mkdir(parents=True, exist_ok=True)
+        sections = []
+        for s in range(rng.randint(1, 6)):
+            body = "\n\n".join(_paragraph(rng) for _ in range(rng.randint(1, 4)))
+            sections.append(f"# Section {s}\n\n{body}")
+        (d / f"note{i:05d}.md").write_text("\n\n".join(sections) + "\n")
+
+
+def _report(label: str, r: NoteIndexResult) -> None:
+    files = r.scanned / r.seconds if r.seconds else 0
+    chunks = r.chunks / r.seconds if r.seconds else 0
+    print(
+        f"{label:<20} {r.seconds:>7.2f}s  scanned {r.scanned:,} ({files:,.0f} files/s), "
+        f"changed {r.changed:,}, chunks {r.chunks:,} ({chunks:,.0f}/s), "
+        f"embedded {r.embedded:,}, reused {r.reused:,}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--ollama", action="store_true", help="embed with the real model")
+    args = parser.parse_args()
+
+    if not args.ollama:
+        semantic.embedding_batch = _batch  # type: ignore[assignment]
+        semantic.generate_embedding = _one  # type: ignore[assignment]
+
+    base = Path(tempfile.mkdtemp(prefix="notebench-"))
+    root = base / "notes"
+    rng = random.Random(42)
+    engine = create_async_engine(
+        settings.database_url, connect_args={"server_settings": {"search_path": "bench,public"}}
+    )
+    try:
+        start = time.perf_counter()
+        _generate(root, args.notes, rng)
+        print(f"Generated {args.notes:,} notes in {time.perf_counter() - start:.1f}s")
+
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE SCHEMA IF NOT EXISTS bench"))
+            await conn.execute(text("DROP TABLE IF EXISTS bench.note_chunks, bench.note_files"))
+            for table in ("note_files", "note_chunks"):
+                await conn.execute(text(
+                    f"CREATE TABLE bench.{table} (LIKE public.{table} INCLUDING ALL)"
+                ))
+
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            index = NoteIndex(session)
+            _report("full refresh", await index.refresh([str(root)]))
+            _report("no-change refresh", await index.refresh([str(root)]))
+
+            for path in rng.sample(sorted(root.glob("*/*.md")), max(args.notes // 100, 1)):
+                path.write_text(path.read_text() + f"\n# Edit\n\n{_paragraph(rng)}\n")
+            _report("1% edited refresh", await index.refresh([str(root)]))
+
+            print(f"{'query':<48} {'p50 ms':>8} {'p95 ms':>8} {'hits':>5}")
+            for q in _QUERIES:
+                samples = []
+                hits = 0
+                for _ in range(args.repeat):
+                    began = time.perf_counter()
+                    hits = len(await index.search(q, top_k=5))
+                    samples.append((time.perf_counter() - began) * 1000)
+                samples.sort()
+                p95 = samples[max(int(len(samples) * 0.95) - 1, 0)]
+                print(f"{q:<48} {statistics.median(samples):>8.1f} {p95:>8.1f} {hits:>5}")
+
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP TABLE bench.note_chunks, bench.note_files"))
+    finally:
+        await engine.dispose()
+        shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
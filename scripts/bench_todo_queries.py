@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Benchmark the todo prioritization queries on a synthetic 100k-row table.
+
+Builds ``bench.todos`` as a copy of the real table definition (generated
+quadrant column and partial indexes included), fills it with synthetic todos,
+then times the TodoManager read paths used by the sidebar and the agent and
+prints each statement's EXPLAIN ANALYZE plan. Queries that are expected to be
+index-backed are flagged if Postgres falls back to a sequential scan.
+The real todos are never touched.
+
+Usage (from the repo root, with the database running and migrated):
+    python scripts/bench_todo_queries.py              # 100,000 rows
+    python scripts/bench_todo_queries.py --rows 10000 --keep
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend" / "src"))
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from istari.config.settings import settings
+from istari.tools.todo.manager import TodoManager
+
+# Status mix roughly like a long-lived personal list: mostly finished work
+_POPULATE_SQL = """
+INSERT INTO bench.todos (id, title, status, priority, urgent, important, due_date, today_date,
+                         created_at, updated_at)
+SELECT g, 'Synthetic todo ' || g,
+       (CASE WHEN r < 0.15 THEN 'open' WHEN r < 0.18 THEN 'in_progress'
+             WHEN r < 0.20 THEN 'blocked' WHEN r < 0.95 THEN 'complete'
+             ELSE 'deferred' END)::todostatus,
+       CASE WHEN g % 4 = 0 THEN 1 + g % 5 END,
+       CASE WHEN g % 3 = 0 THEN NULL ELSE g % 2 = 0 END,
+       CASE WHEN g % 5 = 0 THEN NULL ELSE g % 3 = 1 END,
+       CASE WHEN g % 10 < 3 THEN now() + make_interval(days => (g % 70) - 10) END,
+       CASE WHEN g % 20000 = 0 THEN current_date END,
+       now() - make_interval(mins => g),
+       now() - make_interval(mins => g)
+  FROM (SELECT g, random() AS r FROM generate_series(1, :rows) AS g) AS s
+"""
+
+_INDEXED = {"get_prioritized", "list_today", "list_open", "get_due_soon"}
+
+
+async def _populate(conn: Any, rows: int) -> None:
+    await conn.execute(text("CREATE SCHEMA IF NOT EXISTS bench"))
+    await conn.execute(text("DROP TABLE IF EXISTS bench.todos"))
+    await conn.execute(text("CREATE TABLE bench.todos (LIKE public.todos INCLUDING ALL)"))
+    # The copied id default would draw from the real todos sequence
+    await conn.execute(text("ALTER TABLE bench.todos ALTER COLUMN id DROP DEFAULT"))
+    await conn.execute(text(_POPULATE_SQL), {"rows": rows})
+    await conn.execute(text("ANALYZE bench.todos"))
+
+
+async def _time(fn: Callable[[], Awaitable[list[Any]]], repeat: int) -> tuple[float, float, int]:
+    samples = []
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = len(await fn())
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1], rows
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="reuse/keep the bench table")
+    args = parser.parse_args()
+
+    engine = create_async_engine(
+        settings.database_url, connect_args={"server_settings": {"search_path": "bench,public"}}
+    )
+    async with engine.begin() as conn:
+        exists = (await conn.execute(text("SELECT to_regclass('bench.todos') IS NOT NULL")))
+        if not (args.keep and exists.scalar_one()):
+            start = time.perf_counter()
+            await _populate(conn, args.rows)
+            print(f"Populated {args.rows:,} todos in {time.perf_counter() - start:.1f}s")
+
+    # Capture the SQL each manager call issues so it can be EXPLAINed verbatim
+    captured: list[tuple[str, Any]] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        captured.append((statement, parameters))
+
+    async with AsyncSession(engine) as session:
+        mgr = TodoManager(session)
+        cases: list[tuple[str, Callable[[], Awaitable[list[Any]]]]] = [
+            ("get_prioritized", lambda: mgr.get_prioritized(limit=settings.priorities_max)),
+            ("list_today", mgr.list_today),
+            ("list_open", mgr.list_open),
+            ("get_due_soon", lambda: mgr.get_due_soon(days=settings.deadline_nudge_days)),
+            ("list_visible", mgr.list_visible),
+        ]
+        print(f"{'query':<16} {'p50 ms':>8} {'p95 ms':>8} {'rows':>7}")
+        plans: list[tuple[str, str, Any]] = []
+        for name, fn in cases:
+            captured.clear()
+            p50, p95, rows = await _time(fn, args.repeat)
+            print(f"{name:<16} {p50:>8.1f} {p95:>8.1f} {rows:>7}")
+            plans.append((name, *captured[-1]))
+            session.expunge_all()
+
+        event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+        conn = await session.connection()
+        for name, statement, parameters in plans:
+            result = await conn.exec_driver_sql(
+                "EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters
+            )
+            plan = "\n".join(row[0] for row in result)
+            flag = ""
+            if name in _INDEXED and "Seq Scan on todos" in plan:
+                flag = "  <-- expected an index scan"
+            print(f"\n== {name}{flag}\n{plan}")
+
+    if not args.keep:
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP TABLE bench.todos"))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())